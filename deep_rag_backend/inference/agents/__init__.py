@@ -1,7 +1,7 @@
 """
 Agent modules for direct pipeline (inference/agents/pipeline.py).
 """
-from inference.agents.pipeline import run_deep_rag, State
+from inference.agents.pipeline import run_deep_rag, arun_deep_rag, astream_deep_rag, stream_deep_rag, run_deep_rag_batch, State
 from inference.agents.planner import planner
 from inference.agents.retriever import retriever_agent
 from inference.agents.compressor import compressor
@@ -10,6 +10,10 @@ from inference.agents.synthesizer import synthesizer
 
 __all__ = [
     'run_deep_rag',
+    'arun_deep_rag',
+    'astream_deep_rag',
+    'stream_deep_rag',
+    'run_deep_rag_batch',
     'State',
     'planner',
     'retriever_agent',
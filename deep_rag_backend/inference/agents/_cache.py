@@ -0,0 +1,106 @@
+"""
+Thread-safe LRU cache with TTL for agent LLM outputs (planner/compressor).
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def make_key(*parts: Any) -> str:
+    """Build a stable sha1 cache key from the given parts."""
+    h = hashlib.sha1()
+    for part in parts:
+        h.update(str(part).encode("utf-8"))
+        h.update(b"\x1f")  # unit separator so ("ab", "c") != ("a", "bc")
+    return h.hexdigest()
+
+
+class QueryCache:
+    """
+    LRU cache with per-entry TTL.
+
+    Entries older than `ttl_sec` are treated as misses and dropped on access.
+    When `maxsize` is exceeded, the least recently used entry is evicted.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl_sec: float = 3600.0):
+        self.maxsize = maxsize
+        self.ttl_sec = ttl_sec
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for `key`, or None on miss/expiry."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Insert or refresh `key`, evicting the LRU entry if over capacity."""
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl_sec)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all entries and reset counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl_sec": self.ttl_sec,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hit_rate,
+            }
+
+
+_MAXSIZE = int(os.getenv('AGENT_CACHE_MAXSIZE', '256'))
+_TTL_SEC = float(os.getenv('AGENT_CACHE_TTL_SEC', '3600'))
+
+planner_cache = QueryCache(maxsize=_MAXSIZE, ttl_sec=_TTL_SEC)
+compressor_cache = QueryCache(maxsize=_MAXSIZE, ttl_sec=_TTL_SEC)
+
+
+def get_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Return hit/miss statistics for the agent caches."""
+    return {
+        "planner": planner_cache.stats(),
+        "compressor": compressor_cache.stats(),
+    }
+
+
+def clear_caches() -> None:
+    """Clear all agent caches."""
+    planner_cache.clear()
+    compressor_cache.clear()
@@ -0,0 +1,83 @@
+"""
+Evidence kernels for the agents, JIT-compiled with numba when available.
+
+- count_strong: the critic's strong-chunk count
+- first_occurrence: dedup of evidence on precomputed 64-bit chunk_id hashes
+
+numba is optional: without it (or with NUMBA_DISABLE_JIT=1) the NumPy
+implementations from inference.agents.evidence / retrieval.stages.merge are
+used. The evidence score arrays are float32, so the critic runs the kernel;
+numba's CPU target has no float16 support, so half-precision input from
+other callers takes the NumPy path.
+"""
+import logging
+import numpy as np
+
+from inference.agents.evidence import count_strong as _count_strong_numpy
+from retrieval.stages.merge import first_occurrence as _first_occurrence_numpy
+
+logger = logging.getLogger(__name__)
+
+try:
+    from numba import njit
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
+
+
+if _NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _score_numba(ce, lex, vec, thresh):
+        strong = 0
+        for i in range(ce.shape[0]):
+            if ce[i] > thresh or (lex[i] > 0 and vec[i] > 0):
+                strong += 1
+        return strong
+
+    @njit(cache=True)
+    def _first_occurrence_numba(ids):
+        # Open-addressing hash set over the (already hashed) ids, linear probing;
+        # one pass instead of np.unique's sort + the sort of the kept indices
+        n = ids.shape[0]
+        cap = 1
+        while cap < 2 * n:
+            cap <<= 1
+        mask = np.uint64(cap - 1)
+        table = np.zeros(cap, dtype=np.uint64)
+        used = np.zeros(cap, dtype=np.bool_)
+        keep = np.empty(n, dtype=np.intp)
+        m = 0
+        for i in range(n):
+            h = ids[i]
+            j = h & mask
+            while used[j] and table[j] != h:
+                j = (j + np.uint64(1)) & mask
+            if not used[j]:
+                used[j] = True
+                table[j] = h
+                keep[m] = i
+                m += 1
+        return keep[:m]
+
+    # JIT warmup at import so the first critic call does not pay compilation
+    try:
+        _warm = np.zeros(1, dtype=np.float32)
+        _score_numba(_warm, _warm, _warm, np.float32(0.0))
+        _first_occurrence_numba(np.zeros(1, dtype=np.uint64))
+    except Exception as e:
+        logger.warning("numba scoring warmup failed, using NumPy fallback: %s", e)
+        _NUMBA_AVAILABLE = False
+
+
+def count_strong(ce: np.ndarray, lex: np.ndarray, vec: np.ndarray, thresh: float) -> int:
+    """Count chunks with CE above `thresh` or a positive lexical AND vector score."""
+    if _NUMBA_AVAILABLE and ce.dtype != np.float16:
+        return int(_score_numba(ce, lex, vec, np.float32(thresh)))
+    return _count_strong_numpy(ce, lex, vec, thresh)
+
+
+def first_occurrence(ids: np.ndarray) -> np.ndarray:
+    """Indices of the first occurrence of each distinct uint64 id, in original order."""
+    if _NUMBA_AVAILABLE and ids.dtype == np.uint64:
+        return _first_occurrence_numba(ids)
+    return _first_occurrence_numpy(ids)
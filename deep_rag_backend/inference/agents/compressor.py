@@ -3,7 +3,9 @@ Compressor agent: Summarizes retrieved evidence into concise notes.
 """
 import logging
 from inference.agents.state import State
+from inference.agents.hit import to_hits
 from inference.llm import call_llm
+from inference.agents._cache import compressor_cache, make_key
 
 logger = logging.getLogger(__name__)
 
@@ -13,17 +15,26 @@ def compressor(state: State) -> State:
     logger.info("-" * 40)
     logger.info("AGENT: Compressor - Summarizing evidence")
     logger.info("-" * 40)
-    logger.info(f"Compressing {len(state['evidence'])} chunks into notes...")
+    logger.info("Compressing %d chunks into notes...", len(state['evidence']))
     
+    hits = to_hits(state["evidence"])
     # Map-reduce style compression of top evidence
-    snippets = "\n\n".join([f"[p{h['p0']}–{h['p1']}] {h['text'][:1200]}" for h in state["evidence"]])
+    snippets = "\n\n".join(f"[p{h.p0}–{h.p1}] {h.snippet}" for h in hits)
     prompt = f"""Summarize the following context into crisp notes with bullets.
 Retain numbers and proper nouns verbatim. Avoid speculation.
 Context:\n{snippets}"""
-    notes, _ = call_llm("You compress evidence from grounded context.", [{"role":"user","content":prompt}], max_tokens=300)
-    state["notes"] = notes.strip()
+    # Keyed on the evidence chunk_ids, so notes are recomputed once refinement merges new evidence
+    cache_key = make_key(*sorted(str(h.chunk_id) for h in hits), state.get('question', ''))
+    notes = compressor_cache.get(cache_key)
+    if notes is None:
+        notes, _ = call_llm("You compress evidence from grounded context.", [{"role":"user","content":prompt}], max_tokens=300)
+        notes = notes.strip()
+        compressor_cache.put(cache_key, notes)
+    else:
+        logger.info("Notes served from cache")
+    state["notes"] = notes
     
-    logger.info(f"Compressed Notes:\n{state['notes']}")
+    logger.info("Compressed Notes:\n%s", state['notes'])
     logger.info("-" * 80)
     return state
 
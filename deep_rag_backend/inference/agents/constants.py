@@ -1,6 +1,12 @@
 """
 Constants for agent pipeline.
 """
+import os
+from dotenv import load_dotenv
+load_dotenv()
+
 MAX_ITERS = 3
 THRESH = 0.30  # require ≥2 strong chunks via CE or lex/vec hybrid
-
+# Critic confidence (0-1) below which the synthesizer answers "I don't know." without calling
+# the LLM. The critic heuristic is 0.4 + 0.1*strong, so the default skips when no chunk is strong.
+SYNTH_MIN_CONFIDENCE = float(os.getenv('SYNTH_MIN_CONFIDENCE', '0.45'))
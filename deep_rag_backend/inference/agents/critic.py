@@ -2,9 +2,13 @@
 Critic agent: Evaluates evidence quality and triggers refinement if needed.
 """
 import logging
-import re
+from typing import Tuple
+import numpy as np
 from inference.agents.state import State
 from inference.agents.constants import MAX_ITERS, THRESH
+from inference.agents.hit import to_hits
+from inference.agents.evidence import get_evidence_arrays, merge_evidence
+from inference.agents._scoring import count_strong
 from inference.llm import call_llm
 from retrieval.retrieval import retrieve_hybrid
 import os
@@ -13,71 +17,98 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Refinement query sanitization (characters that break tsquery parsing):
+# one str.translate pass, '&' spelled out and the rest blanked
+_SANITIZE_TABLE = str.maketrans({'&': ' and ', '!': ' ', '|': ' ', ':': ' ', '*': ' ', '"': ' '})
+
+
+def _score_evidence(ce: np.ndarray, lex: np.ndarray, vec: np.ndarray) -> Tuple[int, float]:
+    """Count strong chunks (CE or lex/vec hybrid) and map them to a heuristic confidence."""
+    strong = count_strong(ce, lex, vec, THRESH)
+    conf = min(0.9, 0.4 + 0.1*strong)  # toy heuristic; plug in your own
+    return strong, conf
+
+
+# 0.4 + 0.1*2 = 0.6: two strong chunks already clear the refinement threshold
+_STRONG_ENOUGH = 2
+
 
 def critic(state: State) -> State:
     """Critic agent: Evaluates evidence quality and triggers refinement if needed."""
-    logger.info("-" * 40)
-    logger.info("AGENT: Critic - Evaluating evidence quality")
-    logger.info("-" * 40)
+    logger.debug("-" * 40)
+    logger.debug("AGENT: Critic - Evaluating evidence quality")
+    logger.debug("-" * 40)
+    state["evidence"] = to_hits(state["evidence"])
+    
+    # Hot path: enough strong chunks on the first pass means conf >= 0.6 - skip all refinement setup
+    strong, conf = _score_evidence(*get_evidence_arrays(state))
+    if strong >= _STRONG_ENOUGH:
+        state["confidence"] = conf
+        logger.info("Critic: %d/%d strong chunks, confidence %.2f - proceeding to synthesis",
+                    strong, len(state["evidence"]), conf)
+        return state
+    
     k: int = int(os.getenv('K_CRITIC', '6'))
     k_lex: int = int(os.getenv('K_LEX', '60'))
     k_vec: int = int(os.getenv('K_VEC', '60'))
-    logger.info(f"Critic Retrieval parameters: k={k}, k_lex={k_lex}, k_vec={k_vec}")
-    ev = state["evidence"]
-    strong = sum(1 for h in ev if h.get("ce", 0.0) > THRESH or (h["lex"]>0 and h["vec"]>0))
-    conf = min(0.9, 0.4 + 0.1*strong)  # toy heuristic; plug in your own
-    state["confidence"] = conf
-    
-    logger.info(f"Strong chunks: {strong}/{len(ev)}")
-    logger.info(f"Confidence score: {conf:.2f}")
-    logger.info(f"Iterations: {state['iterations']}/{MAX_ITERS}")
+    logger.info("Critic Retrieval parameters: k=%d, k_lex=%d, k_vec=%d", k, k_lex, k_vec)
     
-    if conf < 0.6 and state["iterations"] < MAX_ITERS:
-        logger.info(f"Confidence {conf:.2f} < 0.6 threshold - Requesting refinement...")
-        # Ask for refinement: new sub-questions or different keywords
-        prompt = f"""Given the plan:\n{state['plan']}\nAnd notes:\n{state['notes']}\n
+    # Refinement loop (bounded by MAX_ITERS) - re-score at the top of every pass
+    while True:
+        ev = state["evidence"]
+        strong, conf = _score_evidence(*get_evidence_arrays(state))
+        state["confidence"] = conf
+        
+        logger.info("Strong chunks: %d/%d", strong, len(ev))
+        logger.info("Confidence score: %.2f", conf)
+        logger.info("Iterations: %d/%d", state['iterations'], MAX_ITERS)
+        
+        if conf >= 0.6:
+            logger.info("Confidence %.2f >= 0.6 - Proceeding to synthesis", conf)
+            break
+        if state["iterations"] >= MAX_ITERS:
+            logger.info("Max iterations (%d) reached with confidence %.2f", MAX_ITERS, conf)
+            break
+        
+        logger.info("Confidence %.2f < 0.6 threshold - Requesting refinement...", conf)
+        fallback_queries = state.get("fallback_queries") or []
+        if fallback_queries:
+            # Use the planner's speculative refinement queries before paying for another LLM call
+            rq_raw = fallback_queries.pop(0)
+            logger.info("Using planner fallback query")
+        else:
+            # Ask for refinement: new sub-questions or different keywords
+            prompt = f"""Given the plan:\n{state['plan']}\nAnd notes:\n{state['notes']}\n
 Propose refined sub-queries (max 4) to retrieve missing evidence. Short, 1 line each.
 
 IMPORTANT: Write queries as natural language questions without special characters like &, *, |, !, :, or quotes. 
 Use plain text only. For example, write "Hygiene and DX" instead of "Hygiene & DX"."""
-        refinements, _ = call_llm("You suggest refinements for the given question and plan.", [{"role":"user","content":prompt}], max_tokens=120)
-        # Re-query once with the first refinement
-        rq_raw = refinements.splitlines()[0].strip("-• ").strip()
+            # Uncached: the prompt can repeat across iterations and each needs a fresh refinement
+            refinements, _ = call_llm("You suggest refinements for the given question and plan.", [{"role":"user","content":prompt}], max_tokens=120, cache=False)
+            # Re-query once with the first refinement
+            rq_raw = refinements.splitlines()[0].strip("-• ").strip()
         # Sanitize the refinement query
-        rq = rq_raw.replace('&', ' and ')
-        rq = re.sub(r'[\!\|\:\*\"]', ' ', rq)
-        rq = re.sub(r'\s+', ' ', rq).strip()
-        logger.info(f"Refinement query: {rq}")
+        rq = " ".join(rq_raw.translate(_SANITIZE_TABLE).split())
+        logger.info("Refinement query: %s", rq)
         
         doc_id = state.get('doc_id')
         cross_doc = state.get('cross_doc', False)
-        hits = retrieve_hybrid(rq, k, k_lex, k_vec, doc_id=doc_id, cross_doc=cross_doc)
+        hits = to_hits(retrieve_hybrid(rq, k, k_lex, k_vec, doc_id=doc_id, cross_doc=cross_doc))
         
         # Track doc_ids from refinement retrieval
         doc_ids_found = set(state.get('doc_ids', []))
         for hit in hits:
-            hit_doc_id = hit.get('doc_id')
-            if hit_doc_id:
-                doc_ids_found.add(hit_doc_id)
+            if hit.doc_id:
+                doc_ids_found.add(hit.doc_id)
         state["doc_ids"] = list(doc_ids_found)
-        logger.info(f"Retrieved {len(hits)} additional chunks from refinement")
+        logger.info("Retrieved %d additional chunks from refinement", len(hits))
         
-        # Merge and dedup by chunk_id
-        seen, merged = set(), []
-        for h in state["evidence"] + hits:
-            if h["chunk_id"] in seen: continue
-            seen.add(h["chunk_id"]); merged.append(h)
-        state["evidence"] = merged
+        # Merge and dedup by chunk_id (existing evidence wins over refinement hits)
+        merge_evidence(state, hits)
         state["iterations"] += 1
         
-        logger.info(f"Total evidence after merge: {len(state['evidence'])} chunks")
+        logger.info("Total evidence after merge: %d chunks", len(state['evidence']))
         logger.info("-" * 80)
-        return critic(state)   # one self-loop step (bounded by MAX_ITERS)
-    else:
-        if conf >= 0.6:
-            logger.info(f"Confidence {conf:.2f} >= 0.6 - Proceeding to synthesis")
-        else:
-            logger.info(f"Max iterations ({MAX_ITERS}) reached with confidence {conf:.2f}")
+    
     logger.info("-" * 80)
     return state
-
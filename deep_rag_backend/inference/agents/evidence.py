@@ -0,0 +1,88 @@
+"""
+Evidence score arrays (SoA) for the direct agent pipeline.
+
+The evidence list stays a list of Hit records; the CE/lex/vec scores are kept
+alongside it as parallel float32 arrays so the critic can score with NumPy
+(or the numba kernel in inference.agents._scoring). Half precision is not
+used: it flushes tiny positive scores to zero, which breaks the lex > 0 and
+vec > 0 test, and rounds scores near THRESH across the threshold.
+"""
+from typing import List, Tuple
+import numpy as np
+
+from inference.agents.state import State
+from inference.agents.hit import Hit
+from retrieval.stages.merge import DEDUP_VECTORIZE_MIN
+
+EvidenceArrays = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+SCORE_DTYPE = np.float32
+
+
+def _score_array(hits: List[Hit], key: str) -> np.ndarray:
+    return np.fromiter((getattr(h, key) or 0.0 for h in hits), dtype=SCORE_DTYPE, count=len(hits))
+
+
+def evidence_arrays(hits: List[Hit]) -> EvidenceArrays:
+    """Build (ce, lex, vec) score arrays aligned with `hits`."""
+    return _score_array(hits, "ce"), _score_array(hits, "lex"), _score_array(hits, "vec")
+
+
+def set_evidence_arrays(state: State, arrays: EvidenceArrays) -> None:
+    """Store the score arrays on the state next to state["evidence"]."""
+    state["evidence_ce"], state["evidence_lex"], state["evidence_vec"] = arrays
+
+
+def get_evidence_arrays(state: State) -> EvidenceArrays:
+    """
+    Return score arrays aligned with state["evidence"].
+
+    Rebuilds them from the hit dicts if they are missing or out of sync
+    (e.g. evidence was replaced without going through the retriever/critic).
+    state["evidence"] must already hold Hit records (see hit.to_hits).
+    """
+    n = len(state.get("evidence", []))
+    ce = state.get("evidence_ce")
+    lex = state.get("evidence_lex")
+    vec = state.get("evidence_vec")
+    if ce is None or lex is None or vec is None or not (len(ce) == len(lex) == len(vec) == n):
+        arrays = evidence_arrays(state.get("evidence", []))
+        set_evidence_arrays(state, arrays)
+        return arrays
+    return ce, lex, vec
+
+
+def count_strong(ce: np.ndarray, lex: np.ndarray, vec: np.ndarray, thresh: float) -> int:
+    """Count chunks with CE above `thresh` or a positive lexical AND vector score."""
+    return int(((ce > thresh) | ((lex > 0) & (vec > 0))).sum())
+
+
+def merge_evidence(state: State, hits: List[Hit]) -> int:
+    """
+    Append `hits` to state["evidence"], dropping repeated chunk_ids (existing
+    evidence wins), and keep the score arrays aligned. Returns the number added.
+
+    Large merges dedup on the precomputed Hit.cid64 hashes (numba hash-set
+    kernel, or np.unique without numba); small ones use a dict keyed by chunk_id.
+    """
+    # Deferred: _scoring imports this module
+    from inference.agents._scoring import first_occurrence
+
+    ce, lex, vec = get_evidence_arrays(state)
+    items = state["evidence"] + hits
+    if len(items) < DEDUP_VECTORIZE_MIN:
+        first = {}
+        for i, h in enumerate(items):
+            first.setdefault(h.chunk_id, i)
+        keep = np.fromiter(first.values(), dtype=np.intp, count=len(first))
+    else:
+        keep = first_occurrence(np.fromiter((h.cid64 for h in items), dtype=np.uint64, count=len(items)))
+    new_ce, new_lex, new_vec = evidence_arrays(hits)
+    set_evidence_arrays(state, (
+        np.concatenate([ce, new_ce])[keep],
+        np.concatenate([lex, new_lex])[keep],
+        np.concatenate([vec, new_vec])[keep],
+    ))
+    added = len(keep) - len(state["evidence"])
+    state["evidence"] = [items[i] for i in keep]
+    return added
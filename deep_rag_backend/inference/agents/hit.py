@@ -0,0 +1,87 @@
+"""
+Hit: typed, slotted record for a retrieved chunk in the direct agent pipeline.
+"""
+from dataclasses import dataclass, field, fields
+from typing import Any, Iterable, List, Mapping, Optional, Union
+import numpy as np
+
+from retrieval.stages.merge import chunk_id_hash
+
+# Evidence text is truncated to this many characters in compressor/synthesizer prompts
+SNIPPET_CHARS = 1200
+
+
+@dataclass(slots=True, frozen=True)
+class Hit:
+    """
+    A retrieved chunk with its retrieval scores.
+
+    retrieve_hybrid still returns dicts (shared with the LangGraph pipeline and
+    the API); the direct pipeline agents convert them with `to_hits()` and use
+    attribute access. `ce` is None when the chunk was not cross-encoder reranked.
+
+    Read-only mapping access (`hit["p0"]`, `hit.get("ce", 0.0)`) is kept so
+    shared helpers that take chunk dicts (e.g. retrieval.confidence) accept hits.
+    """
+    chunk_id: str
+    doc_id: Optional[str] = None
+    text: str = ""
+    p0: Optional[int] = None
+    p1: Optional[int] = None
+    content_type: str = "text"
+    image_path: str = ""
+    lex: float = 0.0
+    vec: float = 0.0
+    ce: Optional[float] = None
+    emb: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
+    # text[:SNIPPET_CHARS], sliced once at conversion instead of in every prompt build
+    snippet: str = field(default="", repr=False, compare=False)
+    # 64-bit hash of chunk_id, computed once so evidence merges can dedup with np.unique
+    cid64: int = field(default=0, repr=False, compare=False)
+
+    def __post_init__(self):
+        if not self.snippet and self.text:
+            object.__setattr__(self, "snippet", self.text[:SNIPPET_CHARS])
+        object.__setattr__(self, "cid64", chunk_id_hash(self.chunk_id))
+
+    @classmethod
+    def from_dict(cls, d: Union["Hit", Mapping[str, Any]]) -> "Hit":
+        """Build a Hit from a retrieval chunk dict (unknown keys are ignored)."""
+        if isinstance(d, Hit):
+            return d
+        return cls(**{name: d[name] for name in _FIELD_NAMES if name in d and d[name] is not None})
+
+    def as_dict(self) -> dict:
+        """Plain dict form (omits unset optional fields), for logging/JSON paths."""
+        return {name: getattr(self, name) for name in _FIELD_NAMES if getattr(self, name) is not None}
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in _FIELD_NAMES:
+            raise KeyError(key)
+        value = getattr(self, key)
+        if value is None and key in _OPTIONAL_SCORES:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        try:
+            self[key]  # type: ignore[index]
+        except KeyError:
+            return False
+        return True
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+
+_FIELD_NAMES = frozenset(f.name for f in fields(Hit) if f.name != "cid64")
+# Fields that were simply absent from the chunk dict when unset
+_OPTIONAL_SCORES = frozenset({"ce", "emb"})
+
+
+def to_hits(chunks: Iterable[Union[Hit, Mapping[str, Any]]]) -> List[Hit]:
+    """Convert retrieval chunk dicts to Hits (Hits are passed through; chunks without a chunk_id are dropped)."""
+    return [Hit.from_dict(c) for c in chunks if isinstance(c, Hit) or c.get("chunk_id")]
@@ -1,18 +1,38 @@
 """
 Main pipeline for direct agent loop.
 """
+import asyncio
 import logging
-from typing import Optional
+import os
+from typing import AsyncIterator, Iterator, List, Optional
 from inference.agents.state import State
-from inference.agents.planner import planner
+from inference.agents.planner import planner, aplanner, prime_plans
 from inference.agents.retriever import retriever_agent
 from inference.agents.compressor import compressor
 from inference.agents.critic import critic
-from inference.agents.synthesizer import synthesizer
+from inference.agents.synthesizer import synthesizer, asynthesize, asynthesizer
+from retrieval.embed_cache import turn_embedding_cache
 
 logger = logging.getLogger(__name__)
 
 
+def _initial_state(question: str, doc_id: Optional[str], cross_doc: bool) -> State:
+    state: State = {
+        "question": question, 
+        "plan": "", 
+        "evidence": [], 
+        "notes": "", 
+        "answer": "", 
+        "confidence": 0.0, 
+        "iterations": 0,
+        "doc_ids": [],
+        "cross_doc": cross_doc
+    }
+    if doc_id:
+        state["doc_id"] = doc_id
+    return state
+
+
 def run_deep_rag(question: str, doc_id: Optional[str] = None, cross_doc: bool = False) -> str:
     """
     Main entry point for Deep RAG pipeline.
@@ -28,24 +48,12 @@ def run_deep_rag(question: str, doc_id: Optional[str] = None, cross_doc: bool =
     logger.info("-" * 40)
     logger.info("DEEP RAG PIPELINE STARTED")
     logger.info("-" * 40)
-    logger.info(f"Question: {question}")
+    logger.info("Question: %s", question)
     if doc_id:
-        logger.info(f"Document filter: {doc_id[:8]}...")
+        logger.info("Document filter: %s...", doc_id[:8])
     logger.info("")
     
-    state: State = {
-        "question": question, 
-        "plan": "", 
-        "evidence": [], 
-        "notes": "", 
-        "answer": "", 
-        "confidence": 0.0, 
-        "iterations": 0,
-        "doc_ids": [],
-        "cross_doc": cross_doc
-    }
-    if doc_id:
-        state["doc_id"] = doc_id
+    state = _initial_state(question, doc_id, cross_doc)
     
     # Execute pipeline stages
     pipeline_stages = [
@@ -56,22 +64,178 @@ def run_deep_rag(question: str, doc_id: Optional[str] = None, cross_doc: bool =
         ("Synthesizer", synthesizer)
     ]
     
-    for stage_name, stage_fn in pipeline_stages:
-        logger.info(f"\n>>> Stage: {stage_name}")
-        try:
-            state = stage_fn(state)
-        except Exception as e:
-            logger.error(f"Error in {stage_name} stage: {e}", exc_info=True)
-            raise
+    # Every stage that embeds the question (or a repeated sub-query) shares one embedding
+    with turn_embedding_cache():
+        for stage_name, stage_fn in pipeline_stages:
+            logger.info("\n>>> Stage: %s", stage_name)
+            try:
+                state = stage_fn(state)
+            except Exception as e:
+                logger.error("Error in %s stage: %s", stage_name, e, exc_info=True)
+                raise
     
     logger.info("")
     logger.info("-" * 40)
     logger.info("DEEP RAG PIPELINE COMPLETED")
     logger.info("-" * 40)
-    logger.info(f"Final Confidence: {state['confidence']:.2f}")
-    logger.info(f"Total Iterations: {state['iterations']}")
-    logger.info(f"Total Evidence Chunks: {len(state['evidence'])}")
+    logger.info("Final Confidence: %.2f", state['confidence'])
+    logger.info("Total Iterations: %d", state['iterations'])
+    logger.info("Total Evidence Chunks: %d", len(state['evidence']))
     logger.info("-" * 40)
     
     return state["answer"]
 
+
+
+async def arun_deep_rag(question: str, doc_id: Optional[str] = None, cross_doc: bool = False) -> str:
+    """
+    Async variant of run_deep_rag for callers on an event loop (e.g. the /ask route).
+    
+    The planner and synthesizer LLM calls use the provider's async client, and
+    the retriever/compressor/critic run in worker threads, so the event loop
+    stays free to serve other requests for the whole pipeline.
+    
+    Args:
+        question: The question to ask
+        doc_id: Optional document ID to filter retrieval to a specific document
+        cross_doc: If True, enable cross-document retrieval (two-stage when doc_id provided)
+        
+    Returns:
+        The answer string
+    """
+    logger.info("-" * 40)
+    logger.info("DEEP RAG PIPELINE STARTED (async)")
+    logger.info("-" * 40)
+    logger.info("Question: %s", question)
+    if doc_id:
+        logger.info("Document filter: %s...", doc_id[:8])
+    
+    state = _initial_state(question, doc_id, cross_doc)
+    
+    try:
+        with turn_embedding_cache():
+            state = await aplanner(state)
+            for stage_name, stage_fn in [("Retriever", retriever_agent), ("Compressor", compressor), ("Critic", critic)]:
+                logger.info("\n>>> Stage: %s", stage_name)
+                state = await asyncio.to_thread(stage_fn, state)
+            logger.info("\n>>> Stage: Synthesizer")
+            state = await asynthesize(state)
+    except Exception as e:
+        logger.error("Error in async pipeline: %s", e, exc_info=True)
+        raise
+    
+    logger.info("-" * 40)
+    logger.info("DEEP RAG PIPELINE COMPLETED (async)")
+    logger.info("Final Confidence: %.2f", state['confidence'])
+    logger.info("-" * 40)
+    return state["answer"]
+
+
+async def astream_deep_rag(question: str, doc_id: Optional[str] = None, cross_doc: bool = False) -> AsyncIterator[str]:
+    """
+    Streaming variant of run_deep_rag: yields answer text as it is generated.
+    
+    The planner streams its plan while retrieval for the raw question is
+    prefetched; retriever/compressor/critic run in a worker thread; the
+    synthesizer's tokens are yielded as they arrive.
+    
+    Args:
+        question: The question to ask
+        doc_id: Optional document ID to filter retrieval to a specific document
+        cross_doc: If True, enable cross-document retrieval (two-stage when doc_id provided)
+        
+    Yields:
+        Answer text deltas (the last one is the sources line)
+    """
+    logger.info("-" * 40)
+    logger.info("DEEP RAG PIPELINE STARTED (streaming)")
+    logger.info("-" * 40)
+    logger.info("Question: %s", question)
+    if doc_id:
+        logger.info("Document filter: %s...", doc_id[:8])
+    
+    state = _initial_state(question, doc_id, cross_doc)
+    
+    try:
+        # No yield inside this block, so the cache is set and reset in the same context
+        with turn_embedding_cache():
+            state = await aplanner(state)
+            for stage_name, stage_fn in [("Retriever", retriever_agent), ("Compressor", compressor), ("Critic", critic)]:
+                logger.info("\n>>> Stage: %s", stage_name)
+                state = await asyncio.to_thread(stage_fn, state)
+        logger.info("\n>>> Stage: Synthesizer")
+        async for delta in asynthesizer(state):
+            yield delta
+    except Exception as e:
+        logger.error("Error in streaming pipeline: %s", e, exc_info=True)
+        raise
+    
+    logger.info("-" * 40)
+    logger.info("DEEP RAG PIPELINE COMPLETED (streaming)")
+    logger.info("Final Confidence: %.2f", state['confidence'])
+    logger.info("-" * 40)
+
+
+def stream_deep_rag(question: str, doc_id: Optional[str] = None, cross_doc: bool = False) -> Iterator[str]:
+    """
+    Synchronous iterator over astream_deep_rag, for callers without an event loop (e.g. the CLI).
+    
+    Drives the async generator on a private event loop one delta at a time, so
+    each token is available to the caller as soon as it is generated.
+    """
+    agen = astream_deep_rag(question, doc_id=doc_id, cross_doc=cross_doc)
+    loop = asyncio.new_event_loop()
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(agen.__anext__())
+            except StopAsyncIteration:
+                break
+    finally:
+        loop.run_until_complete(agen.aclose())
+        loop.close()
+
+
+async def run_deep_rag_batch(
+    questions: List[str],
+    doc_id: Optional[str] = None,
+    cross_doc: bool = False,
+    max_concurrency: Optional[int] = None
+) -> List[str]:
+    """
+    Answer several questions concurrently.
+    
+    The plans for all questions are generated up front with batched LLM
+    requests (see prime_plans). Each question then runs the full pipeline in a
+    worker thread; up to `max_concurrency` pipelines (BATCH_MAX_CONCURRENCY,
+    default 4) overlap their LLM and retrieval waits.
+    
+    Args:
+        questions: Questions to answer
+        doc_id: Optional document ID to filter retrieval to a specific document
+        cross_doc: If True, enable cross-document retrieval (two-stage when doc_id provided)
+        max_concurrency: Max pipelines in flight at once
+        
+    Returns:
+        Answers in the same order as `questions`
+    """
+    if max_concurrency is None:
+        max_concurrency = int(os.getenv('BATCH_MAX_CONCURRENCY', '4'))
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    
+    async def _run(i: int, question: str) -> str:
+        async with semaphore:
+            logger.info("[batch q%d/%d] started", i, len(questions))
+            answer = await asyncio.to_thread(run_deep_rag, question, doc_id, cross_doc)
+            logger.info("[batch q%d/%d] completed", i, len(questions))
+            return answer
+    
+    logger.info("DEEP RAG BATCH: %d questions, concurrency=%d", len(questions), max_concurrency)
+    # One row-marshalled planner request for the whole batch; each pipeline's
+    # planner then hits the cache (on failure they just plan individually)
+    if len(questions) > 1:
+        try:
+            await asyncio.to_thread(prime_plans, questions, doc_id)
+        except Exception as e:
+            logger.warning("Batched planning failed, planning per question: %s", e)
+    return list(await asyncio.gather(*(_run(i, q) for i, q in enumerate(questions, 1))))
@@ -1,35 +1,204 @@
 """
 Planner agent: Decomposes the question into sub-goals.
 """
+import asyncio
+import json
 import logging
+import os
+import re
+from typing import List, Optional, Tuple
 from inference.agents.state import State
-from inference.llm import call_llm
+from inference.llm import call_llm, call_llm_batch, call_llm_stream
+from inference.agents._cache import planner_cache, make_key
+from retrieval.retrieval import retrieve_hybrid
 
 logger = logging.getLogger(__name__)
 
+PLANNER_SYSTEM = "You plan tasks for the given question."
+MAX_FALLBACK_QUERIES = 3
+# Room for the JSON wrapper, up to 3 sub-goals and MAX_FALLBACK_QUERIES queries
+PLANNER_MAX_TOKENS = 600
 
-def planner(state: State) -> State:
-    """Planner agent: Decomposes the question into sub-goals."""
-    logger.info("-" * 40)
-    logger.info("AGENT: Planner - Decomposing question into sub-goals")
-    logger.info("-" * 40)
-    logger.info(f"Question: {state['question']}")
+_CODE_FENCE_RE = re.compile(r"^```(?:json)?\s*|\s*```$")
+# Fields of a JSON object cut off mid-way (e.g. at MAX_TOKENS); a string may be unterminated
+_PLAN_FIELD_RE = re.compile(r'"plan"\s*:\s*"((?:[^"\\]|\\.)*)')
+_FALLBACK_FIELD_RE = re.compile(r'"fallback_queries"\s*:\s*\[(.*)', re.DOTALL)
+_JSON_STRING_RE = re.compile(r'"((?:[^"\\]|\\.)*)"')
+
+
+def _build_planner_prompt(state: State) -> str:
+    """Build the planner prompt, including doc_id context if available."""
     doc_id = state.get('doc_id')
-    if doc_id:
-        logger.info(f"Planning for specific document: {doc_id}...")
-    
-    # Include doc_id context in prompt if available
     doc_context = ""
     if doc_id:
         doc_context = f"\n\nNote: This question is about a specific document that was just ingested. Focus your planning on this document's content."
-    
-    prompt = f"""You are a planner. Decompose the user's question into 1-3 concrete sub-goals
+
+    return f"""You are a planner. Decompose the user's question into 1-3 concrete sub-goals
 that can be answered ONLY from the provided context. Prefer explicit nouns and constraints.
+Also propose up to {MAX_FALLBACK_QUERIES} alternative search queries to use if the first retrieval is weak.
+Write them as natural language questions without special characters like &, *, |, !, :, or quotes.
+Respond with JSON only: {{"plan": "...", "fallback_queries": ["...", "..."]}}
 Question: {state['question']}{doc_context}"""
-    plan, _ = call_llm("You plan tasks for the given question.", [{"role":"user","content":prompt}], max_tokens=350)
-    state["plan"] = plan.strip()
+
+
+def _json_unescape(value: str) -> str:
+    """Decode a JSON string body, dropping a trailing escape cut off by truncation."""
+    for candidate in (value, value.rstrip("\\")):
+        try:
+            return json.loads(f'"{candidate}"')
+        except ValueError:
+            continue
+    return value
+
+
+def _salvage_truncated(raw: str) -> Tuple[str, List[str]]:
+    """
+    Recover (plan, fallback_queries) from a JSON object that was cut off.
+
+    Keeps the plan text written so far and every fallback query whose string
+    was closed. Returns an empty plan if not even the plan field started, so
+    raw JSON is never used as a plan (the retriever then searches the
+    question alone).
+    """
+    match = _PLAN_FIELD_RE.search(raw)
+    plan = _json_unescape(match.group(1)).strip() if match else ""
+    fallback: List[str] = []
+    queries = _FALLBACK_FIELD_RE.search(raw)
+    if queries:
+        fallback = [q for q in (_json_unescape(m).strip() for m in _JSON_STRING_RE.findall(queries.group(1))) if q]
+    return plan, fallback[:MAX_FALLBACK_QUERIES]
+
+
+def _parse_planner_output(text: str) -> Tuple[str, List[str]]:
+    """
+    Parse the planner response into (plan, fallback_queries).
     
-    logger.info(f"Generated Plan: {state['plan']}")
+    A JSON object that fails to parse (typically truncated at MAX_TOKENS) is
+    salvaged field by field; any other text is treated as a free-text plan
+    with no fallback queries.
+    """
+    raw = _CODE_FENCE_RE.sub("", text.strip())
+    try:
+        data = json.loads(raw)
+        plan = data["plan"]
+        if isinstance(plan, list):
+            plan = "\n".join(str(p) for p in plan)
+        fallback = [str(q).strip() for q in data.get("fallback_queries") or [] if str(q).strip()]
+        return str(plan).strip(), fallback[:MAX_FALLBACK_QUERIES]
+    except (ValueError, TypeError, KeyError, AttributeError):
+        if raw.startswith("{"):
+            logger.warning("Planner output is incomplete JSON - salvaging the fields written so far")
+            return _salvage_truncated(raw)
+        logger.debug("Planner output is not JSON - using free-text plan")
+        return text.strip(), []
+
+
+def _log_start(state: State) -> None:
+    logger.info("-" * 40)
+    logger.info("AGENT: Planner - Decomposing question into sub-goals")
+    logger.info("-" * 40)
+    logger.info("Question: %s", state['question'])
+    doc_id = state.get('doc_id')
+    if doc_id:
+        logger.info("Planning for specific document: %s...", doc_id)
+
+
+def planner(state: State) -> State:
+    """Planner agent: Decomposes the question into sub-goals."""
+    _log_start(state)
+
+    prompt = _build_planner_prompt(state)
+    cache_key = make_key(state['question'], state.get('doc_id') or "")
+    cached = planner_cache.get(cache_key)
+    if cached is None:
+        text, _ = call_llm(PLANNER_SYSTEM, [{"role":"user","content":prompt}], max_tokens=PLANNER_MAX_TOKENS)
+        cached = _parse_planner_output(text)
+        planner_cache.put(cache_key, cached)
+    else:
+        logger.info("Plan served from cache")
+    state["plan"], fallback = cached
+    state["fallback_queries"] = list(fallback)
+
+    logger.info("Generated Plan: %s", state['plan'])
+    if state["fallback_queries"]:
+        logger.info("Fallback queries: %s", state['fallback_queries'])
     logger.info("-" * 80)
     return state
 
+
+def prime_plans(questions: List[str], doc_id: Optional[str] = None) -> int:
+    """
+    Plan several questions with batched LLM requests and store the plans in planner_cache.
+
+    Used before fanning out a batch of pipelines, so each pipeline's planner is
+    a cache hit instead of its own LLM request. Returns the number of plans generated.
+    """
+    pending = {}
+    for question in questions:
+        key = make_key(question, doc_id or "")
+        if key not in pending and planner_cache.get(key) is None:
+            state: State = {"question": question}
+            if doc_id:
+                state["doc_id"] = doc_id
+            pending[key] = _build_planner_prompt(state)
+    if not pending:
+        return 0
+
+    texts = call_llm_batch(PLANNER_SYSTEM, list(pending.values()), max_tokens=PLANNER_MAX_TOKENS)
+    for key, text in zip(pending, texts):
+        planner_cache.put(key, _parse_planner_output(text))
+    logger.info("Planned %d question(s) in a batch", len(pending))
+    return len(pending)
+
+
+async def aplanner(state: State) -> State:
+    """
+    Async planner: streams the plan while prefetching retrieval for the raw question.
+
+    The prefetched hits are stored in state["prefetched_evidence"] and fused with
+    the sub-goal results by the retriever agent, so retrieval work overlaps with
+    plan generation.
+    """
+    _log_start(state)
+
+    prompt = _build_planner_prompt(state)
+    cache_key = make_key(state['question'], state.get('doc_id') or "")
+    cached = planner_cache.get(cache_key)
+    if cached is not None:
+        logger.info("Plan served from cache")
+    else:
+        k: int = int(os.getenv('K_RETRIEVER', '8'))
+        k_lex: int = int(os.getenv('K_LEX', '60'))
+        k_vec: int = int(os.getenv('K_VEC', '60'))
+        prefetch = asyncio.create_task(asyncio.to_thread(
+            retrieve_hybrid, state['question'], k, k_lex, k_vec,
+            doc_id=state.get('doc_id'), cross_doc=state.get('cross_doc', False)
+        ))
+
+        parts = []
+        try:
+            async for delta in call_llm_stream(PLANNER_SYSTEM, [{"role":"user","content":prompt}], max_tokens=PLANNER_MAX_TOKENS):
+                parts.append(delta)
+        except Exception:
+            # Only detaches the task: the worker thread can't be interrupted and
+            # finishes its retrieval in the background (the hits still land in
+            # the retrieval result cache)
+            prefetch.cancel()
+            raise
+        cached = _parse_planner_output("".join(parts))
+        planner_cache.put(cache_key, cached)
+
+        try:
+            state["prefetched_evidence"] = await prefetch
+            logger.info("Prefetched %d chunks during planning", len(state['prefetched_evidence']))
+        except Exception as e:
+            # Prefetch is an optimization only - the retriever still runs with the plan
+            logger.warning("Retrieval prefetch failed: %s", e)
+    state["plan"], fallback = cached
+    state["fallback_queries"] = list(fallback)
+
+    logger.info("Generated Plan: %s", state['plan'])
+    if state["fallback_queries"]:
+        logger.info("Fallback queries: %s", state['fallback_queries'])
+    logger.info("-" * 80)
+    return state
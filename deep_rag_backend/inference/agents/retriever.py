@@ -2,64 +2,103 @@
 Retriever agent: Fetches relevant chunks from the vector database.
 """
 import logging
+import re
+import numpy as np
+from typing import List
 from inference.agents.state import State
+from inference.agents.evidence import evidence_arrays, set_evidence_arrays
+from inference.agents.hit import to_hits
 from retrieval.retrieval import retrieve_hybrid
+from retrieval.stages import fuse_rrf
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+MAX_SUB_QUERIES = 3
+_BULLET_RE = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s*")
+
+
+def _plan_sub_queries(plan: str, max_queries: int = MAX_SUB_QUERIES) -> List[str]:
+    """Split a planner plan into up to `max_queries` sub-goal queries (one per line/bullet)."""
+    sub_queries = []
+    for line in plan.splitlines():
+        line = _BULLET_RE.sub("", line).strip()
+        if line:
+            sub_queries.append(line)
+        if len(sub_queries) >= max_queries:
+            break
+    return sub_queries
+
+
 
 def retriever_agent(state: State) -> State:
     """Retriever agent: Fetches relevant chunks from the vector database."""
     logger.info("-" * 40)
     logger.info("AGENT: Retriever - Fetching relevant chunks")
     logger.info("-" * 40)
-    q = f"{state['question']}  {state['plan']}"
+    # Search the question and each plan sub-goal separately, then fuse (RRF)
+    sub_queries = _plan_sub_queries(state.get('plan', ''))
+    queries = [state['question'], *sub_queries]
     doc_id = state.get('doc_id')
     cross_doc = state.get('cross_doc', False)
-    logger.info(f"Query: {q}")
+    logger.info("Queries: %s", queries)
     if doc_id:
-        logger.info(f"Filtering to document: {doc_id}...")
+        logger.info("Filtering to document: %s...", doc_id)
     if cross_doc:
         logger.info("Cross-document retrieval enabled")
     
     k: int = int(os.getenv('K_RETRIEVER', '8'))
     k_lex: int = int(os.getenv('K_LEX', '60'))
     k_vec: int = int(os.getenv('K_VEC', '60'))
-    logger.info(f"Retrieval Agent Parameters: k={k}, k_lex={k_lex}, k_vec={k_vec}")
+    logger.info("Retrieval Agent Parameters: k=%d, k_lex=%d, k_vec=%d", k, k_lex, k_vec)
 
-    hits = retrieve_hybrid(q, k, k_lex, k_vec, doc_id=doc_id, cross_doc=cross_doc)
+    prefetched = state.pop("prefetched_evidence", None)
+    if prefetched is not None:
+        # The async planner already retrieved for the question - only search the sub-goals
+        logger.info("Using %d chunks prefetched during planning for the question", len(prefetched))
+        result_lists = [prefetched]
+        if sub_queries:
+            result_lists.append(retrieve_hybrid(sub_queries, k, k_lex, k_vec, doc_id=doc_id, cross_doc=cross_doc))
+        hits = to_hits(fuse_rrf(result_lists, k))
+    else:
+        hits = to_hits(retrieve_hybrid(queries, k, k_lex, k_vec, doc_id=doc_id, cross_doc=cross_doc))
     state["evidence"] = hits
+    set_evidence_arrays(state, evidence_arrays(hits))
     
     # Track all doc_ids from retrieved chunks
     doc_ids_found = set()
     for hit in hits:
-        hit_doc_id = hit.get('doc_id')
-        if hit_doc_id:
-            doc_ids_found.add(hit_doc_id)
+        if hit.doc_id:
+            doc_ids_found.add(hit.doc_id)
     
     if doc_ids_found:
         state["doc_ids"] = list(doc_ids_found)
-        logger.info(f"Found {len(doc_ids_found)} document(s) in retrieved chunks: {[d + '...' for d in doc_ids_found]}")
+        logger.info("Found %d document(s) in retrieved chunks: %s", len(doc_ids_found), doc_ids_found)
     elif not state.get('doc_ids'):
         state["doc_ids"] = []
     
-    logger.info(f"Retrieved {len(hits)} chunks:")
-    for i, hit in enumerate(hits[:10], 1):  # Log top 10 for better visibility
-        logger.info(f"  [{i}] Chunk ID: {hit.get('chunk_id', 'N/A')[:8]}...")
-        logger.info(f"      Pages: {hit.get('p0', 'N/A')}-{hit.get('p1', 'N/A')}")
-        logger.info(f"      Content Type: {hit.get('content_type', 'N/A')}")
-        logger.info(f"      Scores: lex={hit.get('lex', 0):.4f}, vec={hit.get('vec', 0):.4f}, ce={hit.get('ce', 0):.4f}")
-        # Show more text preview (200 chars) to understand what was retrieved
-        text_preview = hit.get('text', '')[:200] if hit.get('text') else 'N/A'
-        logger.info(f"      Text preview: {text_preview}...")
-    if len(hits) > 10:
-        logger.info(f"  ... and {len(hits) - 10} more chunks")
-    # Log page distribution to see if all pages are represented
-    pages_found = sorted(set([h.get('p0', 0) for h in hits]))
-    logger.info(f"Pages represented in retrieved chunks: {pages_found}")
+    logger.info("Retrieved %d chunks:", len(hits))
+    # Per-hit detail is only built when INFO is enabled (slicing/formatting scales with k)
+    if logger.isEnabledFor(logging.INFO):
+        for i, hit in enumerate(hits[:10], 1):  # Log top 10 for better visibility
+            logger.info("  [%d] Chunk ID: %s...", i, str(hit.chunk_id)[:8])
+            logger.info("      Pages: %s-%s", hit.p0, hit.p1)
+            logger.info("      Content Type: %s", hit.content_type)
+            logger.info("      Scores: lex=%.4f, vec=%.4f, ce=%.4f", hit.lex, hit.vec, hit.ce or 0.0)
+            # Show more text preview (200 chars) to understand what was retrieved
+            text_preview = hit.text[:200] if hit.text else 'N/A'
+            logger.info("      Text preview: %s...", text_preview)
+        if len(hits) > 10:
+            logger.info("  ... and %d more chunks", len(hits) - 10)
+        # Log page distribution to see if all pages are represented
+        if len(hits) > 8:
+            # Single C-level sort + dedup for larger (refinement-merged) hit lists
+            pages_found = np.unique(np.fromiter((h.p0 or 0 for h in hits), dtype=np.int32, count=len(hits))).tolist()
+        else:
+            pages_found = sorted({h.p0 or 0 for h in hits})
+        logger.info("Pages represented in retrieved chunks: %s", pages_found)
     logger.info("-" * 40)
     return state
 
@@ -2,12 +2,15 @@
 State definition for direct agent pipeline.
 """
 from typing import TypedDict, List, Optional
+import numpy as np
+from inference.agents.hit import Hit
 
 
 class State(TypedDict, total=False):
     question: str
     plan: str
-    evidence: List[dict]
+    fallback_queries: List[str]  # Planner-proposed refinement queries, consumed by the critic before asking the LLM
+    evidence: List[Hit]  # Retrieved chunks (agents accept plain chunk dicts and convert with to_hits)
     notes: str
     answer: str
     confidence: float
@@ -15,4 +18,8 @@ class State(TypedDict, total=False):
     doc_id: Optional[str]  # Primary document ID for document-specific retrieval
     doc_ids: List[str]  # All document IDs found during retrieval (for multi-doc tracking)
     cross_doc: bool  # Whether cross-document retrieval is enabled
+    evidence_ce: np.ndarray  # Cross-encoder scores, aligned with evidence (float32)
+    evidence_lex: np.ndarray  # Lexical scores, aligned with evidence (float32)
+    evidence_vec: np.ndarray  # Vector scores, aligned with evidence (float32)
+    prefetched_evidence: List[dict]  # Hits retrieved for the raw question while the async planner streams
 
@@ -1,49 +1,112 @@
 """
 Synthesizer agent: Generates final answer from evidence.
 """
+import json
 import logging
+import re
+from typing import AsyncIterator, List, Optional, Tuple
+from pydantic import BaseModel, ValidationError
 from inference.agents.state import State
-from inference.llm import call_llm
+from inference.agents.constants import SYNTH_MIN_CONFIDENCE
+from inference.agents.hit import to_hits
+from inference.llm import acall_llm, call_llm, call_llm_stream
 from retrieval.confidence import get_confidence_for_chunks
 
 logger = logging.getLogger(__name__)
 
+SYNTHESIZER_SYSTEM = "You write precise, sourced answers."
+# Buffered calls ask for structured output; the streaming path keeps free text
+SYNTHESIZER_SYSTEM_JSON = (
+    SYNTHESIZER_SYSTEM + " Put the answer text in 'answer' and the numbers of the "
+    "context blocks it cites in 'cited_ids'."
+)
+# The JSON wrapper and string escaping cost tokens on top of the free-text answer
+SYNTHESIZER_JSON_MAX_TOKENS = 1024
 
-def synthesizer(state: State) -> State:
-    """Synthesizer agent: Generates final answer from evidence."""
+# Fields of a SynthesizedAnswer cut off mid-way (e.g. at MAX_TOKENS); the answer may be unterminated
+_ANSWER_FIELD_RE = re.compile(r'"answer"\s*:\s*"((?:[^"\\]|\\.)*)')
+_CITED_IDS_RE = re.compile(r'"cited_ids"\s*:\s*\[([\d\s,]*)\]')
+
+
+class SynthesizedAnswer(BaseModel):
+    """An answer to the question and the numbers of the context blocks it cites."""
+    # Passed as the Gemini response_schema; the docstring becomes its description
+    answer: str
+    cited_ids: List[int]
+
+# Prompt templates, built once; filled with str.format per call
+DOC_CONTEXT_NOTE = """\n\nNote: This answer is based on a specific document that was recently ingested or identified from the knowledge base. 
+        Document {doc_id} was used for this answer. Focus your answer on this document's content."""
+
+CLARIFY_PROMPT = """Using ONLY the context, summarize cautiously in 1–2 sentences.
+If the answer is incomplete, say what's missing.
+Add bracket citations like [1], [2] that map to the provided context blocks.{doc_context}
+
+Question: {question}
+
+Context:
+{context}
+"""
+
+ANSWER_PROMPT = """Answer the question using ONLY the context.
+If insufficient evidence, or the result is likely not in the context, say "I don't know."
+Add bracket citations like [1], [2] that map to the provided context blocks and snippets of text used from source documents.
+Which can include exact verbatim text from source documents or image descriptions.{doc_context}
+
+Question: {question}
+
+Context:
+{context}
+"""
+
+
+def _prepare_synthesis(state: State) -> Optional[Tuple[str, List[str], float]]:
+    """
+    Score the evidence and build the synthesis prompt.
+    
+    Returns (prompt, citations, confidence), or None if the agent abstains
+    (in which case state["answer"]/state["confidence"] are already set).
+    """
     logger.info("-" * 40)
     logger.info("AGENT: Synthesizer - Generating final answer")
     logger.info("-" * 40)
-    logger.info(f"Using top {min(5, len(state['evidence']))} chunks for synthesis")
+    logger.info("Using top %d chunks for synthesis", min(5, len(state['evidence'])))
     
     doc_id = state.get('doc_id')
     if doc_id:
-        logger.info(f"Synthesizing answer for specific document: {doc_id}...")
+        logger.info("Synthesizing answer for specific document: %s...", doc_id)
     
-    chunks_used = state["evidence"][:5]
+    chunks_used = to_hits(state["evidence"][:5])
     
     # If no evidence/chunks retrieved, always abstain
     if not chunks_used or len(chunks_used) == 0:
         logger.info("No evidence retrieved - abstaining")
         state["answer"] = "I don't know."
         state["confidence"] = 0.0
-        return state
+        return None
+    
+    # Critic ran out of refinements without finding strong evidence - skip the LLM call
+    critic_conf = state.get("confidence", 0.0)
+    if critic_conf < SYNTH_MIN_CONFIDENCE:
+        logger.info("Critic confidence %.2f < %.2f - abstaining without LLM call", critic_conf, SYNTH_MIN_CONFIDENCE)
+        state["answer"] = "I don't know."
+        state["confidence"] = 0.0
+        return None
     
     # Track all doc_ids from retrieved chunks
     doc_ids_found = set(state.get('doc_ids', []))
     for h in chunks_used:
-        hit_doc_id = h.get('doc_id')
-        if hit_doc_id:
-            doc_ids_found.add(hit_doc_id)
+        if h.doc_id:
+            doc_ids_found.add(h.doc_id)
     
     if doc_ids_found:
         state["doc_ids"] = list(doc_ids_found)
-        logger.info(f"Identified {len(doc_ids_found)} document(s) from retrieved chunks: {[d + '...' for d in doc_ids_found]}")
+        logger.info("Identified %d document(s) from retrieved chunks: %s", len(doc_ids_found), doc_ids_found)
         # Use the first doc_id as primary if not already set
         if not doc_id and len(doc_ids_found) == 1:
             doc_id = list(doc_ids_found)[0]
             state["doc_id"] = doc_id
-            logger.info(f"Using document ID: {doc_id}...")
+            logger.info("Using document ID: %s...", doc_id)
     
     # Calculate overall confidence using multi-feature approach
     question = state.get('question', '')
@@ -52,79 +115,164 @@ def synthesizer(state: State) -> State:
     overall_probability = conf_result["probability"]
     action = conf_result["action"]
     
-    logger.info(f"Confidence: {overall_confidence:.2f}% (probability: {overall_probability:.3f}), Action: {action}, Thresholds: abstain<{conf_result.get('abstain_threshold', 0.45)*100:.1f}%, clarify<{conf_result.get('clarify_threshold', 0.65)*100:.1f}%")
+    logger.info("Confidence: %.2f%% (probability: %.3f), Action: %s, Thresholds: abstain<%.1f%%, clarify<%.1f%%",
+                overall_confidence, overall_probability, action,
+                conf_result.get('abstain_threshold', 0.45)*100, conf_result.get('clarify_threshold', 0.65)*100)
     
     # Handle abstain action - also check if confidence is very low (< 40%) even if above threshold
     # This provides an extra safety check for cases with no documents
     if action == "abstain" or overall_confidence < 40.0:
         state["answer"] = "I don't know."
         state["confidence"] = overall_confidence
-        logger.info(f"Abstaining due to low confidence ({overall_confidence:.2f}%)")
-        return state
+        logger.info("Abstaining due to low confidence (%.2f%%)", overall_confidence)
+        return None
     
-    # Log which chunks are being used for synthesis
-    logger.info("Chunks used for synthesis:")
-    for i, h in enumerate(chunks_used, 1):
-        chunk_doc_id = h.get('doc_id', 'N/A')
-        logger.info(f"  [{i}] Doc: {chunk_doc_id[:8] if chunk_doc_id != 'N/A' else 'N/A'}... Pages {h['p0']}–{h['p1']}: {h.get('text', '')[:100]}...")
-    
-    # Build citations with per-chunk confidence scores
+    # One pass over the chunks builds the citations, the context blocks and
+    # (when INFO is on) the log lines
+    log_chunks = logger.isEnabledFor(logging.INFO)
     citations = []
+    context_parts = []
+    log_lines = []
     for i, h in enumerate(chunks_used, 1):
-        chunk_doc_id = h.get('doc_id')
-        
-        # Calculate per-chunk confidence (simpler approach for citations)
-        lex_score = float(h.get('lex', 0.0) or 0.0)
-        vec_score = float(h.get('vec', 0.0) or 0.0)
-        ce_score = float(h.get('ce', 0.0) or 0.0)
-        
-        # Weighted combination for per-chunk display
+        # Per-chunk confidence (simpler approach for citations): weighted
+        # combination of the retrieval scores
+        lex_score = float(h.lex or 0.0)
+        vec_score = float(h.vec or 0.0)
+        ce_score = float(h.ce or 0.0)
         if ce_score > 0:
             chunk_confidence = (0.2 * lex_score + 0.3 * vec_score + 0.5 * ce_score) * 100
         else:
             chunk_confidence = (0.4 * lex_score + 0.6 * vec_score) * 100
         
-        confidence_pct = f"{chunk_confidence:.1f}%"
-        
-        if chunk_doc_id:
-            citations.append(f"[{i}] doc:{chunk_doc_id} p{h['p0']}–{h['p1']} (confidence: {confidence_pct})")
+        if h.doc_id:
+            citations.append(f"[{i}] doc:{h.doc_id} p{h.p0}–{h.p1} (confidence: {chunk_confidence:.1f}%)")
         else:
-            citations.append(f"[{i}] p{h['p0']}–{h['p1']} (confidence: {confidence_pct})")
-    context = "\n\n".join([f"[{i}] {h['text'][:1200]}" for i, h in enumerate(chunks_used, 1)])
+            citations.append(f"[{i}] p{h.p0}–{h.p1} (confidence: {chunk_confidence:.1f}%)")
+        context_parts.append(f"[{i}] {h.snippet}")
+        if log_chunks:
+            log_lines.append(f"  [{i}] Doc: {(h.doc_id or 'N/A')[:8]}... Pages {h.p0}–{h.p1}: {h.text[:100]}...")
+    context = "\n\n".join(context_parts)
+    if log_chunks:
+        logger.info("Chunks used for synthesis:\n%s", "\n".join(log_lines))
     
     # Include doc_id context in prompt if available
     doc_context = ""
     if doc_id:
-        doc_context = f"""\n\nNote: This answer is based on a specific document that was recently ingested or identified from the knowledge base. 
-        Document {doc_id} was used for this answer. Focus your answer on this document's content."""
+        doc_context = DOC_CONTEXT_NOTE.format(doc_id=doc_id)
     
     # Adjust prompt based on action (clarify vs answer)
-    if action == "clarify":
-        prompt = f"""Using ONLY the context, summarize cautiously in 1–2 sentences.
-If the answer is incomplete, say what's missing.
-Add bracket citations like [1], [2] that map to the provided context blocks.{doc_context}
+    template = CLARIFY_PROMPT if action == "clarify" else ANSWER_PROMPT
+    prompt = template.format(doc_context=doc_context, question=state['question'], context=context)
+    return prompt, citations, overall_confidence
 
-Question: {state['question']}
 
-Context:
-{context}
-"""
-    else:
-        prompt = f"""Answer the question using ONLY the context.
-If insufficient evidence, or the result is likely not in the context, say "I don't know."
-Add bracket citations like [1], [2] that map to the provided context blocks and snippets of text used from source documents.
-Which can include exact verbatim text from source documents or image descriptions.{doc_context}
+def synthesizer(state: State) -> State:
+    """Synthesizer agent: Generates final answer from evidence."""
+    prepared = _prepare_synthesis(state)
+    if prepared is None:
+        return state
+    prompt, citations, overall_confidence = prepared
+    
+    ans, _ = call_llm(SYNTHESIZER_SYSTEM_JSON, [{"role":"user","content":prompt}], max_tokens=SYNTHESIZER_JSON_MAX_TOKENS,
+                      response_schema=SynthesizedAnswer)
+    return _store_answer(state, ans, citations, overall_confidence)
 
-Question: {state['question']}
 
-Context:
-{context}
-"""
-    ans, _ = call_llm("You write precise, sourced answers.", [{"role":"user","content":prompt}], max_tokens=500)
-    state["answer"] = ans.strip() + "\n\nSources: " + ", ".join(citations)
+async def asynthesize(state: State) -> State:
+    """Async synthesizer (non-streaming): same answer as synthesizer, via acall_llm."""
+    prepared = _prepare_synthesis(state)
+    if prepared is None:
+        return state
+    prompt, citations, overall_confidence = prepared
+    
+    ans, _ = await acall_llm(SYNTHESIZER_SYSTEM_JSON, [{"role":"user","content":prompt}], max_tokens=SYNTHESIZER_JSON_MAX_TOKENS,
+                             response_schema=SynthesizedAnswer)
+    return _store_answer(state, ans, citations, overall_confidence)
+
+
+def _cited_sources(cited_ids: List[int], citations: List[str]) -> List[str]:
+    """Citations for the cited block numbers, or every citation if none is known."""
+    cited = [citations[i - 1] for i in dict.fromkeys(cited_ids) if 1 <= i <= len(citations)]
+    return cited or citations
+
+
+def _salvage_truncated(raw: str, citations: List[str]) -> Tuple[str, List[str]]:
+    """
+    Recover the answer from a SynthesizedAnswer object that was cut off.
+
+    Keeps the answer text written so far (cited_ids usually did not make it,
+    so every citation is listed). If not even the answer field started, the
+    agent abstains rather than showing raw JSON.
+    """
+    match = _ANSWER_FIELD_RE.search(raw)
+    if not match:
+        return "I don't know.", citations
+    answer = match.group(1)
+    for candidate in (answer, answer.rstrip("\\")):
+        try:
+            answer = json.loads(f'"{candidate}"')
+            break
+        except ValueError:
+            continue
+    ids = _CITED_IDS_RE.search(raw)
+    cited_ids = [int(i) for i in ids.group(1).replace(",", " ").split()] if ids else []
+    return answer.strip() or "I don't know.", _cited_sources(cited_ids, citations)
+
+
+def _parse_answer(ans: str, citations: List[str]) -> Tuple[str, List[str]]:
+    """
+    Answer text and the citations it used, from a SynthesizedAnswer JSON response.
+
+    Only the cited context blocks are listed as sources. A JSON object that
+    fails to validate (typically truncated at MAX_TOKENS) is salvaged; any
+    other text is used as a plain-text answer with every citation.
+    """
+    try:
+        parsed = SynthesizedAnswer.model_validate_json(ans)
+    except ValidationError:
+        if ans.lstrip().startswith("{"):
+            logger.warning("Synthesizer JSON was incomplete; salvaging the answer text")
+            return _salvage_truncated(ans, citations)
+        logger.warning("Synthesizer response was not SynthesizedAnswer JSON; using it as plain text")
+        return ans.strip(), citations
+    return parsed.answer.strip(), _cited_sources(parsed.cited_ids, citations)
+
+
+def _store_answer(state: State, ans: str, citations: List[str], overall_confidence: float) -> State:
+    answer, sources = _parse_answer(ans, citations)
+    state["answer"] = answer + "\n\nSources: " + ", ".join(sources)
     state["confidence"] = overall_confidence
     
-    logger.info(f"Generated Answer:\n{state['answer']}")
+    logger.info("Generated Answer:\n%s", state['answer'])
     logger.info("-" * 40)
     return state
 
+
+async def asynthesizer(state: State) -> AsyncIterator[str]:
+    """
+    Streaming synthesizer: yields answer tokens as the LLM generates them,
+    followed by the sources line. The full answer is also stored in state["answer"].
+    """
+    prepared = _prepare_synthesis(state)
+    if prepared is None:
+        yield state["answer"]
+        return
+    prompt, citations, overall_confidence = prepared
+    
+    parts = []
+    async for delta in call_llm_stream(SYNTHESIZER_SYSTEM, [{"role":"user","content":prompt}], max_tokens=500):
+        # Strip leading whitespace of the answer, matching ans.strip() in the buffered path
+        if not parts:
+            delta = delta.lstrip()
+            if not delta:
+                continue
+        parts.append(delta)
+        yield delta
+    sources = "\n\nSources: " + ", ".join(citations)
+    yield sources
+    state["answer"] = "".join(parts).rstrip() + sources
+    state["confidence"] = overall_confidence
+    
+    logger.info("Generated Answer:\n%s", state['answer'])
+    logger.info("-" * 40)
+
@@ -4,7 +4,9 @@ CLI entry point - Main Typer application.
 import typer
 from inference.commands import (
     ingest,
+    ingest_batch,
     query,
+    query_batch,
     infer,
     query_graph,
     infer_graph,
@@ -12,20 +14,26 @@ from inference.commands import (
     graph,
     inspect,
     test,
-    test_app
+    test_app,
+    cache_stats,
+    serve
 )
 
 app = typer.Typer(help="Deep RAG CLI - matches FastAPI service routes")
 
 # Register all commands
 app.command()(ingest)
+app.command()(ingest_batch)
 app.command()(query)
+app.command()(query_batch)
 app.command()(infer)
 app.command()(health)
 app.command()(query_graph)
 app.command()(infer_graph)
 app.command()(graph)
 app.command()(inspect)
+app.command()(cache_stats)
+app.command()(serve)
 app.add_typer(test_app, name="test")  # Add test subcommands (test all, test unit, test integration)
 app.command()(test)  # Also add as main command for convenience (test [all|unit|integration])
 
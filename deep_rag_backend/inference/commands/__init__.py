@@ -2,7 +2,9 @@
 CLI command modules.
 """
 from inference.commands.ingest import ingest
+from inference.commands.ingest_batch import ingest_batch
 from inference.commands.query import query
+from inference.commands.query_batch import query_batch
 from inference.commands.infer import infer
 from inference.commands.query_graph import query_graph
 from inference.commands.infer_graph import infer_graph
@@ -10,10 +12,14 @@ from inference.commands.health import health
 from inference.commands.graph import graph
 from inference.commands.inspect import inspect
 from inference.commands.test import test, test_app
+from inference.commands.cache_stats import cache_stats
+from inference.commands.serve import serve
 
 __all__ = [
     'ingest',
+    'ingest_batch',
     'query',
+    'query_batch',
     'infer',
     'query_graph',
     'infer_graph',
@@ -22,5 +28,7 @@ __all__ = [
     'inspect',
     'test',
     'test_app',
+    'cache_stats',
+    'serve',
 ]
 
@@ -0,0 +1,137 @@
+"""
+File-type dispatch for the CLI ingest/infer commands.
+
+Ingestion modules are imported inside the wrappers so a command only loads
+the code path for the file type it is ingesting.
+"""
+import glob
+import os
+import typer
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Union
+from ingestion.file_types import PDF_EXT, TXT_EXT, IMAGE_EXTS
+
+
+def _ingest_pdf(path: str, title: Optional[str]) -> Optional[str]:
+    from ingestion.ingest import ingest as ingest_pdf
+    return ingest_pdf(path, title=title)
+
+
+def _ingest_text(path: str, title: Optional[str]) -> Optional[str]:
+    from ingestion.ingest_text import ingest_text_file
+    return ingest_text_file(path, title=title)
+
+
+def _ingest_image(path: str, title: Optional[str]) -> Optional[str]:
+    from ingestion.ingest_image import ingest_image
+    return ingest_image(path, title=title)
+
+
+class Ingester(NamedTuple):
+    func: Callable[[str, Optional[str]], Optional[str]]
+    label: str
+    # PDFs extract their title from metadata; other types default to the file stem
+    stem_title: bool
+
+
+_IMAGE = Ingester(_ingest_image, "image", True)
+
+INGESTERS: Dict[str, Ingester] = {
+    PDF_EXT: Ingester(_ingest_pdf, "PDF", False),
+    TXT_EXT: Ingester(_ingest_text, "text file", True),
+    **{ext: _IMAGE for ext in sorted(IMAGE_EXTS)},
+}
+
+SUPPORTED_TYPES = "PDF, TXT, PNG, JPEG"
+
+
+class SourceFile(NamedTuple):
+    """Path strings for a file to ingest, derived once."""
+    path: str
+    name: str
+    stem: str
+    ext: str
+
+
+def describe_file(file: Union[SourceFile, str, Path]) -> SourceFile:
+    """Split `file` into path/name/stem/lower-case suffix without touching the filesystem."""
+    if isinstance(file, SourceFile):
+        return file
+    path = os.fspath(file)
+    name = os.path.basename(path)
+    stem, ext = os.path.splitext(name)
+    return SourceFile(path, name, stem, ext.lower())
+
+
+def resolve_file(file: Union[str, Path]) -> SourceFile:
+    """
+    Check `file` exists with a single stat and describe it.
+
+    Raises FileNotFoundError for a missing file and for any other stat
+    failure (permission denied, name too long, ...), so callers report every
+    unusable path the same way.
+    """
+    try:
+        os.stat(file)
+    except FileNotFoundError:
+        raise
+    except OSError as e:
+        raise FileNotFoundError(e.errno, f"File not accessible: {e.strerror}", str(file)) from e
+    return describe_file(file)
+
+
+@dataclass(frozen=True)
+class IngestResult:
+    """Outcome of a CLI ingest. `committed` means this process wrote and committed the chunks."""
+    doc_id: Optional[str]
+    chunk_count: int = 0
+    committed: bool = False
+
+
+def get_ingester(file: Union[SourceFile, str, Path]) -> Ingester:
+    """Look up the ingester for `file` by suffix, or raise typer.BadParameter."""
+    ext = describe_file(file).ext
+    ingester = INGESTERS.get(ext)
+    if ingester is None:
+        raise typer.BadParameter(f"Unsupported file type: {ext}. Supported: {SUPPORTED_TYPES}")
+    return ingester
+
+
+def collect_files(patterns: Iterable[str]) -> List[Path]:
+    """
+    Expand files, directories (searched recursively) and glob patterns into
+    the supported files they contain, grouped by type and without duplicates.
+    """
+    found = []
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.is_dir():
+            candidates = path.rglob("*")
+        elif path.exists():
+            candidates = [path]
+        else:
+            candidates = (Path(p) for p in glob.glob(pattern, recursive=True))
+        found.extend(p for p in candidates if p.is_file() and p.suffix.lower() in INGESTERS)
+    unique = {p.resolve(): p for p in found}
+    return sorted(unique.values(), key=lambda p: (p.suffix.lower(), str(p)))
+
+
+def ingest_one(file: Union[SourceFile, str, Path], title: Optional[str] = None) -> IngestResult:
+    """
+    Ingest a single file with the ingester for its type.
+    
+    Duplicates (document already stored) come back with committed=False, so
+    callers fall back to checking the database for their chunks.
+    """
+    from retrieval.wait import get_committed_chunk_count
+    # Registers the answer cache's index hook, so committing chunks also
+    # drops persisted answers
+    import inference.semantic_cache  # noqa: F401
+    source = describe_file(file)
+    ingester = get_ingester(source)
+    if ingester.stem_title and not title:
+        title = source.stem
+    doc_id = ingester.func(source.path, title)
+    chunk_count = get_committed_chunk_count(doc_id) if doc_id else None
+    return IngestResult(doc_id=doc_id, chunk_count=chunk_count or 0, committed=chunk_count is not None)
@@ -0,0 +1,34 @@
+"""
+JSON encoding for CLI output paths (serve replies, health cache).
+
+Uses orjson when installed, falling back to the standard library.
+"""
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    """Fallback-encoder hook: numpy scalars/arrays as plain values (like orjson's numpy option), else str."""
+    tolist = getattr(obj, "tolist", None)
+    if callable(tolist):
+        return tolist()
+    return str(obj)
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize to UTF-8 JSON bytes; numpy values become plain numbers/lists, other unknown types are stringified."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, default=_default, ensure_ascii=False).encode("utf-8")
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Parse JSON text or bytes (raises ValueError on malformed input)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -0,0 +1,30 @@
+"""
+Answer banner output for the CLI query commands.
+
+The banner is prebuilt as bytes and written with the answer in a single
+write to stdout's binary buffer, instead of one formatted typer.echo per line.
+"""
+import sys
+
+RULE = b"=" * 80
+ANSWER_HEADER = b"\n" + RULE + b"\nAnswer:\n" + RULE + b"\n"
+FOOTER = RULE + b"\n"
+
+
+def write_bytes(data: bytes) -> None:
+    """Write raw bytes to stdout, after anything already buffered by text writes."""
+    out = sys.stdout
+    out.flush()
+    buffer = getattr(out, "buffer", None)
+    if buffer is None:
+        out.write(data.decode("utf-8"))
+        out.flush()
+        return
+    buffer.write(data)
+    buffer.flush()
+
+
+def write_answer(answer: str) -> None:
+    """Print the answer framed by the Answer banner in one write."""
+    encoding = getattr(sys.stdout, "encoding", None) or "utf-8"
+    write_bytes(ANSWER_HEADER + answer.encode(encoding, "replace") + b"\n" + FOOTER)
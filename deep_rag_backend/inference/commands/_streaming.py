@@ -0,0 +1,30 @@
+"""
+Token streaming for the CLI query/infer commands.
+"""
+from typing import Optional
+import typer
+from inference.commands._output import ANSWER_HEADER, FOOTER, write_bytes
+
+
+def stream_answer(question: str, doc_id: Optional[str], cross_doc: bool) -> str:
+    """
+    Print the direct-pipeline answer to stdout as the synthesizer generates it.
+
+    A cached answer is printed in one piece. The semantic cache scope is kept
+    apart from the non-streaming path's: the streamed answer is free text that
+    lists every context block under Sources, while the buffered one lists only
+    the blocks it cites, so sharing entries would make the Sources line depend
+    on which path answered first. Returns the full answer text.
+    """
+    from inference.agents import stream_deep_rag
+    from inference.semantic_cache import cached_stream
+    write_bytes(ANSWER_HEADER)
+    parts = []
+    for delta in cached_stream(
+        question, ("agents", doc_id, cross_doc, "stream"),
+        lambda: stream_deep_rag(question, doc_id=doc_id, cross_doc=cross_doc)
+    ):
+        parts.append(delta)
+        typer.echo(delta, nl=False)
+    write_bytes(b"\n" + FOOTER)
+    return "".join(parts)
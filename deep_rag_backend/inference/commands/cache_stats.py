@@ -0,0 +1,24 @@
+"""
+Cache stats command - Show the on-disk cache state.
+"""
+from inference.commands import _json
+from inference.commands._output import write_bytes
+
+
+def cache_stats():
+    """
+    Show the caches a new CLI process starts from: the persisted semantic
+    answer cache (SEMANTIC_CACHE_PATH) and the health-check cache.
+
+    The planner/compressor, LLM response and retrieval caches live in the
+    memory of the process that filled them, so a fresh CLI process would only
+    ever see them empty. Ask the process that holds them instead: a `serve`
+    worker ({"cmd": "cache_stats"}) or the API (GET /diagnostics/llm_cache).
+    """
+    from inference.commands.health import HEALTH_CACHE_PATH, _cached_ok
+    from inference.semantic_cache import persisted_stats
+    report = {
+        "semantic_cache": persisted_stats(),
+        "health_cache": {"path": HEALTH_CACHE_PATH, "fresh": _cached_ok()},
+    }
+    write_bytes(_json.dumps(report) + b"\n")
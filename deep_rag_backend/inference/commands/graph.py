@@ -2,7 +2,6 @@
 Graph command - Export LangGraph visualization.
 """
 import typer
-from inference.graph.graph_viz import export_graph_png
 
 
 def graph(out: str = typer.Option("inference/graph/artifacts/deep_rag_graph.png", "--out", "-o", help="Output file path for the graph")):
@@ -11,6 +10,7 @@ def graph(out: str = typer.Option("inference/graph/artifacts/deep_rag_graph.png"
     """
     try:
         # Lazy import to avoid loading graph_viz unless needed
+        from inference.graph.graph_viz import export_graph_png
         path = export_graph_png(out)
         typer.echo(f"✅ Wrote graph to: {path}")
     except Exception as e:
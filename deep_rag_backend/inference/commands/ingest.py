@@ -2,11 +2,8 @@
 Ingest command - Ingest documents without querying.
 """
 import typer
-from pathlib import Path
 from typing import Optional
-from ingestion.ingest import ingest as ingest_pdf
-from ingestion.ingest_text import ingest_text_file
-from ingestion.ingest_image import ingest_image
+from inference.commands._ingest_dispatch import get_ingester, ingest_one, resolve_file
 
 
 def ingest(
@@ -22,27 +19,16 @@ def ingest(
     
     Matches: POST /ingest endpoint
     """
-    file_path = Path(file)
-    if not file_path.exists():
-        typer.echo(f"Error: File not found: {file}", err=True)
+    try:
+        source = resolve_file(file)
+    except FileNotFoundError:
+        typer.echo(f"Error: File not found or not accessible: {file}", err=True)
         raise typer.Exit(1)
     
-    file_ext = file_path.suffix.lower()
-    
     try:
-        doc_id = None
-        if file_ext == '.pdf':
-            doc_id = ingest_pdf(str(file_path), title=title)
-            typer.echo(f"✅ Ingested PDF: {file_path.name}")
-        elif file_ext == '.txt':
-            doc_id = ingest_text_file(str(file_path), title=title or file_path.stem)
-            typer.echo(f"✅ Ingested text file: {file_path.name}")
-        elif file_ext in ['.png', '.jpg', '.jpeg']:
-            doc_id = ingest_image(str(file_path), title=title or file_path.stem)
-            typer.echo(f"✅ Ingested image: {file_path.name}")
-        else:
-            typer.echo(f"Error: Unsupported file type: {file_ext}. Supported: PDF, TXT, PNG, JPEG", err=True)
-            raise typer.Exit(1)
+        ingester = get_ingester(source)
+        doc_id = ingest_one(source, title).doc_id
+        typer.echo(f"✅ Ingested {ingester.label}: {source.name}")
         
         if doc_id:
             typer.echo(f"📋 Document ID: {doc_id}")
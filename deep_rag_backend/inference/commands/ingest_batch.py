@@ -0,0 +1,53 @@
+"""
+Ingest batch command - Ingest many documents in one process.
+"""
+import os
+import typer
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Optional
+from inference.commands._ingest_dispatch import SUPPORTED_TYPES, collect_files, ingest_one
+
+
+def ingest_batch(
+    paths: List[str] = typer.Argument(..., help="Files, directories (searched recursively) or glob patterns, e.g. 'docs/**/*.pdf'"),
+    workers: Optional[int] = typer.Option(None, "--workers", "-w", help="Files ingested in parallel (default: CPU count)"),
+):
+    """
+    Ingest many documents in a single process.
+    Supports PDF, TXT, PNG, JPEG.
+    
+    Compared to running 'ingest' once per file, the embedding model is loaded once,
+    pooled database connections are reused, and chunk rows are written with
+    multi-row INSERTs. Files are ingested on a thread pool so OCR, embedding and
+    database I/O overlap across files; a failure is reported and the batch continues.
+    """
+    files = collect_files(paths)
+    if not files:
+        typer.echo(f"Error: No supported files found ({SUPPORTED_TYPES})", err=True)
+        raise typer.Exit(1)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(files)))
+    
+    if workers > 1:
+        # Load the CLIP model once up front instead of racing its lazy init in every worker
+        from ingestion.embeddings import get_clip_model, get_clip_processor
+        get_clip_model()
+        get_clip_processor()
+    
+    typer.echo(f"📄 Ingesting {len(files)} files with {workers} worker(s)...")
+    failed = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(ingest_one, file_path): file_path for file_path in files}
+        for i, future in enumerate(as_completed(futures), 1):
+            file_path = futures[future]
+            try:
+                result = future.result()
+                typer.echo(f"✅ [{i}/{len(files)}] {file_path.name} → {result.doc_id}")
+            except Exception as e:
+                failed.append(file_path)
+                typer.echo(f"❌ [{i}/{len(files)}] {file_path.name}: {e}", err=True)
+    
+    typer.echo("\n" + "="*80)
+    typer.echo(f"Ingested {len(files) - len(failed)}/{len(files)} files")
+    typer.echo("="*80)
+    if failed:
+        raise typer.Exit(1)
@@ -3,7 +3,6 @@ Inspect command - Inspect document chunks and pages.
 """
 import typer
 from typing import Optional
-from retrieval.diagnostics import print_inspection_report
 
 
 def inspect(
@@ -22,6 +21,7 @@ def inspect(
     Matches: GET /diagnostics/document endpoint
     """
     try:
+        from retrieval.diagnostics import print_inspection_report
         print_inspection_report(doc_title=doc_title, doc_id=doc_id)
     except Exception as e:
         typer.echo(f"Error inspecting document: {e}", err=True)
@@ -3,13 +3,15 @@ Query command - Query existing documents.
 """
 import typer
 from typing import Optional
-from inference.agents import run_deep_rag
+from inference.commands._output import write_answer
+from inference.commands._streaming import stream_answer
 
 
 def query(
     question: str = typer.Argument(..., help="The question to ask against ingested documents"),
     doc_id: Optional[str] = typer.Option(None, "--doc-id", "-d", help="Optional document ID (UUID) to filter retrieval to a specific document"),
-    cross_doc: bool = typer.Option(False, "--cross-doc", help="Enable cross-document retrieval (two-stage when doc_id provided)")
+    cross_doc: bool = typer.Option(False, "--cross-doc", help="Enable cross-document retrieval (two-stage when doc_id provided)"),
+    stream: bool = typer.Option(True, "--stream/--no-stream", help="Print the answer as it is generated instead of after synthesis completes")
 ):
     """
     Query existing documents in the vector database.
@@ -26,12 +28,18 @@ def query(
             typer.echo(f"🔍 Querying with document filter: {doc_id}...")
         if cross_doc:
             typer.echo("🌐 Cross-document retrieval enabled")
-        answer = run_deep_rag(question, doc_id=doc_id, cross_doc=cross_doc)
-        typer.echo("\n" + "="*80)
-        typer.echo("Answer:")
-        typer.echo("="*80)
-        typer.echo(answer)
-        typer.echo("="*80)
+        if stream:
+            stream_answer(question, doc_id, cross_doc)
+        else:
+            from inference.agents import run_deep_rag
+            from inference.semantic_cache import cached_answer
+            answer, from_cache = cached_answer(
+                question, ("agents", doc_id, cross_doc),
+                lambda: run_deep_rag(question, doc_id=doc_id, cross_doc=cross_doc)
+            )
+            if from_cache:
+                typer.echo("⚡ Answer served from semantic cache")
+            write_answer(answer)
     except Exception as e:
         typer.echo(f"Error querying: {e}", err=True)
         raise typer.Exit(1)
@@ -0,0 +1,42 @@
+"""
+Query batch command - Answer several questions concurrently.
+"""
+import typer
+from pathlib import Path
+from typing import List, Optional
+
+
+def query_batch(
+    questions: Optional[List[str]] = typer.Argument(None, help="Questions to ask against ingested documents"),
+    file: Optional[Path] = typer.Option(None, "--file", "-f", help="Text file with one question per line"),
+    doc_id: Optional[str] = typer.Option(None, "--doc-id", "-d", help="Optional document ID (UUID) to filter retrieval to a specific document"),
+    cross_doc: bool = typer.Option(False, "--cross-doc", help="Enable cross-document retrieval (two-stage when doc_id provided)"),
+    concurrency: Optional[int] = typer.Option(None, "--concurrency", "-c", help="Max questions in flight (default: BATCH_MAX_CONCURRENCY or 4)")
+):
+    """
+    Answer several questions concurrently using the direct pipeline.
+    Useful for eval harnesses and batch scripts.
+    
+    Questions can be passed as arguments and/or read from --file (one per line).
+    """
+    all_questions = list(questions or [])
+    if file:
+        all_questions += [line.strip() for line in file.read_text(encoding="utf-8").splitlines() if line.strip()]
+    if not all_questions:
+        typer.echo("No questions provided (pass questions or --file)", err=True)
+        raise typer.Exit(1)
+    
+    try:
+        typer.echo(f"🔍 Answering {len(all_questions)} questions...")
+        import asyncio
+        from inference.agents import run_deep_rag_batch
+        answers = asyncio.run(run_deep_rag_batch(all_questions, doc_id=doc_id, cross_doc=cross_doc, max_concurrency=concurrency))
+        for i, (question, answer) in enumerate(zip(all_questions, answers), 1):
+            typer.echo("\n" + "="*80)
+            typer.echo(f"[{i}] {question}")
+            typer.echo("="*80)
+            typer.echo(answer)
+        typer.echo("="*80)
+    except Exception as e:
+        typer.echo(f"Error querying batch: {e}", err=True)
+        raise typer.Exit(1)
@@ -3,7 +3,7 @@ Query graph command - Query existing documents using LangGraph.
 """
 import typer
 from typing import Optional
-from inference.graph.graph_wrapper import ask_with_graph
+from inference.commands._output import write_answer
 
 
 def query_graph(
@@ -29,16 +29,21 @@ def query_graph(
             typer.echo(f"🔍 Querying with document filter: {doc_id}...")
         if cross_doc:
             typer.echo("🌐 Cross-document retrieval enabled")
-        result = ask_with_graph(question, thread_id=thread_id, doc_id=doc_id, cross_doc=cross_doc)
+        from inference.graph.graph_wrapper import ask_with_graph
+        from inference.semantic_cache import cached_answer
+
+        def _ask() -> dict:
+            graph_result = ask_with_graph(question, thread_id=thread_id, doc_id=doc_id, cross_doc=cross_doc)
+            return {key: graph_result.get(key) for key in ("answer", "confidence", "action") if key in graph_result}
+
+        result, from_cache = cached_answer(question, ("graph", doc_id, cross_doc, thread_id), _ask)
+        if from_cache:
+            typer.echo("⚡ Answer served from semantic cache")
         answer = result.get("answer", "")
         confidence = result.get("confidence", 0.0)
         action = result.get("action", "answer")
         
-        typer.echo("\n" + "="*80)
-        typer.echo("Answer:")
-        typer.echo("="*80)
-        typer.echo(answer)
-        typer.echo("="*80)
+        write_answer(answer)
         typer.echo(f"\nConfidence: {confidence:.3f} | Action: {action}")
     except Exception as e:
         typer.echo(f"Error querying with graph: {e}", err=True)
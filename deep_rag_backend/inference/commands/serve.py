@@ -0,0 +1,136 @@
+"""
+Serve command - Long-running JSON-lines worker for scripted use.
+
+Pays Python/torch imports, the CLIP model load and the DB pool setup once,
+then answers one request per stdin line:
+
+    {"id": 1, "cmd": "query", "args": {"question": "...", "doc_id": null, "cross_doc": false}}
+
+and writes one reply per stdout line:
+
+    {"id": 1, "ok": true, "result": {"answer": "...", "cached": false}}
+
+Commands: query, query_graph, ingest, health, cache_stats. Logs and any print() output
+from the pipeline go to stderr so stdout carries only replies.
+"""
+import sys
+import typer
+from inference.commands import _json
+from contextlib import redirect_stdout
+from typing import Any, Callable, Dict, Optional
+
+
+def _query(question: str, doc_id: Optional[str] = None, cross_doc: bool = False) -> Dict[str, Any]:
+    from inference.agents import run_deep_rag
+    from inference.semantic_cache import cached_answer
+    answer, from_cache = cached_answer(
+        question, ("agents", doc_id, cross_doc),
+        lambda: run_deep_rag(question, doc_id=doc_id, cross_doc=cross_doc)
+    )
+    return {"answer": answer, "cached": from_cache}
+
+
+def _query_graph(question: str, doc_id: Optional[str] = None, cross_doc: bool = False, thread_id: str = "default") -> Dict[str, Any]:
+    from inference.graph.graph_wrapper import ask_with_graph
+    from inference.semantic_cache import cached_answer
+
+    def _ask() -> dict:
+        graph_result = ask_with_graph(question, thread_id=thread_id, doc_id=doc_id, cross_doc=cross_doc)
+        return {key: graph_result.get(key) for key in ("answer", "confidence", "action") if key in graph_result}
+
+    result, from_cache = cached_answer(question, ("graph", doc_id, cross_doc, thread_id), _ask)
+    return {**result, "cached": from_cache}
+
+
+def _ingest(file: str, title: Optional[str] = None) -> Dict[str, Any]:
+    from inference.commands._ingest_dispatch import ingest_one, resolve_file
+    result = ingest_one(resolve_file(file), title)
+    return {"doc_id": result.doc_id, "chunk_count": result.chunk_count}
+
+
+def _health() -> Dict[str, Any]:
+    from retrieval.db_utils import connect
+    with connect() as conn, conn.cursor() as cur:
+        cur.execute("SELECT 1")
+        cur.fetchone()
+    return {"ok": True}
+
+
+def _cache_stats() -> Dict[str, Any]:
+    """In-memory cache statistics of this worker (the caches a one-shot CLI process never fills)."""
+    from inference.agents._cache import get_cache_stats
+    from inference.llm.cache import get_llm_cache_stats
+    from inference.semantic_cache import SEMANTIC_CACHE_ENABLED, get_semantic_cache
+    return {
+        "agents": get_cache_stats(),
+        "llm": get_llm_cache_stats(),
+        "semantic": get_semantic_cache().stats() if SEMANTIC_CACHE_ENABLED else None,
+    }
+
+
+HANDLERS: Dict[str, Callable[..., Dict[str, Any]]] = {
+    "query": _query,
+    "query_graph": _query_graph,
+    "ingest": _ingest,
+    "health": _health,
+    "cache_stats": _cache_stats,
+}
+
+
+def handle_request(line: str) -> Dict[str, Any]:
+    """Run one JSON request line and build its reply (errors are reported, not raised)."""
+    request_id = None
+    try:
+        request = _json.loads(line)
+        request_id = request.get("id")
+        handler = HANDLERS.get(request.get("cmd"))
+        if handler is None:
+            raise ValueError(f"Unknown cmd: {request.get('cmd')!r}. Supported: {', '.join(HANDLERS)}")
+        return {"id": request_id, "ok": True, "result": handler(**(request.get("args") or {}))}
+    except Exception as e:
+        return {"id": request_id, "ok": False, "error": f"{type(e).__name__}: {e}"}
+
+
+def _warm_up() -> None:
+    """Import the pipelines and open the shared resources before the first request."""
+    from inference.agents import run_deep_rag  # noqa: F401
+    from inference.graph.builder import get_app
+    from ingestion.embeddings import get_clip_model, get_clip_processor
+    from retrieval.db_utils import _get_pool
+    from retrieval.reranker import warmup_reranker
+    get_app()
+    get_clip_model()
+    get_clip_processor()
+    warmup_reranker()
+    try:
+        _get_pool()
+    except Exception as e:
+        # connect() falls back to direct connections; report and keep serving
+        typer.echo(f"⚠️  Database pool unavailable at startup: {e}", err=True)
+
+
+def serve(
+    warm: bool = typer.Option(True, "--warm/--no-warm", help="Load models and open the DB pool before reading requests")
+):
+    """
+    Serve newline-delimited JSON requests on stdin, one JSON reply per line on stdout.
+
+    Keeps imports, the CLIP model, the DB pool and the semantic cache alive
+    across requests, for eval harnesses that would otherwise start the CLI
+    once per question.
+    """
+    out = sys.stdout
+    with redirect_stdout(sys.stderr):
+        if warm:
+            _warm_up()
+        typer.echo("✅ Ready for requests", err=True)
+        for line in sys.stdin:
+            if not line.strip():
+                continue
+            data = _json.dumps(handle_request(line)) + b"\n"
+            if hasattr(out, "buffer"):
+                out.buffer.write(data)
+                out.buffer.flush()
+            else:
+                out.write(data.decode("utf-8"))
+                out.flush()
@@ -1,19 +1,133 @@
 # agent_logger.py
 # Comprehensive logging system for agentic reasoning loop
 # Logs queries, reasoning steps, decisions, and retrieval results
-# Saves to CSV/TXT for future model training (SFT) and presentation
+# Saves to CSV/TXT for future model training (SFT) and presentation,
+# plus an optional compact binary log (.bin) for training data extraction
 
+import atexit
 import csv
 import json
 import logging
+import queue
+import struct
 import sys
+import threading
+import time
+import zlib
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, Iterator, List, Optional, Union
 import os
 
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import orjson
+    _ORJSON_OPTS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# TXT is for reading along; CSV (and .bin) carry the training data
+AGENT_LOG_CSV = os.getenv("AGENT_LOG_CSV", "true").lower() in ("true", "1", "yes")
+AGENT_LOG_VERBOSE = os.getenv("AGENT_LOG_VERBOSE", "true").lower() in ("true", "1", "yes")
+AGENT_LOG_BINARY = os.getenv("AGENT_LOG_BINARY", "false").lower() in ("true", "1", "yes")
+
+# Write buffer per log file; each batch is flushed as a single write()
+LOG_BUFFER_SIZE = 1 << 16
+# Records waiting for the writer thread (log calls block when it is full)
+LOG_QUEUE_SIZE = 1024
+# Most records the writer thread drains into one batch
+LOG_BATCH_SIZE = 64
+# TXT bytes gathered per os.write(); the scratch buffer is reused across batches
+TXT_SCRATCH_MAX = 128 * 1024
+# Sessions whose last "Pages Retrieved" line is remembered (oldest dropped first)
+PAGES_MEMO_SESSIONS = 256
+# How long the writer thread waits for a batch to fill before writing what it has
+LOG_FLUSH_INTERVAL_SEC = 0.1
+
+# .bin record: header (timestamp ns, node id, action id, payload length,
+# crc32 of session_id) followed by a msgpack map of the non-empty fields
+BIN_HEADER = struct.Struct("<QBBII")
+BIN_BUFFER_SIZE = 1 << 20
+# Node/action ids in .bin records (append only; 0 = not listed, name kept in the payload)
+BIN_NODES = ("", "planner", "retriever", "compressor", "critic", "refine_retrieve", "synthesizer", "citation_pruner")
+BIN_ACTIONS = (
+    "", "plan_generation", "retrieve", "merge_results", "compress", "evaluate",
+    "request_refinement", "refine_query", "synthesize", "abstain_no_context",
+    "abstain_low_confidence", "abstain_low_critic_confidence", "prune_citations",
+    "prune_abstain", "ERROR",
+)
+_NODE_IDS = {name: i for i, name in enumerate(BIN_NODES) if name}
+_ACTION_IDS = {name: i for i, name in enumerate(BIN_ACTIONS) if name}
+
+# Tells the writer thread to exit
+_STOP = object()
+
+# TXT record framing, built once instead of per record
+_TXT_RULE = "-" * 80 + "\n"
+_TXT_BAR = "=" * 80 + "\n"
+_TXT_END = "\n" + _TXT_BAR + "\n"
+
+
+def _dumps(obj: Any, indent: bool = False) -> str:
+    """JSON for CSV cells and TXT metadata: orjson when installed, else the standard library."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=(_ORJSON_OPTS | orjson.OPT_INDENT_2) if indent else _ORJSON_OPTS).decode('utf-8')
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits: let json handle (or reject) them
+    return json.dumps(obj, indent=2 if indent else None)
+
+
+def _write_all(fd: int, data) -> None:
+    """os.write() the whole buffer (a single call unless the kernel takes it partially)."""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def _session_hash(session_id: Optional[str]) -> int:
+    return zlib.crc32(session_id.encode("utf-8")) if session_id else 0
+
+
+def _pack_event(ts_ns: int, node: str, action: str, session_id: Optional[str], payload: Dict[str, Any]) -> bytes:
+    """Encode one .bin record."""
+    node_id = _NODE_IDS.get(node, 0)
+    action_id = _ACTION_IDS.get(action, 0)
+    if not node_id:
+        payload["node"] = node
+    if not action_id:
+        payload["action"] = action
+    if session_id:
+        payload["session_id"] = session_id
+    body = msgpack.packb(payload, default=str)
+    return BIN_HEADER.pack(ts_ns, node_id, action_id, len(body), _session_hash(session_id)) + body
+
+
+def read_binary_log(path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """Yield the records of a .bin agent log as dicts (fields as passed to log_step/log_error)."""
+    if msgpack is None:
+        raise ImportError("msgpack is required to read binary agent logs")
+    with open(path, "rb") as f:
+        while True:
+            header = f.read(BIN_HEADER.size)
+            if len(header) < BIN_HEADER.size:
+                return
+            ts_ns, node_id, action_id, length, session_hash = BIN_HEADER.unpack(header)
+            record = {
+                "timestamp_ns": ts_ns,
+                "node": BIN_NODES[node_id] if node_id < len(BIN_NODES) else "",
+                "action": BIN_ACTIONS[action_id] if action_id < len(BIN_ACTIONS) else "",
+                "session_hash": session_hash,
+            }
+            record.update(msgpack.unpackb(f.read(length)))
+            yield record
+
 class AgentLogger:
     """
     Logger for agentic reasoning steps.
@@ -21,10 +135,17 @@ class AgentLogger:
     Logs to both CSV (structured data) and TXT (human-readable)
     for different use cases:
     - CSV: For future model training, data analysis
-    - TXT: For presentations, debugging, human review
+    - TXT: For presentations, debugging, human review (verbose only)
+    - BIN: Optional compact records for training data extraction (see read_binary_log)
     """
     
-    def __init__(self, log_dir: Optional[Union[str, Path]] = None):
+    def __init__(
+        self,
+        log_dir: Optional[Union[str, Path]] = None,
+        verbose: Optional[bool] = None,
+        binary: Optional[bool] = None,
+        csv_log: Optional[bool] = None
+    ):
         # Detect if running in test environment
         # Check multiple ways to detect test environment:
         # 1. AGENT_LOG_TEST_MODE environment variable (explicit override)
@@ -69,53 +190,187 @@ class AgentLogger:
         self.csv_path = self.log_dir / f"agent_log_{timestamp}.csv"
         self.txt_path = self.log_dir / f"agent_log_{timestamp}.txt"
         
+        # Defaults come from AGENT_LOG_CSV / AGENT_LOG_VERBOSE / AGENT_LOG_BINARY
+        self.csv_log = AGENT_LOG_CSV if csv_log is None else csv_log
+        self.verbose = AGENT_LOG_VERBOSE if verbose is None else verbose
+        binary = AGENT_LOG_BINARY if binary is None else binary
+        if binary and msgpack is None:
+            logger.warning("Binary agent log requested but msgpack is not installed - writing CSV/TXT only")
+            binary = False
+        self.bin_path = self.log_dir / f"agent_log_{timestamp}.bin" if binary else None
+        # With every channel off, log calls return before doing any work
+        self._enabled = bool(self.csv_log or self.verbose or binary)
+        
         # Track if files have been initialized
         self._csv_initialized = False
         self._txt_initialized = False
         
+        # Session-long handles: one open() per file instead of one per record
+        self._csv_fh = None
+        self._csv_writer = None
+        self._txt_fh = None
+        self._txt_scratch = bytearray()
+        self._bin_fh = None
+        # (epoch second, its "YYYY-MM-DDTHH:MM:SS" prefix), swapped as one tuple
+        self._ts_second = (None, '')
+        # session_id -> (pages as last logged, their "Pages Retrieved" line)
+        self._pages_memo: Dict[Optional[str], tuple] = {}
+        # Graph nodes only enqueue records; a daemon thread drains them to disk
+        # in batches so file I/O stays off the reasoning loop
+        self._lock = threading.RLock()
+        self._q: "queue.Queue" = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+        self._writer: Optional[threading.Thread] = None
+        
         # Only initialize files immediately if not in test mode
         # In test mode, files will be initialized on first write to prevent empty files
         if not is_test:
             # Initialize CSV with headers
-            self._initialize_csv()
+            if self.csv_log:
+                self._initialize_csv()
             
             # Initialize TXT with header
-            self._initialize_txt()
+            if self.verbose:
+                self._initialize_txt()
             
             logger.info(f"Agent logger initialized:")
-            logger.info(f"  CSV: {self.csv_path}")
-            logger.info(f"  TXT: {self.txt_path}")
+            if self.csv_log:
+                logger.info(f"  CSV: {self.csv_path}")
+            if self.verbose:
+                logger.info(f"  TXT: {self.txt_path}")
+            if self.bin_path is not None:
+                logger.info(f"  BIN: {self.bin_path}")
+        
+        self._writer = threading.Thread(target=self._writer_loop, name="agent-log-writer", daemon=True)
+        self._writer.start()
     
     def _initialize_csv(self):
         """Initialize CSV file with headers."""
         self._csv_initialized = True
-        with open(self.csv_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow([
-                'timestamp',
-                'session_id',
-                'node',
-                'action',
-                'question',
-                'plan',
-                'query',
-                'num_chunks_retrieved',
-                'pages_retrieved',
-                'confidence',
-                'iterations',
-                'refinements',
-                'answer',
-                'metadata'
-            ])
+        self._csv_fh = open(self.csv_path, 'w', newline='', encoding='utf-8', buffering=LOG_BUFFER_SIZE)
+        # Plain RFC 4180 CSV via the C writer: plans and answers carry raw newlines,
+        # commas and quotes, so an unquoted delimiter-only format would split rows,
+        # and a pure-Python formatter measured slower than writerows()
+        self._csv_writer = csv.writer(self._csv_fh)
+        self._csv_writer.writerow([
+            'timestamp',
+            'session_id',
+            'node',
+            'action',
+            'question',
+            'plan',
+            'query',
+            'num_chunks_retrieved',
+            'pages_retrieved',
+            'confidence',
+            'iterations',
+            'refinements',
+            'answer',
+            'metadata'
+        ])
+        self._csv_fh.flush()
     
     def _initialize_txt(self):
         """Initialize TXT file with header."""
         self._txt_initialized = True
-        with open(self.txt_path, 'w', encoding='utf-8') as f:
-            f.write("="*80 + "\n")
-            f.write("AGENT REASONING LOG\n")
-            f.write(f"Session started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write("="*80 + "\n\n")
+        # Unbuffered: records are gathered in _txt_scratch and written with os.write
+        self._txt_fh = open(self.txt_path, 'wb', buffering=0)
+        _write_all(self._txt_fh.fileno(), (
+            f"{_TXT_BAR}AGENT REASONING LOG\n"
+            f"Session started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+            f"{_TXT_BAR}\n"
+        ).encode('utf-8'))
+    
+    def _csv(self):
+        """CSV writer for the session, initializing the file on first use (lazy in test mode)."""
+        if not self._csv_initialized:
+            self._initialize_csv()
+        elif self._csv_fh is None:
+            # Logged again after close(): append instead of truncating
+            self._csv_fh = open(self.csv_path, 'a', newline='', encoding='utf-8', buffering=LOG_BUFFER_SIZE)
+            self._csv_writer = csv.writer(self._csv_fh)
+        return self._csv_writer
+    
+    def _txt(self):
+        """TXT handle for the session, initializing the file on first use (lazy in test mode)."""
+        if not self._txt_initialized:
+            self._initialize_txt()
+        elif self._txt_fh is None:
+            self._txt_fh = open(self.txt_path, 'ab', buffering=0)
+        return self._txt_fh
+    
+    def _bin(self):
+        """Binary log handle, opened on first use."""
+        if self._bin_fh is None:
+            self._bin_fh = open(self.bin_path, 'ab', buffering=BIN_BUFFER_SIZE)
+        return self._bin_fh
+    
+    def _write_batch(self, batch: List[tuple]):
+        """Write (row, text, event) records: one write per file, then flush."""
+        rows = [row for row, _, _ in batch if row is not None]
+        if rows:
+            self._csv().writerows(rows)
+            self._csv_fh.flush()
+        texts = [text for _, text, _ in batch if text]
+        if texts:
+            fd = self._txt().fileno()
+            scratch = self._txt_scratch
+            oversized = False
+            for text in texts:
+                scratch += text.encode('utf-8')
+                if len(scratch) >= TXT_SCRATCH_MAX:
+                    oversized = oversized or len(scratch) > TXT_SCRATCH_MAX
+                    _write_all(fd, scratch)
+                    del scratch[:]
+            if scratch:
+                _write_all(fd, scratch)
+                del scratch[:]
+            if oversized:
+                # Don't hold on to the capacity an oversized record grew it to
+                self._txt_scratch = bytearray()
+        events = [event for _, _, event in batch if event is not None]
+        if events and self.bin_path is not None:
+            f = self._bin()
+            f.write(b"".join(_pack_event(*event) for event in events))
+            f.flush()
+    
+    def _writer_loop(self):
+        """Drain queued records to disk in batches until the stop sentinel arrives."""
+        while True:
+            batch = [self._q.get()]
+            # A planner/retriever/critic round logs several records in quick
+            # succession; collect them into one writerows() instead of one each
+            deadline = time.monotonic() + LOG_FLUSH_INTERVAL_SEC
+            while len(batch) < LOG_BATCH_SIZE and batch[-1] is not _STOP:
+                timeout = deadline - time.monotonic()
+                try:
+                    batch.append(self._q.get(timeout=timeout) if timeout > 0 else self._q.get_nowait())
+                except queue.Empty:
+                    break
+            stop = any(item is _STOP for item in batch)
+            records = [item for item in batch if item is not _STOP]
+            try:
+                if records:
+                    self._write_batch(records)
+            except Exception as e:
+                logger.warning(f"Failed to write {len(records)} agent log record(s): {e}")
+            finally:
+                for _ in batch:
+                    self._q.task_done()
+            if stop:
+                return
+    
+    def _write(self, row: Optional[tuple], text: Optional[str], event: Optional[tuple] = None):
+        """Queue one record (CSV row, TXT block, .bin event; each optional) for the writer thread."""
+        with self._lock:
+            if self._writer is None:
+                # Closed: nodes keep their module-level logger, so still record synchronously
+                self._write_batch([(row, text, event)])
+            else:
+                self._q.put((row, text, event))
+    
+    def flush(self):
+        """Block until every queued record has been written."""
+        self._q.join()
     
     def log_step(
         self,
@@ -151,16 +406,17 @@ class AgentLogger:
             answer: Final answer
             metadata: Additional metadata (scores, timings, etc.)
         """
-        timestamp = datetime.now().isoformat()
-        
-        # Initialize CSV file if not already initialized (lazy initialization for tests)
-        if not self._csv_initialized:
-            self._initialize_csv()
+        if not self._enabled:
+            return
+        # One clock read per record, shared by the CSV, TXT and .bin timestamps
+        ts_ns = time.time_ns()
+        timestamp = self._timestamp(ts_ns)
         
-        # Log to CSV
-        with open(self.csv_path, 'a', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow([
+        # CSV row: a tuple literal is as cheap to build as a list, smaller, and
+        # immutable once handed to the writer thread
+        row = None
+        if self.csv_log:
+            row = (
                 timestamp,
                 session_id or '',
                 node,
@@ -169,60 +425,91 @@ class AgentLogger:
                 plan or '',
                 query or '',
                 num_chunks or 0,
-                json.dumps(pages) if pages else '',
+                _dumps(pages) if pages else '',
                 confidence or 0.0,
                 iterations or 0,
-                json.dumps(refinements) if refinements else '',
+                _dumps(refinements) if refinements else '',
                 answer or '',
-                json.dumps(metadata) if metadata else ''
-            ])
-        
-        # Initialize TXT file if not already initialized (lazy initialization for tests)
-        if not self._txt_initialized:
-            self._initialize_txt()
+                _dumps(metadata) if metadata else ''
+            )
         
-        # Log to TXT (human-readable)
-        with open(self.txt_path, 'a', encoding='utf-8') as f:
-            f.write(f"[{datetime.now().strftime('%H:%M:%S')}] {node.upper()} - {action}\n")
-            f.write("-" * 80 + "\n")
+        # TXT block (human-readable)
+        text = None
+        if self.verbose:
+            # Collected and joined into one string: a single TXT write per record
+            lines = [f"[{timestamp[11:19]}] {node.upper()} - {action}\n", _TXT_RULE]
             
             if session_id:
-                f.write(f"Session ID: {session_id}\n")
+                lines.append(f"Session ID: {session_id}\n")
             
             if question:
-                f.write(f"Question: {question}\n\n")
+                lines.append(f"Question: {question}\n\n")
             
             if plan:
-                f.write(f"Plan:\n{plan}\n\n")
+                lines.append(f"Plan:\n{plan}\n\n")
             
             if query:
-                f.write(f"Query: {query}\n")
+                lines.append(f"Query: {query}\n")
             
             if num_chunks is not None:
-                f.write(f"Chunks Retrieved: {num_chunks}\n")
+                lines.append(f"Chunks Retrieved: {num_chunks}\n")
             
             if pages:
-                f.write(f"Pages Retrieved: {sorted(set(pages))}\n")
+                lines.append(self._pages_line(session_id, pages))
             
             if confidence is not None:
-                f.write(f"Confidence: {confidence:.2f}\n")
+                lines.append(f"Confidence: {confidence:.2f}\n")
             
             if iterations is not None:
-                f.write(f"Iterations: {iterations}\n")
+                lines.append(f"Iterations: {iterations}\n")
             
             if refinements:
-                f.write(f"Refinements:\n")
+                lines.append(f"Refinements:\n")
                 for i, ref in enumerate(refinements, 1):
-                    f.write(f"  {i}. {ref}\n")
-                f.write("\n")
+                    lines.append(f"  {i}. {ref}\n")
+                lines.append("\n")
             
             if answer:
-                f.write(f"Answer:\n{answer}\n\n")
+                lines.append(f"Answer:\n{answer}\n\n")
             
             if metadata:
-                f.write(f"Metadata: {json.dumps(metadata, indent=2)}\n")
+                lines.append(f"Metadata: {_dumps(metadata, indent=True)}\n")
             
-            f.write("\n" + "="*80 + "\n\n")
+            lines.append(_TXT_END)
+            text = "".join(lines)
+        
+        # .bin event: packed by the writer thread
+        event = None
+        if self.bin_path is not None:
+            fields = (
+                ("question", question), ("plan", plan), ("query", query), ("num_chunks", num_chunks),
+                ("pages", pages), ("confidence", confidence), ("iterations", iterations),
+                ("refinements", refinements), ("answer", answer), ("metadata", metadata),
+            )
+            event = (ts_ns, node, action, session_id, {k: v for k, v in fields if v is not None})
+        self._write(row, text, event)
+    
+    def _timestamp(self, ts_ns: int) -> str:
+        """Local ISO timestamp with microseconds; the date/time part is formatted once per second."""
+        second, micros = divmod(ts_ns // 1000, 1_000_000)
+        cached_second, prefix = self._ts_second
+        if second != cached_second:
+            prefix = time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(second))
+            self._ts_second = (second, prefix)
+        return f"{prefix}.{micros:06d}"
+    
+    def _pages_line(self, session_id: Optional[str], pages: List[int]) -> str:
+        """TXT "Pages Retrieved" line, re-sorted only when the session's page list changed."""
+        with self._lock:
+            memo = self._pages_memo.get(session_id)
+            if memo is not None and memo[0] == pages:
+                return memo[1]
+            line = f"Pages Retrieved: {sorted(set(pages))}\n"
+            self._pages_memo.pop(session_id, None)
+            self._pages_memo[session_id] = (list(pages), line)
+            if len(self._pages_memo) > PAGES_MEMO_SESSIONS:
+                del self._pages_memo[next(iter(self._pages_memo))]
+            return line
     
     def log_retrieval_details(
         self,
@@ -238,74 +525,98 @@ class AgentLogger:
             query: Query used
             chunks: List of retrieved chunks with scores
         """
-        # Initialize TXT file if not already initialized (lazy initialization for tests)
-        if not self._txt_initialized:
-            self._initialize_txt()
-        with open(self.txt_path, 'a', encoding='utf-8') as f:
-            f.write(f"[{datetime.now().strftime('%H:%M:%S')}] RETRIEVAL DETAILS\n")
-            f.write("-" * 80 + "\n")
-            f.write(f"Query: {query}\n")
-            f.write(f"Results: {len(chunks)} chunks\n\n")
-            
-            for i, chunk in enumerate(chunks[:10], 1):  # Top 10
-                f.write(f"[{i}] Chunk ID: {chunk.get('chunk_id', 'N/A')[:8]}...\n")
-                f.write(f"    Pages: {chunk.get('p0', 'N/A')}-{chunk.get('p1', 'N/A')}\n")
-                f.write(f"    Content Type: {chunk.get('content_type', 'N/A')}\n")
-                f.write(f"    Scores: lex={chunk.get('lex', 0):.4f}, vec={chunk.get('vec', 0):.4f}, ce={chunk.get('ce', 0):.4f}\n")
-                text_preview = chunk.get('text', '')[:200] if chunk.get('text') else 'N/A'
-                f.write(f"    Text: {text_preview}...\n\n")
-            
-            if len(chunks) > 10:
-                f.write(f"... and {len(chunks) - 10} more chunks\n")
-            
-            f.write("\n" + "="*80 + "\n\n")
+        if not self.verbose:
+            return
+        lines = [
+            f"[{self._timestamp(time.time_ns())[11:19]}] RETRIEVAL DETAILS\n",
+            _TXT_RULE,
+            f"Query: {query}\n",
+            f"Results: {len(chunks)} chunks\n\n",
+        ]
+        
+        for i, chunk in enumerate(chunks[:10], 1):  # Top 10
+            lines.append(f"[{i}] Chunk ID: {chunk.get('chunk_id', 'N/A')[:8]}...\n")
+            lines.append(f"    Pages: {chunk.get('p0', 'N/A')}-{chunk.get('p1', 'N/A')}\n")
+            lines.append(f"    Content Type: {chunk.get('content_type', 'N/A')}\n")
+            lines.append(f"    Scores: lex={chunk.get('lex', 0):.4f}, vec={chunk.get('vec', 0):.4f}, ce={chunk.get('ce', 0):.4f}\n")
+            text_preview = chunk.get('text', '')[:200] if chunk.get('text') else 'N/A'
+            lines.append(f"    Text: {text_preview}...\n\n")
+        
+        if len(chunks) > 10:
+            lines.append(f"... and {len(chunks) - 10} more chunks\n")
+        
+        lines.append(_TXT_END)
+        self._write(None, "".join(lines))
     
     def log_error(self, node: str, error: str, session_id: Optional[str] = None):
         """Log an error that occurred during reasoning."""
-        timestamp = datetime.now().isoformat()
-        
-        # Initialize CSV file if not already initialized (lazy initialization for tests)
-        if not self._csv_initialized:
-            self._initialize_csv()
+        if not self._enabled:
+            return
+        # One clock read per record, shared by the CSV, TXT and .bin timestamps
+        ts_ns = time.time_ns()
+        timestamp = self._timestamp(ts_ns)
         
-        # Log to CSV
-        with open(self.csv_path, 'a', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow([
+        # CSV row
+        row = None
+        if self.csv_log:
+            row = (
                 timestamp,
                 session_id or '',
                 node,
                 'ERROR',
                 '', '', '', 0, '', 0.0, 0, '', '',
-                json.dumps({'error': error})
-            ])
+                _dumps({'error': error})
+            )
         
-        # Initialize TXT file if not already initialized (lazy initialization for tests)
-        if not self._txt_initialized:
-            self._initialize_txt()
+        # TXT block
+        text = None
+        if self.verbose:
+            text = "".join((f"[{timestamp[11:19]}] ERROR in {node.upper()}\n", _TXT_RULE, f"Error: {error}\n", _TXT_END))
         
-        # Log to TXT
-        with open(self.txt_path, 'a', encoding='utf-8') as f:
-            f.write(f"[{datetime.now().strftime('%H:%M:%S')}] ERROR in {node.upper()}\n")
-            f.write("-" * 80 + "\n")
-            f.write(f"Error: {error}\n")
-            f.write("\n" + "="*80 + "\n\n")
+        event = (ts_ns, node, 'ERROR', session_id, {"error": error}) if self.bin_path is not None else None
+        self._write(row, text, event)
     
     def close(self):
-        """Finalize the log files."""
-        with open(self.txt_path, 'a', encoding='utf-8') as f:
-            f.write("="*80 + "\n")
-            f.write(f"Session ended: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write("="*80 + "\n")
+        """Drain the queue, stop the writer thread, finalize the log files and release their handles."""
+        with self._lock:
+            if self._writer is not None:
+                self._q.put(_STOP)
+                self._writer.join()
+                self._writer = None
+            if self.verbose:
+                f = self._txt_fh or open(self.txt_path, 'ab', buffering=0)
+                _write_all(f.fileno(), (
+                    f"{_TXT_BAR}Session ended: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n{_TXT_BAR}"
+                ).encode('utf-8'))
+                f.close()
+                self._txt_fh = None
+            if self._csv_fh is not None:
+                self._csv_fh.close()
+                self._csv_fh = None
+                self._csv_writer = None
+            if self._bin_fh is not None:
+                self._bin_fh.close()
+                self._bin_fh = None
         
         logger.info(f"Agent logger closed. Logs saved to:")
-        logger.info(f"  CSV: {self.csv_path}")
-        logger.info(f"  TXT: {self.txt_path}")
+        if self.csv_log:
+            logger.info(f"  CSV: {self.csv_path}")
+        if self.verbose:
+            logger.info(f"  TXT: {self.txt_path}")
+        if self.bin_path is not None:
+            logger.info(f"  BIN: {self.bin_path}")
 
 
 # Global logger instance
 _agent_logger: Optional[AgentLogger] = None
 
+def _flush_agent_logger():
+    # Records still queued at interpreter exit would be lost with the daemon thread
+    if _agent_logger is not None:
+        _agent_logger.flush()
+
+atexit.register(_flush_agent_logger)
+
 def get_agent_logger() -> AgentLogger:
     """Get or create the global agent logger instance."""
     global _agent_logger
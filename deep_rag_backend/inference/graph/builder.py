@@ -1,8 +1,13 @@
 """
 Graph builder for LangGraph pipeline.
 """
+import functools
+import sqlite3
+import threading
+from typing import Optional
 from langgraph.graph import StateGraph, END  # type: ignore[import-untyped]
 from inference.graph.state import GraphState
+from inference.graph.constants import GRAPH_CHECKPOINT_PERSIST
 from inference.graph.nodes import (
     node_planner,
     node_retriever,
@@ -12,7 +17,7 @@ from inference.graph.nodes import (
     node_synthesizer,
     node_citation_pruner
 )
-from inference.graph.routing import should_refine
+from inference.graph.routing import should_compress, should_refine
 
 # Try to import SqliteSaver, fallback to None if not available
 try:
@@ -26,7 +31,7 @@ except ImportError:
         SqliteSaver = None
 
 
-def build_app(sqlite_path: str = "langgraph_state.sqlite"):
+def build_app(sqlite_path: str = "langgraph_state.sqlite", persistent: bool = False):
     graph = StateGraph(GraphState)
 
     # Nodes
@@ -41,28 +46,69 @@ def build_app(sqlite_path: str = "langgraph_state.sqlite"):
     # Edges
     graph.set_entry_point("planner")
     graph.add_edge("planner", "retriever")
-    graph.add_edge("retriever", "compressor")
+    # Strong first-pass evidence skips the compressor/critic loop; evidence the
+    # critic will accept skips only the compressor
+    compress_routes = {
+        "compress": "compressor",
+        "critique": "critic",
+        "skip": "synthesizer"
+    }
+    graph.add_conditional_edges("retriever", should_compress, compress_routes)
     graph.add_edge("compressor", "critic")
     graph.add_conditional_edges("critic", should_refine, {
         "refine": "refine_retrieve",
         "synthesize": "synthesizer"
     })
     # After refine retrieval, go back to compressor → critic again
-    graph.add_edge("refine_retrieve", "compressor")
+    graph.add_conditional_edges("refine_retrieve", should_compress, compress_routes)
     graph.add_edge("synthesizer", "citation_pruner")
     graph.add_edge("citation_pruner", END)
 
-    # Persistence (per-thread history/checkpoints)
-    if SqliteSaver is not None:
+    # Persistence (per-thread history/checkpoints), opt-in: each request passes
+    # its full initial state, so checkpoints are only written, never resumed
+    if persistent and SqliteSaver is not None:
         try:
-            checkpointer = SqliteSaver.from_conn_string(sqlite_path)
+            # One connection for the process (shared by request threads). WAL lets
+            # checkpoint reads for one thread proceed while another thread writes;
+            # synchronous=NORMAL skips the fsync on every checkpoint commit.
+            conn = sqlite3.connect(sqlite_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            checkpointer = SqliteSaver(conn)
             app = graph.compile(checkpointer=checkpointer)
         except Exception as e:
             # Fallback to no checkpoint if SQLite fails
             print(f"Warning: Could not initialize SQLite checkpoint: {e}. Using in-memory mode.")
             app = graph.compile()
     else:
-        # No checkpoint available, use in-memory mode
+        # Persistence off (or checkpoint package unavailable): no checkpointer
         app = graph.compile()
     return app
 
+
+_app_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=4)
+def _compiled_app(sqlite_path: str, persistent: bool):
+    return build_app(sqlite_path, persistent=persistent)
+
+
+def get_app(sqlite_path: str = "langgraph_state.sqlite", persistent: Optional[bool] = None):
+    """
+    Compiled graph shared by every query in the process.
+
+    The graph's structure is fixed; doc_id, cross_doc and thread_id only
+    change the invocation state and config, so one compiled app (and one
+    checkpointer connection) per sqlite_path serves all of them. The lock
+    keeps concurrent first requests from compiling (and opening) it twice.
+
+    persistent=None follows GRAPH_CHECKPOINT_PERSIST.
+    """
+    if persistent is None:
+        persistent = GRAPH_CHECKPOINT_PERSIST
+    with _app_lock:
+        return _compiled_app(sqlite_path, persistent)
+
+
+get_app.cache_clear = _compiled_app.cache_clear
@@ -8,3 +8,14 @@ load_dotenv()
 MAX_ITERS = int(os.getenv('MAX_ITERS', '5'))  # Increased from 3 to 5 for better convergence on complex multi-document queries
 THRESH = float(os.getenv('THRESH', '0.30'))   # matches CE/lex+vec heuristic
 
+# Evidence text per chunk in the compressor and synthesizer prompts
+SNIPPET_CHARS = 1200
+
+SYNTH_MIN_CONFIDENCE = float(os.getenv('SYNTH_MIN_CONFIDENCE', '0.45'))  # skip the LLM when the critic found no strong chunk
+
+# Retriever routes straight to the synthesizer when the first pass already has
+# this many strong chunks (skips compressor + critic); 0 disables
+EARLY_ACCEPT_STRONG = int(os.getenv('EARLY_ACCEPT_STRONG', '5'))
+
+# SQLite checkpoints of every node transition; nothing reads them back per request, so off by default
+GRAPH_CHECKPOINT_PERSIST = os.getenv('GRAPH_CHECKPOINT_PERSIST', 'false').lower() in ('1', 'true', 'yes')
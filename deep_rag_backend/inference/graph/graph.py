@@ -1,9 +1,20 @@
 """
 Legacy graph.py - Maintained for backward compatibility.
 
-This module now imports from the modularized graph package.
+This module re-exports from the modularized graph package. The exports are
+resolved lazily (PEP 562), so importing it does not load the LangGraph,
+retrieval and LLM stack until build_app is actually used.
 """
-from inference.graph.builder import build_app
-from inference.graph.state import GraphState
+from typing import Any
 
 __all__ = ['build_app', 'GraphState']
+
+
+def __getattr__(name: str) -> Any:
+    if name == 'build_app':
+        from inference.graph.builder import build_app
+        return build_app
+    if name == 'GraphState':
+        from inference.graph.state import GraphState
+        return GraphState
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
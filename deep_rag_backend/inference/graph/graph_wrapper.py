@@ -1,12 +1,19 @@
-from inference.graph.builder import build_app
+from inference.graph.builder import get_app
+from inference.graph.streaming import stream_tokens
+from retrieval.embed_cache import turn_embedding_cache
+import asyncio
+import contextvars
 import logging
+import queue
+import threading
 import unicodedata
-from typing import Optional, List, Dict
+from typing import Any, Iterator, Optional, List, Dict
 
 logger = logging.getLogger(__name__)
 
 def ask_with_graph(question: str, thread_id: str = "default", doc_id: Optional[str] = None, 
-                  selected_doc_ids: Optional[list[str]] = None, uploaded_doc_ids: Optional[list[str]] = None, cross_doc: bool = False) -> dict:
+                  selected_doc_ids: Optional[list[str]] = None, uploaded_doc_ids: Optional[list[str]] = None, cross_doc: bool = False,
+                  persistent: Optional[bool] = None) -> dict:
     """
     Query using LangGraph pipeline with conditional routing.
     
@@ -18,6 +25,8 @@ def ask_with_graph(question: str, thread_id: str = "default", doc_id: Optional[s
         thread_id: Optional thread ID for conversation state (default: "default")
         doc_id: Optional document ID to filter retrieval to a specific document
         cross_doc: If True, enable cross-document retrieval (two-stage when doc_id provided)
+        persistent: Checkpoint node transitions to ./langgraph_state.sqlite
+            (default: GRAPH_CHECKPOINT_PERSIST, off)
         
     Returns:
         Dictionary with answer, confidence, action, and other metadata
@@ -59,7 +68,7 @@ def ask_with_graph(question: str, thread_id: str = "default", doc_id: Optional[s
     if cross_doc:
         logger.info("Cross-document retrieval enabled")
     
-    app = build_app()  # uses ./langgraph_state.sqlite
+    app = get_app(persistent=persistent)  # compiled once per process
     # thread_id lets you keep state per ongoing conversation (optional for this pipeline)
     # CRITICAL: Explicitly clear doc_id and selected_doc_ids to prevent using persisted state
     # LangGraph persists state between queries, so we must explicitly set these to None/[] 
@@ -100,10 +109,12 @@ def ask_with_graph(question: str, thread_id: str = "default", doc_id: Optional[s
     # If doc_ids_to_use is None and selected_doc_ids was not explicitly provided, 
     # both doc_id and selected_doc_ids remain None (explicitly cleared in initial_state above)
     
-    resp = app.invoke(
-        initial_state,
-        config={"configurable": {"thread_id": thread_id}}
-    )
+    # Nodes run with a copy of this context, so they share one query embedding per distinct query
+    with turn_embedding_cache():
+        resp = app.invoke(
+            initial_state,
+            config={"configurable": {"thread_id": thread_id}}
+        )
     
     # Log final state
     logger.info("-" * 40)
@@ -116,14 +127,13 @@ def ask_with_graph(question: str, thread_id: str = "default", doc_id: Optional[s
     logger.info(f"Total Iterations Executed: {iterations}")
     logger.info(f"Refinement prompts issued: {len(refinements)}")
     if refinements:
-        logger.info(f"Refinement history: {refinements}")
+        logger.info("Refinement history: %s", refinements)
     logger.info(f"Total Evidence Chunks: {len(resp.get('evidence', []))}")
     
     # Log page distribution in final evidence
     evidence = resp.get('evidence', [])
-    if evidence:
-        pages_found = sorted(set([h.get('p0', 0) for h in evidence]))
-        logger.info(f"Pages in final evidence: {pages_found}")
+    if evidence and logger.isEnabledFor(logging.INFO):
+        logger.info("Pages in final evidence: %s", sorted({h.get('p0', 0) for h in evidence}))
     logger.info("-" * 40)
     
     # CRITICAL: Use citation_pruner's filtered doc_ids (only documents referenced in answer)
@@ -245,6 +255,66 @@ def ask_with_graph(question: str, thread_id: str = "default", doc_id: Optional[s
     
     return result
 
+
+async def ask_with_graph_async(question: str, **kwargs: Any) -> dict:
+    """
+    ask_with_graph for async callers.
+
+    The graph and its nodes are synchronous, so the run is handed to a worker
+    thread (with the caller's context) instead of blocking the event loop;
+    concurrent requests share the one compiled app from get_app.
+
+    Args:
+        question: The question to ask
+        **kwargs: Passed through to ask_with_graph (thread_id, doc_id, ...)
+    """
+    return await asyncio.to_thread(ask_with_graph, question, **kwargs)
+
+
+_STREAM_DONE = object()
+
+
+def stream_with_graph(question: str, **kwargs: Any) -> Iterator[Dict[str, Any]]:
+    """
+    Streaming variant of ask_with_graph.
+
+    Runs the graph in a worker thread and yields {"event": "token", "data": delta}
+    for each synthesizer token as it is generated, then one
+    {"event": "result", "data": <ask_with_graph result>} once the citation pruner
+    has finished. Join the token deltas for the raw answer; the result's answer
+    is the final text with citations. An abstaining synthesizer makes no LLM
+    call, so only the result event is produced.
+
+    Args:
+        question: The question to ask
+        **kwargs: Passed through to ask_with_graph (thread_id, doc_id, ...)
+    """
+    events: "queue.Queue[Any]" = queue.Queue()
+    outcome: Dict[str, Any] = {}
+
+    def _run() -> None:
+        try:
+            with stream_tokens(events.put):
+                outcome["result"] = ask_with_graph(question, **kwargs)
+        except BaseException as e:  # re-raised in the consuming thread
+            outcome["error"] = e
+        finally:
+            events.put(_STREAM_DONE)
+
+    ctx = contextvars.copy_context()
+    worker = threading.Thread(target=ctx.run, args=(_run,), name="graph-stream", daemon=True)
+    worker.start()
+    while True:
+        item = events.get()
+        if item is _STREAM_DONE:
+            break
+        yield {"event": "token", "data": item}
+    worker.join()
+    if "error" in outcome:
+        raise outcome["error"]
+    yield {"event": "result", "data": outcome["result"]}
+
+
 if __name__ == "__main__":
     import sys
     q = " ".join(sys.argv[1:]) or "In summary, what does the document say?"
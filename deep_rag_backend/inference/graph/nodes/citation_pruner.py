@@ -13,6 +13,41 @@ from retrieval.db_utils import get_document_title
 logger = logging.getLogger(__name__)
 agent_log = get_agent_logger()
 
+# Patterns are compiled once at import; several run per citation/Sources line
+_NEGATIVE_ANSWER_RE = re.compile("|".join([
+    r"^i\s+don'?t\s+know",
+    r"^i\s+do\s+not\s+know",
+    r"does\s+not\s+contain\s+the\s+answer",
+    r"does\s+not\s+contain\s+the\s+information",
+    r"does\s+not\s+provide\s+the\s+answer",
+    r"no\s+answer\s+is\s+available",
+    r"no\s+relevant\s+information",
+    r"cannot\s+determine\s+from\s+the\s+document",
+    r"cannot\s+find\s+this\s+information",
+    r"not\s+provided\s+in\s+the\s+document",
+    r"document\s+does\s+not\s+provide",
+    r"document\s+does\s+not\s+mention",
+    r"not\s+enough\s+information\s+in\s+the\s+document",
+    r"context\s+does\s+not\s+contain",
+    r"no\s+supportive\s+evidence\s+in\s+the\s+context",
+]), re.IGNORECASE)
+# Inline document references: [DOC abcd1234], DOC abcd1234, Document abcd1234, doc:abcd1234
+_DOC_BRACKETED_RE = re.compile(r'\[DOC\s+\{?([a-f0-9]{8})\}?\]', re.IGNORECASE)
+_DOC_PLAIN_RE = re.compile(r'DOC\s+\{?([a-f0-9]{8})\}?', re.IGNORECASE)
+_DOC_WORD_RE = re.compile(r'\bDocument\s+\{?([a-f0-9]{8})\}?', re.IGNORECASE)
+_DOC_COLON_RE = re.compile(r'doc:\s*\{?([a-f0-9]{8})\}?', re.IGNORECASE)
+# Full doc_id in a synthesizer citation string
+_CITATION_DOC_ID_RE = re.compile(r'doc:([a-f0-9-]+)', re.IGNORECASE)
+_ALPHA_CITATION_RE = re.compile(r'\[([A-Z])\]')
+# Sources / "Documents used for analysis" sections
+_SOURCES_TAIL_RE = re.compile(r'\n+Sources:.*$', re.DOTALL)
+_SOURCES_SECTION_RE = re.compile(r'\n+Sources:.*?(?=\n+Documents used for analysis|$)', re.DOTALL)
+_SOURCES_SECTION_LINE_START_RE = re.compile(r'^Sources:.*?(?=\n+Documents used for analysis|$)', re.MULTILINE | re.DOTALL)
+_SOURCES_DOC_REF_RE = re.compile(r'\[DOC:\s*([a-f0-9]{8})\]\s*', re.IGNORECASE)
+_SOURCE_LINE_RE = re.compile(r'^(-\s*\[([A-Z])\]\s*)\[DOC:\s*([a-f0-9]{8})\]\s*$', re.IGNORECASE)
+_SOURCE_LINE_START_RE = re.compile(r'^-\s*\[([A-Z])\]\s*\[DOC:', re.IGNORECASE)
+_DOCS_ANALYSIS_RE = re.compile(r'\n+Documents used for analysis.*$', re.DOTALL)
+
 
 def _normalize_for_match(text: str) -> str:
     """Normalize text for matching (lowercase, strip whitespace)."""
@@ -28,29 +63,7 @@ def _check_idont_know(answer: str) -> bool:
         return True
     
     # Check for negative response patterns
-    negative_patterns = [
-        r"^i\s+don'?t\s+know",
-        r"^i\s+do\s+not\s+know",
-        r"does\s+not\s+contain\s+the\s+answer",
-        r"does\s+not\s+contain\s+the\s+information",
-        r"does\s+not\s+provide\s+the\s+answer",
-        r"no\s+answer\s+is\s+available",
-        r"no\s+relevant\s+information",
-        r"cannot\s+determine\s+from\s+the\s+document",
-        r"cannot\s+find\s+this\s+information",
-        r"not\s+provided\s+in\s+the\s+document",
-        r"document\s+does\s+not\s+provide",
-        r"document\s+does\s+not\s+mention",
-        r"not\s+enough\s+information\s+in\s+the\s+document",
-        r"context\s+does\s+not\s+contain",
-        r"no\s+supportive\s+evidence\s+in\s+the\s+context",
-    ]
-    
-    for pattern in negative_patterns:
-        if re.search(pattern, normalized, re.IGNORECASE):
-            return True
-    
-    return False
+    return _NEGATIVE_ANSWER_RE.search(normalized) is not None
 
 
 def _extract_doc_references(answer: str) -> Set[str]:
@@ -68,28 +81,24 @@ def _extract_doc_references(answer: str) -> Set[str]:
     doc_refs: Set[str] = set()
     
     # Pattern 1: [DOC {doc[:8]}] or [DOC doc[:8]]
-    pattern1 = r'\[DOC\s+\{?([a-f0-9]{8})\}?\]'
-    matches1 = re.findall(pattern1, answer, re.IGNORECASE)
+    matches1 = _DOC_BRACKETED_RE.findall(answer)
     doc_refs.update(matches1)
     
     # Pattern 2: DOC {doc[:8]} or DOC doc[:8] (without brackets)
-    pattern2 = r'DOC\s+\{?([a-f0-9]{8})\}?'
-    matches2 = re.findall(pattern2, answer, re.IGNORECASE)
+    matches2 = _DOC_PLAIN_RE.findall(answer)
     doc_refs.update(matches2)
     
     # Pattern 3: Document {doc[:8]} or Document doc[:8] (case-insensitive)
     # Make sure we match "Document" as a word (not part of another word)
-    pattern3 = r'\bDocument\s+\{?([a-f0-9]{8})\}?'
-    matches3 = re.findall(pattern3, answer, re.IGNORECASE)
+    matches3 = _DOC_WORD_RE.findall(answer)
     doc_refs.update(matches3)
-    logger.debug(f"Pattern 3 (Document) matches: {matches3}")
+    logger.debug("Pattern 3 (Document) matches: %s", matches3)
     
     # Pattern 4: doc:doc[:8] or doc: {doc[:8]}
-    pattern4 = r'doc:\s*\{?([a-f0-9]{8})\}?'
-    matches4 = re.findall(pattern4, answer, re.IGNORECASE)
+    matches4 = _DOC_COLON_RE.findall(answer)
     doc_refs.update(matches4)
     
-    logger.debug(f"Extracted document references from answer: {doc_refs}")
+    logger.debug("Extracted document references from answer: %s", doc_refs)
     return doc_refs
 
 
@@ -107,18 +116,18 @@ def _match_doc_ids_by_prefix(doc_refs: Set[str], available_doc_ids: List[str]) -
     matched_doc_ids: Set[str] = set()
     doc_refs_lower = {ref.lower() for ref in doc_refs}
     
-    logger.debug(f"Matching {len(doc_refs)} reference(s) against {len(available_doc_ids)} available doc_id(s)")
+    logger.debug("Matching %s reference(s) against %s available doc_id(s)", len(doc_refs), len(available_doc_ids))
     
     for doc_id in available_doc_ids:
         doc_id_prefix = doc_id[:8].lower()
         if doc_id_prefix in doc_refs_lower:
             matched_doc_ids.add(doc_id)
-            logger.info(f"✓ Matched prefix '{doc_id_prefix}' to full doc_id: {doc_id}")
+            logger.info("✓ Matched prefix '%s' to full doc_id: %s", doc_id_prefix, doc_id)
         else:
-            logger.debug(f"✗ Prefix '{doc_id_prefix}' not in references {doc_refs_lower}")
+            logger.debug("✗ Prefix '%s' not in references %s", doc_id_prefix, doc_refs_lower)
     
     if not matched_doc_ids and doc_refs:
-        logger.warning(f"No matches found! References: {doc_refs_lower}, Available prefixes: {[d[:8].lower() for d in available_doc_ids]}")
+        logger.warning("No matches found! References: %s, Available prefixes: %s", doc_refs_lower, [d[:8].lower() for d in available_doc_ids])
     
     return matched_doc_ids
 
@@ -162,7 +171,7 @@ def _replace_doc_citations(answer: str, doc_id_to_title: Dict[str, str]) -> str:
             return f"[{title}]"
         return match.group(0)  # Keep original if title not found
     
-    result = re.sub(r'\[DOC\s+\{?([a-f0-9]{8})\}?\]', replace_bracketed, result, flags=re.IGNORECASE)
+    result = _DOC_BRACKETED_RE.sub(replace_bracketed, result)
     
     # Pattern 2: DOC {doc[:8]} or DOC doc[:8] (without brackets)
     def replace_unbracketed(match: Match[str]) -> str:
@@ -172,7 +181,7 @@ def _replace_doc_citations(answer: str, doc_id_to_title: Dict[str, str]) -> str:
             return title
         return match.group(0)  # Keep original if title not found
     
-    result = re.sub(r'DOC\s+\{?([a-f0-9]{8})\}?', replace_unbracketed, result, flags=re.IGNORECASE)
+    result = _DOC_PLAIN_RE.sub(replace_unbracketed, result)
     
     # Pattern 3: Document {doc[:8]} or Document doc[:8] (case-insensitive)
     # Match "Document" as a word boundary to avoid matching "Documentation" etc.
@@ -183,7 +192,7 @@ def _replace_doc_citations(answer: str, doc_id_to_title: Dict[str, str]) -> str:
             return title
         return match.group(0)  # Keep original if title not found
     
-    result = re.sub(r'\bDocument\s+\{?([a-f0-9]{8})\}?', replace_document_word, result, flags=re.IGNORECASE)
+    result = _DOC_WORD_RE.sub(replace_document_word, result)
     
     # Pattern 4: doc:doc[:8] or doc: {doc[:8]}
     def replace_doc_colon(match: Match[str]) -> str:
@@ -193,7 +202,7 @@ def _replace_doc_citations(answer: str, doc_id_to_title: Dict[str, str]) -> str:
             return title
         return match.group(0)  # Keep original if title not found
     
-    result = re.sub(r'doc:\s*\{?([a-f0-9]{8})\}?', replace_doc_colon, result, flags=re.IGNORECASE)
+    result = _DOC_COLON_RE.sub(replace_doc_colon, result)
     
     return result
 
@@ -212,7 +221,7 @@ def _build_document_map(doc_ids: List[str]) -> Dict[str, Optional[str]]:
     for doc_id in doc_ids:
         title = get_document_title(doc_id)
         doc_map[doc_id] = title
-        logger.debug(f"Mapped doc_id {doc_id[:8]}... to title: {title}")
+        logger.debug("Mapped doc_id %s... to title: %s", doc_id[:8], title)
     return doc_map
 
 
@@ -233,7 +242,7 @@ def _prune_citations(citations: List[str], used_doc_ids: Set[str], doc_id_to_tit
     
     for citation in citations:
         # Extract doc_id from citation (format: "[{idx}] doc:{doc_id} {page_str} (confidence: {conf}%)")
-        doc_match = re.search(r'doc:([a-f0-9-]+)', citation, re.IGNORECASE)
+        doc_match = _CITATION_DOC_ID_RE.search(citation)
         if doc_match:
             doc_id = doc_match.group(1)
             if doc_id in used_doc_ids:
@@ -241,12 +250,7 @@ def _prune_citations(citations: List[str], used_doc_ids: Set[str], doc_id_to_tit
                 title = doc_id_to_title.get(doc_id)
                 if title:
                     # Replace "doc:{doc_id}" with title
-                    updated_citation = re.sub(
-                        r'doc:[a-f0-9-]+',
-                        title,
-                        citation,
-                        flags=re.IGNORECASE
-                    )
+                    updated_citation = _CITATION_DOC_ID_RE.sub(title, citation)
                     pruned_citations.append(updated_citation)
                 else:
                     # Keep original if title not found
@@ -283,10 +287,10 @@ def node_citation_pruner(state: GraphState) -> GraphState:
     action = state.get("action", "answer")
     question = state.get("question", "")
     
-    logger.info(f"Input state: answer_length={len(answer)}, doc_ids={len(doc_ids)}, citations={len(citations)}")
-    logger.info(f"Question: {question}")
-    logger.info(f"Confidence: {confidence:.2f}%, Action: {action}")
-    logger.info(f"Answer preview (first 500 chars): {answer[:500]}")
+    logger.info("Input state: answer_length=%s, doc_ids=%s, citations=%s", len(answer), len(doc_ids), len(citations))
+    logger.info("Question: %s", question)
+    logger.info("Confidence: %.2f%%, Action: %s", confidence, action)
+    logger.info("Answer preview (first 500 chars): %s", answer[:500])
     
     # Step 1: Check for "I don't know" response
     is_idont_know = _check_idont_know(answer)
@@ -294,13 +298,13 @@ def node_citation_pruner(state: GraphState) -> GraphState:
         logger.warning("=" * 60)
         logger.warning("DETECTED 'I DON'T KNOW' RESPONSE IN CITATION_PRUNER")
         logger.warning("=" * 60)
-        logger.warning(f"Question: {question}")
-        logger.warning(f"Answer (full): {answer}")
-        logger.warning(f"Answer length: {len(answer)} characters")
-        logger.warning(f"Confidence from synthesizer: {confidence:.2f}%")
-        logger.warning(f"Action from synthesizer: {action}")
-        logger.warning(f"Document IDs provided: {doc_ids}")
-        logger.warning(f"Number of citations: {len(citations)}")
+        logger.warning("Question: %s", question)
+        logger.warning("Answer (full): %s", answer)
+        logger.warning("Answer length: %s characters", len(answer))
+        logger.warning("Confidence from synthesizer: %.2f%%", confidence)
+        logger.warning("Action from synthesizer: %s", action)
+        logger.warning("Document IDs provided: %s", doc_ids)
+        logger.warning("Number of citations: %s", len(citations))
         logger.warning("This may indicate:")
         logger.warning("  1. LLM generated 'I don't know' despite having context")
         logger.warning("  2. Confidence threshold was too low (< 40%)")
@@ -336,40 +340,40 @@ def node_citation_pruner(state: GraphState) -> GraphState:
     
     # Step 2: Extract document references from answer body
     doc_refs = _extract_doc_references(answer)
-    logger.info(f"Extracted {len(doc_refs)} document reference(s) from answer body: {[ref for ref in doc_refs]}")
+    logger.info("Extracted %s document reference(s) from answer body: %s", len(doc_refs), [ref for ref in doc_refs])
     
     # Step 2a: Also extract from alphabetic citations in answer body using letter_to_doc_prefix
     letter_to_doc_prefix = state.get("letter_to_doc_prefix", {})
     if letter_to_doc_prefix:
-        logger.info(f"Found letter_to_doc_prefix mapping: {letter_to_doc_prefix}")
+        logger.info("Found letter_to_doc_prefix mapping: %s", letter_to_doc_prefix)
         # Extract alphabetic citations like [B], [G], [M] from answer body
-        alphabetic_citations = re.findall(r'\[([A-Z])\]', answer)
+        alphabetic_citations = _ALPHA_CITATION_RE.findall(answer)
         if alphabetic_citations:
-            logger.info(f"Found alphabetic citations in answer body: {set(alphabetic_citations)}")
+            logger.info("Found alphabetic citations in answer body: %s", set(alphabetic_citations))
             # Map letters to doc prefixes
             for letter in set(alphabetic_citations):
                 if letter in letter_to_doc_prefix:
                     doc_prefix = letter_to_doc_prefix[letter].lower()
                     doc_refs.add(doc_prefix)
-                    logger.debug(f"Mapped citation [{letter}] to doc prefix: {doc_prefix}")
+                    logger.debug("Mapped citation [%s] to doc prefix: %s", letter, doc_prefix)
     
     # Step 2b: Also extract document references from Sources section if present
     if "Sources:" in answer:
         # Match Sources section with flexible newline handling (1 or 2 newlines)
-        sources_match = re.search(r'\n+Sources:.*$', answer, re.DOTALL)
+        sources_match = _SOURCES_TAIL_RE.search(answer)
         if sources_match:
             sources_text = sources_match.group(0)
             # Extract [DOC: 16a68247] patterns from Sources section
-            sources_doc_refs = re.findall(r'\[DOC:\s*([a-f0-9]{8})\]\s*', sources_text, re.IGNORECASE)
+            sources_doc_refs = _SOURCES_DOC_REF_RE.findall(sources_text)
             if sources_doc_refs:
                 doc_refs.update([ref.lower() for ref in sources_doc_refs])
-                logger.info(f"Extracted {len(sources_doc_refs)} document reference(s) from Sources section: {sources_doc_refs}")
+                logger.info("Extracted %s document reference(s) from Sources section: %s", len(sources_doc_refs), sources_doc_refs)
     
     if doc_refs:
-        logger.info(f"Total document reference prefixes found: {list(doc_refs)}")
+        logger.info("Total document reference prefixes found: %s", list(doc_refs))
     else:
-        logger.warning(f"No document references found in answer. Answer preview: {answer[:500]}")
-        logger.debug(f"Available doc_ids to match against: {[d[:8] for d in doc_ids]}")
+        logger.warning("No document references found in answer. Answer preview: %s", answer[:500])
+        logger.debug("Available doc_ids to match against: %s", [d[:8] for d in doc_ids])
     
     # Step 3: Match references to full document IDs
     used_doc_ids: Set[str] = _match_doc_ids_by_prefix(doc_refs, doc_ids) if doc_refs else set()
@@ -379,10 +383,11 @@ def node_citation_pruner(state: GraphState) -> GraphState:
     if not used_doc_ids:
         logger.warning("No explicit document references found in answer - clearing all sources")
         used_doc_ids = set()
-    else:
-        logger.info(f"Found explicit document references: {[d[:8] + '...' for d in used_doc_ids]}")
+    elif logger.isEnabledFor(logging.INFO):
+        logger.info("Found explicit document references: %s", [d[:8] + '...' for d in used_doc_ids])
     
-    logger.info(f"Matched {len(used_doc_ids)} document(s) to references: {[d[:8] + '...' for d in used_doc_ids]}")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Matched %s document(s) to references: %s", len(used_doc_ids), [d[:8] + '...' for d in used_doc_ids])
     
     # Step 4: Build document title map for ALL available docs (for replacement)
     # But we'll only return the used ones
@@ -391,14 +396,14 @@ def node_citation_pruner(state: GraphState) -> GraphState:
     # Step 5: Replace document citations in answer with titles
     # Use all docs for replacement (in case answer mentions docs not in used set)
     updated_answer = _replace_doc_citations(answer, {k: v for k, v in all_doc_id_to_title.items() if v})
-    logger.info(f"Replaced document citations in answer (length: {len(updated_answer)})")
+    logger.info("Replaced document citations in answer (length: %s)", len(updated_answer))
     
     # Build title map only for used documents
     doc_id_to_title = {k: v for k, v in all_doc_id_to_title.items() if k in used_doc_ids}
     
     # Step 6: Prune citations to only include used documents
     pruned_citations = _prune_citations(citations, used_doc_ids, doc_id_to_title)
-    logger.info(f"Pruned citations from {len(citations)} to {len(pruned_citations)}")
+    logger.info("Pruned citations from %s to %s", len(citations), len(pruned_citations))
     
     # Step 7: Update pages to only include pages from used documents
     # (Pages are already filtered in synthesizer, but we ensure consistency)
@@ -418,16 +423,16 @@ def node_citation_pruner(state: GraphState) -> GraphState:
         sources_text = None
         
         # Pattern 1: Sources: with preceding newlines, stop at "Documents used for analysis"
-        sources_match = re.search(r'\n+Sources:.*?(?=\n+Documents used for analysis|$)', answer, re.DOTALL)
+        sources_match = _SOURCES_SECTION_RE.search(answer)
         if sources_match:
             sources_text = sources_match.group(0)
-            logger.info(f"Found Sources section (pattern 1): {sources_text[:200]}...")
+            logger.info("Found Sources section (pattern 1): %s...", sources_text[:200])
         else:
             # Pattern 2: Sources: at start of line (with MULTILINE flag)
-            sources_match_alt = re.search(r'^Sources:.*?(?=\n+Documents used for analysis|$)', answer, re.MULTILINE | re.DOTALL)
+            sources_match_alt = _SOURCES_SECTION_LINE_START_RE.search(answer)
             if sources_match_alt:
                 sources_text = sources_match_alt.group(0)
-                logger.info(f"Found Sources section (pattern 2): {sources_text[:200]}...")
+                logger.info("Found Sources section (pattern 2): %s...", sources_text[:200])
             else:
                 # Pattern 3: Just find "Sources:" and everything after until "Documents used for analysis" or end
                 sources_idx = answer.find("Sources:")
@@ -437,13 +442,13 @@ def node_citation_pruner(state: GraphState) -> GraphState:
                         sources_text = answer[sources_idx:docs_idx].rstrip()
                     else:
                         sources_text = answer[sources_idx:].rstrip()
-                    logger.info(f"Found Sources section (pattern 3 - substring): {sources_text[:200]}...")
+                    logger.info("Found Sources section (pattern 3 - substring): %s...", sources_text[:200])
                 else:
-                    logger.warning(f"Sources: found in answer but all extraction patterns failed. Answer snippet: {answer[max(0, answer.find('Sources:')-50):answer.find('Sources:')+200]}")
+                    logger.warning("Sources: found in answer but all extraction patterns failed. Answer snippet: %s", answer[max(0, answer.find('Sources:')-50):answer.find('Sources:')+200])
         
         if sources_text:
             # letter_to_doc_prefix was already retrieved above
-            logger.debug(f"letter_to_doc_prefix mapping: {letter_to_doc_prefix}")
+            logger.debug("letter_to_doc_prefix mapping: %s", letter_to_doc_prefix)
             
             # Parse alphabetic citations from Sources section: "- [B] [DOC: 16a68247]"
             sources_lines = []
@@ -455,10 +460,10 @@ def node_citation_pruner(state: GraphState) -> GraphState:
                     continue
                 
                 # Match pattern: "- [B] [DOC: 16a68247]" or "- [B] [DOC:16a68247]"
-                citation_match = re.match(r'^-\s*\[([A-Z])\]\s*\[DOC:\s*([a-f0-9]{8})\]\s*$', line, re.IGNORECASE)
+                citation_match = _SOURCE_LINE_RE.match(line)
                 if citation_match:
-                    letter = citation_match.group(1).upper()
-                    doc_prefix = citation_match.group(2).lower()
+                    letter = citation_match.group(2).upper()
+                    doc_prefix = citation_match.group(3).lower()
                     
                     # Check if this document was actually used
                     # First, verify the letter maps to the correct doc_prefix
@@ -479,15 +484,15 @@ def node_citation_pruner(state: GraphState) -> GraphState:
                             if matching_doc_id in used_doc_ids:
                                 # Explicitly referenced - include it
                                 sources_lines.append(line)
-                                logger.debug(f"Including citation: {line} (doc_id: {matching_doc_id[:8]}... in used_doc_ids)")
+                                logger.debug("Including citation: %s (doc_id: %s... in used_doc_ids)", line, matching_doc_id[:8])
                             elif letter_to_doc_prefix and letter in letter_to_doc_prefix:
                                 # Valid letter mapping - include it (alphabetic citation was used in answer)
                                 sources_lines.append(line)
-                                logger.debug(f"Including citation: {line} (doc_id: {matching_doc_id[:8]}... via letter mapping)")
+                                logger.debug("Including citation: %s (doc_id: %s... via letter mapping)", line, matching_doc_id[:8])
                             else:
-                                logger.debug(f"Excluding citation: {line} (document not in used_doc_ids and no valid letter mapping)")
+                                logger.debug("Excluding citation: %s (document not in used_doc_ids and no valid letter mapping)", line)
                         else:
-                            logger.debug(f"Excluding citation: {line} (doc_id not found for prefix {doc_prefix})")
+                            logger.debug("Excluding citation: %s (doc_id not found for prefix %s)", line, doc_prefix)
                     else:
                         # If letter_to_doc_prefix is empty, still include if doc_prefix is in used_doc_ids
                         # This handles the case where LLM generated Sources but letter mapping is missing
@@ -499,11 +504,11 @@ def node_citation_pruner(state: GraphState) -> GraphState:
                                     break
                             if matching_doc_id and matching_doc_id in used_doc_ids:
                                 sources_lines.append(line)
-                                logger.debug(f"Including citation: {line} (doc_id: {matching_doc_id[:8]}... in used_doc_ids, no letter mapping)")
+                                logger.debug("Including citation: %s (doc_id: %s... in used_doc_ids, no letter mapping)", line, matching_doc_id[:8])
                             else:
-                                logger.debug(f"Excluding citation: {line} (letter {letter} doesn't match expected prefix {expected_prefix} and doc not in used_doc_ids)")
+                                logger.debug("Excluding citation: %s (letter %s doesn't match expected prefix %s and doc not in used_doc_ids)", line, letter, expected_prefix)
                         else:
-                            logger.debug(f"Excluding citation: {line} (letter {letter} doesn't match expected prefix {expected_prefix})")
+                            logger.debug("Excluding citation: %s (letter %s doesn't match expected prefix %s)", line, letter, expected_prefix)
                 else:
                     # Keep non-citation lines (like "Sources:" header)
                     if line:
@@ -512,9 +517,9 @@ def node_citation_pruner(state: GraphState) -> GraphState:
             # Rebuild Sources section if we have any citations
             if len(sources_lines) > 1:  # More than just "Sources:"
                 sources_section = "\n" + "\n".join(sources_lines)
-                logger.info(f"Rebuilt Sources section with {len(sources_lines) - 1} citation(s): {sources_section[:200]}...")
+                logger.info("Rebuilt Sources section with %s citation(s): %s...", len(sources_lines) - 1, sources_section[:200])
             else:
-                logger.warning(f"Sources section found but no valid citations after filtering. sources_lines={sources_lines}, letter_to_doc_prefix={letter_to_doc_prefix}, used_doc_ids={[d[:8] for d in used_doc_ids]}")
+                logger.warning("Sources section found but no valid citations after filtering. sources_lines=%s, letter_to_doc_prefix=%s, used_doc_ids=%s", sources_lines, letter_to_doc_prefix, [d[:8] for d in used_doc_ids])
                 # If we found Sources but filtered everything out, preserve the original
                 # We'll replace [DOC: prefix] with titles later regardless
                 if sources_text:
@@ -522,25 +527,25 @@ def node_citation_pruner(state: GraphState) -> GraphState:
                     original_sources_lines = []
                     for line in sources_text.split('\n'):
                         line = line.strip()
-                        if line and (line == "Sources:" or re.match(r'^-\s*\[([A-Z])\]\s*\[DOC:', line, re.IGNORECASE)):
+                        if line and (line == "Sources:" or _SOURCE_LINE_START_RE.match(line)):
                             original_sources_lines.append(line)
                     if len(original_sources_lines) > 1:
                         sources_section = "\n" + "\n".join(original_sources_lines)
-                        logger.info(f"Preserved original Sources section: {sources_section[:200]}...")
+                        logger.info("Preserved original Sources section: %s...", sources_section[:200])
     
     # Extract "Documents used for analysis" section separately
     # This section contains confidence scores per page, so we must preserve it exactly as-is
     if "Documents used for analysis" in answer:
         # Extract the entire "Documents used for analysis" section (preserve confidence scores)
         # Use a more precise pattern to ensure we get everything including confidence scores
-        docs_analysis_match = re.search(r'\n+Documents used for analysis.*$', answer, re.DOTALL)
+        docs_analysis_match = _DOCS_ANALYSIS_RE.search(answer)
         if docs_analysis_match:
             documents_analysis_section = docs_analysis_match.group(0)
             # Verify contribution strength scores are present (check for both old "confidence" and new "contribution strength")
             has_contribution = '(contribution strength:' in documents_analysis_section.lower() or 'contribution strength:' in documents_analysis_section.lower()
             has_confidence = '(confidence:' in documents_analysis_section.lower() or 'confidence:' in documents_analysis_section.lower()
             has_scores = has_contribution or has_confidence
-            logger.info(f"Found 'Documents used for analysis' section (length: {len(documents_analysis_section)}, has_scores: {has_scores}): {documents_analysis_section[:300]}...")
+            logger.info("Found 'Documents used for analysis' section (length: %s, has_scores: %s): %s...", len(documents_analysis_section), has_scores, documents_analysis_section[:300])
             if not has_scores:
                 logger.warning("'Documents used for analysis' section extracted but no contribution strength scores detected!")
     
@@ -548,13 +553,11 @@ def node_citation_pruner(state: GraphState) -> GraphState:
     if "Sources:" in updated_answer:
         # Match Sources section with flexible newline handling (1 or 2 newlines)
         # Stop at "Documents used for analysis" if present
-        sources_pattern = r'\n+Sources:.*?(?=\n+Documents used for analysis|$)'
-        updated_answer = re.sub(sources_pattern, '', updated_answer, flags=re.DOTALL)
+        updated_answer = _SOURCES_SECTION_RE.sub('', updated_answer)
     
     if "Documents used for analysis" in updated_answer:
         # Remove "Documents used for analysis" section (we'll add it back after Sources)
-        docs_analysis_pattern = r'\n+Documents used for analysis.*$'
-        updated_answer = re.sub(docs_analysis_pattern, '', updated_answer, flags=re.DOTALL)
+        updated_answer = _DOCS_ANALYSIS_RE.sub('', updated_answer)
     
     # Add preserved Sources section if we have one
     # Replace [DOC: prefix] with document titles in Sources section
@@ -579,7 +582,7 @@ def node_citation_pruner(state: GraphState) -> GraphState:
                 continue
             
             # Match pattern: "- [B] [DOC: 16a68247]" or "- [B] [DOC:16a68247]"
-            citation_match = re.match(r'^(-\s*\[([A-Z])\]\s*)\[DOC:\s*([a-f0-9]{8})\]\s*$', line, re.IGNORECASE)
+            citation_match = _SOURCE_LINE_RE.match(line)
             if citation_match:
                 prefix = citation_match.group(3).lower()
                 letter_part = citation_match.group(1)  # "- [B] "
@@ -600,12 +603,12 @@ def node_citation_pruner(state: GraphState) -> GraphState:
         updated_answer = updated_answer.rstrip()
         # Add extra spacing before Sources section to make it more visible
         updated_answer += "\n\n" + sources_section_replaced
-        logger.info(f"Added Sources section to final answer (with title replacements). Sources section length: {len(sources_section_replaced)}")
+        logger.info("Added Sources section to final answer (with title replacements). Sources section length: %s", len(sources_section_replaced))
     elif pruned_citations:
         # Fallback: if no Sources section from LLM, use pruned_citations (old behavior)
         updated_answer = updated_answer.rstrip()
         updated_answer += "\n\nSources: " + ", ".join(pruned_citations)
-        logger.info(f"Added fallback Sources section using pruned_citations")
+        logger.info("Added fallback Sources section using pruned_citations")
     else:
         logger.warning("No Sources section to add - sources_section is empty and no pruned_citations available")
     
@@ -621,10 +624,10 @@ def node_citation_pruner(state: GraphState) -> GraphState:
         has_contribution_after = '(contribution strength:' in documents_analysis_clean.lower() or 'contribution strength:' in documents_analysis_clean.lower()
         has_confidence_after = '(confidence:' in documents_analysis_clean.lower() or 'confidence:' in documents_analysis_clean.lower()
         has_scores_after = has_contribution_after or has_confidence_after
-        logger.info(f"Added 'Documents used for analysis' section to final answer. Section length: {len(documents_analysis_clean)}, has_scores: {has_scores_after}")
+        logger.info("Added 'Documents used for analysis' section to final answer. Section length: %s, has_scores: %s", len(documents_analysis_clean), has_scores_after)
         if not has_scores_after:
             logger.error("CRITICAL: 'Documents used for analysis' section added but contribution strength scores missing!")
-            logger.error(f"Section content: {documents_analysis_clean[:500]}")
+            logger.error("Section content: %s", documents_analysis_clean[:500])
     else:
         logger.warning("No 'Documents used for analysis' section to add")
     
@@ -657,23 +660,23 @@ def node_citation_pruner(state: GraphState) -> GraphState:
     if primary_doc_id and primary_doc_id in used_doc_ids:
         result_payload["doc_id"] = primary_doc_id
     
-    logger.info(f"Citation pruning complete: {len(used_doc_ids)} document(s) retained")
-    logger.info(f"Updated answer preview: {updated_answer[:200]}...")
-    logger.info(f"Final answer contains 'Sources:': {'Sources:' in updated_answer}")
-    logger.info(f"Final answer contains 'Documents used for analysis': {'Documents used for analysis' in updated_answer}")
+    logger.info("Citation pruning complete: %s document(s) retained", len(used_doc_ids))
+    logger.info("Updated answer preview: %s...", updated_answer[:200])
+    logger.info("Final answer contains 'Sources:': %s", 'Sources:' in updated_answer)
+    logger.info("Final answer contains 'Documents used for analysis': %s", 'Documents used for analysis' in updated_answer)
     if "Sources:" in updated_answer:
         sources_start = updated_answer.find("Sources:")
-        logger.info(f"Sources section in final answer: {updated_answer[sources_start:sources_start+300]}...")
+        logger.info("Sources section in final answer: %s...", updated_answer[sources_start:sources_start+300])
     if "Documents used for analysis" in updated_answer:
         docs_start = updated_answer.find("Documents used for analysis")
         # Log more of the section to verify confidence scores are present
         docs_section_preview = updated_answer[docs_start:docs_start+500]
-        logger.info(f"'Documents used for analysis' section in final answer (length: {len(updated_answer) - docs_start}): {docs_section_preview}...")
+        logger.info("'Documents used for analysis' section in final answer (length: %s): %s...", len(updated_answer) - docs_start, docs_section_preview)
         # Verify contribution strength scores are in the final answer (check for both old "confidence" and new "contribution strength")
         has_contribution_final = '(contribution strength:' in updated_answer.lower() or 'contribution strength:' in updated_answer.lower()
         has_confidence_final = '(confidence:' in updated_answer.lower() or 'confidence:' in updated_answer.lower()
         has_scores_final = has_contribution_final or has_confidence_final
-        logger.info(f"Contribution strength scores present in final answer: {has_scores_final}")
+        logger.info("Contribution strength scores present in final answer: %s", has_scores_final)
     else:
         logger.warning("'Documents used for analysis' section NOT found in final answer!")
     logger.info("-" * 40)
@@ -2,7 +2,7 @@
 Compressor node: Summarizes retrieved evidence into concise notes.
 """
 import logging
-from inference.graph.state import GraphState
+from inference.graph.state import GraphState, hit_snippet
 from inference.graph.agent_logger import get_agent_logger
 from inference.graph.prompt_templates import format_template
 from inference.llm import call_llm
@@ -11,31 +11,39 @@ logger = logging.getLogger(__name__)
 agent_log = get_agent_logger()
 
 
+def _format_snippet(h: dict) -> str:
+    return f"[p{h['p0']}–{h['p1']}] {hit_snippet(h)}"
+
+
+def _snippets(evidence) -> str:
+    """All evidence snippets joined for the prompt."""
+    return "\n\n".join(_format_snippet(h) for h in evidence)
+
+
 def node_compressor(state: GraphState) -> GraphState:
     logger.info("=" * 80)
     logger.info("GRAPH NODE: Compressor - Summarizing evidence")
     logger.info("=" * 80)
-    logger.info(f"State snapshot:")
-    logger.info(f"  - Iterations: {state.get('iterations', 0)}")
-    logger.info(f"  - Evidence chunks: {len(state.get('evidence', []))}")
-    logger.info(f"  - Cross-doc: {state.get('cross_doc', False)}")
+    logger.info("State snapshot:")
+    logger.info("  - Iterations: %s", state.get('iterations', 0))
+    logger.info("  - Evidence chunks: %s", len(state.get('evidence', [])))
+    logger.info("  - Cross-doc: %s", state.get('cross_doc', False))
     logger.info("-" * 80)
     
     evidence = state.get("evidence", [])
-    logger.info(f"Compressing {len(evidence)} chunks into notes...")
-    
-    # Log document distribution in evidence
-    doc_distribution = {}
-    for h in evidence:
-        doc_id = h.get('doc_id', 'unknown')
-        doc_distribution[doc_id] = doc_distribution.get(doc_id, 0) + 1
+    logger.info("Compressing %s chunks into notes...", len(evidence))
     
-    if doc_distribution:
-        logger.info(f"Evidence distribution across documents:")
+    # Log document distribution in evidence (only counted when INFO is on)
+    if evidence and logger.isEnabledFor(logging.INFO):
+        doc_distribution = {}
+        for h in evidence:
+            doc_id = h.get('doc_id', 'unknown')
+            doc_distribution[doc_id] = doc_distribution.get(doc_id, 0) + 1
+        logger.info("Evidence distribution across documents:")
         for doc_id, count in sorted(doc_distribution.items(), key=lambda x: -x[1]):
-            logger.info(f"  - {doc_id[:8]}...: {count} chunk(s)")
+            logger.info("  - %s...: %s chunk(s)", doc_id[:8], count)
     
-    snippets = "\n\n".join([f"[p{h['p0']}–{h['p1']}] {h['text'][:1200]}" for h in evidence])
+    snippets = _snippets(evidence)
     prompt = format_template(
         "compressor",
         snippets=snippets
@@ -43,8 +51,11 @@ def node_compressor(state: GraphState) -> GraphState:
     notes, _ = call_llm("You compress evidence.", [{"role": "user", "content": prompt}], max_tokens=400, temperature=0.1)
     notes_text = notes.strip()
     
-    logger.info(f"Compressed Notes (length: {len(notes_text)} chars):")
-    logger.info(f"{notes_text[:500]}..." if len(notes_text) > 500 else notes_text)
+    logger.info("Compressed Notes (length: %s chars):", len(notes_text))
+    if len(notes_text) > 500:
+        logger.info("%s...", notes_text[:500])
+    else:
+        logger.info("%s", notes_text)
     logger.info("-" * 80)
     
     # Log compression step
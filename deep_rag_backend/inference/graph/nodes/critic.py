@@ -2,9 +2,9 @@
 Critic node: Evaluates evidence quality and triggers refinement if needed.
 """
 import logging
-import re
 from inference.graph.state import GraphState
 from inference.graph.constants import MAX_ITERS, THRESH
+from inference.graph.scoring import count_strong, critic_confidence, critic_wants_refinement
 from inference.graph.agent_logger import get_agent_logger
 from inference.graph.prompt_templates import format_template
 from inference.llm import call_llm
@@ -12,22 +12,26 @@ from inference.llm import call_llm
 logger = logging.getLogger(__name__)
 agent_log = get_agent_logger()
 
+# Refinement query sanitization (characters that break tsquery parsing):
+# one str.translate pass, '&' spelled out and the rest blanked
+_SANITIZE_TABLE = str.maketrans({'&': ' and ', '!': ' ', '|': ' ', ':': ' ', '*': ' ', '"': ' '})
+
 
 def node_critic(state: GraphState) -> GraphState:
     logger.info("-" * 40)
     logger.info("GRAPH NODE: Critic - Evaluating evidence quality")
-    logger.info(f"State snapshot → iterations={state.get('iterations', 0)}, evidence_chunks={len(state.get('evidence', []))}")
+    logger.info("State snapshot → iterations=%s, evidence_chunks=%s", state.get('iterations', 0), len(state.get('evidence', [])))
     logger.info("-" * 40)
     
     ev = state.get("evidence", [])
-    strong = sum(1 for h in ev if float(h.get("ce", 0.0)) > THRESH or (h.get("lex",0)>0 and h.get("vec",0)>0))
-    conf = min(0.9, 0.4 + 0.1*strong)
+    strong = count_strong(ev)
+    conf = critic_confidence(strong)
 
     result: GraphState = {"confidence": conf, "iterations": state.get("iterations", 0)}
 
-    logger.info(f"Strong chunks: {strong}/{len(ev)}")
-    logger.info(f"Confidence score: {conf:.2f}")
-    logger.info(f"Iterations: {state.get('iterations', 0)}/{MAX_ITERS}")
+    logger.info("Strong chunks: %s/%s", strong, len(ev))
+    logger.info("Confidence score: %.2f", conf)
+    logger.info("Iterations: %s/%s", state.get('iterations', 0), MAX_ITERS)
     
     # Log critic evaluation
     agent_log.log_step(
@@ -43,9 +47,9 @@ def node_critic(state: GraphState) -> GraphState:
     )
 
     # If weak confidence and not at loop cap, propose refinements (sub-queries)
-    if conf < 0.6 and state.get("iterations", 0) < MAX_ITERS:
-        logger.info(f"Confidence {conf:.2f} < 0.6 threshold - Requesting refinement...")
-        logger.info(f"Current iteration: {state.get('iterations', 0)}/{MAX_ITERS}")
+    if critic_wants_refinement(conf, state.get("iterations", 0)):
+        logger.info("Confidence %.2f < 0.6 threshold - Requesting refinement...", conf)
+        logger.info("Current iteration: %s/%s", state.get('iterations', 0), MAX_ITERS)
         
         # Enhanced prompt for multi-document queries
         question = state.get('question', '')
@@ -68,28 +72,25 @@ def node_critic(state: GraphState) -> GraphState:
                 notes=state.get('notes', '')
             )
         
-        refinements, _ = call_llm("You suggest refinements.", [{"role":"user","content":prompt}], max_tokens=120, temperature=0.0)
-        lines = [ln.strip("-• ").strip() for ln in refinements.splitlines() if ln.strip()]
-        # Additional sanitization: remove any remaining special characters
+        # Uncached, like the agents critic: the prompt can repeat across iterations
+        refinements, _ = call_llm("You suggest refinements.", [{"role":"user","content":prompt}], max_tokens=120, temperature=0.0, cache=False)
+        # One pass per line: strip bullets, replace & with "and", blank other
+        # problematic characters, collapse whitespace; keep the first two
         sanitized_lines = []
-        for line in lines:
-            # Remove leading special chars and normalize
-            cleaned = line.strip()
-            # Replace & with "and" if present
-            cleaned = cleaned.replace('&', ' and ')
-            # Remove other problematic characters
-            cleaned = re.sub(r'[\!\|\:\*\"]', ' ', cleaned)
-            cleaned = re.sub(r'\s+', ' ', cleaned).strip()
+        for line in refinements.splitlines():
+            cleaned = " ".join(line.strip("-• ").translate(_SANITIZE_TABLE).split())
             if cleaned:
                 sanitized_lines.append(cleaned)
+                if len(sanitized_lines) == 2:
+                    break
         
-        result["refinements"] = sanitized_lines[:2] if sanitized_lines else []
+        result["refinements"] = sanitized_lines
         result["iterations"] = state.get("iterations", 0) + 1
         
-        logger.info(f"Generated {len(result['refinements'])} refinement(s):")
+        logger.info("Generated %s refinement(s):", len(result['refinements']))
         for i, ref in enumerate(result['refinements'], 1):
-            logger.info(f"  {i}. {ref}")
-        logger.info(f"Next iteration will be: {result['iterations']}/{MAX_ITERS}")
+            logger.info("  %s. %s", i, ref)
+        logger.info("Next iteration will be: %s/%s", result['iterations'], MAX_ITERS)
         logger.info("Routing to refine_retrieve node")
         
         # Log refinement decision
@@ -103,7 +104,7 @@ def node_critic(state: GraphState) -> GraphState:
     else:
         result["refinements"] = []
         if conf >= 0.6:
-            logger.info(f"Confidence {conf:.2f} >= 0.6 - Routing to synthesizer")
+            logger.info("Confidence %.2f >= 0.6 - Routing to synthesizer", conf)
         else:
             logger.warning(
                 "Max iterations (%s) reached. Critic heuristic confidence (0-1 scale): %.2f. "
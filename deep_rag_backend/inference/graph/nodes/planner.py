@@ -2,6 +2,8 @@
 Planner node: Decomposes the question into sub-goals.
 """
 import logging
+import threading
+from typing import Optional
 from inference.graph.state import GraphState
 from inference.graph.agent_logger import get_agent_logger
 from inference.graph.prompt_templates import format_template
@@ -10,24 +12,61 @@ from inference.llm import call_llm
 logger = logging.getLogger(__name__)
 agent_log = get_agent_logger()
 
+_warmup_lock = threading.Lock()
+_warmup_started = False
+_warmup_thread: Optional[threading.Thread] = None
+
+
+def _warm_retrieval() -> None:
+    from retrieval.db_utils import _get_pool
+    try:
+        _get_pool()
+    except Exception as e:
+        # Optimization only: connect() falls back and reports errors on the retrieval path
+        logger.debug("DB pool warm-up failed: %s", e)
+    try:
+        from retrieval.reranker import warmup_reranker
+        warmup_reranker()
+    except Exception as e:
+        # Optimization only: rerank_candidates degrades to unreranked results on its own
+        logger.debug("Reranker warm-up failed: %s", e)
+
+
+def _start_db_pool_warmup() -> None:
+    """
+    Open the retrieval DB pool and load the cross-encoder in the background, once per process.
+
+    The retriever can only start once the plan exists, so the pool's
+    connect/auth round-trips and the reranker's model load overlap the
+    planner LLM call instead of delaying the first retrieval.
+    """
+    global _warmup_started, _warmup_thread
+    with _warmup_lock:
+        if _warmup_started:
+            return
+        _warmup_started = True
+    _warmup_thread = threading.Thread(target=_warm_retrieval, name="retrieval-warmup", daemon=True)
+    _warmup_thread.start()
+
 
 def node_planner(state: GraphState) -> GraphState:
     logger.info("=" * 80)
     logger.info("GRAPH NODE: Planner - Decomposing question into sub-goals")
     logger.info("=" * 80)
-    logger.info(f"State snapshot:")
-    logger.info(f"  - Iterations: {state.get('iterations', 0)}")
-    logger.info(f"  - Cross-doc: {state.get('cross_doc', False)}")
-    logger.info(f"  - Selected doc IDs: {state.get('selected_doc_ids')}")
-    logger.info(f"  - Doc ID: {state.get('doc_id')}")
+    logger.info("State snapshot:")
+    logger.info("  - Iterations: %s", state.get('iterations', 0))
+    logger.info("  - Cross-doc: %s", state.get('cross_doc', False))
+    logger.info("  - Selected doc IDs: %s", state.get('selected_doc_ids'))
+    logger.info("  - Doc ID: %s", state.get('doc_id'))
     logger.info("-" * 80)
-    logger.info(f"Question: {state['question']}")
+    logger.info("Question: %s", state['question'])
     doc_id = state.get('doc_id')
     selected_doc_ids = state.get('selected_doc_ids')
     if selected_doc_ids and len(selected_doc_ids) > 0:
-        logger.info(f"Planning for {len(selected_doc_ids)} selected document(s): {[d[:8] + '...' for d in selected_doc_ids]}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Planning for %s selected document(s): %s", len(selected_doc_ids), [d[:8] + '...' for d in selected_doc_ids])
     elif doc_id:
-        logger.info(f"Planning for specific document: {doc_id[:8]}...")
+        logger.info("Planning for specific document: %s...", doc_id[:8])
     
     # Include doc_id context in prompt if available
     doc_context = ""
@@ -40,10 +79,11 @@ def node_planner(state: GraphState) -> GraphState:
         question=state['question'],
         doc_context=doc_context
     )
+    _start_db_pool_warmup()
     plan, _ = call_llm("You plan tasks.", [{"role": "user", "content": prompt}], max_tokens=200, temperature=0.2)
     plan_text = plan.strip()
     
-    logger.info(f"Generated Plan: {plan_text}")
+    logger.info("Generated Plan: %s", plan_text)
     logger.info("-" * 40)
     
     # Log to agent logger for future training
@@ -1,12 +1,15 @@
 """
 Refine retrieve node: Optional additional retrieve step driven by critic's refinements.
 """
+import contextvars
 import os
 import logging
-from typing import List, Dict, Any
-from inference.graph.state import GraphState
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+from inference.graph.state import GraphState, evidence_hits
 from inference.graph.agent_logger import get_agent_logger
-from retrieval.retrieval import retrieve_hybrid
+from retrieval.retrieval import retrieve_hybrid_batch
+from retrieval.stages.merge import dedup_by_chunk_id
 from dotenv import load_dotenv
 load_dotenv()
 
@@ -14,21 +17,92 @@ logger = logging.getLogger(__name__)
 agent_log = get_agent_logger()
 
 
+def _map_in_context(fn: Callable[[Any], Any], items: List[Any]) -> List[Any]:
+    """
+    fn over items on a thread pool (RETRIEVAL_MAX_WORKERS), results in input order.
+
+    Each call runs in a copy of the caller's context so workers share its turn
+    embedding cache; a single item runs inline.
+    """
+    if len(items) <= 1:
+        return [fn(item) for item in items]
+    max_workers = min(len(items), int(os.getenv("RETRIEVAL_MAX_WORKERS", "4")))
+    contexts = [contextvars.copy_context() for _ in items]
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(lambda ctx, item: ctx.run(fn, item), contexts, items))
+
+
+def _retrieve_refinements(
+    refinements: List[str], k: int, k_lex: int, k_vec: int,
+    doc_ids_to_filter: Optional[List[str]], cross_doc: bool
+) -> List[List[Dict[str, Any]]]:
+    """
+    Hits for each refinement query (in refinement order), scoped to the selected/uploaded documents if any.
+
+    All refinements for a scope go through one retrieve_hybrid_batch call, so
+    their candidates share a single cross-encoder pass.
+    """
+    # If specific documents are selected/uploaded
+    if doc_ids_to_filter and len(doc_ids_to_filter) > 0:
+        # First, retrieve from selected/uploaded documents (concurrently per document)
+        per_doc = _map_in_context(
+            lambda d: retrieve_hybrid_batch(refinements, k, k_lex, k_vec, doc_id=d, cross_doc=False), doc_ids_to_filter
+        )
+        # Per refinement, hits are kept in selection order
+        hit_lists: List[List[Dict[str, Any]]] = []
+        for i in range(len(refinements)):
+            hits = []
+            for doc_id_for_retrieval, doc_lists in zip(doc_ids_to_filter, per_doc):
+                hits.extend(doc_lists[i])
+                logger.info("  Retrieved %s chunks from document: %s...", len(doc_lists[i]), doc_id_for_retrieval[:8])
+            hit_lists.append(hits)
+        
+        if cross_doc:
+            # Supplement refinements with limited coverage with cross-doc retrieval
+            limited = [i for i, hits in enumerate(hit_lists) if len(hits) < 12]
+            if limited:
+                doc_ids_set = set(doc_ids_to_filter)
+                cross_doc_lists = retrieve_hybrid_batch(
+                    [refinements[i] for i in limited], k, k_lex, k_vec, doc_id=None, cross_doc=True
+                )
+                for i, cross_doc_hits in zip(limited, cross_doc_lists):
+                    logger.info("  Limited coverage (%s chunks) - supplementing with cross-doc retrieval", len(hit_lists[i]))
+                    # Filter to exclude chunks from already-retrieved documents
+                    cross_doc_hits_filtered = [h for h in cross_doc_hits if h.get('doc_id') not in doc_ids_set]
+                    hit_lists[i].extend(cross_doc_hits_filtered)
+                    logger.info("  Added %s chunks from cross-doc retrieval", len(cross_doc_hits_filtered))
+            # cross_doc=True: Allow hits from selected/uploaded docs AND cross-doc hits
+            for hits in hit_lists:
+                logger.info("  Retrieved %s chunks (prioritized from selected/uploaded docs, supplemented with cross-doc)", len(hits))
+        else:
+            # cross_doc=False: Only allow hits from selected/uploaded documents
+            doc_ids_set = set(doc_ids_to_filter)
+            for i, hits in enumerate(hit_lists):
+                hit_lists[i] = [h for h in hits if h.get('doc_id') in doc_ids_set]
+                logger.info("  Retrieved %s chunks (filtered to selected/uploaded documents only)", len(hit_lists[i]))
+        return hit_lists
+    
+    hit_lists = retrieve_hybrid_batch(refinements, k, k_lex, k_vec, doc_id=None, cross_doc=cross_doc)
+    for hits in hit_lists:
+        logger.info("  Retrieved %s chunks", len(hits))
+    return hit_lists
+
+
 def node_refine_retrieve(state: GraphState) -> GraphState:
     """Optional additional retrieve step driven by critic's refinements."""
     logger.info("=" * 80)
     logger.info("GRAPH NODE: Refine Retriever - Fetching additional chunks from refinements")
     logger.info("=" * 80)
-    logger.info(f"State snapshot:")
-    logger.info(f"  - Iterations: {state.get('iterations', 0)}")
-    logger.info(f"  - Pending refinements: {len(state.get('refinements', []))}")
-    logger.info(f"  - Current evidence: {len(state.get('evidence', []))} chunks")
-    logger.info(f"  - Cross-doc: {state.get('cross_doc', False)}")
+    logger.info("State snapshot:")
+    logger.info("  - Iterations: %s", state.get('iterations', 0))
+    logger.info("  - Pending refinements: %s", len(state.get('refinements', [])))
+    logger.info("  - Current evidence: %s chunks", len(state.get('evidence', [])))
+    logger.info("  - Cross-doc: %s", state.get('cross_doc', False))
     logger.info("-" * 80)
     k: int = int(os.getenv('K_RETRIEVER', '12'))
     k_lex: int = int(os.getenv('K_LEX', '72'))
     k_vec: int = int(os.getenv('K_VEC', '72'))
-    logger.info(f"Refine Retrieval Parameters: k={k}, k_lex={k_lex}, k_vec={k_vec}")
+    logger.info("Refine Retrieval Parameters: k=%s, k_lex=%s, k_vec=%s", k, k_lex, k_vec)
     
     refinements = state.get("refinements", [])
     if not refinements:
@@ -36,9 +110,9 @@ def node_refine_retrieve(state: GraphState) -> GraphState:
         logger.info("-" * 80)
         return {}
     
-    logger.info(f"Processing {len(refinements)} refinement queries:")
+    logger.info("Processing %s refinement queries:", len(refinements))
     for i, ref in enumerate(refinements, 1):
-        logger.info(f"  {i}. {ref}")
+        logger.info("  %s. %s", i, ref)
     
     doc_id = state.get('doc_id')
     selected_doc_ids = state.get('selected_doc_ids')
@@ -53,9 +127,9 @@ def node_refine_retrieve(state: GraphState) -> GraphState:
     # We don't force cross_doc=False here - we respect the user's cross_doc setting
     if uploaded_doc_ids and len(uploaded_doc_ids) > 0:
         if cross_doc:
-            logger.info(f"🔄 uploaded_doc_ids present in refine_retrieve ({len(uploaded_doc_ids)} document(s)) with cross_doc=True - will prioritize attached docs but allow cross-doc")
+            logger.info("🔄 uploaded_doc_ids present in refine_retrieve (%s document(s)) with cross_doc=True - will prioritize attached docs but allow cross-doc", len(uploaded_doc_ids))
         else:
-            logger.info(f"🔒 uploaded_doc_ids present in refine_retrieve ({len(uploaded_doc_ids)} document(s)) with cross_doc=False - will scope to ONLY attached documents")
+            logger.info("🔒 uploaded_doc_ids present in refine_retrieve (%s document(s)) with cross_doc=False - will scope to ONLY attached documents", len(uploaded_doc_ids))
     
     # CRITICAL FIX: If specific documents are selected or uploaded, query those documents (ignore cross_doc flag)
     # cross_doc flag only applies when no specific documents are selected or uploaded
@@ -85,65 +159,29 @@ def node_refine_retrieve(state: GraphState) -> GraphState:
         if cross_doc:
             # HYBRID MODE: Prioritize selected/uploaded docs but allow cross-doc
             if len(doc_ids_to_filter) > 1:
-                logger.info(f"Refinement queries will prioritize {len(doc_ids_to_filter)} specific document(s) with cross-doc enabled")
+                logger.info("Refinement queries will prioritize %s specific document(s) with cross-doc enabled", len(doc_ids_to_filter))
             else:
-                logger.info(f"Refinement queries will prioritize specific document: {doc_ids_to_filter[0][:8]}... with cross-doc enabled")
+                logger.info("Refinement queries will prioritize specific document: %s... with cross-doc enabled", doc_ids_to_filter[0][:8])
         else:
             # Scoped mode: Only query selected/uploaded documents
             if len(doc_ids_to_filter) > 1:
-                logger.info(f"Refinement queries will target {len(doc_ids_to_filter)} specific document(s) (cross_doc disabled)")
+                logger.info("Refinement queries will target %s specific document(s) (cross_doc disabled)", len(doc_ids_to_filter))
             else:
-                logger.info(f"Refinement queries will target specific document: {doc_ids_to_filter[0][:8]}... (cross_doc disabled)")
+                logger.info("Refinement queries will target specific document: %s... (cross_doc disabled)", doc_ids_to_filter[0][:8])
     else:
-        doc_id_for_retrieval = None
-        cross_doc_for_retrieval = cross_doc
         if cross_doc:
             logger.info("Refinement queries will use cross-document search (no specific documents selected)")
     
-    for idx, rq in enumerate(refinements, 1):
-        logger.info(f"Refinement {idx}/{len(refinements)}: {rq}")
-        # If specific documents are selected/uploaded
-        if doc_ids_to_filter and len(doc_ids_to_filter) > 0:
-            hits = []
-            # First, retrieve from selected/uploaded documents
-            for doc_id_for_retrieval in doc_ids_to_filter:
-                doc_hits = retrieve_hybrid(rq, k, k_lex, k_vec, doc_id=doc_id_for_retrieval, cross_doc=False)
-                hits.extend(doc_hits)
-                logger.info(f"  Retrieved {len(doc_hits)} chunks from document: {doc_id_for_retrieval[:8]}...")
-            
-            # If cross_doc=True and we have limited coverage, supplement with cross-doc retrieval
-            if cross_doc and len(hits) < 12:
-                logger.info(f"  Limited coverage ({len(hits)} chunks) - supplementing with cross-doc retrieval")
-                cross_doc_hits = retrieve_hybrid(rq, k, k_lex, k_vec, doc_id=None, cross_doc=True)
-                # Filter to exclude chunks from already-retrieved documents
-                doc_ids_set = set(doc_ids_to_filter)
-                cross_doc_hits_filtered = [h for h in cross_doc_hits if h.get('doc_id') not in doc_ids_set]
-                hits.extend(cross_doc_hits_filtered)
-                logger.info(f"  Added {len(cross_doc_hits_filtered)} chunks from cross-doc retrieval")
-        else:
-            hits = retrieve_hybrid(rq, k, k_lex, k_vec, doc_id=None, cross_doc=cross_doc)
-        
-        # Filter hits based on cross_doc setting
-        if doc_ids_to_filter and len(doc_ids_to_filter) > 0:
-            if cross_doc:
-                # cross_doc=True: Allow hits from selected/uploaded docs AND cross-doc hits
-                # (hits already include both from the logic above)
-                logger.info(f"  Retrieved {len(hits)} chunks (prioritized from selected/uploaded docs, supplemented with cross-doc)")
-            else:
-                # cross_doc=False: Only allow hits from selected/uploaded documents
-                doc_ids_set = set(doc_ids_to_filter)
-                hits = [h for h in hits if h.get('doc_id') in doc_ids_set]
-                logger.info(f"  Retrieved {len(hits)} chunks (filtered to selected/uploaded documents only)")
-        else:
-            logger.info(f"  Retrieved {len(hits)} chunks")
-        
+    # Refinement queries are independent: retrieved as one batch (concurrent
+    # candidate fetches, one rerank pass); results are consumed in refinement order
+    hit_lists = _retrieve_refinements(refinements, k, k_lex, k_vec, doc_ids_to_filter, cross_doc)
+    
+    for idx, (rq, hits) in enumerate(zip(refinements, hit_lists), 1):
+        logger.info("Refinement %s/%s: %s (%s chunks)", idx, len(refinements), rq, len(hits))
         hits_all.extend(hits)
         
         # Track doc_ids from refinement retrieval
-        for hit in hits:
-            hit_doc_id = hit.get('doc_id')
-            if hit_doc_id:
-                doc_ids_found.add(hit_doc_id)
+        doc_ids_found.update(h['doc_id'] for h in hits if h.get('doc_id'))
         
         # Log each refinement query
         agent_log.log_step(
@@ -151,33 +189,30 @@ def node_refine_retrieve(state: GraphState) -> GraphState:
             action="refine_query",
             query=rq,
             num_chunks=len(hits),
-            pages=sorted(set([h.get('p0', 0) for h in hits]))
+            pages=sorted({h.get('p0', 0) for h in hits})
         )
     
-    logger.info(f"Retrieved {len(hits_all)} additional chunks from refinements")
+    logger.info("Retrieved %s additional chunks from refinements", len(hits_all))
     
-    # Log retrieved chunks with text preview
-    for i, hit in enumerate(hits_all[:5], 1):
-        logger.info(f"  Refinement [{i}] Pages: {hit.get('p0', 'N/A')}-{hit.get('p1', 'N/A')}")
-        text_preview = hit.get('text', '')[:250] if hit.get('text') else 'N/A'
-        logger.info(f"      Text preview: {text_preview}...")
+    # Log retrieved chunks with text preview (skipped entirely when INFO is off)
+    if logger.isEnabledFor(logging.INFO):
+        for i, hit in enumerate(hits_all[:5], 1):
+            logger.info("  Refinement [%s] Pages: %s-%s", i, hit.get('p0', 'N/A'), hit.get('p1', 'N/A'))
+            text_preview = hit.get('text', '')[:250] if hit.get('text') else 'N/A'
+            logger.info("      Text preview: %s...", text_preview)
     
     # Merge with existing evidence
-    seen, merged = set(), []
-    for h in (state.get("evidence", []) + hits_all):
-        if h["chunk_id"] in seen:
-            continue
-        seen.add(h["chunk_id"]); merged.append(h)
+    merged = dedup_by_chunk_id(state.get("evidence", []), evidence_hits(hits_all))
     
-    logger.info(f"Total evidence after merge: {len(merged)} chunks")
+    logger.info("Total evidence after merge: %s chunks", len(merged))
     
     # Update doc_ids in state
-    if doc_ids_found:
-        logger.info(f"Found {len(doc_ids_found)} document(s) in refinement retrieval: {[d + '...' for d in doc_ids_found]}")
+    if doc_ids_found and logger.isEnabledFor(logging.INFO):
+        logger.info("Found %s document(s) in refinement retrieval: %s", len(doc_ids_found), [d + '...' for d in doc_ids_found])
     
     # Log page distribution after merge
-    pages_found = sorted(set([h.get('p0', 0) for h in merged]))
-    logger.info(f"Pages represented after merge: {pages_found}")
+    pages_found = sorted({h.get('p0', 0) for h in merged})
+    logger.info("Pages represented after merge: %s", pages_found)
     logger.info("Routing back to compressor for re-compression")
     logger.info("-" * 40)
     
@@ -2,9 +2,12 @@
 Retriever node: Fetches relevant chunks from the vector database.
 """
 import logging
-from inference.graph.state import GraphState
+from inference.graph.state import GraphState, evidence_hits
 from inference.graph.agent_logger import get_agent_logger
+from inference.graph.constants import EARLY_ACCEPT_STRONG
+from inference.graph.scoring import count_strong, critic_confidence
 from retrieval.retrieval import retrieve_hybrid
+from retrieval.stages.merge import dedup_by_chunk_id
 from retrieval.document_structure import retrieve_by_document_structure
 import os
 
@@ -40,9 +43,9 @@ def node_retriever(state: GraphState) -> GraphState:
     # We don't force cross_doc=False here - we respect the user's cross_doc setting
     if uploaded_doc_ids and len(uploaded_doc_ids) > 0:
         if cross_doc:
-            logger.info(f"🔄 uploaded_doc_ids present ({len(uploaded_doc_ids)} document(s)) with cross_doc=True - will prioritize attached docs but allow cross-doc")
+            logger.info("🔄 uploaded_doc_ids present (%s document(s)) with cross_doc=True - will prioritize attached docs but allow cross-doc", len(uploaded_doc_ids))
         else:
-            logger.info(f"🔒 uploaded_doc_ids present ({len(uploaded_doc_ids)} document(s)) with cross_doc=False - will scope to ONLY attached documents")
+            logger.info("🔒 uploaded_doc_ids present (%s document(s)) with cross_doc=False - will scope to ONLY attached documents", len(uploaded_doc_ids))
     
     # CRITICAL: If cross_doc=False and selected_doc_ids is explicitly empty (user deselected all), return empty
     # Check this FIRST before determining doc_ids_to_filter
@@ -60,7 +63,7 @@ def node_retriever(state: GraphState) -> GraphState:
     # Start with selected_doc_ids if provided
     if selected_doc_ids and len(selected_doc_ids) > 0:
         doc_ids_to_filter = list(selected_doc_ids)  # Make a copy to avoid modifying original
-        logger.info(f"Starting with {len(doc_ids_to_filter)} selected document(s)")
+        logger.info("Starting with %s selected document(s)", len(doc_ids_to_filter))
     
     # Add uploaded_doc_ids if provided (attached documents)
     if uploaded_doc_ids and len(uploaded_doc_ids) > 0:
@@ -69,22 +72,22 @@ def node_retriever(state: GraphState) -> GraphState:
         for uploaded_id in uploaded_doc_ids:
             if uploaded_id not in doc_ids_to_filter:
                 doc_ids_to_filter.append(uploaded_id)
-        logger.info(f"Added {len(uploaded_doc_ids)} uploaded document(s), total: {len(doc_ids_to_filter)} document(s)")
+        logger.info("Added %s uploaded document(s), total: %s document(s)", len(uploaded_doc_ids), len(doc_ids_to_filter))
     
     # Add doc_id if provided and not already included
     if doc_id:
         if doc_ids_to_filter is None:
             doc_ids_to_filter = [doc_id]
-            logger.info(f"Using doc_id: {doc_id[:8]}...")
+            logger.info("Using doc_id: %s...", doc_id[:8])
         elif doc_id not in doc_ids_to_filter:
             doc_ids_to_filter.append(doc_id)
-            logger.info(f"Combining with doc_id: {len(doc_ids_to_filter)} document(s) total")
+            logger.info("Combining with doc_id: %s document(s) total", len(doc_ids_to_filter))
     
     if doc_ids_to_filter:
         if len(doc_ids_to_filter) > 1:
-            logger.info(f"Multi-document selection: {len(doc_ids_to_filter)} document(s)")
+            logger.info("Multi-document selection: %s document(s)", len(doc_ids_to_filter))
         else:
-            logger.info(f"Filtering to document: {doc_ids_to_filter[0][:8]}...")
+            logger.info("Filtering to document: %s...", doc_ids_to_filter[0][:8])
     
     # CRITICAL: If cross_doc=False and no doc_ids_to_filter (no documents specified), return empty
     # Only search all documents when cross_doc=True
@@ -94,7 +97,7 @@ def node_retriever(state: GraphState) -> GraphState:
         result["doc_ids"] = []
         return result
     
-    logger.info(f"Retrieval parameters: k={os.getenv('K_RETRIEVER', '10')}, k_lex={os.getenv('K_LEX', '60')}, k_vec={os.getenv('K_VEC', '60')}")
+    logger.info("Retrieval parameters: k=%s, k_lex=%s, k_vec=%s", os.getenv('K_RETRIEVER', '10'), os.getenv('K_LEX', '60'), os.getenv('K_VEC', '60'))
     k = int(os.getenv('K_RETRIEVER', '8'))
     k_lex = int(os.getenv('K_LEX', '60'))
     k_vec = int(os.getenv('K_VEC', '60'))
@@ -104,16 +107,16 @@ def node_retriever(state: GraphState) -> GraphState:
     # - Prioritize selected documents (retrieve more from them)
     # - But still allow cross-doc retrieval for supplementary context
     if cross_doc and doc_ids_to_filter and len(doc_ids_to_filter) > 0:
-        logger.info(f"HYBRID MODE: Cross-doc enabled with {len(doc_ids_to_filter)} selected document(s)")
+        logger.info("HYBRID MODE: Cross-doc enabled with %s selected document(s)", len(doc_ids_to_filter))
         logger.info("  Strategy: Prioritize selected docs, supplement with cross-doc if needed")
         
         # First, retrieve from selected documents (higher k for better coverage)
         selected_hits = []
         for selected_doc in doc_ids_to_filter:
-            logger.info(f"  Retrieving from selected document: {selected_doc[:8]}...")
+            logger.info("  Retrieving from selected document: %s...", selected_doc[:8])
             doc_hits = retrieve_hybrid(q, k, k_lex, k_vec, doc_id=selected_doc, cross_doc=False)
             selected_hits.extend(doc_hits)
-            logger.info(f"    Found {len(doc_hits)} chunks via similarity search")
+            logger.info("    Found %s chunks via similarity search", len(doc_hits))
             
             # Check if similarity is poor and supplement with structure-based retrieval
             has_good_similarity = any(
@@ -123,13 +126,14 @@ def node_retriever(state: GraphState) -> GraphState:
                 for h in doc_hits
             )
             
-            logger.info(f"    Similarity check: has_good_similarity={has_good_similarity}, "
-                       f"top_scores: ce={max((h.get('ce', 0) for h in doc_hits), default=0):.3f}, "
-                       f"vec={max((h.get('vec', 0) for h in doc_hits), default=0):.3f}, "
-                       f"lex={max((h.get('lex', 0) for h in doc_hits), default=0):.3f}")
+            logger.info("    Similarity check: has_good_similarity=%s, top_scores: ce=%.3f, vec=%.3f, lex=%.3f",
+                        has_good_similarity,
+                        max((h.get('ce', 0) for h in doc_hits), default=0),
+                        max((h.get('vec', 0) for h in doc_hits), default=0),
+                        max((h.get('lex', 0) for h in doc_hits), default=0))
             
             if not has_good_similarity:
-                logger.info(f"    Similarity results poor - supplementing with structure-based retrieval")
+                logger.info("    Similarity results poor - supplementing with structure-based retrieval")
                 structure_hits = retrieve_by_document_structure(
                     doc_id=selected_doc,
                     max_chunks=15,
@@ -142,9 +146,10 @@ def node_retriever(state: GraphState) -> GraphState:
                     if struct_hit["chunk_id"] not in seen_chunk_ids:
                         selected_hits.append(struct_hit)
                         seen_chunk_ids.add(struct_hit["chunk_id"])
-                        logger.debug(f"      Added structure chunk: page {struct_hit.get('p0')}")
+                        logger.debug("      Added structure chunk: page %s", struct_hit.get('p0'))
                 
-                logger.info(f"    Total after structure supplement: {len([h for h in selected_hits if h.get('doc_id') == selected_doc])} chunks")
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("    Total after structure supplement: %s chunks", sum(1 for h in selected_hits if h.get('doc_id') == selected_doc))
         
         # Remove duplicates from selected hits
         seen_selected = set()
@@ -154,7 +159,7 @@ def node_retriever(state: GraphState) -> GraphState:
                 seen_selected.add(h["chunk_id"])
                 unique_selected_hits.append(h)
         
-        logger.info(f"  Total from selected documents: {len(unique_selected_hits)} unique chunks")
+        logger.info("  Total from selected documents: %s unique chunks", len(unique_selected_hits))
         
         # If we have good coverage from selected docs, use them
         # Otherwise, supplement with cross-doc retrieval
@@ -162,7 +167,7 @@ def node_retriever(state: GraphState) -> GraphState:
             logger.info("  Sufficient coverage from selected documents - using them")
             hits = unique_selected_hits[:20]  # Cap at 20 for consistency
         else:
-            logger.info(f"  Limited coverage ({len(unique_selected_hits)} chunks) - supplementing with cross-doc")
+            logger.info("  Limited coverage (%s chunks) - supplementing with cross-doc", len(unique_selected_hits))
             # Retrieve from all documents to supplement
             cross_doc_hits = retrieve_hybrid(q, k, k_lex, k_vec, doc_id=None, cross_doc=True)
             
@@ -183,16 +188,16 @@ def node_retriever(state: GraphState) -> GraphState:
                     merged_hits.append(h)
             
             hits = merged_hits
-            logger.info(f"  Merged result: {len(hits)} chunks ({len(unique_selected_hits)} from selected, {len(hits) - len(unique_selected_hits)} from cross-doc)")
+            logger.info("  Merged result: %s chunks (%s from selected, %s from cross-doc)", len(hits), len(unique_selected_hits), len(hits) - len(unique_selected_hits))
     elif doc_ids_to_filter and len(doc_ids_to_filter) > 0:
         # Force retrieval strictly within selected documents when cross_doc=False
         logger.info("Selective retrieval mode: restricting search to explicitly selected documents")
         all_hits = []
         for doc in doc_ids_to_filter:
-            logger.info(f"  Retrieving from selected document: {doc[:8]}...")
+            logger.info("  Retrieving from selected document: %s...", doc[:8])
             doc_hits = retrieve_hybrid(q, k, k_lex, k_vec, doc_id=doc, cross_doc=False)
             all_hits.extend(doc_hits)
-            logger.info(f"    Found {len(doc_hits)} chunks via similarity search")
+            logger.info("    Found %s chunks via similarity search", len(doc_hits))
             
             # ENHANCEMENT: For explicit document selection with ambiguous queries,
             # supplement with structure-based retrieval if similarity results are poor
@@ -210,17 +215,18 @@ def node_retriever(state: GraphState) -> GraphState:
             )
             
             # Log similarity check for debugging
-            logger.info(f"    Similarity check: has_good_similarity={has_good_similarity}, "
-                       f"top_scores: ce={max((h.get('ce', 0) for h in doc_hits), default=0):.3f}, "
-                       f"vec={max((h.get('vec', 0) for h in doc_hits), default=0):.3f}, "
-                       f"lex={max((h.get('lex', 0) for h in doc_hits), default=0):.3f}")
+            logger.info("    Similarity check: has_good_similarity=%s, top_scores: ce=%.3f, vec=%.3f, lex=%.3f",
+                        has_good_similarity,
+                        max((h.get('ce', 0) for h in doc_hits), default=0),
+                        max((h.get('vec', 0) for h in doc_hits), default=0),
+                        max((h.get('lex', 0) for h in doc_hits), default=0))
             
             # If similarity is poor, supplement with structure-based retrieval
             # Changed condition: trigger structure-based retrieval if similarity is poor, regardless of chunk count
             # This is critical for ambiguous queries like "share details about this document"
             # where similarity search may return many chunks but with poor scores
             if not has_good_similarity:
-                logger.info(f"    Similarity results poor (has_good_similarity=False) - supplementing with structure-based retrieval")
+                logger.info("    Similarity results poor (has_good_similarity=False) - supplementing with structure-based retrieval")
                 structure_hits = retrieve_by_document_structure(
                     doc_id=doc,
                     max_chunks=15,  # Get more chunks for document analysis
@@ -233,22 +239,21 @@ def node_retriever(state: GraphState) -> GraphState:
                     if struct_hit["chunk_id"] not in seen_chunk_ids:
                         all_hits.append(struct_hit)
                         seen_chunk_ids.add(struct_hit["chunk_id"])
-                        logger.debug(f"      Added structure chunk: page {struct_hit.get('p0')}")
+                        logger.debug("      Added structure chunk: page %s", struct_hit.get('p0'))
                 
-                logger.info(f"    Total after structure supplement: {len([h for h in all_hits if h.get('doc_id') == doc])} chunks")
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("    Total after structure supplement: %s chunks", sum(1 for h in all_hits if h.get('doc_id') == doc))
 
         # Deduplicate chunk hits and filter to only selected documents (safety check)
-        seen = set()
-        hits = []
         doc_ids_set = set(doc_ids_to_filter)
+        restricted = {}  # chunk_id -> first hit, in retrieval order
         for h in all_hits:
-            if h["chunk_id"] not in seen:
-                hit_doc_id = h.get('doc_id')
-                # Only include chunks from selected documents
-                if hit_doc_id and hit_doc_id in doc_ids_set:
-                    seen.add(h["chunk_id"])
-                    hits.append(h)
-        logger.info(f"  Total restricted hits: {len(hits)} chunks from {len(doc_ids_to_filter)} documents")
+            hit_doc_id = h.get('doc_id')
+            # Only include chunks from selected documents
+            if hit_doc_id and hit_doc_id in doc_ids_set:
+                restricted.setdefault(h["chunk_id"], h)
+        hits = list(restricted.values())
+        logger.info("  Total restricted hits: %s chunks from %s documents", len(hits), len(doc_ids_to_filter))
     else:
         # Single document or cross-doc query without explicit selection
         doc_id_for_retrieval = None
@@ -259,36 +264,30 @@ def node_retriever(state: GraphState) -> GraphState:
         hits = retrieve_hybrid(q, k=20, k_lex=100, k_vec=100, doc_id=doc_id_for_retrieval, cross_doc=cross_doc_for_retrieval)
 
     # Merge with any prior evidence (e.g., from refinement loops)
-    seen, merged = set(), []
-    for h in (state.get("evidence", []) + hits):
-        if h["chunk_id"] in seen:
-            continue
-        seen.add(h["chunk_id"]); merged.append(h)
+    merged = dedup_by_chunk_id(state.get("evidence", []), evidence_hits(hits))
     
     # Track all doc_ids from retrieved chunks
-    doc_ids_found = set()
-    for hit in merged:
-        hit_doc_id = hit.get('doc_id')
-        if hit_doc_id:
-            doc_ids_found.add(hit_doc_id)
+    doc_ids_found = {h['doc_id'] for h in merged if h.get('doc_id')}
     
-    if doc_ids_found:
-        logger.info(f"Found {len(doc_ids_found)} document(s) in retrieved chunks: {[d + '...' for d in doc_ids_found]}")
+    if doc_ids_found and logger.isEnabledFor(logging.INFO):
+        logger.info("Found %s document(s) in retrieved chunks: %s", len(doc_ids_found), [d + '...' for d in doc_ids_found])
     
-    logger.info(f"Retrieved {len(hits)} new chunks, {len(merged)} total after merge")
-    for i, hit in enumerate(merged[:10], 1):  # Log top 10 for better visibility
-        logger.info(f"  [{i}] Chunk ID: {hit.get('chunk_id', 'N/A')[:8]}...")
-        logger.info(f"      Pages: {hit.get('p0', 'N/A')}-{hit.get('p1', 'N/A')}")
-        logger.info(f"      Content Type: {hit.get('content_type', 'N/A')}")
-        logger.info(f"      Scores: lex={hit.get('lex', 0):.4f}, vec={hit.get('vec', 0):.4f}, ce={hit.get('ce', 0):.4f}")
-        # Show text preview (first 200 chars) to understand what was retrieved
-        text_preview = hit.get('text', '')[:200] if hit.get('text') else 'N/A'
-        logger.info(f"      Text preview: {text_preview}...")
-    if len(merged) > 10:
-        logger.info(f"  ... and {len(merged) - 10} more chunks")
+    logger.info("Retrieved %s new chunks, %s total after merge", len(hits), len(merged))
+    # Per-hit previews slice/format every hit; skip them entirely when INFO is off
+    if logger.isEnabledFor(logging.INFO):
+        for i, hit in enumerate(merged[:10], 1):  # Log top 10 for better visibility
+            logger.info("  [%s] Chunk ID: %s...", i, hit.get('chunk_id', 'N/A')[:8])
+            logger.info("      Pages: %s-%s", hit.get('p0', 'N/A'), hit.get('p1', 'N/A'))
+            logger.info("      Content Type: %s", hit.get('content_type', 'N/A'))
+            logger.info("      Scores: lex=%.4f, vec=%.4f, ce=%.4f", hit.get('lex', 0), hit.get('vec', 0), hit.get('ce', 0))
+            # Show text preview (first 200 chars) to understand what was retrieved
+            text_preview = hit.get('text', '')[:200] if hit.get('text') else 'N/A'
+            logger.info("      Text preview: %s...", text_preview)
+        if len(merged) > 10:
+            logger.info("  ... and %s more chunks", len(merged) - 10)
     # Log page distribution to see if all pages are represented
-    pages_found = sorted(set([h.get('p0', 0) for h in merged]))
-    logger.info(f"Pages represented in retrieved chunks: {pages_found}")
+    pages_found = sorted({h.get('p0', 0) for h in merged})
+    logger.info("Pages represented in retrieved chunks: %s", pages_found)
     logger.info("-" * 40)
     
     # Log to agent logger with detailed retrieval info
@@ -321,5 +320,21 @@ def node_retriever(state: GraphState) -> GraphState:
     result = {"evidence": merged}
     # Always include doc_ids, even if empty
     result["doc_ids"] = list(doc_ids_found) if doc_ids_found else []
+    
+    # Early accept: enough strong chunks that the critic would pass them anyway
+    if EARLY_ACCEPT_STRONG > 0:
+        strong = count_strong(merged)
+        result["strong_chunks"] = strong
+        if strong >= EARLY_ACCEPT_STRONG:
+            # What the critic would report, for the synthesizer's confidence gate
+            result["confidence"] = critic_confidence(strong)
+            result["refinements"] = []
+            logger.info("Early accept: %s strong chunks (>= %s) - routing directly to synthesizer", strong, EARLY_ACCEPT_STRONG)
+            agent_log.log_step(
+                node="retriever",
+                action="early_accept",
+                confidence=result["confidence"],
+                metadata={"strong_chunks": strong, "threshold": EARLY_ACCEPT_STRONG}
+            )
     return result
 
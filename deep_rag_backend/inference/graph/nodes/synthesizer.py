@@ -19,8 +19,10 @@ from typing import (
 )
 
 from inference.graph.agent_logger import get_agent_logger
-from inference.graph.state import GraphState
+from inference.graph.state import GraphState, hit_snippet
+from inference.graph.constants import SYNTH_MIN_CONFIDENCE
 from inference.graph.prompt_templates import format_template
+from inference.graph.streaming import current_token_sink, stream_llm_to_sink
 from inference.llm import call_llm
 from retrieval.confidence import get_confidence_for_chunks
 from retrieval.db_utils import get_document_title
@@ -160,12 +162,14 @@ def node_synthesizer(state: GraphState) -> GraphState:
         return f"p{start}"
 
     evidence = state.get("evidence") or []
-    logger.info(f"Total chunks retrieved: {len(evidence)}")
+    logger.info("Total chunks retrieved: %s", len(evidence))
 
-    for idx, chunk in enumerate(evidence):
-        doc_ref = chunk.get("doc_id")
-        preview = str(chunk.get("text", ""))[:80].replace("\n", " ")
-        logger.info(f"  Chunk {idx}: doc={doc_ref if doc_ref else 'None'} preview={preview}...")
+    # One preview line per evidence chunk; skip building them when INFO is off
+    if logger.isEnabledFor(logging.INFO):
+        for idx, chunk in enumerate(evidence):
+            doc_ref = chunk.get("doc_id")
+            preview = str(chunk.get("text", ""))[:80].replace("\n", " ")
+            logger.info("  Chunk %s: doc=%s preview=%s...", idx, doc_ref if doc_ref else 'None', preview)
 
     selected_doc_ids = _normalize_doc_ids(state.get("selected_doc_ids"))
     uploaded_doc_ids = _normalize_doc_ids(state.get("uploaded_doc_ids"))
@@ -175,9 +179,33 @@ def node_synthesizer(state: GraphState) -> GraphState:
     doc_id = str(raw_doc_id) if raw_doc_id else None
 
     if doc_id:
-        logger.info(f"Primary document requested: {doc_id}")
+        logger.info("Primary document requested: %s", doc_id)
 
     question_text = state.get("question", "") or ""
+
+    # Fast path: the critic found no strong chunk and no document was pinned by the user,
+    # so the confidence gate below would abstain anyway - skip the LLM call entirely
+    critic_conf = state.get("confidence")
+    if critic_conf is not None and critic_conf < SYNTH_MIN_CONFIDENCE and not explicit_docs:
+        logger.info("Critic confidence %.2f < %.2f - abstaining without LLM call", critic_conf, SYNTH_MIN_CONFIDENCE)
+        agent_log.log_step(
+            node="synthesizer",
+            action="abstain_low_critic_confidence",
+            question=question_text,
+            num_chunks=len(evidence),
+            confidence=critic_conf,
+            iterations=state.get("iterations", 0),
+            metadata={"threshold": SYNTH_MIN_CONFIDENCE}
+        )
+        low_conf_result: Dict[str, Any] = {
+            "answer": "I don't know.",
+            "confidence": 0.0,
+            "action": "abstain",
+            "doc_ids": [],
+            "pages": [],
+        }
+        return cast(GraphState, low_conf_result)
+
     doc_stats: Dict[str, DocumentStats] = {}
     doc_aliases: Dict[str, Set[str]] = defaultdict(set)
     doc_order: List[str] = []
@@ -209,7 +237,7 @@ def node_synthesizer(state: GraphState) -> GraphState:
             if isinstance(alias_value, str) and alias_value.strip():
                 doc_aliases[doc_ref].add(alias_value.strip())
 
-    logger.info(f"Document stats collected: {len(doc_stats)} document(s)")
+    logger.info("Document stats collected: %s document(s)", len(doc_stats))
     for doc_ref, stats in doc_stats.items():
         logger.info(
             "  Doc %s: count=%s, score=%.4f, pages=%s",
@@ -223,11 +251,11 @@ def node_synthesizer(state: GraphState) -> GraphState:
     if not ctx_evs:
         logger.warning("=" * 60)
         logger.warning("SYNTHESIZER: No context chunks available - abstaining")
-        logger.warning(f"Total evidence chunks: {len(evidence)}")
-        logger.warning(f"Selected doc IDs: {selected_doc_ids}")
-        logger.warning(f"Evidence chunks detail:")
+        logger.warning("Total evidence chunks: %s", len(evidence))
+        logger.warning("Selected doc IDs: %s", selected_doc_ids)
+        logger.warning("Evidence chunks detail:")
         for idx, chunk in enumerate(evidence):
-            logger.warning(f"  Chunk {idx}: doc_id={chunk.get('doc_id')}, chunk_id={chunk.get('chunk_id')}, p0={chunk.get('p0')}, p1={chunk.get('p1')}")
+            logger.warning("  Chunk %s: doc_id=%s, chunk_id=%s, p0=%s, p1=%s", idx, chunk.get('doc_id'), chunk.get('chunk_id'), chunk.get('p0'), chunk.get('p1'))
         logger.warning("=" * 60)
         agent_log.log_step(
             node="synthesizer",
@@ -289,7 +317,7 @@ def node_synthesizer(state: GraphState) -> GraphState:
     for doc_ref in score_order:
         if doc_ref in explicit_docs:
             top_doc_candidates.append(doc_ref)
-            logger.info(f"Including explicit doc {doc_ref[:8]}...")
+            logger.info("Including explicit doc %s...", doc_ref[:8])
     
     # Then add top-scoring docs that aren't already included
     for doc_ref in score_order:
@@ -367,11 +395,12 @@ def node_synthesizer(state: GraphState) -> GraphState:
     #            which will be detected by citation_pruner and handled appropriately.
     confidence_threshold = explicit_selection_threshold if is_explicit_doc_selection else default_threshold
     
-    logger.info(f"Confidence threshold: {confidence_threshold:.1f}% (explicit_selection={is_explicit_doc_selection}, "
-                f"cross_doc={cross_doc}, "
-                f"selected_docs={len(selected_doc_ids) if selected_doc_ids else 0}, "
-                f"uploaded_docs={len(uploaded_doc_ids) if uploaded_doc_ids else 0}, "
-                f"doc_id={'present' if doc_id else 'none'})")
+    logger.info("Confidence threshold: %.1f%% (explicit_selection=%s, cross_doc=%s, "
+                "selected_docs=%s, uploaded_docs=%s, doc_id=%s)",
+                confidence_threshold, is_explicit_doc_selection, cross_doc,
+                len(selected_doc_ids) if selected_doc_ids else 0,
+                len(uploaded_doc_ids) if uploaded_doc_ids else 0,
+                'present' if doc_id else 'none')
     
     conf_result = get_confidence_for_chunks(ctx_evs, query=question_for_confidence)
     overall_confidence = conf_result["confidence"]
@@ -394,13 +423,13 @@ def node_synthesizer(state: GraphState) -> GraphState:
         logger.warning("=" * 60)
         logger.warning("SYNTHESIZER ABSTAINING - CONFIDENCE TOO LOW")
         logger.warning("=" * 60)
-        logger.warning(f"Question: {question_text}")
-        logger.warning(f"Action from confidence check: {action}")
-        logger.warning(f"Overall confidence: {overall_confidence:.2f}%")
-        logger.warning(f"Confidence threshold: {confidence_threshold:.1f}%")
-        logger.warning(f"Context chunks available: {len(ctx_evs)}")
-        logger.warning(f"Top doc IDs: {top_doc_ids}")
-        logger.warning(f"Selected doc IDs: {selected_doc_ids}")
+        logger.warning("Question: %s", question_text)
+        logger.warning("Action from confidence check: %s", action)
+        logger.warning("Overall confidence: %.2f%%", overall_confidence)
+        logger.warning("Confidence threshold: %.1f%%", confidence_threshold)
+        logger.warning("Context chunks available: %s", len(ctx_evs))
+        logger.warning("Top doc IDs: %s", top_doc_ids)
+        logger.warning("Selected doc IDs: %s", selected_doc_ids)
         logger.warning("Reason: Confidence below threshold or action='abstain'")
         logger.warning("=" * 60)
         logger.info("Returning abstain result")
@@ -455,34 +484,41 @@ def node_synthesizer(state: GraphState) -> GraphState:
     # Build document reference list for LLM prompt with alphabetic citations
     doc_reference_list = ""
     if ctx_evs:
-        doc_reference_list = "\n\nAvailable Chunks (use alphabetic citations when referencing):\n"
+        # Collected as parts and joined once rather than grown with +=
+        reference_parts = ["\n\nAvailable Chunks (use alphabetic citations when referencing):\n"]
         for idx, chunk in enumerate(ctx_evs[:26]):  # Limit to 26 chunks (A-Z)
-            chunk_id = chunk.get("chunk_id", "")
             doc_id = chunk.get("doc_id", "")
             doc_prefix = doc_id[:8] if doc_id else "unknown"
             doc_title = get_document_title(doc_id) if doc_id else "Unknown"
             letter = letters[idx] if idx < len(letters) else "?"
             
             # Get chunk preview
-            chunk_text = str(chunk.get("text", ""))[:100].replace("\n", " ")
-            doc_reference_list += f"[{letter}] {doc_title} ({doc_prefix}): {chunk_text}...\n"
+            chunk_text = hit_snippet(chunk)[:100].replace("\n", " ")
+            reference_parts.append(f"[{letter}] {doc_title} ({doc_prefix}): {chunk_text}...\n")
         
-        doc_reference_list += "\nWhen you reference information from a chunk in your answer, use the alphabetic citation [A], [B], [C], etc. corresponding to the chunk letter above.\n"
-        doc_reference_list += "Example: If discussing content from chunk [A], cite it as [A] at the end of the relevant sentence or paragraph."
+        reference_parts.append("\nWhen you reference information from a chunk in your answer, use the alphabetic citation [A], [B], [C], etc. corresponding to the chunk letter above.\n")
+        reference_parts.append("Example: If discussing content from chunk [A], cite it as [A] at the end of the relevant sentence or paragraph.")
+        doc_reference_list = "".join(reference_parts)
 
     context_sections: List[str] = []
     if top_doc_ids:
+        # Bucket the context by document in one pass instead of rescanning it per document
+        chunks_by_doc: Dict[Any, List[EvidenceChunk]] = {}
+        for chunk in ctx_evs:
+            chunks_by_doc.setdefault(chunk.get("doc_id"), []).append(chunk)
         for doc_ref in top_doc_ids:
-            doc_chunks = [chunk for chunk in ctx_evs if chunk.get("doc_id") == doc_ref]
+            doc_chunks = chunks_by_doc.get(doc_ref)
             if not doc_chunks:
                 continue
             label = doc_labels.get(doc_ref, doc_ref[:8])
-            snippet = "\n\n".join(str(chunk.get("text", ""))[:1200] for chunk in doc_chunks)
+            snippet = "\n\n".join([hit_snippet(chunk) for chunk in doc_chunks])
             context_sections.append(f"Document {doc_ref[:8]} ({label}):\n{snippet}")
-        remaining = [chunk for chunk in ctx_evs if chunk.get("doc_id") not in top_doc_ids]
-        context_sections.extend(str(chunk.get("text", ""))[:1200] for chunk in remaining)
+        top_doc_set = set(top_doc_ids)
+        context_sections.extend(
+            hit_snippet(chunk) for chunk in ctx_evs if chunk.get("doc_id") not in top_doc_set
+        )
     else:
-        context_sections = [str(chunk.get("text", ""))[:1200] for chunk in ctx_evs]
+        context_sections = [hit_snippet(chunk) for chunk in ctx_evs]
 
     context = "\n\n---\n\n".join(context_sections)
     order_block = f"{doc_order_instruction}\n\n" if doc_order_instruction else ""
@@ -528,7 +564,6 @@ def node_synthesizer(state: GraphState) -> GraphState:
         prompt = format_template(
             "synthesizer_standard",
             doc_reference_list=doc_reference_list,
-            question_text=question_text,
             citation_format=format,
             order_block=order_block,
             question_lower=question_lower,
@@ -628,24 +663,35 @@ def node_synthesizer(state: GraphState) -> GraphState:
     for doc_rank, doc_label, page_str, avg_confidence, doc_id, _ in page_citations:
         citation = f"[{doc_rank}] \"{doc_label}\" - Page: {page_str} - (contribution strength: {avg_confidence:.1f}%)"
         ranked_citations.append(citation)
-        logger.debug(f"Page citation: {citation}")
+        logger.debug("Page citation: %s", citation)
     
-    logger.info(f"Built {len(ranked_citations)} page-level citations from {len(ctx_evs)} context chunks")
+    logger.info("Built %s page-level citations from %s context chunks", len(ranked_citations), len(ctx_evs))
     logger.info("Invoking LLM for synthesis")
-    logger.info(f"Prompt length: {len(prompt)} characters")
-    logger.info(f"Context chunks: {len(ctx_evs)}, Top doc IDs: {top_doc_ids}")
+    logger.info("Prompt length: %s characters", len(prompt))
+    logger.info("Context chunks: %s, Top doc IDs: %s", len(ctx_evs), top_doc_ids)
     
     # Estimate input tokens (rough approximation: ~4 characters per token)
     system_prompt = "You write precise, grounded answers. Avoid speculation and keep sources aligned. Answer with I dont know if you cannot ground your answer."
     estimated_input_tokens = (len(system_prompt) + len(prompt)) // 4
-    logger.info(f"Estimated input tokens: ~{estimated_input_tokens} (based on character count)")
-    
-    llm_response, token_info = call_llm(
-        system_prompt,
-        [{"role": "user", "content": prompt}],
-        max_tokens=1800,
-        temperature=0.2,
-    )
+    logger.info("Estimated input tokens: ~%s (based on character count)", estimated_input_tokens)
+    
+    # Under stream_with_graph, forward tokens to the caller as they are generated
+    token_sink = current_token_sink()
+    if token_sink is not None:
+        llm_response, token_info = stream_llm_to_sink(
+            token_sink,
+            system_prompt,
+            [{"role": "user", "content": prompt}],
+            max_tokens=1800,
+            temperature=0.2,
+        )
+    else:
+        llm_response, token_info = call_llm(
+            system_prompt,
+            [{"role": "user", "content": prompt}],
+            max_tokens=1800,
+            temperature=0.2,
+        )
     
     # Log token usage
     input_tokens = token_info.get("input_tokens", 0)
@@ -653,20 +699,20 @@ def node_synthesizer(state: GraphState) -> GraphState:
     total_tokens = token_info.get("total_tokens", 0)
     logger.info("=" * 60)
     logger.info("TOKEN USAGE:")
-    logger.info(f"  Input tokens: {input_tokens}")
-    logger.info(f"  Output tokens: {output_tokens}")
-    logger.info(f"  Total tokens: {total_tokens}")
+    logger.info("  Input tokens: %s", input_tokens)
+    logger.info("  Output tokens: %s", output_tokens)
+    logger.info("  Total tokens: %s", total_tokens)
     if estimated_input_tokens > 0 and input_tokens > 0:
-        logger.info(f"  Estimation accuracy: {abs(estimated_input_tokens - input_tokens) / input_tokens * 100:.1f}% difference")
+        logger.info("  Estimation accuracy: %.1f%% difference", abs(estimated_input_tokens - input_tokens) / input_tokens * 100)
     logger.info("=" * 60)
     
     # Log raw LLM response for debugging
     raw_answer = llm_response.strip()
     logger.info("=" * 60)
     logger.info("RAW LLM RESPONSE FROM SYNTHESIZER:")
-    logger.info(f"Length: {len(raw_answer)} characters")
-    logger.info(f"First 500 chars: {raw_answer[:500]}")
-    logger.info(f"Full response: {raw_answer}")
+    logger.info("Length: %s characters", len(raw_answer))
+    logger.info("First 500 chars: %s", raw_answer[:500])
+    logger.info("Full response: %s", raw_answer)
     logger.info("=" * 60)
     
     answer_text = raw_answer
@@ -734,7 +780,7 @@ def node_synthesizer(state: GraphState) -> GraphState:
     if citations:
         result_payload["citations"] = citations
 
-    logger.info(f"Generated answer for {len(top_doc_ids)} document(s)")
+    logger.info("Generated answer for %s document(s)", len(top_doc_ids))
     logger.info(final_answer)
     logger.info("-" * 40)
 
@@ -3,12 +3,20 @@ Prompt templates for graph nodes.
 
 This module provides access to all prompt templates used by the graph nodes.
 Each template is stored in a separate file for easy maintenance and updates.
+Templates are read once at import time; nodes format them on every query, so
+the per-call cost is a dict lookup and str.format rather than file I/O.
 """
 from pathlib import Path
+from typing import Dict
 
 # Base directory for templates
 TEMPLATES_DIR = Path(__file__).parent
 
+# template name -> template text, loaded once
+_TEMPLATES: Dict[str, str] = {
+    path.stem: path.read_text(encoding='utf-8') for path in TEMPLATES_DIR.glob("*.txt")
+}
+
 
 def load_template(template_name: str) -> str:
     """
@@ -20,11 +28,17 @@ def load_template(template_name: str) -> str:
     Returns:
         Template string content
     """
+    template = _TEMPLATES.get(template_name)
+    if template is not None:
+        return template
+
     template_path = TEMPLATES_DIR / f"{template_name}.txt"
     if not template_path.exists():
         raise FileNotFoundError(f"Template '{template_name}' not found at {template_path}")
-    
-    return template_path.read_text(encoding='utf-8')
+
+    template = template_path.read_text(encoding='utf-8')
+    _TEMPLATES[template_name] = template
+    return template
 
 
 def format_template(template_name: str, **kwargs) -> str:
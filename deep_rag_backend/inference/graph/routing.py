@@ -2,7 +2,25 @@
 Conditional routing functions for LangGraph.
 """
 from inference.graph.state import GraphState
-from inference.graph.constants import MAX_ITERS
+from inference.graph.constants import MAX_ITERS, EARLY_ACCEPT_STRONG
+from inference.graph.scoring import count_strong, critic_confidence, critic_wants_refinement
+
+
+def should_compress(state: GraphState) -> str:
+    """
+    Edge function after retrieval: compress → critic, critic directly, or skip to the synthesizer.
+
+    The critic's decision is a function of the evidence alone, and the
+    compressor's notes are only read by its refinement prompt. When the
+    critic is going to route to the synthesizer anyway, the compressor's LLM
+    call is skipped ("critique").
+    """
+    if EARLY_ACCEPT_STRONG > 0 and state.get("strong_chunks", 0) >= EARLY_ACCEPT_STRONG:
+        return "skip"
+    conf = critic_confidence(count_strong(state.get("evidence") or []))
+    if critic_wants_refinement(conf, state.get("iterations", 0)):
+        return "compress"
+    return "critique"
 
 
 def should_refine(state: GraphState) -> str:
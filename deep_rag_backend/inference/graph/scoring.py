@@ -0,0 +1,24 @@
+"""
+Evidence strength heuristics shared by the critic and the retriever's early accept.
+"""
+import numpy as np
+from inference.graph.constants import MAX_ITERS, THRESH
+
+
+def count_strong(ev) -> int:
+    """Count chunks with CE above THRESH or a positive lexical AND vector score."""
+    n = len(ev)
+    ce = np.fromiter((h.get("ce") or 0.0 for h in ev), dtype=np.float32, count=n)
+    lex = np.fromiter((h.get("lex") or 0.0 for h in ev), dtype=np.float32, count=n)
+    vec = np.fromiter((h.get("vec") or 0.0 for h in ev), dtype=np.float32, count=n)
+    return int(np.count_nonzero((ce > THRESH) | ((lex > 0) & (vec > 0))))
+
+
+def critic_confidence(strong: int) -> float:
+    """Critic heuristic confidence (0-1) for a number of strong chunks."""
+    return min(0.9, 0.4 + 0.1*strong)
+
+
+def critic_wants_refinement(conf: float, iterations: int) -> bool:
+    """Whether the critic asks for refinement queries (the only use of the compressor's notes)."""
+    return conf < 0.6 and iterations < MAX_ITERS
@@ -2,12 +2,33 @@
 State definition for LangGraph pipeline.
 """
 from typing import TypedDict, List, Dict, Any, Optional
+from inference.graph.constants import SNIPPET_CHARS
+
+
+class EvidenceHit(TypedDict, total=False):
+    """
+    One retrieval hit as carried in GraphState.evidence (a plain dict at runtime).
+
+    The direct agent pipeline converts hits to the slotted inference.agents.hit.Hit;
+    the graph keeps retrieve_hybrid's dicts, which its nodes, the API responses
+    and the checkpoints all consume as-is.
+    """
+    chunk_id: str
+    doc_id: Optional[str]
+    text: str
+    p0: int
+    p1: int
+    content_type: str  # "text", "pdf_text", "image" or "multimodal"
+    image_path: str
+    lex: float  # lexical (ts_rank) score
+    vec: float  # vector similarity
+    ce: float  # cross-encoder score
 
 
 class GraphState(TypedDict, total=False):
     question: str
     plan: str
-    evidence: List[Dict[str, Any]]
+    evidence: List[EvidenceHit]
     notes: str
     answer: str
     confidence: float
@@ -18,4 +39,24 @@ class GraphState(TypedDict, total=False):
     selected_doc_ids: Optional[List[str]]  # Multi-document selection (not cross-doc)
     doc_ids: List[str]  # All document IDs found during retrieval (for multi-doc tracking)
     cross_doc: bool  # Whether cross-document retrieval is enabled
+    strong_chunks: int  # Strong chunks after the first retrieval (early accept routing)
+
+
+def evidence_hits(hits: List[Dict[str, Any]]) -> List[EvidenceHit]:
+    """
+    Retrieval hits as stored in GraphState.evidence: without the dense 'emb' vector.
+
+    Retrieval keeps the embedding for MMR; no graph node reads it, but it would
+    otherwise ride along in every state update and checkpoint.
+    """
+    return [{key: value for key, value in h.items() if key != "emb"} if "emb" in h else h for h in hits]
+
+
+def hit_snippet(h: Dict[str, Any]) -> str:
+    """
+    The hit's prompt snippet: the first SNIPPET_CHARS of its text.
 
+    Cut on the fly rather than stored on the hit, since a second copy of the
+    text would ride along in every state update and checkpoint.
+    """
+    return str(h.get("text", ""))[:SNIPPET_CHARS]
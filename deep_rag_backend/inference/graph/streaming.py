@@ -0,0 +1,67 @@
+"""
+Token streaming out of the LangGraph pipeline.
+
+The graph is compiled and invoked synchronously (the SQLite checkpointer and
+every caller are sync), so tokens are not streamed through astream_events.
+Instead, `stream_tokens(sink)` sets a callback in a ContextVar. LangGraph's
+node executors run with a copy of the caller's context, so the synthesizer
+sees the callback, streams its LLM call, and hands each delta to the sink as
+it arrives. When no sink is set, the synthesizer keeps its blocking call_llm
+path.
+"""
+import asyncio
+import contextvars
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from inference.llm import call_llm_stream
+
+TokenSink = Callable[[str], None]
+
+_token_sink: contextvars.ContextVar[Optional[TokenSink]] = contextvars.ContextVar(
+    "graph_token_sink", default=None
+)
+
+
+@contextmanager
+def stream_tokens(sink: TokenSink) -> Iterator[None]:
+    """Send synthesizer tokens generated inside this block to `sink`."""
+    token = _token_sink.set(sink)
+    try:
+        yield
+    finally:
+        _token_sink.reset(token)
+
+
+def current_token_sink() -> Optional[TokenSink]:
+    """The sink set by an enclosing stream_tokens block, if any."""
+    return _token_sink.get()
+
+
+def stream_llm_to_sink(
+    sink: TokenSink,
+    system: str,
+    messages: List[Dict[str, str]],
+    max_tokens: int,
+    temperature: Optional[float] = None,
+) -> Tuple[str, Dict[str, int]]:
+    """
+    Blocking call_llm replacement that forwards each delta to `sink`.
+
+    Drives call_llm_stream on a private event loop (graph nodes run in worker
+    threads with no running loop). Returns the full text and an empty
+    token-usage dict, since the stream does not report usage.
+    """
+    parts: List[str] = []
+
+    async def _consume() -> None:
+        async for delta in call_llm_stream(system, messages, max_tokens=max_tokens, temperature=temperature):
+            parts.append(delta)
+            sink(delta)
+
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(_consume())
+    finally:
+        loop.close()
+    return "".join(parts), {}
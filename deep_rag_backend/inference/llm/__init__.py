@@ -1,9 +1,9 @@
 """
 LLM module - Unified interface for chat completion across providers.
 
-Main entry point: call_llm()
+Main entry points: call_llm(), acall_llm(), call_llm_stream(), call_llm_batch(), acall_llm_batch()
 """
-from inference.llm.wrapper import call_llm
+from inference.llm.wrapper import acall_llm, acall_llm_batch, call_llm, call_llm_batch, call_llm_stream
 
-__all__ = ['call_llm']
+__all__ = ['call_llm', 'acall_llm', 'call_llm_batch', 'acall_llm_batch', 'call_llm_stream']
 
@@ -0,0 +1,104 @@
+"""
+Exact-match response cache for call_llm.
+
+Graph loops, retries and repeated questions send byte-identical prompts to
+the provider; near-deterministic calls (temperature <= LLM_CACHE_MAX_TEMP)
+are answered from an in-process LRU with a TTL instead of another HTTP round
+trip. The key is a sha256 of the model, system prompt, messages, max_tokens
+and temperature, so any change to the prompt is a miss. Paraphrased questions
+are handled one level up by inference.semantic_cache.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from dotenv import load_dotenv
+
+load_dotenv()
+
+LLM_CACHE_MAXSIZE = int(os.getenv('LLM_CACHE_MAXSIZE', '256'))
+LLM_CACHE_TTL_SEC = float(os.getenv('LLM_CACHE_TTL_SEC', '3600'))
+LLM_CACHE_MAX_TEMP = float(os.getenv('LLM_CACHE_MAX_TEMP', '0.2'))
+
+LLMResponse = Tuple[str, Dict[str, int]]
+
+# key -> (response, expires_at)
+_responses: "OrderedDict[str, Tuple[LLMResponse, float]]" = OrderedDict()
+_responses_lock = threading.Lock()
+_hits = 0
+_misses = 0
+
+
+def response_key(
+    model: Optional[str],
+    system: str,
+    messages: List[Dict[str, str]],
+    max_tokens: int,
+    temperature: float,
+    response_schema: Optional[type] = None,
+) -> Optional[str]:
+    """Cache key for a call_llm request, or None when the call should not be cached."""
+    if LLM_CACHE_MAXSIZE <= 0 or temperature > LLM_CACHE_MAX_TEMP:
+        return None
+    request = {"m": model, "sys": system, "msgs": messages, "mt": max_tokens, "t": round(temperature, 2)}
+    if response_schema is not None:
+        request["rs"] = f"{response_schema.__module__}.{response_schema.__qualname__}"
+    payload = json.dumps(request, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def get_response(key: str) -> Optional[LLMResponse]:
+    """
+    Cached (text, token_info) for `key`, or None on miss/expiry.
+
+    A hit spends no provider tokens, so its token_info has the stored keys
+    with zero counts; callers summing usage would otherwise count it twice.
+    """
+    global _hits, _misses
+    with _responses_lock:
+        entry = _responses.get(key)
+        if entry is None or entry[1] < time.monotonic():
+            if entry is not None:
+                del _responses[key]
+            _misses += 1
+            return None
+        _responses.move_to_end(key)
+        _hits += 1
+        text, token_info = entry[0]
+    return text, dict.fromkeys(token_info, 0)
+
+
+def put_response(key: str, text: str, token_info: Dict[str, int]) -> None:
+    """Store a response under `key`, evicting the least recently used entry past the cap."""
+    with _responses_lock:
+        _responses[key] = ((text, dict(token_info)), time.monotonic() + LLM_CACHE_TTL_SEC)
+        _responses.move_to_end(key)
+        while len(_responses) > LLM_CACHE_MAXSIZE:
+            _responses.popitem(last=False)
+
+
+def clear_responses() -> None:
+    """Drop every cached response and reset the counters."""
+    global _hits, _misses
+    with _responses_lock:
+        _responses.clear()
+        _hits = 0
+        _misses = 0
+
+
+def get_llm_cache_stats() -> Dict[str, Any]:
+    """Hit/miss statistics for the response cache."""
+    with _responses_lock:
+        total = _hits + _misses
+        return {
+            "size": len(_responses),
+            "maxsize": LLM_CACHE_MAXSIZE,
+            "ttl_sec": LLM_CACHE_TTL_SEC,
+            "max_temperature": LLM_CACHE_MAX_TEMP,
+            "hits": _hits,
+            "misses": _misses,
+            "hit_rate": _hits / total if total else 0.0,
+        }
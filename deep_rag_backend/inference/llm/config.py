@@ -9,6 +9,12 @@ load_dotenv()
 # LLM Provider Configuration
 LLM_PROVIDER = os.getenv("LLM_PROVIDER", "gemini").lower()
 DEFAULT_TEMP = float(os.getenv("LLM_TEMPERATURE", "0.2"))
+# Upper bound on one retry backoff sleep (seconds)
+LLM_RETRY_MAX_DELAY_SEC = float(os.getenv("LLM_RETRY_MAX_DELAY_SEC", "60"))
+# Independent prompts marshalled into one request by call_llm_batch
+LLM_BATCH_MAX_ROWS = int(os.getenv("LLM_BATCH_MAX_ROWS", "8"))
+# Provider requests one acall_llm_batch keeps in flight at once
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
 
 # Gemini configuration
 GEMINI_MODEL = os.getenv("GEMINI_MODEL")
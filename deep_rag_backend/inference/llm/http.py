@@ -0,0 +1,67 @@
+"""
+Shared HTTP transport for LLM providers.
+
+Provider SDK clients are handed these httpx clients so sequential calls reuse
+pooled keep-alive TCP/TLS connections instead of opening a new one per call.
+"""
+import asyncio
+import atexit
+import importlib.util
+import logging
+import os
+import threading
+import weakref
+from typing import Optional
+import httpx
+from dotenv import load_dotenv
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+MAX_KEEPALIVE = int(os.getenv("LLM_HTTP_MAX_KEEPALIVE", "32"))
+MAX_CONNECTIONS = int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "64"))
+# HTTP/2 needs the optional 'h2' package (pip install httpx[http2])
+HTTP2 = importlib.util.find_spec("h2") is not None
+
+_client: Optional[httpx.Client] = None
+_client_lock = threading.Lock()
+# httpx.AsyncClient connections are bound to the event loop that opened them,
+# so keep one async client per running loop
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(max_keepalive_connections=MAX_KEEPALIVE, max_connections=MAX_CONNECTIONS)
+
+
+def get_http_client() -> httpx.Client:
+    """Get or create the process-wide pooled httpx client (thread-safe)."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = httpx.Client(http2=HTTP2, limits=_limits())
+                logger.debug(f"Created shared LLM HTTP client (http2={HTTP2}, keepalive={MAX_KEEPALIVE})")
+    return _client
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """Get or create the pooled httpx async client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(http2=HTTP2, limits=_limits())
+        _async_clients[loop] = client
+    return client
+
+
+def close_http_clients() -> None:
+    """Close the shared sync client (async clients are released with their loop)."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
+
+atexit.register(close_http_clients)
@@ -1,9 +1,9 @@
 """
 LLM provider implementations.
 """
-from inference.llm.providers.gemini import gemini_chat
+from inference.llm.providers.gemini import gemini_chat, gemini_chat_async, gemini_chat_stream, gemini_error_code
 
-__all__ = ['gemini_chat']
+__all__ = ['gemini_chat', 'gemini_chat_async', 'gemini_chat_stream', 'gemini_error_code']
 
 # Future providers (commented out - uncomment when needed)
 # from inference.llm.providers.openai import openai_chat
@@ -1,42 +1,105 @@
 """
 Google Gemini LLM provider implementation.
 """
+import asyncio
+import functools
 import logging
-from typing import List, Dict
+import threading
+import weakref
+from typing import AsyncIterator, List, Dict, Optional, Tuple
+import httpx
 from google import genai
+from google.genai import errors as genai_errors
 from google.genai import types
 from inference.llm.config import GEMINI_MODEL, GEMINI_API_KEY
+from inference.llm.http import get_http_client, get_async_http_client
 
 logger = logging.getLogger(__name__)
 
+API_VERSION = 'v1alpha'
 
-def gemini_chat(
-    system: str,
-    messages: List[Dict[str, str]],
-    max_tokens: int,
-    temperature: float
-) -> tuple[str, Dict[str, int]]:
-    """
-    Gemini chat implementation using Google's new GenAI SDK (google-genai).
-    Based on: https://github.com/googleapis/python-genai
-    
-    Gemini is multi-modal (text, images, audio, video) but this implementation
-    currently handles text-only. Can be extended for multi-modal later.
-    
-    Requires GEMINI_API_KEY to be set in environment.
-    """
+# Building a genai.Client validates its options and sets up an SSL context and
+# a default transport for whichever side (sync/async) was not supplied, which
+# takes tens of milliseconds. Clients are built once and reused; async ones
+# are per event loop, like the httpx async clients they wrap.
+_client: Optional[genai.Client] = None
+_client_lock = threading.Lock()
+# loop -> (httpx async client the Gemini client was built on, Gemini client)
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Tuple[httpx.AsyncClient, genai.Client]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _check_api_key() -> None:
     if not GEMINI_API_KEY:
         raise EnvironmentError(
             "GEMINI_API_KEY not set in environment. "
             "Get your key from https://makersuite.google.com/app/apikey"
         )
-    
-    # Use the configured model directly - no need to check available models
-    # The model name is set in .env file (GEMINI_MODEL)
-    model_name = GEMINI_MODEL
-    logger.debug(f"Using Gemini model: {model_name}")
-    
-    # Build config for the new SDK
+
+
+def gemini_error_code(error: Optional[BaseException]) -> Optional[int]:
+    """HTTP status of the Gemini API error behind `error` (following its cause chain), or None."""
+    while error is not None:
+        if isinstance(error, genai_errors.APIError):
+            return error.code
+        error = error.__cause__
+    return None
+
+
+def get_client() -> genai.Client:
+    """Get or create the process-wide sync Gemini client (thread-safe)."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                # The shared httpx client keeps TLS connections alive across calls
+                # (the SDK does not close caller-provided httpx clients)
+                _client = genai.Client(
+                    api_key=GEMINI_API_KEY,
+                    http_options=types.HttpOptions(api_version=API_VERSION, httpx_client=get_http_client()))
+    return _client
+
+
+def get_async_client() -> genai.Client:
+    """Get or create the Gemini client whose .aio surface uses the running loop's httpx client."""
+    loop = asyncio.get_running_loop()
+    httpx_async_client = get_async_http_client()
+    entry = _async_clients.get(loop)
+    if entry is not None and entry[0] is httpx_async_client:
+        return entry[1]
+    client = genai.Client(
+        api_key=GEMINI_API_KEY,
+        http_options=types.HttpOptions(
+            api_version=API_VERSION,
+            httpx_client=get_http_client(),
+            httpx_async_client=httpx_async_client))
+    _async_clients[loop] = (httpx_async_client, client)
+    return client
+
+
+def reset_clients() -> None:
+    """Drop cached Gemini clients (the pooled httpx transports stay open)."""
+    global _client
+    with _client_lock:
+        _client = None
+    _async_clients.clear()
+
+
+@functools.lru_cache(maxsize=64)
+def _make_config(
+    max_tokens: int,
+    temperature: float,
+    system: Optional[str],
+    response_schema: Optional[type],
+) -> "types.GenerateContentConfig":
+    """
+    GenerateContentConfig for a call, built once per distinct combination.
+
+    Callers reuse a handful of (max_tokens, temperature, system) settings, so
+    the Pydantic construction and validation is cached. Sharing the instance is
+    safe: the SDK copies the config before adding anything to it.
+    """
     # System instruction is set in config
     config = types.GenerateContentConfig(
         max_output_tokens=max_tokens,
@@ -44,6 +107,27 @@ def gemini_chat(
     )
     if system:
         config.system_instruction = system
+    if response_schema is not None:
+        # Structured output: the model returns JSON matching the schema
+        config.response_mime_type = "application/json"
+        config.response_schema = response_schema
+    return config
+
+
+def _build_request(
+    system: str,
+    messages: List[Dict[str, str]],
+    max_tokens: int,
+    temperature: float,
+    response_schema: Optional[type] = None,
+) -> Tuple[str, str, "types.GenerateContentConfig"]:
+    """Build (model_path, user_content, config) for a generate_content call."""
+    # Use the configured model directly - no need to check available models
+    # The model name is set in .env file (GEMINI_MODEL)
+    model_name = GEMINI_MODEL
+    logger.debug(f"Using Gemini model: {model_name}")
+    
+    config = _make_config(max_tokens, round(temperature, 3), system or None, response_schema)
     
     # Build contents from messages
     # The new SDK expects a list of Content objects or a simple string
@@ -64,88 +148,67 @@ def gemini_chat(
     
     # Use the configured model directly - format as "models/{model_name}"
     model_path = f"models/{model_name}" if not model_name.startswith("models/") else model_name
+    return model_path, user_content, config
+
+
+def _parse_response(response, model_path: str, max_tokens: int) -> Tuple[str, Dict[str, int]]:
+    """
+    Extract (text, token_info) from a generate_content response.
+
+    response.text already joins the first candidate's text parts (skipping
+    thoughts) and is None when there are none, so it is the only extraction
+    path. An empty response raises, naming the finish reason.
+    """
+    usage = response.usage_metadata
+    token_info = {
+        "input_tokens": (usage.prompt_token_count or 0) if usage else 0,
+        "output_tokens": (usage.candidates_token_count or 0) if usage else 0,
+        "total_tokens": (usage.total_token_count or 0) if usage else 0,
+    }
+
+    text = (response.text or "").strip()
+    if text:
+        return text, token_info
+
+    finish_reason = response.candidates[0].finish_reason if response.candidates else None
+    if finish_reason == types.FinishReason.MAX_TOKENS:
+        raise RuntimeError(
+            f"Gemini model {model_path} response was truncated due to MAX_TOKENS limit. "
+            f"Consider increasing max_tokens (currently {max_tokens}). "
+            f"Response had {token_info['total_tokens'] or 'unknown'} tokens."
+        )
+    raise RuntimeError(f"Gemini model {model_path} returned an empty response (finish_reason={finish_reason})")
+
+
+def gemini_chat(
+    system: str,
+    messages: List[Dict[str, str]],
+    max_tokens: int,
+    temperature: float,
+    response_schema: Optional[type] = None,
+) -> tuple[str, Dict[str, int]]:
+    """
+    Gemini chat implementation using Google's new GenAI SDK (google-genai).
+    Based on: https://github.com/googleapis/python-genai
+    
+    Gemini is multi-modal (text, images, audio, video) but this implementation
+    currently handles text-only. Can be extended for multi-modal later.
+    
+    Requires GEMINI_API_KEY to be set in environment. With `response_schema`
+    (a Pydantic model), Gemini returns JSON matching it as the response text.
+    """
+    _check_api_key()
+    model_path, user_content, config = _build_request(system, messages, max_tokens, temperature, response_schema)
     
     try:
         # Use the new SDK's generate_content method
-        with genai.Client(
-            api_key=GEMINI_API_KEY,
-            http_options=types.HttpOptions(api_version='v1alpha')) as client:
-            response = client.models.generate_content(
-                model=model_path,
-                contents=user_content,
-                config=config
-            )
-        
-        # Extract token usage information from response
-        token_info = {"input_tokens": 0, "output_tokens": 0, "total_tokens": 0}
-        if hasattr(response, 'usage_metadata') and response.usage_metadata:
-            usage = response.usage_metadata
-            token_info["input_tokens"] = getattr(usage, 'prompt_token_count', 0) or 0
-            token_info["output_tokens"] = getattr(usage, 'candidates_token_count', 0) or 0
-            token_info["total_tokens"] = getattr(usage, 'total_token_count', 0) or 0
-        
-        # Try to get text directly from response.text property first
-        # Note: response.text is a computed property that extracts from candidates[0].content.parts
-        # If parts is None (e.g., MAX_TOKENS), text might be None even if hasattr returns True
-        if hasattr(response, 'text'):
-            try:
-                text_value = response.text
-                # Check if text_value is not None and not empty
-                if text_value and str(text_value).strip():
-                    return str(text_value).strip(), token_info
-            except (AttributeError, TypeError, Exception) as e:
-                logger.debug(f"Could not access response.text: {e}")
-                pass
+        response = get_client().models.generate_content(
+            model=model_path,
+            contents=user_content,
+            config=config
+        )
         
-        # Fallback: Try to extract text from candidates structure
-        if hasattr(response, 'candidates') and response.candidates:
-            candidate = response.candidates[0]
-            
-            # Check if candidate has content with parts
-            if (hasattr(candidate, 'content') and candidate.content is not None and 
-                hasattr(candidate.content, 'parts') and candidate.content.parts is not None):
-                text_parts = []
-                for part in candidate.content.parts:
-                    if part is not None and hasattr(part, 'text') and part.text:
-                        text_parts.append(part.text)
-                if text_parts:
-                    return " ".join(text_parts).strip(), token_info
-            
-            # Handle case where parts is None (e.g., MAX_TOKENS finish_reason)
-            # When parts is None, the response might still have generated text before hitting the limit
-            if hasattr(candidate, 'content') and candidate.content is not None:
-                finish_reason = getattr(candidate, 'finish_reason', None)
-                
-                # If parts is None, try alternative ways to get text
-                if getattr(candidate.content, 'parts', None) is None:
-                    logger.warning(f"Response content.parts is None. Finish reason: {finish_reason}")
-                    
-                    # Try to access text directly on content if available
-                    if hasattr(candidate.content, 'text') and candidate.content.text:
-                        return candidate.content.text.strip(), token_info
-                    
-                    # If finish_reason is MAX_TOKENS, the response was truncated
-                    # In this case, we might need to return an error or partial response
-                    if finish_reason and 'MAX_TOKENS' in str(finish_reason):
-                        # Access usage_metadata as an object, not a dictionary
-                        usage_metadata = getattr(response, 'usage_metadata', None)
-                        if usage_metadata:
-                            token_count = getattr(usage_metadata, 'total_token_count', 'unknown')
-                        else:
-                            token_count = 'unknown'
-                        raise RuntimeError(
-                            f"Gemini model {model_path} response was truncated due to MAX_TOKENS limit. "
-                            f"Consider increasing max_tokens (currently {max_tokens}). "
-                            f"Response had {token_count} tokens."
-                        )
-
-        # Log response structure for debugging if we get here
-        logger.error(f"Unexpected response structure. Response type: {type(response)}, "
-                    f"Has text: {hasattr(response, 'text')}, "
-                    f"Text value: {getattr(response, 'text', None) if hasattr(response, 'text') else 'N/A'}, "
-                    f"Has candidates: {hasattr(response, 'candidates')}, "
-                    f"Candidates: {getattr(response, 'candidates', None)}")
-        raise RuntimeError(f"Gemini model {model_path} returned empty or unexpected response structure")
+        return _parse_response(response, model_path, max_tokens)
         
     except Exception as e:
         # Provide helpful error message
@@ -154,3 +217,63 @@ def gemini_chat(
         error_msg += "\nNote: Using the 'google-genai' SDK. See https://github.com/googleapis/python-genai for documentation."
         raise RuntimeError(error_msg) from e
 
+
+
+async def gemini_chat_async(
+    system: str,
+    messages: List[Dict[str, str]],
+    max_tokens: int,
+    temperature: float,
+    response_schema: Optional[type] = None,
+) -> tuple[str, Dict[str, int]]:
+    """
+    Async variant of gemini_chat (client.aio), so event-loop callers do not
+    hold a thread for the whole round trip.
+    """
+    _check_api_key()
+    model_path, user_content, config = _build_request(system, messages, max_tokens, temperature, response_schema)
+    
+    client = get_async_client()
+    try:
+        response = await client.aio.models.generate_content(
+            model=model_path,
+            contents=user_content,
+            config=config
+        )
+        return _parse_response(response, model_path, max_tokens)
+    except Exception as e:
+        raise RuntimeError(f"Gemini API call failed with model {model_path}: {e}") from e
+
+
+async def gemini_chat_stream(
+    system: str,
+    messages: List[Dict[str, str]],
+    max_tokens: int,
+    temperature: float
+) -> AsyncIterator[str]:
+    """
+    Streaming variant of gemini_chat: yields text deltas as Gemini generates them.
+    
+    Uses the async client (client.aio) so callers can overlap other work
+    (retrieval, citation building) with token generation.
+    """
+    _check_api_key()
+    model_path, user_content, config = _build_request(system, messages, max_tokens, temperature)
+    
+    client = get_async_client()
+    try:
+        stream = await client.aio.models.generate_content_stream(
+            model=model_path,
+            contents=user_content,
+            config=config
+        )
+        async for chunk in stream:
+            try:
+                text = chunk.text
+            except Exception as e:
+                logger.debug(f"Could not access chunk.text: {e}")
+                text = None
+            if text:
+                yield text
+    except Exception as e:
+        raise RuntimeError(f"Gemini streaming call failed with model {model_path}: {e}") from e
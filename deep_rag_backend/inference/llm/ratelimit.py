@@ -0,0 +1,68 @@
+"""
+Client-side request rate limiting for LLM providers.
+
+Without it the only signal that the per-minute quota is exhausted is a 429,
+which costs a full round trip plus a backoff sleep. Every provider request
+(each attempt of call_llm, acall_llm and call_llm_stream) first takes a token
+from a process-wide bucket refilled at GEMINI_RPM / 60 per second, so bursts
+beyond the quota queue locally instead. Cache hits do not take a token.
+"""
+import asyncio
+import os
+import threading
+import time
+from dotenv import load_dotenv
+
+load_dotenv()
+
+GEMINI_RPM = float(os.getenv("GEMINI_RPM", "500"))  # 0 disables
+LLM_RATE_BURST = int(os.getenv("LLM_RATE_BURST", "16"))
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket shared by sync and async callers.
+
+    A caller reserves its token under the lock and then sleeps outside it, so
+    waiters are served in arrival order and the lock is never held across a
+    sleep (or an await).
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, n: float = 1.0) -> float:
+        """Take `n` tokens; returns the seconds to wait before using them (0 if available now)."""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= n
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+    def reset(self) -> None:
+        """Refill the bucket to capacity."""
+        with self._lock:
+            self._tokens = self.capacity
+            self._last = time.monotonic()
+
+    def acquire(self, n: float = 1.0) -> None:
+        """Block until `n` tokens are available."""
+        wait = self.reserve(n)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def aacquire(self, n: float = 1.0) -> None:
+        """Await until `n` tokens are available without blocking the event loop."""
+        wait = self.reserve(n)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+request_bucket = TokenBucket(rate=GEMINI_RPM / 60.0, capacity=LLM_RATE_BURST)
@@ -1,17 +1,59 @@
 """
 LLM wrapper - Unified interface for chat completion across providers.
 """
+import asyncio
+import random
+import re
 import time
 import logging
-from typing import List, Dict, Optional
-from inference.llm.config import LLM_PROVIDER, DEFAULT_TEMP
-from inference.llm.providers import gemini_chat
+from typing import AsyncIterator, List, Dict, Optional
+from inference.llm.cache import get_response, put_response, response_key
+from inference.llm.config import (
+    LLM_PROVIDER, DEFAULT_TEMP, GEMINI_MODEL, LLM_BATCH_MAX_ROWS, LLM_MAX_CONCURRENCY, LLM_RETRY_MAX_DELAY_SEC
+)
+from inference.llm.providers import gemini_chat, gemini_chat_async, gemini_chat_stream, gemini_error_code
+from inference.llm.ratelimit import request_bucket
 
 logger = logging.getLogger(__name__)
 
 # Future providers (commented out - uncomment when needed)
 # from inference.llm.providers import openai_chat, ollama_chat
 
+# Monotonic time before which no new attempt is started, set when the provider
+# answers 429 so every worker in the process backs off together
+_rate_limited_until = 0.0
+
+
+def _check_provider() -> None:
+    if LLM_PROVIDER != "gemini":
+        raise ValueError(
+            f"Unsupported LLM_PROVIDER: {LLM_PROVIDER}. "
+            f"Currently only 'gemini' is supported. Set LLM_PROVIDER=gemini in .env"
+        )
+
+
+def _retry_delay(error: Exception, attempt: int, retry_backoff_sec: float) -> Optional[float]:
+    """
+    Seconds to sleep before the next attempt, or None if `error` is not worth retrying.
+
+    Request errors (4xx other than 408/429: bad request, auth, permission) fail
+    fast. Otherwise the delay is exponential backoff with full jitter, capped at
+    LLM_RETRY_MAX_DELAY_SEC, so concurrent callers do not retry in lockstep.
+    """
+    global _rate_limited_until
+    code = gemini_error_code(error)
+    if code is not None and 400 <= code < 500 and code not in (408, 429):
+        return None
+    delay = random.uniform(0, min(LLM_RETRY_MAX_DELAY_SEC, retry_backoff_sec * (2 ** (attempt - 1))))
+    if code == 429:
+        _rate_limited_until = max(_rate_limited_until, time.monotonic() + delay)
+    return delay
+
+
+def _rate_limit_wait() -> float:
+    """Seconds left on a provider rate-limit backoff (0 if none)."""
+    return max(0.0, _rate_limited_until - time.monotonic())
+
 
 def call_llm(
     system: str,
@@ -20,6 +62,8 @@ def call_llm(
     temperature: Optional[float] = None,
     retries: int = 8,
     retry_backoff_sec: float = 2.0,
+    response_schema: Optional[type] = None,
+    cache: bool = True,
 ) -> tuple[str, Dict[str, int]]:
     """
     Unified interface for chat completion across providers.
@@ -29,35 +73,257 @@ def call_llm(
         messages: list like [{"role":"user","content":"..."}, {"role":"assistant","content":"..."}]
         max_tokens: max new tokens to generate
         temperature: sampling temperature; defaults from .env if None
-        retries: retry attempts on transient errors
-        retry_backoff_sec: exponential backoff base seconds
+        retries: retry attempts on transient errors (network, 408/429, 5xx)
+        retry_backoff_sec: exponential backoff base seconds (jittered)
+        response_schema: optional Pydantic model; the provider is asked for JSON
+            matching it, returned as the response text
+        cache: False to skip the response cache, for callers that need a fresh
+            answer to a repeated prompt (e.g. the critic's refinement loop)
 
     Returns:
         assistant string response (stripped)
+
+    Identical low-temperature requests are served from the response cache
+    (inference/llm/cache.py) without calling the provider; a cache hit reports
+    zero token usage.
     """
     temperature = DEFAULT_TEMP if temperature is None else temperature
+    cache_key = response_key(GEMINI_MODEL, system, messages, max_tokens, temperature, response_schema) if cache else None
+    if cache_key is not None:
+        cached = get_response(cache_key)
+        if cached is not None:
+            logger.debug("LLM response cache hit")
+            return cached
+    _check_provider()
     last_err: Optional[Exception] = None
 
     for attempt in range(1, retries + 1):
+        wait = _rate_limit_wait()
+        if wait > 0:
+            time.sleep(wait)
+        request_bucket.acquire()
         try:
-            if LLM_PROVIDER == "gemini":
-                text, token_info = gemini_chat(system, messages, max_tokens, temperature)
-                return text, token_info
-            # Future providers (commented out - uncomment when needed)
-            # elif LLM_PROVIDER == "openai":
-            #     return openai_chat(system, messages, max_tokens, temperature)
+            # Only gemini passes _check_provider for now. Future providers
+            # (commented out - uncomment when needed):
+            # if LLM_PROVIDER == "openai":
+            #     text, token_info = openai_chat(system, messages, max_tokens, temperature)
             # elif LLM_PROVIDER == "ollama":
-            #     return ollama_chat(system, messages, max_tokens, temperature)
-            else:
-                raise ValueError(
-                    f"Unsupported LLM_PROVIDER: {LLM_PROVIDER}. "
-                    f"Currently only 'gemini' is supported. Set LLM_PROVIDER=gemini in .env"
-                )
+            #     text, token_info = ollama_chat(system, messages, max_tokens, temperature)
+            text, token_info = gemini_chat(system, messages, max_tokens, temperature, response_schema=response_schema)
+            if cache_key is not None:
+                put_response(cache_key, text, token_info)
+            return text, token_info
+        except Exception as e:
+            last_err = e
+            delay = _retry_delay(e, attempt, retry_backoff_sec)
+            if delay is None:
+                raise RuntimeError(f"LLM call failed (not retryable): {e}") from e
+            if attempt == retries:
+                break
+            time.sleep(delay)
+
+    raise RuntimeError(f"LLM call failed after {retries} attempts: {last_err}")
+
+
+async def acall_llm(
+    system: str,
+    messages: List[Dict[str, str]],
+    max_tokens: int = 1024,
+    temperature: Optional[float] = None,
+    retries: int = 8,
+    retry_backoff_sec: float = 2.0,
+    response_schema: Optional[type] = None,
+    cache: bool = True,
+) -> tuple[str, Dict[str, int]]:
+    """
+    Async counterpart of call_llm for callers on an event loop.
+
+    Same response cache, retry classification and backoff as call_llm, but the
+    request goes through the provider's async client and backoff sleeps are
+    awaited, so one event loop can have many calls in flight without a thread
+    per call.
+    """
+    temperature = DEFAULT_TEMP if temperature is None else temperature
+    cache_key = response_key(GEMINI_MODEL, system, messages, max_tokens, temperature, response_schema) if cache else None
+    if cache_key is not None:
+        cached = get_response(cache_key)
+        if cached is not None:
+            logger.debug("LLM response cache hit")
+            return cached
+    _check_provider()
+    last_err: Optional[Exception] = None
+
+    for attempt in range(1, retries + 1):
+        wait = _rate_limit_wait()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        await request_bucket.aacquire()
+        try:
+            text, token_info = await gemini_chat_async(
+                system, messages, max_tokens, temperature, response_schema=response_schema
+            )
+            if cache_key is not None:
+                put_response(cache_key, text, token_info)
+            return text, token_info
         except Exception as e:
             last_err = e
+            delay = _retry_delay(e, attempt, retry_backoff_sec)
+            if delay is None:
+                raise RuntimeError(f"LLM call failed (not retryable): {e}") from e
             if attempt == retries:
                 break
-            time.sleep(retry_backoff_sec * (2 ** (attempt - 1)))
+            await asyncio.sleep(delay)
 
     raise RuntimeError(f"LLM call failed after {retries} attempts: {last_err}")
 
+
+_ROW_MARKER_RE = re.compile(r"^===ROW (\d+)===[ \t]*$", re.MULTILINE)
+
+
+def _batch_prompt(prompts: List[str]) -> str:
+    rows = "".join(f"\n\n===ROW {i}===\n{prompt}" for i, prompt in enumerate(prompts, 1))
+    return (
+        f"The {len(prompts)} rows below are independent requests. Answer each one exactly as if it "
+        f"had been sent on its own. Start each answer with its marker line (===ROW 1===, "
+        f"===ROW 2===, ...) and write nothing else outside the answers."
+        f"{rows}"
+    )
+
+
+def _split_rows(text: str, n: int) -> List[Optional[str]]:
+    """Split a batched response on its row markers; rows that are missing or empty stay None."""
+    answers: List[Optional[str]] = [None] * n
+    markers = list(_ROW_MARKER_RE.finditer(text))
+    for m, nxt in zip(markers, markers[1:] + [None]):
+        row = int(m.group(1))
+        body = text[m.end():nxt.start() if nxt else len(text)].strip()
+        if 1 <= row <= n and body and answers[row - 1] is None:
+            answers[row - 1] = body
+    return answers
+
+
+async def acall_llm_batch(
+    system: str,
+    prompts: List[str],
+    max_tokens: int = 1024,
+    temperature: Optional[float] = None,
+    max_concurrency: Optional[int] = None,
+) -> List[str]:
+    """
+    Answer independent single-turn prompts with as few provider requests as possible.
+
+    Up to LLM_BATCH_MAX_ROWS prompts are row-marshalled into one acall_llm
+    request (delimited by ===ROW i=== markers) and the response is split back
+    per row; longer lists are split into groups of that size, sent concurrently
+    (at most `max_concurrency` requests in flight, LLM_MAX_CONCURRENCY by
+    default). Any row the model leaves out is retried on its own, so the
+    result always has one answer per prompt.
+
+    Args:
+        system: system prompt shared by every row
+        prompts: user prompts, one per row
+        max_tokens: max new tokens per row
+        temperature: sampling temperature; defaults from .env if None
+        max_concurrency: max provider requests in flight
+
+    Returns:
+        answers in the same order as `prompts`
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency or LLM_MAX_CONCURRENCY))
+
+    async def _one(prompt: str) -> str:
+        async with semaphore:
+            text, _ = await acall_llm(system, [{"role": "user", "content": prompt}], max_tokens, temperature)
+        return text
+
+    async def _group(group: List[str]) -> List[str]:
+        if len(group) == 1:
+            return [await _one(group[0])]
+        async with semaphore:
+            text, _ = await acall_llm(
+                system,
+                [{"role": "user", "content": _batch_prompt(group)}],
+                max_tokens=max_tokens * len(group),
+                temperature=temperature,
+            )
+        rows = _split_rows(text, len(group))
+        missing = [i for i, row in enumerate(rows) if row is None]
+        if missing:
+            logger.warning("Batched LLM response missing %d/%d rows - retrying them individually", len(missing), len(group))
+            for i, text in zip(missing, await asyncio.gather(*(_one(group[i]) for i in missing))):
+                rows[i] = text
+        return rows
+
+    rows_per_group = max(1, LLM_BATCH_MAX_ROWS)
+    groups = [prompts[start:start + rows_per_group] for start in range(0, len(prompts), rows_per_group)]
+    results = await asyncio.gather(*(_group(group) for group in groups))
+    return [answer for group_answers in results for answer in group_answers]
+
+
+def call_llm_batch(
+    system: str,
+    prompts: List[str],
+    max_tokens: int = 1024,
+    temperature: Optional[float] = None,
+    max_concurrency: Optional[int] = None,
+) -> List[str]:
+    """
+    Blocking acall_llm_batch, for callers in a thread without a running event loop.
+    """
+    return asyncio.run(acall_llm_batch(system, prompts, max_tokens, temperature, max_concurrency))
+
+
+
+async def call_llm_stream(
+    system: str,
+    messages: List[Dict[str, str]],
+    max_tokens: int = 1024,
+    temperature: Optional[float] = None,
+    retries: int = 8,
+    retry_backoff_sec: float = 2.0,
+) -> AsyncIterator[str]:
+    """
+    Streaming counterpart of call_llm: yields text deltas as they are generated.
+
+    Retries (with the same jittered backoff as call_llm) only apply before
+    the first token is yielded; once output has been streamed to the caller,
+    a failure is raised instead of restarting the response.
+
+    Args:
+        system: system prompt string
+        messages: list like [{"role":"user","content":"..."}]
+        max_tokens: max new tokens to generate
+        temperature: sampling temperature; defaults from .env if None
+        retries: retry attempts on transient errors (before first token)
+        retry_backoff_sec: exponential backoff base seconds
+
+    Yields:
+        text deltas (unstripped; concatenate for the full response)
+    """
+    temperature = DEFAULT_TEMP if temperature is None else temperature
+    _check_provider()
+    last_err: Optional[Exception] = None
+
+    for attempt in range(1, retries + 1):
+        wait = _rate_limit_wait()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        await request_bucket.aacquire()
+        started = False
+        try:
+            async for delta in gemini_chat_stream(system, messages, max_tokens, temperature):
+                started = True
+                yield delta
+            return
+        except Exception as e:
+            if started:
+                raise
+            last_err = e
+            delay = _retry_delay(e, attempt, retry_backoff_sec)
+            if delay is None:
+                raise RuntimeError(f"LLM stream failed (not retryable): {e}") from e
+            if attempt == retries:
+                break
+            await asyncio.sleep(delay)
+
+    raise RuntimeError(f"LLM stream failed after {retries} attempts: {last_err}")
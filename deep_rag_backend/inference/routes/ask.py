@@ -3,8 +3,9 @@ Ask route - Query existing documents using direct pipeline.
 """
 import logging
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from inference.routes.models import AskBody
-from inference.agents import run_deep_rag
+from inference.agents import arun_deep_rag, astream_deep_rag
 
 logger = logging.getLogger(__name__)
 
@@ -12,7 +13,7 @@ router = APIRouter()
 
 
 @router.post("/ask")
-def ask(body: AskBody):
+async def ask(body: AskBody):
     """
     Query existing documents in the vector database using direct pipeline.
     Assumes documents have already been ingested.
@@ -20,15 +21,32 @@ def ask(body: AskBody):
     
     If doc_id is provided, retrieval is filtered to that specific document.
     If doc_id is not provided, retrieval searches across all documents.
+    
+    Runs on the event loop (async LLM client, blocking stages in worker
+    threads), so concurrent requests are not limited by the threadpool size.
     """
     try:
         if body.doc_id:
             logger.info(f"Querying with document filter: {body.doc_id}...")
         if body.cross_doc:
             logger.info("Cross-document retrieval enabled")
-        answer = run_deep_rag(body.question, doc_id=body.doc_id, cross_doc=body.cross_doc)
+        answer = await arun_deep_rag(body.question, doc_id=body.doc_id, cross_doc=body.cross_doc)
         return {"answer": answer, "mode": "query_only", "pipeline": "direct", "doc_id": body.doc_id, "cross_doc": body.cross_doc}
     except Exception as e:
         logger.error(f"Error in /ask: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
+
+
+@router.post("/ask/stream")
+async def ask_stream(body: AskBody):
+    """
+    Streaming variant of /ask: returns the answer as plain text chunks
+    while the synthesizer generates it (direct pipeline).
+    """
+    if body.doc_id:
+        logger.info(f"Streaming query with document filter: {body.doc_id}...")
+    return StreamingResponse(
+        astream_deep_rag(body.question, doc_id=body.doc_id, cross_doc=body.cross_doc),
+        media_type="text/plain; charset=utf-8",
+    )
@@ -8,6 +8,8 @@ from pathlib import Path
 from typing import Optional
 from fastapi import APIRouter, HTTPException
 from retrieval.diagnostics import inspect_document
+from inference.llm.cache import get_llm_cache_stats
+from ingestion.file_types import IMAGE_EXTS
 
 logger = logging.getLogger(__name__)
 
@@ -70,7 +72,7 @@ def get_file_type_from_doc(result: dict) -> Optional[str]:
         return None
     
     path_lower = source_path.lower()
-    if path_lower.endswith('.png') or path_lower.endswith('.jpg') or path_lower.endswith('.jpeg'):
+    if os.path.splitext(path_lower)[1] in IMAGE_EXTS:
         # Check if it's OCR by looking at chunks
         page_dist = result.get("page_distribution", {})
         for page_info in page_dist.values():
@@ -85,6 +87,14 @@ def get_file_type_from_doc(result: dict) -> Optional[str]:
     return None
 
 
+@router.get("/diagnostics/llm_cache")
+def llm_cache_diagnostics():
+    """
+    Hit/miss statistics for the in-process LLM response cache.
+    """
+    return get_llm_cache_stats()
+
+
 @router.get("/diagnostics/document")
 def diagnostics(doc_title: Optional[str] = None, doc_id: Optional[str] = None):
     """
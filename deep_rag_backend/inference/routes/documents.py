@@ -4,7 +4,10 @@ Documents route - List and manage documents.
 import logging
 from typing import List, Dict, Optional
 from fastapi import APIRouter, HTTPException, Query
+# Imported for its index hook: API deletes also clear a persisted answer cache
+import inference.semantic_cache  # noqa: F401
 from retrieval.db_utils import connect
+from retrieval.invalidation import notify_index_changed
 
 logger = logging.getLogger(__name__)
 
@@ -94,6 +97,8 @@ def delete_document(doc_id: str) -> Dict[str, str]:
                             logger.warning(f"Failed to delete diagnostic report {report_file}: {e}")
             
             conn.commit()
+            # Cached retrievals and answers may still hold the deleted document's chunks
+            notify_index_changed()
             
             logger.info(f"Deleted document: doc_id={doc_id}, title={doc[1]}")
             
@@ -2,12 +2,21 @@
 Health check route.
 """
 import logging
+import time
+from typing import Any, Dict, Optional
 from fastapi import APIRouter, HTTPException
 from retrieval.db_utils import connect
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# A healthy schema check is reused for this long; probes in between only
+# round-trip SELECT 1 over a pooled connection instead of querying the catalog
+HEALTH_SCHEMA_TTL_SEC = 30.0
+
+_healthy_result: Optional[Dict[str, Any]] = None
+_healthy_until = 0.0
+
 
 @router.get("/health")
 def health():
@@ -16,10 +25,20 @@ def health():
     - API is running
     - Database connection is available
     - Required tables exist (documents, chunks, thread_tracking)
+
+    The table check is cached for HEALTH_SCHEMA_TTL_SEC after a healthy
+    result; the connection is still verified on every call.
     """
+    global _healthy_result, _healthy_until
     try:
         # Check database connection
         with connect() as conn, conn.cursor() as cur:
+            cached = _healthy_result
+            if cached is not None and time.monotonic() < _healthy_until:
+                cur.execute("SELECT 1")
+                cur.fetchone()
+                return cached
+
             # Verify required tables exist
             cur.execute("""
                 SELECT table_name 
@@ -43,12 +62,14 @@ def health():
                     "tables_required": required_tables
                 }
             
-            return {
+            _healthy_result = {
                 "ok": True,
                 "status": "healthy",
                 "database": "connected",
                 "tables": tables
             }
+            _healthy_until = time.monotonic() + HEALTH_SCHEMA_TTL_SEC
+            return _healthy_result
     except Exception as e:
         logger.error(f"Health check failed: {e}", exc_info=True)
         raise HTTPException(status_code=503, detail=f"Health check failed: {str(e)}")
@@ -1,6 +1,7 @@
 """
 Infer route - Combined ingestion and query using direct pipeline.
 """
+import asyncio
 import logging
 import os
 import tempfile
@@ -11,6 +12,7 @@ from inference.agents import run_deep_rag
 from ingestion.ingest import ingest as ingest_pdf
 from ingestion.ingest_text import ingest_text_file
 from ingestion.ingest_image import ingest_image
+from ingestion.file_types import PDF_EXT, TXT_EXT, IMAGE_EXTS
 from retrieval.retrieval import wait_for_chunks
 
 logger = logging.getLogger(__name__)
@@ -47,7 +49,7 @@ async def infer(
         if not attachment:
             if cross_doc:
                 logger.info("Cross-document retrieval enabled")
-            answer = run_deep_rag(question, cross_doc=cross_doc)
+            answer = await asyncio.to_thread(run_deep_rag, question, cross_doc=cross_doc)
             return {
                 "answer": answer,
                 "mode": "query_only",
@@ -69,18 +71,18 @@ async def infer(
         try:
             doc_id = None
             # Process based on file type
-            if file_ext in ['.pdf'] or 'pdf' in content_type:
-                doc_id = ingest_pdf(tmp_path, title=title)
+            if file_ext == PDF_EXT or 'pdf' in content_type:
+                doc_id = await asyncio.to_thread(ingest_pdf, tmp_path, title=title)
                 logger.info(f"✅ Ingested PDF: {attachment.filename}")
                 logger.info(f"📋 Document ID: {doc_id}")
                 
-            elif file_ext in ['.txt'] or 'text/plain' in content_type:
-                doc_id = ingest_text_file(tmp_path, title=title or attachment.filename)
+            elif file_ext == TXT_EXT or 'text/plain' in content_type:
+                doc_id = await asyncio.to_thread(ingest_text_file, tmp_path, title=title or attachment.filename)
                 logger.info(f"✅ Ingested text file: {attachment.filename}")
                 logger.info(f"📋 Document ID: {doc_id}")
                 
-            elif file_ext in ['.png', '.jpg', '.jpeg'] or 'image' in content_type:
-                doc_id = ingest_image(tmp_path, title=title or attachment.filename)
+            elif file_ext in IMAGE_EXTS or 'image' in content_type:
+                doc_id = await asyncio.to_thread(ingest_image, tmp_path, title=title or attachment.filename)
                 logger.info(f"✅ Ingested image: {attachment.filename}")
                 logger.info(f"📋 Document ID: {doc_id}")
                 
@@ -94,7 +96,7 @@ async def infer(
             if doc_id:
                 logger.info(f"Waiting for chunks for document {doc_id}...")
                 try:
-                    chunk_count = wait_for_chunks(doc_id, max_wait_seconds=40)
+                    chunk_count = await asyncio.to_thread(wait_for_chunks, doc_id, max_wait_seconds=40)
                     logger.info(f"Found {chunk_count} chunks, ready to query")
                 except TimeoutError as e:
                     logger.warning(f"Timeout waiting for chunks: {e}. Proceeding anyway.")
@@ -102,7 +104,7 @@ async def infer(
             # After ingestion, run the query with doc_id filter for document-specific retrieval
             if cross_doc:
                 logger.info("Cross-document retrieval enabled")
-            answer = run_deep_rag(question, doc_id=doc_id, cross_doc=cross_doc)
+            answer = await asyncio.to_thread(run_deep_rag, question, doc_id=doc_id, cross_doc=cross_doc)
             
             return {
                 "answer": answer,
@@ -1,16 +1,19 @@
 """
 Infer graph route - Combined ingestion and query using LangGraph pipeline.
 """
+import asyncio
 import logging
 import os
 import tempfile
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException
-from inference.graph.graph_wrapper import ask_with_graph
+from inference.graph.graph_wrapper import ask_with_graph_async
+from inference.routes.documents import delete_document
 from ingestion.ingest import ingest as ingest_pdf
 from ingestion.ingest_text import ingest_text_file
 from ingestion.ingest_image import ingest_image
+from ingestion.file_types import PDF_EXT, TXT_EXT, IMAGE_EXTS
 from retrieval.retrieval import wait_for_chunks
 from retrieval.db_utils import get_document_title
 from retrieval.thread_tracking.log import log_thread_interaction
@@ -19,6 +22,25 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Max attachments ingested at once per request
+INGEST_MAX_CONCURRENCY = int(os.getenv("INGEST_MAX_CONCURRENCY", "4"))
+
+
+def _ingester_for(upload: UploadFile):
+    """(ingest function, label) for an upload, or HTTP 400 if its type is unsupported."""
+    file_ext = Path(upload.filename).suffix.lower() if upload.filename else ""
+    content_type = upload.content_type or ""
+    if file_ext == PDF_EXT or 'pdf' in content_type:
+        return ingest_pdf, "PDF"
+    if file_ext == TXT_EXT or 'text/plain' in content_type:
+        return ingest_text_file, "text file"
+    if file_ext in IMAGE_EXTS or 'image' in content_type:
+        return ingest_image, "image"
+    raise HTTPException(
+        status_code=400,
+        detail=f"Unsupported file type: {file_ext}. Supported: PDF, TXT, PNG, JPEG"
+    )
+
 
 @router.post("/infer-graph")
 async def infer_graph(
@@ -72,7 +94,19 @@ async def infer_graph(
         # Process attachments if provided
         if attachments_list:
             logger.info(f"Ingesting {len(attachments_list)} attachment(s)")
-        for idx, upload in enumerate(attachments_list):
+        # Reject unsupported types before anything is ingested, so a bad file
+        # never leaves the other attachments behind as orphan documents
+        ingesters = [_ingester_for(upload) for upload in attachments_list]
+        # Attachments are ingested concurrently in worker threads (extraction,
+        # embedding and upserts of one file overlap with the others) without
+        # blocking the event loop; gather keeps the upload order
+        semaphore = asyncio.Semaphore(max(1, INGEST_MAX_CONCURRENCY))
+        # (filename, doc_id) of documents this request created; duplicates of
+        # documents already in the knowledge base are reused and never rolled back
+        created_docs: List[tuple] = []
+
+        async def _ingest_attachment(idx: int, upload: UploadFile) -> Optional[Dict[str, Any]]:
+            ingest_fn, label = ingesters[idx]
             file_ext = Path(upload.filename).suffix.lower() if upload.filename else ""
             content_type = upload.content_type or ""
             tmp_path = None
@@ -89,45 +123,54 @@ async def infer_graph(
                 if not title_to_use:
                     title_to_use = "Uploaded Document"
 
-                if file_ext in ['.pdf'] or 'pdf' in content_type:
-                    generated_doc_id = ingest_pdf(tmp_path, title=title_to_use)
-                    logger.info(f"✅ Ingested PDF ({idx + 1}/{len(attachments_list)}): {upload.filename}")
-
-                elif file_ext in ['.txt'] or 'text/plain' in content_type:
-                    generated_doc_id = ingest_text_file(tmp_path, title=title_to_use)
-                    logger.info(f"✅ Ingested text file ({idx + 1}/{len(attachments_list)}): {upload.filename}")
-
-                elif file_ext in ['.png', '.jpg', '.jpeg'] or 'image' in content_type:
-                    generated_doc_id = ingest_image(tmp_path, title=title_to_use)
-                    logger.info(f"✅ Ingested image ({idx + 1}/{len(attachments_list)}): {upload.filename}")
-
-                else:
-                    raise HTTPException(
-                        status_code=400,
-                        detail=f"Unsupported file type: {file_ext}. Supported: PDF, TXT, PNG, JPEG"
+                async with semaphore:
+                    generated_doc_id, created = await asyncio.to_thread(
+                        ingest_fn, tmp_path, title=title_to_use, return_created=True
                     )
+                if generated_doc_id and created:
+                    created_docs.append((upload.filename, generated_doc_id))
+                logger.info(f"✅ Ingested {label} ({idx + 1}/{len(attachments_list)}): {upload.filename}")
 
-                if generated_doc_id:
-                    uploaded_doc_ids.append(generated_doc_id)
-                    attachment_metadata.append({
-                        "filename": upload.filename,
-                        "file_type": file_ext or content_type,
-                        "doc_id": generated_doc_id,
-                        "title": title_to_use
-                    })
-                    if doc_id is None:
-                        doc_id = generated_doc_id  # Preserve first doc_id for backward compatibility
-
-                    logger.info(f"📋 Document ID: {generated_doc_id}")
-                    logger.info(f"Waiting for chunks for document {generated_doc_id}...")
-                    try:
-                        chunk_count = wait_for_chunks(generated_doc_id, max_wait_seconds=40)
-                        logger.info(f"Found {chunk_count} chunks for {generated_doc_id}, ready to query")
-                    except TimeoutError as e:
-                        logger.warning(f"Timeout waiting for chunks for {generated_doc_id}: {e}. Proceeding anyway.")
+                if not generated_doc_id:
+                    return None
+                logger.info(f"📋 Document ID: {generated_doc_id}")
+                logger.info(f"Waiting for chunks for document {generated_doc_id}...")
+                try:
+                    chunk_count = await asyncio.to_thread(wait_for_chunks, generated_doc_id, max_wait_seconds=40)
+                    logger.info(f"Found {chunk_count} chunks for {generated_doc_id}, ready to query")
+                except TimeoutError as e:
+                    logger.warning(f"Timeout waiting for chunks for {generated_doc_id}: {e}. Proceeding anyway.")
+                return {
+                    "filename": upload.filename,
+                    "file_type": file_ext or content_type,
+                    "doc_id": generated_doc_id,
+                    "title": title_to_use
+                }
             finally:
                 if tmp_path and os.path.exists(tmp_path):
                     os.unlink(tmp_path)
+
+        ingested = await asyncio.gather(
+            *(_ingest_attachment(idx, upload) for idx, upload in enumerate(attachments_list)),
+            return_exceptions=True
+        )
+        failures = [r for r in ingested if isinstance(r, BaseException)]
+        if failures:
+            # All or nothing: delete the documents this request created before failing it
+            for filename, created_doc_id in created_docs:
+                try:
+                    await asyncio.to_thread(delete_document, created_doc_id)
+                    logger.info(f"Rolled back attachment {filename} (doc_id={created_doc_id})")
+                except Exception as e:
+                    logger.error(f"Failed to roll back attachment {filename} (doc_id={created_doc_id}): {e}")
+            raise failures[0]
+        for meta in ingested:
+            if meta is None:
+                continue
+            uploaded_doc_ids.append(meta["doc_id"])
+            attachment_metadata.append(meta)
+        if uploaded_doc_ids:
+            doc_id = uploaded_doc_ids[0]  # Preserve first doc_id for backward compatibility
         
         # Parse selected_doc_ids if provided (JSON string)
         selected_doc_ids_list = None
@@ -189,7 +232,7 @@ async def infer_graph(
         
         if cross_doc:
             logger.info("Cross-document retrieval enabled")
-        result = ask_with_graph(
+        result = await ask_with_graph_async(
             question,
             thread_id=thread_id_value,
             doc_id=doc_id_for_graph,  # Keep for backward compatibility
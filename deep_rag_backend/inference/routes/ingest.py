@@ -1,6 +1,7 @@
 """
 Ingest route - Ingest documents without querying.
 """
+import asyncio
 import logging
 import os
 import tempfile
@@ -10,6 +11,7 @@ from fastapi import APIRouter, UploadFile, File, Form, HTTPException
 from ingestion.ingest import ingest as ingest_pdf
 from ingestion.ingest_text import ingest_text_file
 from ingestion.ingest_image import ingest_image
+from ingestion.file_types import PDF_EXT, TXT_EXT, IMAGE_EXTS
 
 logger = logging.getLogger(__name__)
 
@@ -45,21 +47,21 @@ async def ingest_endpoint(
             doc_id = None
             # Process based on file type
             logger.info(f"Processing file type: {file_ext} (content_type: {content_type})")
-            if file_ext in ['.pdf'] or 'pdf' in content_type:
+            if file_ext == PDF_EXT or 'pdf' in content_type:
                 logger.info(f"Starting PDF ingestion...")
-                doc_id = ingest_pdf(tmp_path, title=title)
+                doc_id = await asyncio.to_thread(ingest_pdf, tmp_path, title=title)
                 logger.info(f"✅ Ingested PDF: {attachment.filename}")
                 logger.info(f"📋 Document ID: {doc_id}")
                 
-            elif file_ext in ['.txt'] or 'text/plain' in content_type:
+            elif file_ext == TXT_EXT or 'text/plain' in content_type:
                 logger.info(f"Starting text file ingestion...")
-                doc_id = ingest_text_file(tmp_path, title=title or attachment.filename)
+                doc_id = await asyncio.to_thread(ingest_text_file, tmp_path, title=title or attachment.filename)
                 logger.info(f"✅ Ingested text file: {attachment.filename}")
                 logger.info(f"📋 Document ID: {doc_id}")
                 
-            elif file_ext in ['.png', '.jpg', '.jpeg'] or 'image' in content_type:
+            elif file_ext in IMAGE_EXTS or 'image' in content_type:
                 logger.info(f"Starting image ingestion...")
-                doc_id = ingest_image(tmp_path, title=title or attachment.filename)
+                doc_id = await asyncio.to_thread(ingest_image, tmp_path, title=title or attachment.filename)
                 logger.info(f"✅ Ingested image: {attachment.filename}")
                 logger.info(f"📋 Document ID: {doc_id}")
                 
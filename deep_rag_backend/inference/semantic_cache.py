@@ -0,0 +1,308 @@
+"""
+In-process semantic answer cache for the CLI query commands.
+
+Answers are keyed on the question embedding (same CLIP text encoder used for
+retrieval) within a scope (pipeline, doc_id, cross_doc, ...). A repeated or
+paraphrased question whose cosine similarity to a cached one is at least
+SEMANTIC_CACHE_THRESHOLD returns the cached answer without running any LLM.
+
+Cached embeddings are held int8-quantized (one symmetric scale per vector),
+a quarter of the float32 footprint; at the hit threshold the quantization
+error (~1e-3 in cosine) is negligible.
+
+Entries can optionally be persisted to SEMANTIC_CACHE_PATH (embeddings via
+numpy.save plus a JSON sidecar) so hits carry across CLI invocations. Expiry
+times are wall-clock (time.time) so they stay valid in the next process.
+
+Off by default: a paraphrase can still match a different question. When on,
+ingesting or deleting a document drops every cached answer, since any of
+them may be stale: invalidate_semantic_cache is registered as a retrieval
+index hook when this module is imported.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional, Tuple
+import numpy as np
+from dotenv import load_dotenv
+from retrieval.invalidation import register_index_hook
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+SEMANTIC_CACHE_ENABLED = os.getenv('SEMANTIC_CACHE_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+# CLIP text embeddings sit closer together than sentence-transformer ones, so the
+# threshold is stricter than the usual ~0.87 to avoid matching unrelated questions
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv('SEMANTIC_CACHE_THRESHOLD', '0.92'))
+SEMANTIC_CACHE_MAXSIZE = int(os.getenv('SEMANTIC_CACHE_MAXSIZE', '256'))
+SEMANTIC_CACHE_TTL_SEC = float(os.getenv('SEMANTIC_CACHE_TTL_SEC', '3600'))
+SEMANTIC_CACHE_PATH = os.getenv('SEMANTIC_CACHE_PATH', '')
+
+
+def _normalize_question(question: str) -> str:
+    return " ".join(question.lower().split())
+
+
+def quantize_int8(emb: np.ndarray) -> Tuple[np.ndarray, float]:
+    """Symmetric int8 quantization: returns (codes, scale) with emb ~= codes * scale."""
+    peak = float(np.max(np.abs(emb))) if emb.size else 0.0
+    scale = peak / 127.0 if peak > 0 else 1.0
+    return np.clip(np.rint(emb / scale), -127, 127).astype(np.int8), scale
+
+
+def _default_embed(text: str) -> np.ndarray:
+    # Lazy import: loads the CLIP model only when the cache is first consulted.
+    # Goes through the turn cache so retrieval reuses this embedding.
+    from retrieval.embed_cache import embed_query
+    return embed_query(text)
+
+
+class SemanticCache:
+    """
+    LRU cache of answers keyed by (scope, normalized question), matched semantically.
+
+    Lookups first try the exact normalized question, then compare the question
+    embedding against every cached embedding in the same scope with one matmul.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 256,
+        threshold: float = 0.92,
+        ttl_sec: float = 3600.0,
+        path: str = "",
+        embed_fn: Optional[Callable[[str], np.ndarray]] = None,
+    ):
+        self.maxsize = maxsize
+        self.threshold = threshold
+        self.ttl_sec = ttl_sec
+        self.path = path
+        self._embed_fn = embed_fn or _default_embed
+        # key -> (int8 embedding, scale, value, expires_at as time.time()); key is (scope, normalized question)
+        self._data: "OrderedDict[Tuple[Hashable, str], tuple]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        if path:
+            self._load()
+
+    def _embed(self, question: str) -> np.ndarray:
+        emb = np.asarray(self._embed_fn(question), dtype=np.float32)
+        norm = np.linalg.norm(emb)
+        return emb / norm if norm > 0 else emb
+
+    def _drop_expired(self) -> None:
+        now = time.time()
+        for key in [k for k, (_, _, _, expires_at) in self._data.items() if expires_at < now]:
+            del self._data[key]
+
+    def get(self, question: str, scope: Hashable = None) -> Tuple[Optional[Any], Optional[np.ndarray]]:
+        """
+        Return (cached value or None, question embedding).
+
+        The embedding (None on an exact-key hit) can be passed back to put() so
+        a miss does not embed the question twice.
+        """
+        key = (scope, _normalize_question(question))
+        with self._lock:
+            self._drop_expired()
+            entry = self._data.get(key)
+            if entry is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return entry[2], None
+            candidates = [k for k in self._data if k[0] == scope]
+
+        emb = self._embed(question)
+        if not candidates:
+            with self._lock:
+                self.misses += 1
+            return None, emb
+
+        with self._lock:
+            candidates = [k for k in candidates if k in self._data]
+            if candidates:
+                entries = [self._data[k] for k in candidates]
+                # Dequantize on the fly: (codes @ q) * per-vector scale
+                codes = np.stack([e[0] for e in entries]).astype(np.float32)
+                sims = (codes @ emb) * np.array([e[1] for e in entries], dtype=np.float32)
+                best = int(np.argmax(sims))
+                if sims[best] >= self.threshold:
+                    self._data.move_to_end(candidates[best])
+                    self.hits += 1
+                    logger.info("Semantic cache hit (similarity %.3f)", sims[best])
+                    return entries[best][2], emb
+            self.misses += 1
+            return None, emb
+
+    def put(self, question: str, value: Any, scope: Hashable = None, emb: Optional[np.ndarray] = None) -> None:
+        """Cache `value` for `question` in `scope`, evicting the LRU entry if over capacity."""
+        if emb is None:
+            emb = self._embed(question)
+        key = (scope, _normalize_question(question))
+        codes, scale = quantize_int8(emb)
+        with self._lock:
+            self._data[key] = (codes, scale, value, time.time() + self.ttl_sec)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+            if self.path:
+                self._save()
+
+    def clear(self) -> None:
+        """Drop every entry (and the persisted ones) and reset the counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+            if self.path:
+                self._save()
+
+    def _save(self) -> None:
+        """Persist entries: int8 embeddings to <path>.npy, keys/scales/values/expiry to <path>.json."""
+        keys = list(self._data)
+        try:
+            if keys:
+                np.save(f"{self.path}.npy", np.stack([self._data[k][0] for k in keys]))
+            meta = [
+                {"scope": list(k[0]) if isinstance(k[0], tuple) else k[0], "question": k[1],
+                 "scale": self._data[k][1], "value": self._data[k][2], "expires_at": self._data[k][3]}
+                for k in keys
+            ]
+            with open(f"{self.path}.json", "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning("Could not persist semantic cache to %s: %s", self.path, e)
+
+    def _load(self) -> None:
+        try:
+            with open(f"{self.path}.json", encoding="utf-8") as f:
+                meta = json.load(f)
+            embs = np.load(f"{self.path}.npy") if meta else None
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning("Could not load semantic cache from %s: %s", self.path, e)
+            return
+        now = time.time()
+        for row, item in enumerate(meta):
+            # Files written before expires_at hold a monotonic-clock ttl_left,
+            # meaningless in another process; those entries are dropped
+            if item.get("expires_at", 0) <= now:
+                continue
+            scope = tuple(item["scope"]) if isinstance(item["scope"], list) else item["scope"]
+            if "scale" in item:
+                codes, scale = embs[row].astype(np.int8), float(item["scale"])
+            else:
+                # Files written before quantization hold float32 embeddings
+                codes, scale = quantize_int8(embs[row])
+            self._data[(scope, item["question"])] = (codes, scale, item["value"], item["expires_at"])
+        logger.debug("Loaded %d semantic cache entries from %s", len(self._data), self.path)
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "threshold": self.threshold,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+
+def persisted_stats(path: Optional[str] = None) -> Dict[str, Any]:
+    """Entry counts in the persisted cache file, i.e. what the next CLI process will load."""
+    path = SEMANTIC_CACHE_PATH if path is None else path
+    if not path:
+        return {"path": None, "entries": 0, "live": 0}
+    try:
+        with open(f"{path}.json", encoding="utf-8") as f:
+            meta = json.load(f)
+    except FileNotFoundError:
+        return {"path": path, "entries": 0, "live": 0}
+    except (OSError, ValueError) as e:
+        return {"path": path, "error": str(e)}
+    now = time.time()
+    return {"path": path, "entries": len(meta), "live": sum(1 for item in meta if item.get("expires_at", 0) > now)}
+
+
+_cache: Optional[SemanticCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_semantic_cache() -> SemanticCache:
+    """Get or create the process-wide semantic cache."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = SemanticCache(
+                    maxsize=SEMANTIC_CACHE_MAXSIZE,
+                    threshold=SEMANTIC_CACHE_THRESHOLD,
+                    ttl_sec=SEMANTIC_CACHE_TTL_SEC,
+                    path=SEMANTIC_CACHE_PATH,
+                )
+    return _cache
+
+
+@register_index_hook
+def invalidate_semantic_cache() -> None:
+    """Drop every cached answer, persisted ones included (the document index changed)."""
+    if not SEMANTIC_CACHE_ENABLED or (_cache is None and not SEMANTIC_CACHE_PATH):
+        return
+    get_semantic_cache().clear()
+
+
+def cached_answer(question: str, scope: Hashable, compute: Callable[[], Any]) -> Tuple[Any, bool]:
+    """
+    Return (answer, from_cache) for `question` in `scope`, calling `compute()` on a miss.
+
+    With SEMANTIC_CACHE_ENABLED=false this always calls `compute()`.
+    """
+    if not SEMANTIC_CACHE_ENABLED:
+        return compute(), False
+    from retrieval.embed_cache import turn_embedding_cache
+    # One turn: retrieval inside compute() reuses the lookup's question embedding
+    with turn_embedding_cache():
+        cache = get_semantic_cache()
+        value, emb = cache.get(question, scope)
+        if value is not None:
+            return value, True
+        value = compute()
+    cache.put(question, value, scope, emb=emb)
+    return value, False
+
+
+def cached_stream(question: str, scope: Hashable, stream: Callable[[], Iterator[str]]) -> Iterator[str]:
+    """
+    Streaming counterpart of cached_answer: yields the cached answer in one piece
+    on a hit, otherwise yields from `stream()` and caches the joined text.
+    """
+    if not SEMANTIC_CACHE_ENABLED:
+        yield from stream()
+        return
+    from retrieval.embed_cache import turn_embedding_cache
+    cache = get_semantic_cache()
+    with turn_embedding_cache():
+        value, emb = cache.get(question, scope)
+        if value is None:
+            # Retrieval happens before the first delta, so pulling it inside the
+            # turn lets the pipeline reuse the lookup's question embedding
+            deltas = stream()
+            first = next(deltas, None)
+    if value is not None:
+        yield value
+        return
+    parts = []
+    if first is not None:
+        parts.append(first)
+        yield first
+    for delta in deltas:
+        parts.append(delta)
+        yield delta
+    cache.put(question, "".join(parts), scope, emb=emb)
@@ -0,0 +1,60 @@
+"""
+Thin client for the `serve` CLI command.
+
+    with ServeClient() as client:
+        print(client.request("query", question="What is RAG?")["answer"])
+
+Starts `python -m inference.cli serve` once and sends every request over its
+stdin/stdout, so the pipeline's startup cost is paid once for many questions.
+"""
+import itertools
+import json
+import subprocess
+import sys
+from typing import Any, Dict, List, Optional
+
+
+class ServeClient:
+    """JSON-lines client for a `serve` subprocess (one request in flight at a time)."""
+
+    def __init__(self, command: Optional[List[str]] = None, cwd: Optional[str] = None):
+        self._proc = subprocess.Popen(
+            command or [sys.executable, "-m", "inference.cli", "serve"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            cwd=cwd,
+        )
+        self._ids = itertools.count(1)
+
+    def request(self, cmd: str, **args: Any) -> Dict[str, Any]:
+        """Send one command and return its result; raises RuntimeError if the server reports an error."""
+        request_id = next(self._ids)
+        self._proc.stdin.write(json.dumps({"id": request_id, "cmd": cmd, "args": args}) + "\n")
+        self._proc.stdin.flush()
+        line = self._proc.stdout.readline()
+        if not line:
+            raise RuntimeError(f"serve process exited (code {self._proc.poll()})")
+        reply = json.loads(line)
+        if not reply.get("ok"):
+            raise RuntimeError(reply.get("error", "unknown error"))
+        return reply["result"]
+
+    def close(self) -> None:
+        if self._proc.poll() is None:
+            self._proc.stdin.close()
+            self._proc.wait()
+
+    def __enter__(self) -> "ServeClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+if __name__ == "__main__":
+    # Minimal CLI client: one question per stdin line, one answer per stdout line
+    with ServeClient() as client:
+        for question in sys.stdin:
+            if question.strip():
+                print(json.dumps(client.request("query", question=question.strip())))
@@ -10,12 +10,15 @@ Chunk database operations.
 # pyright: reportUnknownLambdaType=false
 # pyright: reportMissingImports=false
 import logging
+import os
 from uuid import uuid4
-from typing import List, Tuple, Optional, Any
+from typing import List, Tuple, Optional, Any, Sequence
 
 try:
-    from psycopg2.extras import Json  # type: ignore[reportMissingImports]
+    from psycopg2.extras import Json, execute_values  # type: ignore[reportMissingImports]
 except ImportError:  # pragma: no cover
+    execute_values = None
+
     class Json(dict):  # type: ignore[override]
         """Fallback Json wrapper when psycopg2 is unavailable."""
         def __init__(self, value: Any):
@@ -25,6 +28,32 @@ from ingestion.embeddings import embed_text, embed_image, embed_multi_modal
 
 logger = logging.getLogger(__name__)
 
+# Rows per multi-row INSERT when writing chunks
+INSERT_BATCH_SIZE = int(os.getenv('INGEST_INSERT_BATCH_SIZE', '500'))
+
+_CHUNK_INSERT_SQL = """
+  INSERT INTO chunks (
+    chunk_id, doc_id, page_start, page_end, section, text,
+    is_ocr, is_figure, content_type, image_path,
+    lex, emb, meta
+  )
+  VALUES %s
+"""
+_CHUNK_ROW_TEMPLATE = "(%s,%s,%s,%s,%s,%s,%s,%s,%s,%s, to_tsvector('simple', unaccent(%s)), %s, %s)"
+
+
+def insert_chunk_rows(cur: Any, rows: Sequence[Tuple], batch_size: Optional[int] = None) -> None:
+    """
+    Insert prepared chunk rows with multi-row INSERTs (execute_values).
+    
+    Each row is (chunk_id, doc_id, page_start, page_end, section, text, is_ocr,
+    is_figure, content_type, image_path, lex_text, emb, meta); lex_text is passed
+    through to_tsvector('simple', unaccent(...)).
+    """
+    if not rows:
+        return
+    execute_values(cur, _CHUNK_INSERT_SQL, rows, template=_CHUNK_ROW_TEMPLATE, page_size=batch_size or INSERT_BATCH_SIZE)
+
 
 def upsert_chunks(cur: Any, doc_id: str, chunks: List[Tuple], temp_dir: Optional[str] = None) -> None:
     """
@@ -40,6 +69,7 @@ def upsert_chunks(cur: Any, doc_id: str, chunks: List[Tuple], temp_dir: Optional
     """
     logger.info(f"Upserting {len(chunks)} chunks for document {doc_id}")
     
+    rows: List[Tuple] = []
     for chunk_index, chunk_data in enumerate(chunks):
         try:
             # Handle both old format (5-tuple) and new format (8-tuple)
@@ -94,24 +124,15 @@ def upsert_chunks(cur: Any, doc_id: str, chunks: List[Tuple], temp_dir: Optional
                 continue
             
             cid = str(uuid4())
-            
-            # Insert into database with multi-modal support
-            cur.execute("""
-              INSERT INTO chunks (
-                chunk_id, doc_id, page_start, page_end, section, text, 
-                is_ocr, is_figure, content_type, image_path,
-                lex, emb, meta
-              )
-              VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s, to_tsvector('simple', unaccent(%s)), %s, %s)
-            """, (
+            rows.append((
                 cid, doc_id, p0, p1, None, text,
                 is_ocr, is_fig, content_type, image_path,
-                text, emb.tolist(), 
+                text, emb.tolist(),
                 Json({"len": len(text), "content_type": content_type})
             ))
             
             logger.info(
-                f"Chunk {chunk_index} inserted: chunk_id={cid}, "
+                f"Chunk {chunk_index} prepared: chunk_id={cid}, "
                 f"pages={p0}-{p1}, content_type={content_type}, "
                 f"tokens={len(text.split()) if text else 0}, "
                 f"has_image={image is not None}",
@@ -131,7 +152,7 @@ def upsert_chunks(cur: Any, doc_id: str, chunks: List[Tuple], temp_dir: Optional
             )
         except Exception as e:
             logger.error(
-                f"Failed to insert chunk {chunk_index}: {e}",
+                f"Failed to prepare chunk {chunk_index}: {e}",
                 exc_info=True,
                 extra={
                     "chunk_index": chunk_index,
@@ -140,5 +161,6 @@ def upsert_chunks(cur: Any, doc_id: str, chunks: List[Tuple], temp_dir: Optional
             )
             raise
     
-    logger.info(f"Successfully upserted {len(chunks)} chunks for document {doc_id}")
+    insert_chunk_rows(cur, rows)
+    logger.info(f"Successfully upserted {len(rows)}/{len(chunks)} chunks for document {doc_id}")
 
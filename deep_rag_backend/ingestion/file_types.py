@@ -0,0 +1,6 @@
+"""
+File extensions accepted by the upload/CLI ingestion paths.
+"""
+PDF_EXT = '.pdf'
+TXT_EXT = '.txt'
+IMAGE_EXTS = frozenset({'.png', '.jpg', '.jpeg'})
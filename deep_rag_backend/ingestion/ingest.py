@@ -9,6 +9,7 @@ import logging
 import shutil
 from pathlib import Path
 from retrieval.db_utils import connect
+from retrieval.wait import mark_chunks_committed
 
 from ingestion.pdf_extract import pdf_extract
 from ingestion.chunking import semantic_chunks
@@ -18,16 +19,18 @@ from ingestion.title_extract import extract_title
 logger = logging.getLogger(__name__)
 
 
-def ingest(pdf_path: str, title: str = None) -> str:
+def ingest(pdf_path: str, title: str = None, return_created: bool = False):
     """
     Ingest a PDF file into the vector database.
     
     Args:
         pdf_path: Path to PDF file
         title: Optional title for the document
+        return_created: If True, return (doc_id, created) instead of doc_id;
+            created is False when an existing duplicate document was reused
         
     Returns:
-        Document ID (UUID string)
+        Document ID (UUID string), or (doc_id, created) with return_created
         
     Raises:
         FileNotFoundError: If PDF file does not exist
@@ -98,6 +101,7 @@ def ingest(pdf_path: str, title: str = None) -> str:
                 
                 conn.commit()
                 logger.info(f"Ingestion complete: doc_id={doc_id}, {len(chunks)} chunks stored")
+                mark_chunks_committed(doc_id, len(chunks))
     finally:
         # Clean up temp directory
         if temp_dir and os.path.exists(temp_dir):
@@ -107,6 +111,8 @@ def ingest(pdf_path: str, title: str = None) -> str:
                 logger.warning(f"Failed to clean up temp directory: {e}")
     
     print(f"Ingested: {resolved_path} (title: {final_title}, {len(chunks)} chunks)")
+    if return_created:
+        return doc_id, not is_duplicate
     return doc_id
 
 
@@ -27,6 +27,8 @@ logger = logging.getLogger(__name__)
 from ingestion.embeddings import embed_text, embed_multi_modal
 
 from retrieval.db_utils import connect
+from ingestion.db_ops.chunks import insert_chunk_rows
+from retrieval.wait import mark_chunks_committed
 
 def extract_text_from_image(image_path: str) -> str:
     """
@@ -66,6 +68,7 @@ def upsert_chunks(cur: Any, doc_id: str, chunks: Sequence[Tuple[Any, ...]]) -> N
     """Insert chunks with embeddings."""
     logger.info(f"Upserting {len(chunks)} chunks for image document {doc_id}")
     
+    rows: List[Tuple[Any, ...]] = []
     for chunk_index, chunk_data in enumerate(chunks):
         try:
             # Handle both old format (5-tuple) and new format (7-tuple)
@@ -91,22 +94,22 @@ def upsert_chunks(cur: Any, doc_id: str, chunks: Sequence[Tuple[Any, ...]]) -> N
                 continue
             
             cid = str(uuid4())
-            
-            cur.execute("""
-              INSERT INTO chunks (chunk_id, doc_id, page_start, page_end, section, text, is_ocr, is_figure, content_type, image_path, lex, emb, meta)
-              VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s, to_tsvector('simple', unaccent(%s)), %s, %s)
-            """, (cid, doc_id, p0, p1, None, text, is_ocr, is_fig, 'image', image_path, text, emb.tolist(), pe.Json({"len": len(text), "source": "image"})))
+            rows.append((cid, doc_id, p0, p1, None, text, is_ocr, is_fig, 'image', image_path, text, emb.tolist(), pe.Json({"len": len(text), "source": "image"})))
             
         except Exception as e:
-            logger.error(f"Failed to insert chunk {chunk_index}: {e}", exc_info=True)
+            logger.error(f"Failed to prepare chunk {chunk_index}: {e}", exc_info=True)
             raise
     
-    logger.info(f"Successfully upserted {len(chunks)} chunks for image document {doc_id}")
+    insert_chunk_rows(cur, rows)
+    logger.info(f"Successfully upserted {len(rows)}/{len(chunks)} chunks for image document {doc_id}")
 
-def ingest_image(image_path: str, title: Optional[str] = None) -> str:
+def ingest_image(image_path: str, title: Optional[str] = None, return_created: bool = False):
     """
     Ingest an image file (PNG, JPEG) into the vector database.
     
+    Returns the doc_id, or (doc_id, created) with return_created; created is
+    False when an existing duplicate document was reused.
+    
     Current implementation:
     - Extracts text via OCR (Tesseract)
     - Uses text-only embeddings (BAAI/bge-m3)
@@ -195,7 +198,10 @@ def ingest_image(image_path: str, title: Optional[str] = None) -> str:
             
             conn.commit()
             logger.info(f"Ingestion complete: doc_id={doc_id}, {len(chunks)} chunks stored")
+            mark_chunks_committed(doc_id, len(chunks))
     
     print(f"Ingested: {image_path} (title: {title}, {len(chunks)} chunks)")
+    if return_created:
+        return doc_id, existing is None
     return doc_id
 
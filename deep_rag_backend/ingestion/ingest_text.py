@@ -20,6 +20,8 @@ def normalize(v: np.ndarray) -> np.ndarray:
     return v / max(n, 1e-12)
 
 from retrieval.db_utils import connect
+from ingestion.db_ops.chunks import insert_chunk_rows
+from retrieval.wait import mark_chunks_committed
 
 def semantic_chunks_text(text: str, max_words=25, overlap=12):
     """
@@ -64,6 +66,7 @@ def upsert_chunks(cur, doc_id, chunks):
     """Insert chunks with embeddings."""
     logger.info(f"Upserting {len(chunks)} chunks for document {doc_id}")
     
+    rows = []
     for chunk_index, (text, p0, p1, is_ocr, is_fig) in enumerate(chunks):
         try:
             # Generate embedding - skip chunk if embedding fails
@@ -75,21 +78,21 @@ def upsert_chunks(cur, doc_id, chunks):
                 continue
             
             cid = str(uuid4())
-            
-            cur.execute("""
-              INSERT INTO chunks (chunk_id, doc_id, page_start, page_end, section, text, is_ocr, is_figure, content_type, lex, emb, meta)
-              VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s, to_tsvector('simple', unaccent(%s)), %s, %s)
-            """, (cid, doc_id, p0, p1, None, text, is_ocr, is_fig, 'text', text, emb.tolist(), pe.Json({"len": len(text), "content_type": "text"})))
+            rows.append((cid, doc_id, p0, p1, None, text, is_ocr, is_fig, 'text', None, text, emb.tolist(), pe.Json({"len": len(text), "content_type": "text"})))
             
         except Exception as e:
-            logger.error(f"Failed to insert chunk {chunk_index}: {e}", exc_info=True)
+            logger.error(f"Failed to prepare chunk {chunk_index}: {e}", exc_info=True)
             raise
     
-    logger.info(f"Successfully upserted {len(chunks)} chunks for document {doc_id}")
+    insert_chunk_rows(cur, rows)
+    logger.info(f"Successfully upserted {len(rows)}/{len(chunks)} chunks for document {doc_id}")
 
-def ingest_text_file(text_path: str, title: str = None):
+def ingest_text_file(text_path: str, title: str = None, return_created: bool = False):
     """
     Ingest a plain text file into the vector database.
+    
+    Returns the doc_id, or (doc_id, created) with return_created; created is
+    False when an existing duplicate document was reused.
     """
     if not os.path.exists(text_path):
         raise FileNotFoundError(f"Text file not found: {text_path}")
@@ -127,8 +130,9 @@ def ingest_text_file(text_path: str, title: str = None):
             (doc_id,)
         )
         existing_chunks = cur.fetchone()[0]
+        created = existing_chunks == 0
         
-        if existing_chunks > 0:
+        if not created:
             # Duplicate found - document and chunks already exist
             logger.info(f"Duplicate document found: doc_id={doc_id}, title={title}")
             logger.info(f"Using existing document: doc_id={doc_id}, title={title}")
@@ -139,7 +143,10 @@ def ingest_text_file(text_path: str, title: str = None):
             
             conn.commit()
             logger.info(f"Ingestion complete: doc_id={doc_id}, {len(chunks)} chunks stored")
+            mark_chunks_committed(doc_id, len(chunks))
     
     print(f"Ingested: {text_path} (title: {title}, {len(chunks)} chunks)")
+    if return_created:
+        return doc_id, created
     return doc_id
 
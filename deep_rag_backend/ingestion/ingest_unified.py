@@ -24,6 +24,8 @@ SUPPORTED_EXTENSIONS = {
     'text': ['.txt', '.text', '.md', '.markdown'],
     'image': ['.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tiff', '.webp']
 }
+# Extension -> file type, so detection is one dict lookup
+_TYPE_BY_EXTENSION = {ext: file_type for file_type, exts in SUPPORTED_EXTENSIONS.items() for ext in exts}
 
 def get_file_type(file_path: str) -> Optional[str]:
     """
@@ -35,13 +37,7 @@ def get_file_type(file_path: str) -> Optional[str]:
     Returns:
         'pdf', 'text', 'image', or None if unsupported
     """
-    ext = Path(file_path).suffix.lower()
-    
-    for file_type, extensions in SUPPORTED_EXTENSIONS.items():
-        if ext in extensions:
-            return file_type
-    
-    return None
+    return _TYPE_BY_EXTENSION.get(Path(file_path).suffix.lower())
 
 def ingest_file(file_path: str, title: Optional[str] = None):
     """
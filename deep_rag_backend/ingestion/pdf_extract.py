@@ -3,6 +3,7 @@ PDF extraction utilities.
 """
 import re
 import logging
+import threading
 import fitz  # PyMuPDF
 from pdf2image import convert_from_path
 import pytesseract
@@ -12,6 +13,12 @@ from typing import List, Dict
 
 logger = logging.getLogger(__name__)
 
+# PyMuPDF does not support concurrent use from multiple threads; parallel
+# ingestion (ingest-batch --workers) holds this lock only for the PyMuPDF calls,
+# while OCR (pdf2image + tesseract), image decoding, embedding and DB writes
+# overlap across workers
+FITZ_LOCK = threading.Lock()
+
 
 def pdf_extract(path: str, extract_images: bool = True) -> List[Dict]:
     """
@@ -25,53 +32,70 @@ def pdf_extract(path: str, extract_images: bool = True) -> List[Dict]:
         - captions: figure captions
         - is_ocr: whether OCR was used
     """
+    with FITZ_LOCK:
+        raw_pages = _read_pages(path, extract_images)
+    return [_finish_page(path, raw) for raw in raw_pages]
+
+
+def _read_pages(path: str, extract_images: bool) -> List[Dict]:
+    """PyMuPDF pass: per-page text, raw image bytes and figure captions (call under FITZ_LOCK)."""
     doc = fitz.open(path)
     pages = []
-    
-    for i, page in enumerate(doc):
-        text = page.get_text("text") or ""
-        text = re.sub(r'[ \t]+', ' ', text).strip()
-        is_scan = (len(text) < 20)
-        ocr_text = ""
-        if is_scan:
-            # OCR at page-level
-            images = convert_from_path(path, first_page=i+1, last_page=i+1, dpi=300)
-            ocr_text = pytesseract.image_to_string(images[0])
-        final_text = text if len(text) >= len(ocr_text) else ocr_text
+    try:
+        for i, page in enumerate(doc):
+            text = page.get_text("text") or ""
+            text = re.sub(r'[ \t]+', ' ', text).strip()
 
-        # Extract images from PDF page
-        page_images = []
-        if extract_images:
-            try:
-                image_list = page.get_images()
-                for img_index, img in enumerate(image_list):
-                    try:
-                        xref = img[0]
-                        base_image = doc.extract_image(xref)
-                        image_bytes = base_image["image"]
-                        image = Image.open(io.BytesIO(image_bytes)).convert('RGB')
-                        page_images.append(image)
-                        logger.debug(f"Extracted image {img_index} from page {i+1}")
-                    except Exception as e:
-                        logger.warning(f"Failed to extract image {img_index} from page {i+1}: {e}")
-            except Exception as e:
-                logger.warning(f"Failed to extract images from page {i+1}: {e}")
+            # Extract images from PDF page (decoded outside the lock)
+            image_bytes = []
+            if extract_images:
+                try:
+                    image_list = page.get_images()
+                    for img_index, img in enumerate(image_list):
+                        try:
+                            xref = img[0]
+                            image_bytes.append((img_index, doc.extract_image(xref)["image"]))
+                        except Exception as e:
+                            logger.warning(f"Failed to extract image {img_index} from page {i+1}: {e}")
+                except Exception as e:
+                    logger.warning(f"Failed to extract images from page {i+1}: {e}")
 
-        # Extract figure captions
-        captions = []
-        for block in page.get_text("blocks"):
-            btxt = block[4].strip()
-            if re.search(r'^(Figure|Fig\.|Diagram)\s*\d+', btxt, re.I):
-                captions.append(btxt)
+            # Extract figure captions
+            captions = []
+            for block in page.get_text("blocks"):
+                btxt = block[4].strip()
+                if re.search(r'^(Figure|Fig\.|Diagram)\s*\d+', btxt, re.I):
+                    captions.append(btxt)
 
-        pages.append({
-            "page": i+1,
-            "text": final_text,
-            "images": page_images,
-            "captions": captions,
-            "is_ocr": is_scan and len(final_text) > 0
-        })
-    
-    doc.close()
+            pages.append({"page": i+1, "text": text, "image_bytes": image_bytes, "captions": captions})
+    finally:
+        doc.close()
     return pages
 
+
+def _finish_page(path: str, raw: Dict) -> Dict:
+    """OCR fallback and image decoding for one page; needs no PyMuPDF, so runs unlocked."""
+    page_no, text = raw["page"], raw["text"]
+    is_scan = (len(text) < 20)
+    ocr_text = ""
+    if is_scan:
+        # OCR at page-level
+        images = convert_from_path(path, first_page=page_no, last_page=page_no, dpi=300)
+        ocr_text = pytesseract.image_to_string(images[0])
+    final_text = text if len(text) >= len(ocr_text) else ocr_text
+
+    page_images = []
+    for img_index, data in raw["image_bytes"]:
+        try:
+            page_images.append(Image.open(io.BytesIO(data)).convert('RGB'))
+            logger.debug(f"Extracted image {img_index} from page {page_no}")
+        except Exception as e:
+            logger.warning(f"Failed to extract image {img_index} from page {page_no}: {e}")
+
+    return {
+        "page": page_no,
+        "text": final_text,
+        "images": page_images,
+        "captions": raw["captions"],
+        "is_ocr": is_scan and len(final_text) > 0
+    }
@@ -5,6 +5,7 @@ import logging
 from pathlib import Path
 import fitz  # PyMuPDF
 from typing import List, Dict, Optional
+from ingestion.pdf_extract import FITZ_LOCK
 
 logger = logging.getLogger(__name__)
 
@@ -35,8 +36,9 @@ def extract_title(pdf_path: str, pages: List[Dict], provided_title: Optional[str
     
     # Try to extract title from PDF metadata or first page
     try:
-        doc = fitz.open(pdf_path)
-        metadata = doc.metadata
+        # PyMuPDF is not thread-safe; read the metadata and close under the shared lock
+        with FITZ_LOCK, fitz.open(pdf_path) as doc:
+            metadata = doc.metadata
         if metadata.get("title"):
             # Truncate metadata title to 20 words max
             metadata_title = metadata["title"]
@@ -47,7 +49,6 @@ def extract_title(pdf_path: str, pages: List[Dict], provided_title: Optional[str
             else:
                 final_title = metadata_title
             print(f"Extracted title from PDF metadata: {final_title}")
-            doc.close()
             return final_title
         elif pages and pages[0].get("text"):
             # Extract first line or first 100 chars as title
@@ -64,12 +65,10 @@ def extract_title(pdf_path: str, pages: List[Dict], provided_title: Optional[str
                 print(f"Extracted title from first page: {final_title}")
             else:
                 print(f"Using filename as title: {final_title}")
-            doc.close()
             return final_title
         else:
             final_title = Path(pdf_path).stem  # filename without extension
             print(f"Using filename as title: {final_title}")
-            doc.close()
             return final_title
     except Exception as e:
         final_title = Path(pdf_path).stem
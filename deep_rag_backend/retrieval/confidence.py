@@ -116,10 +116,14 @@ def build_conf_features(
                    f"all_ce_negative={all_ce_negative}, max_vec={max(cosines) if cosines else 0:.3f}")
         # Use vector scores as rerank scores when CE is unreliable (meta-query/explicit selection scenario)
         reranks = cosines.copy()
-        logger.info(f"Replaced rerank scores: max_rerank changed from {max([float(c.get('ce', c.get('vec', 0.0)) or 0.0) for c in ranked_chunks]) if ranked_chunks else 0:.3f} to {max(reranks) if reranks else 0:.3f}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Replaced rerank scores: max_rerank changed from %.3f to %.3f",
+                        max((float(c.get('ce', c.get('vec', 0.0)) or 0.0) for c in ranked_chunks), default=0),
+                        max(reranks) if reranks else 0)
     else:
-        logger.debug(f"Not using vector scores for rerank: has_lexical_matches={has_lexical_matches}, "
-                    f"has_good_vector_matches={has_good_vector_matches}, all_ce_negative={all_ce_negative}")
+        logger.debug("Not using vector scores for rerank: has_lexical_matches=%s, "
+                     "has_good_vector_matches=%s, all_ce_negative=%s",
+                     has_lexical_matches, has_good_vector_matches, all_ce_negative)
     
     # f1: max rerank score (raw value, weights applied in confidence_probability)
     max_r = max(reranks) if reranks else 0.0
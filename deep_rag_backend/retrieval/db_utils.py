@@ -3,8 +3,10 @@ Database utility functions for connecting to PostgreSQL.
 Centralized DB connection to avoid DRY violations.
 Uses connection pooling for high-concurrency workloads.
 """
+import atexit
 import os
 import logging
+import threading
 import psycopg2
 from psycopg2 import pool
 from dotenv import load_dotenv
@@ -15,46 +17,69 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Idle connections kept open between uses / hard cap on open connections.
+# The cap should stay below the server's max_connections across all workers.
+DB_POOL_MIN = int(os.getenv("DB_POOL_MIN", "2"))
+DB_POOL_MAX = int(os.getenv("DB_POOL_MAX", "30"))
+
 # Global connection pool (initialized on first use)
 _connection_pool: Optional[pool.ThreadedConnectionPool] = None
+# Concurrent first callers (e.g. ingest-batch workers) must not each create a pool
+_pool_lock = threading.Lock()
+
+
+def _connection_params() -> dict:
+    # Environment variables take precedence over .env file
+    return {
+        "host": os.getenv("DB_HOST"),
+        "port": os.getenv("DB_PORT"),
+        "user": os.getenv("DB_USER"),
+        "password": os.getenv("DB_PASS"),
+        "dbname": os.getenv("DB_NAME"),
+    }
 
 
 def _get_pool():
     """
     Get or create the global connection pool.
     
-    Uses ThreadedConnectionPool for thread-safe connection management.
-    Pool size: 10-50 connections (adjust based on UVICORN_WORKERS * expected concurrent queries)
+    Uses ThreadedConnectionPool for thread-safe connection management. Every
+    caller in the process (API routes, CLI commands, retrieval stages,
+    wait_for_chunks) shares it, so connect/auth is paid once per connection
+    rather than once per call. Size via DB_POOL_MIN / DB_POOL_MAX.
     """
     global _connection_pool
     if _connection_pool is None:
-        try:
-            # Get connection parameters (environment variables take precedence over .env file)
-            db_host = os.getenv("DB_HOST")
-            db_port = os.getenv("DB_PORT")
-            db_user = os.getenv("DB_USER")
-            db_pass = os.getenv("DB_PASS")
-            db_name = os.getenv("DB_NAME")
-            
-            logger.info(f"Initializing PostgreSQL connection pool (2-30 connections)")
-            logger.info(f"Connection parameters: host={db_host}, port={db_port}, user={db_user}, dbname={db_name}")
-            
-            _connection_pool = pool.ThreadedConnectionPool(
-                minconn=2,   # Start with minimal connections
-                maxconn=30,  # Maximum connections (should be < POSTGRES_MAX_CONNECTIONS)
-                host=db_host,
-                port=db_port,
-                user=db_user,
-                password=db_pass,
-                dbname=db_name
-            )
-            logger.info("PostgreSQL connection pool initialized successfully")
-        except Exception as e:
-            logger.error(f"Failed to initialize connection pool: {e}")
-            raise
+        with _pool_lock:
+            if _connection_pool is None:
+                params = _connection_params()
+                logger.info(f"Initializing PostgreSQL connection pool ({DB_POOL_MIN}-{DB_POOL_MAX} connections)")
+                logger.info(f"Connection parameters: host={params['host']}, port={params['port']}, user={params['user']}, dbname={params['dbname']}")
+                try:
+                    _connection_pool = pool.ThreadedConnectionPool(
+                        minconn=DB_POOL_MIN,
+                        maxconn=DB_POOL_MAX,
+                        **params
+                    )
+                    logger.info("PostgreSQL connection pool initialized successfully")
+                except Exception as e:
+                    logger.error(f"Failed to initialize connection pool: {e}")
+                    raise
     return _connection_pool
 
 
+def close_pool() -> None:
+    """Close every pooled connection (registered atexit)."""
+    global _connection_pool
+    with _pool_lock:
+        if _connection_pool is not None and not _connection_pool.closed:
+            _connection_pool.closeall()
+        _connection_pool = None
+
+
+atexit.register(close_pool)
+
+
 @contextmanager
 def connect():
     """
@@ -71,30 +96,23 @@ def connect():
     try:
         conn_pool = _get_pool()
         conn = conn_pool.getconn()
-        try:
-            yield conn
-        finally:
-            conn_pool.putconn(conn)
     except Exception as e:
         logger.warning(f"Connection pool unavailable, using direct connection: {e}")
         # Fallback to direct connection (old behavior)
-        db_host = os.getenv("DB_HOST")
-        db_port = os.getenv("DB_PORT")
-        db_user = os.getenv("DB_USER")
-        db_pass = os.getenv("DB_PASS")
-        db_name = os.getenv("DB_NAME")
-        logger.info(f"Fallback connection: host={db_host}, port={db_port}, user={db_user}, dbname={db_name}")
-        conn = psycopg2.connect(
-            host=db_host,
-            port=db_port,
-            user=db_user,
-            password=db_pass,
-            dbname=db_name
-        )
+        params = _connection_params()
+        logger.info(f"Fallback connection: host={params['host']}, port={params['port']}, user={params['user']}, dbname={params['dbname']}")
+        conn = psycopg2.connect(**params)
         try:
             yield conn
         finally:
             conn.close()
+        return
+    
+    # Errors raised by the caller's block propagate; only acquisition falls back
+    try:
+        yield conn
+    finally:
+        conn_pool.putconn(conn)
 
 
 def get_document_title(doc_id: str) -> Optional[str]:
@@ -0,0 +1,171 @@
+"""
+Query embedding memoization.
+
+Within one question ("turn") the same text is embedded several times: the
+semantic cache lookup, the planner's prefetch, the retriever's sub-queries,
+both stages of two-stage retrieval and per-document retrieval in the graph.
+`turn_embedding_cache()` scopes a dict to the turn so each distinct query is
+embedded once; it is held in a ContextVar so worker threads started with the
+caller's context (asyncio.to_thread, LangGraph node executors) share it, and
+it is dropped when the turn ends.
+
+Across runs, embeddings can also be persisted under EMBED_CACHE_DIR, one .npy
+file per query keyed by a hash of the normalized text, in a directory per
+CLIP_MODEL so switching models never serves stale vectors. A warm rerun of
+the same question skips loading the CLIP model entirely. The disk cache is
+opt-in (EMBED_CACHE_ENABLED), meant for CLI and batch runs: files are derived
+from user queries, so a server should not accumulate them by default. It is
+bounded either way: files unused for EMBED_CACHE_MAX_AGE_SEC are deleted, and
+beyond EMBED_CACHE_MAX_FILES per model the least recently used go first.
+"""
+import contextvars
+import hashlib
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional
+import numpy as np
+from dotenv import load_dotenv
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+EMBED_CACHE_ENABLED = os.getenv('EMBED_CACHE_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+EMBED_CACHE_DIR = os.getenv('EMBED_CACHE_DIR') or os.path.join(os.path.expanduser("~"), ".cache", "deep_rag", "embeddings")
+EMBED_CACHE_MAX_FILES = int(os.getenv('EMBED_CACHE_MAX_FILES', '10000'))  # per CLIP model; 0 = no cap
+EMBED_CACHE_MAX_AGE_SEC = float(os.getenv('EMBED_CACHE_MAX_AGE_SEC', str(7 * 24 * 3600)))  # 0 = no age limit
+
+# The directory is pruned on the first write in a process and every
+# _PRUNE_EVERY writes after that, not on every write
+_PRUNE_EVERY = 256
+_writes = 0
+_writes_lock = threading.Lock()
+
+_turn_embeddings: contextvars.ContextVar[Optional[Dict[str, np.ndarray]]] = contextvars.ContextVar(
+    "turn_embeddings", default=None
+)
+
+
+def normalize_query(text: str) -> str:
+    """Cache key for a query: the CLIP tokenizer lower-cases and collapses whitespace, so these match."""
+    return " ".join(text.lower().split())
+
+
+def _cache_path(text: str) -> Path:
+    model = (os.getenv("CLIP_MODEL") or "default").replace("/", "__")
+    key = hashlib.blake2b(normalize_query(text).encode("utf-8"), digest_size=16).hexdigest()
+    return Path(EMBED_CACHE_DIR) / model / f"{key}.npy"
+
+
+def _prune(directory: Path) -> None:
+    """Delete files unused for EMBED_CACHE_MAX_AGE_SEC, then the least recently used beyond EMBED_CACHE_MAX_FILES."""
+    now = time.time()
+    entries = []
+    for path in directory.glob("*.npy"):
+        try:
+            mtime = path.stat().st_mtime
+            if EMBED_CACHE_MAX_AGE_SEC > 0 and now - mtime > EMBED_CACHE_MAX_AGE_SEC:
+                path.unlink(missing_ok=True)
+                continue
+        except OSError:
+            continue
+        entries.append((mtime, path))
+    if EMBED_CACHE_MAX_FILES > 0 and len(entries) > EMBED_CACHE_MAX_FILES:
+        entries.sort()
+        for _, path in entries[:len(entries) - EMBED_CACHE_MAX_FILES]:
+            try:
+                path.unlink(missing_ok=True)
+            except OSError:
+                pass
+
+
+def _maybe_prune(directory: Path) -> None:
+    global _writes
+    with _writes_lock:
+        due = _writes % _PRUNE_EVERY == 0
+        _writes += 1
+    if due:
+        try:
+            _prune(directory)
+        except OSError as e:
+            logger.warning("Could not prune embedding cache %s: %s", directory, e)
+
+
+def get_or_compute(text: str, fn: Callable[[str], np.ndarray]) -> np.ndarray:
+    """
+    Return the on-disk embedding for `text`, or compute it with `fn` and store it.
+
+    A hit refreshes the file's mtime, which pruning treats as its last use.
+    Cache read/write failures are logged and fall back to `fn`.
+    """
+    if not EMBED_CACHE_ENABLED:
+        return fn(text)
+    path = _cache_path(text)
+    try:
+        emb = np.load(path)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return emb
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError) as e:
+        logger.warning("Ignoring unreadable embedding cache file %s: %s", path, e)
+    emb = fn(text)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write-then-rename so concurrent readers never see a partial file
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, "wb") as f:
+            np.save(f, emb)
+        os.replace(tmp, path)
+    except OSError as e:
+        logger.warning("Could not write embedding cache file %s: %s", path, e)
+        return emb
+    _maybe_prune(path.parent)
+    return emb
+
+
+def _embed_text(text: str) -> np.ndarray:
+    from ingestion.embeddings import embed_text
+    return embed_text(text, normalize_emb=True)
+
+
+@contextmanager
+def turn_embedding_cache() -> Iterator[Dict[str, np.ndarray]]:
+    """
+    Memoize query embeddings until the block exits.
+
+    Nested use (e.g. the CLI opening a turn around run_deep_rag, which opens
+    its own) reuses the outer cache.
+    """
+    current = _turn_embeddings.get()
+    if current is not None:
+        yield current
+        return
+    cache: Dict[str, np.ndarray] = {}
+    token = _turn_embeddings.set(cache)
+    try:
+        yield cache
+    finally:
+        _turn_embeddings.reset(token)
+        logger.debug("Turn embedding cache released (%d queries)", len(cache))
+
+
+def embed_query(text: str) -> np.ndarray:
+    """Normalized CLIP text embedding for a query, memoized within the current turn and on disk."""
+    cache = _turn_embeddings.get()
+    if cache is None:
+        return get_or_compute(text, _embed_text)
+    key = normalize_query(text)
+    emb = cache.get(key)
+    if emb is None:
+        emb = get_or_compute(text, _embed_text)
+        # Shared across stages/threads, so guard against in-place edits
+        emb.setflags(write=False)
+        cache[key] = emb
+    return emb
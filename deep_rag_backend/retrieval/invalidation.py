@@ -0,0 +1,36 @@
+"""
+Index-change hooks.
+
+Caches built on retrieval results (the retrieval result cache here, the
+semantic answer cache in the inference layer) register a callback with
+register_index_hook. Whoever changes the chunk index (ingestion committing
+chunks, a document delete) calls notify_index_changed, so retrieval never
+has to import the layers above it.
+"""
+import logging
+import threading
+from typing import Callable, List
+
+logger = logging.getLogger(__name__)
+
+_hooks: List[Callable[[], None]] = []
+_hooks_lock = threading.Lock()
+
+
+def register_index_hook(hook: Callable[[], None]) -> Callable[[], None]:
+    """Call `hook` whenever the chunk index changes; registering the same hook twice is a no-op."""
+    with _hooks_lock:
+        if hook not in _hooks:
+            _hooks.append(hook)
+    return hook
+
+
+def notify_index_changed() -> None:
+    """Run every registered hook; a failing hook is logged and does not stop the others."""
+    with _hooks_lock:
+        hooks = list(_hooks)
+    for hook in hooks:
+        try:
+            hook()
+        except Exception as e:
+            logger.warning("Index-change hook %s failed: %s", getattr(hook, "__qualname__", hook), e)
@@ -18,17 +18,24 @@ def mmr(candidates: List[Dict], query_emb: np.ndarray, lambda_mult: float = 0.5,
     Returns:
         List of selected chunks with diversity
     """
-    selected, selected_ids = [], set()
-    cand = candidates.copy()
-    while len(selected) < min(k, len(cand)):
-        best, best_id, best_score = None, None, -1e9
-        for i, c in enumerate(cand):
-            sim_q = float(np.dot(c["emb"], query_emb))  # cosine if normalized
-            sim_d = max((np.dot(c["emb"], s["emb"]) for s in selected), default=0.0)
-            score = lambda_mult*sim_q - (1-lambda_mult)*sim_d
-            if score > best_score:
-                best, best_id, best_score = c, c["chunk_id"], score
-        selected.append(best)
-        cand = [x for x in cand if x["chunk_id"] != best_id]
+    if not candidates:
+        return []
+    # One contiguous (N, D) float32 matrix: query and redundancy similarities
+    # become BLAS matrix-vector products instead of per-pair np.dot calls
+    embs = np.ascontiguousarray(np.stack([c["emb"] for c in candidates]), dtype=np.float32)
+    sim_q = embs @ np.asarray(query_emb, dtype=np.float32)
+    # Max similarity of each candidate to anything selected so far (0.0 before the first pick)
+    sim_d = np.zeros(len(candidates), dtype=np.float32)
+    ids = np.array([c["chunk_id"] for c in candidates], dtype=object)
+    available = np.ones(len(candidates), dtype=bool)
+    
+    selected = []
+    while len(selected) < min(k, int(available.sum())):
+        scores = lambda_mult*sim_q - (1-lambda_mult)*sim_d
+        scores[~available] = -np.inf
+        best = int(np.argmax(scores))  # first maximum, as in a strict '>' scan
+        selected.append(candidates[best])
+        available &= ids != ids[best]
+        best_sims = embs @ embs[best]
+        sim_d = best_sims if len(selected) == 1 else np.maximum(sim_d, best_sims)
     return selected
-
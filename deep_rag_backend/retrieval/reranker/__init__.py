@@ -1,12 +1,14 @@
 """
 Reranker package for query-time reranking.
 """
-from retrieval.reranker.model import get_reranker, RERANK_MODEL
-from retrieval.reranker.rerank import rerank_candidates
+from retrieval.reranker.model import get_reranker, warmup_reranker, RERANK_MODEL
+from retrieval.reranker.rerank import rerank_candidates, rerank_candidates_batch
 
 __all__ = [
     "get_reranker",
+    "warmup_reranker",
     "RERANK_MODEL",
     "rerank_candidates",
+    "rerank_candidates_batch",
 ]
 
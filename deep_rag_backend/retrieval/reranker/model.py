@@ -3,6 +3,8 @@ Reranker model loading and configuration.
 """
 import os
 import logging
+import threading
+import time
 from typing import Optional
 from sentence_transformers import CrossEncoder
 from dotenv import load_dotenv
@@ -14,8 +16,17 @@ logger = logging.getLogger(__name__)
 # Reranker for query time (text-only cross-encoder)
 # Default: cross-encoder/ms-marco-MiniLM-L-6-v2
 RERANK_MODEL = os.getenv("RERANK_MODEL", "cross-encoder/ms-marco-MiniLM-L-6-v2")
+# Seconds to wait after a failed load before trying again
+RERANK_RETRY_SECONDS = float(os.getenv("RERANK_RETRY_SECONDS", "60"))
 
 _reranker = None
+# Set once the model loaded successfully
+_reranker_loaded = False
+# monotonic() before which a failed load is not retried, so a missing model
+# is not reloaded on every query but can still come up (e.g. after a download)
+_reranker_retry_at = 0.0
+_reranker_lock = threading.Lock()
+_reranker_warm = False
 
 
 def get_reranker() -> Optional[CrossEncoder]:
@@ -23,11 +34,23 @@ def get_reranker() -> Optional[CrossEncoder]:
     Get or initialize the reranker model.
     Supports loading from local path (via RERANK_MODEL_PATH env var) or Hugging Face.
     
+    Loaded once per process: concurrent first callers (parallel retrievals)
+    wait for a single load. A failed load returns None and is retried no
+    sooner than RERANK_RETRY_SECONDS later rather than on every query.
+    
     Returns:
         CrossEncoder instance, or None if not available
     """
-    global _reranker
-    if _reranker is None:
+    global _reranker, _reranker_loaded, _reranker_retry_at
+    if _reranker_loaded:
+        return _reranker
+    if time.monotonic() < _reranker_retry_at:
+        return None
+    with _reranker_lock:
+        if _reranker_loaded:
+            return _reranker
+        if time.monotonic() < _reranker_retry_at:
+            return None
         try:
             # Check if we have a local model path
             local_model_path = os.getenv("RERANK_MODEL_PATH")
@@ -51,9 +74,27 @@ def get_reranker() -> Optional[CrossEncoder]:
                 logger.info(f"Loading reranker model from Hugging Face: {RERANK_MODEL}")
             
             _reranker = CrossEncoder(model_path)
+            _reranker_loaded = True
             logger.info(f"Loaded reranker model: {model_path}")
         except Exception as e:
             logger.warning(f"Reranker not available: {e}. Continuing without reranking.")
             _reranker = None
+            _reranker_retry_at = time.monotonic() + RERANK_RETRY_SECONDS
     return _reranker
 
+
+def warmup_reranker() -> None:
+    """
+    Load the reranker and run one tiny prediction, once per process.
+    
+    The first predict() also pays one-time framework initialization, so doing
+    it ahead of the first query keeps that off the retrieval path.
+    """
+    global _reranker_warm
+    if _reranker_warm:
+        return
+    reranker = get_reranker()
+    if reranker is not None:
+        reranker.predict([["warm", "up"]])
+        _reranker_warm = True
+
@@ -19,18 +19,37 @@ def rerank_candidates(query: str, candidates: List[Dict]) -> List[Dict]:
     Returns:
         List of candidates with 'ce' (cross-encoder) score added, sorted by score
     """
+    return rerank_candidates_batch([query], [candidates])[0]
+
+
+def rerank_candidates_batch(queries: List[str], candidate_lists: List[List[Dict]]) -> List[List[Dict]]:
+    """
+    Rerank several queries' candidates with a single cross-encoder call.
+    
+    All (query, text) pairs go through one predict(), so the model batches
+    across queries instead of running one small batch per query.
+    
+    Args:
+        queries: Query strings
+        candidate_lists: Candidates for each query (same order as queries)
+        
+    Returns:
+        Each candidate list with 'ce' scores added, sorted by score
+    """
     reranker = get_reranker()
-    if not reranker or not candidates:
-        return candidates
+    if not reranker or not any(candidate_lists):
+        return candidate_lists
     
     try:
-        pairs = [[query, c["text"]] for c in candidates]
+        pairs = [[query, c["text"]] for query, candidates in zip(queries, candidate_lists) for c in candidates]
         ce_scores = reranker.predict(pairs)
-        for c, s in zip(candidates, ce_scores):
-            c["ce"] = float(s)
-        candidates.sort(key=lambda x: x.get("ce", 0.0), reverse=True)
+        offset = 0
+        for candidates in candidate_lists:
+            for c, s in zip(candidates, ce_scores[offset:offset + len(candidates)]):
+                c["ce"] = float(s)
+            offset += len(candidates)
+            candidates.sort(key=lambda x: x.get("ce", 0.0), reverse=True)
     except Exception as e:
         logger.warning(f"Reranking failed: {e}. Continuing without reranking.")
     
-    return candidates
-
+    return candidate_lists
@@ -0,0 +1,71 @@
+"""
+Retrieval result memoization.
+
+Refinement queries are often slight rephrasings of the initial retrieval
+query (or of each other), and a follow-up question in the same session often
+repeats one. Results of text-only retrieve_hybrid calls are kept in an
+in-process LRU with a TTL, keyed by the normalized query and every parameter
+that shapes the result. Any change to the chunk index in this process
+(mark_chunks_committed, a document delete) clears it through the index hook
+registered below, so freshly ingested documents are never hidden behind a stale entry; the
+TTL bounds staleness for ingestion done by other processes.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from dotenv import load_dotenv
+from retrieval.embed_cache import normalize_query
+from retrieval.invalidation import register_index_hook
+
+load_dotenv()
+
+RETRIEVAL_CACHE_MAXSIZE = int(os.getenv('RETRIEVAL_CACHE_MAXSIZE', '256'))
+RETRIEVAL_CACHE_TTL_SEC = float(os.getenv('RETRIEVAL_CACHE_TTL_SEC', '300'))
+
+ResultKey = Tuple[str, Optional[str], int, int, int, bool]
+
+# key -> (hits, expires_at)
+_results: "OrderedDict[ResultKey, Tuple[List[Dict], float]]" = OrderedDict()
+_results_lock = threading.Lock()
+
+
+def result_key(query: str, doc_id: Optional[str], k: int, k_lex: int, k_vec: int, cross_doc: bool) -> ResultKey:
+    """Cache key for a text-only retrieval."""
+    return (normalize_query(query), doc_id, k, k_lex, k_vec, bool(cross_doc))
+
+
+def get_results(key: ResultKey) -> Optional[List[Dict]]:
+    """Cached hits for `key` (shallow copies, safe to annotate), or None on miss/expiry."""
+    if RETRIEVAL_CACHE_MAXSIZE <= 0:
+        return None
+    with _results_lock:
+        entry = _results.get(key)
+        if entry is None:
+            return None
+        hits, expires_at = entry
+        if expires_at < time.monotonic():
+            del _results[key]
+            return None
+        _results.move_to_end(key)
+    return [dict(h) for h in hits]
+
+
+def put_results(key: ResultKey, hits: List[Dict]) -> None:
+    """Store shallow copies of `hits` under `key`, evicting the least recently used entry past the cap."""
+    if RETRIEVAL_CACHE_MAXSIZE <= 0:
+        return
+    stored = [dict(h) for h in hits]
+    with _results_lock:
+        _results[key] = (stored, time.monotonic() + RETRIEVAL_CACHE_TTL_SEC)
+        _results.move_to_end(key)
+        while len(_results) > RETRIEVAL_CACHE_MAXSIZE:
+            _results.popitem(last=False)
+
+
+@register_index_hook
+def clear_results() -> None:
+    """Drop every cached result (the chunk index changed)."""
+    with _results_lock:
+        _results.clear()
@@ -4,13 +4,18 @@ Main retrieval module - Hybrid retrieval with multi-modal support.
 This module provides the main retrieve_hybrid function and maintains
 backward compatibility by importing from modularized submodules.
 """
+import contextvars
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Union, List
 from PIL import Image
 
 # Import from modularized submodules
 from retrieval.wait import wait_for_chunks
-from retrieval.stages import retrieve_stage_one, retrieve_stage_two, merge_and_deduplicate
+from retrieval.stages import retrieve_stage_one, retrieve_stage_two, merge_and_deduplicate, fuse_rrf
+from retrieval.stages.stage_one import fetch_stage_one_candidates, finish_stage_one
+from retrieval.reranker import rerank_candidates_batch
+from retrieval.result_cache import result_key, get_results, put_results
 import os
 from dotenv import load_dotenv
 load_dotenv()
@@ -20,12 +25,14 @@ logger = logging.getLogger(__name__)
 # Export for backward compatibility
 __all__ = [
     "retrieve_hybrid",
+    "retrieve_hybrid_multi",
+    "retrieve_hybrid_batch",
     "wait_for_chunks",
 ]
 
 
 def retrieve_hybrid(
-    query: str, 
+    query: Union[str, List[str]], 
     k: int = int(os.getenv("K_RETRIEVER", "6")),
     k_lex: int = int(os.getenv("K_LEX", "60")), 
     k_vec: int = int(os.getenv("K_VEC", "60")),
@@ -41,7 +48,7 @@ def retrieve_hybrid(
     2. Second stage: Embed query + retrieved content, then search semantically across all docs
     
     Args:
-        query: Text query string
+        query: Text query string, or a list of queries (see retrieve_hybrid_multi)
         k: Number of results to return
         k_lex: Number of lexical results to retrieve
         k_vec: Number of vector results to retrieve
@@ -53,6 +60,36 @@ def retrieve_hybrid(
     Returns:
         List of retrieved chunks with scores
     """
+    if isinstance(query, list):
+        if len(query) == 1:
+            query = query[0]
+        else:
+            return retrieve_hybrid_multi(query, k, k_lex, k_vec, query_image=query_image, doc_id=doc_id, cross_doc=cross_doc)
+    
+    if query_image is not None:
+        return _retrieve_single(query, k, k_lex, k_vec, query_image, doc_id, cross_doc)
+    
+    # Text-only results are memoized (see retrieval.result_cache)
+    key = result_key(query, doc_id, k, k_lex, k_vec, cross_doc)
+    hits = get_results(key)
+    if hits is not None:
+        logger.info("Retrieval results served from cache")
+        return hits
+    hits = _retrieve_single(query, k, k_lex, k_vec, None, doc_id, cross_doc)
+    put_results(key, hits)
+    return hits
+
+
+def _retrieve_single(
+    query: str,
+    k: int,
+    k_lex: int,
+    k_vec: int,
+    query_image: Optional[Union[str, Image.Image]],
+    doc_id: Optional[str],
+    cross_doc: bool
+) -> List[dict]:
+    """retrieve_hybrid for one query, uncached."""
     # Two-stage retrieval when cross_doc=True and doc_id is provided
     if cross_doc and doc_id:
         logger.info(f"Two-stage retrieval: First stage from doc_id {doc_id}..., then cross-document semantic search")
@@ -91,3 +128,104 @@ def retrieve_hybrid(
         # Cross-doc disabled: if doc_id provided, ONLY search within that doc_id
         # If no doc_id, search all documents (fallback behavior)
         return retrieve_stage_one(query, k, k_lex, k_vec, query_image, doc_id)
+
+
+
+def retrieve_hybrid_multi(
+    queries: List[str],
+    k: int = int(os.getenv("K_RETRIEVER", "6")),
+    k_lex: int = int(os.getenv("K_LEX", "60")),
+    k_vec: int = int(os.getenv("K_VEC", "60")),
+    query_image: Optional[Union[str, Image.Image]] = None,
+    doc_id: Optional[str] = None,
+    cross_doc: bool = False
+) -> List[dict]:
+    """
+    Retrieve for several queries at once and fuse the results with RRF.
+    
+    Queries run concurrently (each on its own pooled DB connection), so total
+    latency is roughly that of the slowest query rather than the sum.
+    
+    Args:
+        queries: Text queries (e.g. the question plus planner sub-goals)
+        k, k_lex, k_vec, query_image, doc_id, cross_doc: As in retrieve_hybrid
+        
+    Returns:
+        Fused top-k list of unique chunks
+    """
+    queries = [q for q in queries if q and q.strip()]
+    if not queries:
+        return []
+    if len(queries) == 1:
+        return retrieve_hybrid(queries[0], k, k_lex, k_vec, query_image=query_image, doc_id=doc_id, cross_doc=cross_doc)
+    
+    logger.info(f"Multi-query retrieval: {len(queries)} queries")
+    max_workers = min(len(queries), int(os.getenv("RETRIEVAL_MAX_WORKERS", "4")))
+    # Run each query in a copy of the caller's context so workers share its turn embedding cache
+    contexts = [contextvars.copy_context() for _ in queries]
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        result_lists = list(pool.map(
+            lambda ctx, q: ctx.run(retrieve_hybrid, q, k, k_lex, k_vec, query_image=query_image, doc_id=doc_id, cross_doc=cross_doc),
+            contexts, queries
+        ))
+    return fuse_rrf(result_lists, k)
+
+
+
+def retrieve_hybrid_batch(
+    queries: List[str],
+    k: int = int(os.getenv("K_RETRIEVER", "6")),
+    k_lex: int = int(os.getenv("K_LEX", "60")),
+    k_vec: int = int(os.getenv("K_VEC", "60")),
+    doc_id: Optional[str] = None,
+    cross_doc: bool = False
+) -> List[List[dict]]:
+    """
+    retrieve_hybrid for each of several queries, with one cross-encoder pass.
+    
+    Unlike retrieve_hybrid_multi the results are not fused: one list per query,
+    in query order, each what retrieve_hybrid would return. Candidate fetches
+    (embedding + hybrid SQL) run concurrently, then every query's candidates
+    are reranked in a single predict() call and MMR-diversified per query.
+    Two-stage retrieval (cross_doc with doc_id) depends on each query's first
+    stage, so it falls back to concurrent retrieve_hybrid calls. Results share
+    retrieve_hybrid's result cache.
+    
+    Args:
+        queries: Text queries (e.g. critic refinements)
+        k, k_lex, k_vec, doc_id, cross_doc: As in retrieve_hybrid
+        
+    Returns:
+        One list of retrieved chunks per query
+    """
+    if not queries:
+        return []
+    
+    def _in_pool(qs, fn):
+        if len(qs) == 1:
+            return [fn(qs[0])]
+        max_workers = min(len(qs), int(os.getenv("RETRIEVAL_MAX_WORKERS", "4")))
+        # Each query runs in a copy of the caller's context (shared turn embedding cache)
+        contexts = [contextvars.copy_context() for _ in qs]
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return list(pool.map(lambda ctx, q: ctx.run(fn, q), contexts, qs))
+    
+    if cross_doc and doc_id:
+        return _in_pool(queries, lambda q: retrieve_hybrid(q, k, k_lex, k_vec, doc_id=doc_id, cross_doc=True))
+    
+    # Cached queries are answered directly; only the misses are fetched and reranked
+    keys = [result_key(q, doc_id, k, k_lex, k_vec, cross_doc) for q in queries]
+    results = [get_results(key) for key in keys]
+    misses = [i for i, hits in enumerate(results) if hits is None]
+    if not misses:
+        return results
+    miss_queries = [queries[i] for i in misses]
+    
+    # Same scoping as retrieve_hybrid's single-stage path
+    scope = None if cross_doc else doc_id
+    fetched = _in_pool(miss_queries, lambda q: fetch_stage_one_candidates(q, k_lex, k_vec, None, scope))
+    reranked = rerank_candidates_batch(miss_queries, [cands for cands, _ in fetched])
+    for i, cands, (_, qemb) in zip(misses, reranked, fetched):
+        results[i] = finish_stage_one(cands, qemb, k) if cands else []
+        put_results(keys[i], results[i])
+    return results
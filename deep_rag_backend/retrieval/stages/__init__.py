@@ -3,11 +3,13 @@ Retrieval stages package for two-stage cross-document retrieval.
 """
 from retrieval.stages.stage_one import retrieve_stage_one
 from retrieval.stages.stage_two import retrieve_stage_two
-from retrieval.stages.merge import merge_and_deduplicate
+from retrieval.stages.merge import merge_and_deduplicate, fuse_rrf, dedup_by_chunk_id
 
 __all__ = [
     "retrieve_stage_one",
     "retrieve_stage_two",
     "merge_and_deduplicate",
+    "fuse_rrf",
+    "dedup_by_chunk_id",
 ]
 
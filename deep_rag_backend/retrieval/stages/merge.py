@@ -1,11 +1,54 @@
 """
 Merge and deduplicate chunks from two retrieval stages.
 """
+import hashlib
 import logging
 from typing import List, Dict
+import numpy as np
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
 
 logger = logging.getLogger(__name__)
 
+# Below this many chunks a Python dict beats deduplicating precomputed hashes
+DEDUP_VECTORIZE_MIN = 32
+
+
+def chunk_id_hash(chunk_id: str) -> int:
+    """Stable unsigned 64-bit hash of a chunk_id (xxh64 if installed, else blake2b)."""
+    data = str(chunk_id).encode("utf-8")
+    if xxhash is not None:
+        return xxhash.xxh64_intdigest(data)
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+
+def first_occurrence(ids: np.ndarray) -> np.ndarray:
+    """Indices of the first occurrence of each distinct id, in original order."""
+    _, keep = np.unique(ids, return_index=True)
+    return np.sort(keep)
+
+
+def dedup_by_chunk_id(*sources: List[Dict]) -> List[Dict]:
+    """
+    Drop repeated chunk_ids, keeping the first occurrence and the original order.
+    
+    Several lists (e.g. prior evidence and new hits) are treated as one list in
+    order, without concatenating them first. Uses one insertion-ordered dict
+    keyed by chunk_id at every size because these dicts carry no precomputed
+    hash: hashing the ids at call time makes the array path several times
+    slower than the dict. merge_evidence (inference.agents.evidence) does take
+    the array path above DEDUP_VECTORIZE_MIN, since Hit.cid64 is hashed once
+    when the Hit is built and deduplicating those hashes beats the dict.
+    """
+    merged: Dict[str, Dict] = {}
+    for chunks in sources:
+        for c in chunks:
+            merged.setdefault(c["chunk_id"], c)
+    return list(merged.values())
+
 
 def merge_and_deduplicate(primary_chunks: List[Dict], secondary_chunks: List[Dict], k: int) -> List[Dict]:
     """
@@ -51,3 +94,36 @@ def merge_and_deduplicate(primary_chunks: List[Dict], secondary_chunks: List[Dic
     
     return merged[:k]
 
+
+
+def fuse_rrf(result_lists: List[List[Dict]], k: int, rrf_k: int = 60) -> List[Dict]:
+    """
+    Fuse ranked result lists from several queries with Reciprocal Rank Fusion.
+    
+    Each chunk scores sum(1 / (rrf_k + rank)) over the lists it appears in.
+    The first-seen dict for a chunk_id is kept (its lex/vec/ce scores are preserved).
+    
+    Args:
+        result_lists: Ranked chunk lists, one per query
+        k: Maximum number of chunks to return
+        rrf_k: RRF smoothing constant (60 is the usual default)
+        
+    Returns:
+        Fused list of unique chunks, best first
+    """
+    scores: Dict[str, float] = {}
+    chunks: Dict[str, Dict] = {}
+    for results in result_lists:
+        for rank, chunk in enumerate(results, 1):
+            chunk_id = chunk.get("chunk_id")
+            if not chunk_id:
+                continue
+            scores[chunk_id] = scores.get(chunk_id, 0.0) + 1.0 / (rrf_k + rank)
+            chunks.setdefault(chunk_id, chunk)
+    
+    # sorted() is stable, so ties keep first-seen order
+    fused = [chunks[cid] for cid in sorted(chunks, key=lambda cid: scores[cid], reverse=True)]
+    
+    logger.info(f"RRF-fused {len(result_lists)} result lists into {len(fused)} unique chunks (returning top {k})")
+    
+    return fused[:k]
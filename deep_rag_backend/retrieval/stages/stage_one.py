@@ -3,7 +3,7 @@ Stage 1: Primary retrieval from doc_id or all documents.
 """
 import numpy as np
 import logging
-from typing import Optional, Union, List, Dict
+from typing import Optional, Union, List, Dict, Tuple
 from PIL import Image
 
 from retrieval.db_utils import connect
@@ -12,7 +12,8 @@ from retrieval.sanitize import sanitize_query_for_tsquery
 from retrieval.vector_utils import parse_vector
 from retrieval.reranker import rerank_candidates
 from retrieval.mmr import mmr
-from ingestion.embeddings import embed_text, embed_multi_modal, EMBEDDING_DIM
+from ingestion.embeddings import embed_multi_modal, EMBEDDING_DIM
+from retrieval.embed_cache import embed_query
 
 logger = logging.getLogger(__name__)
 
@@ -39,11 +40,41 @@ def retrieve_stage_one(
     Returns:
         List of retrieved chunks with scores
     """
+    cands, qemb = fetch_stage_one_candidates(query, k_lex, k_vec, query_image, doc_id)
+    if not cands:
+        return []
+
+    # Cross-encoder rerank (text-only, heavy precision step)
+    cands = rerank_candidates(query, cands)
+    return finish_stage_one(cands, qemb, k)
+
+
+def finish_stage_one(reranked: List[Dict], qemb: np.ndarray, k: int) -> List[Dict]:
+    """MMR diversify the top reranked candidates and return the top-k."""
+    return mmr(reranked[:30], qemb, lambda_mult=0.5, k=k)
+
+
+def fetch_stage_one_candidates(
+    query: str,
+    k_lex: int,
+    k_vec: int,
+    query_image: Optional[Union[str, Image.Image]],
+    doc_id: Optional[str]
+) -> Tuple[List[Dict], np.ndarray]:
+    """
+    Embed the query and fetch hybrid (lexical + vector) candidates, before reranking.
+    
+    Split out of retrieve_stage_one so batch retrieval can rerank several
+    queries' candidates in one cross-encoder call.
+    
+    Returns:
+        (candidates with lex/vec scores and embeddings, query embedding)
+    """
     # Embed query using CLIP (text or text+image)
     if query_image:
         qemb = embed_multi_modal(text=query, image_path=query_image, normalize_emb=True)
     else:
-        qemb = embed_text(query, normalize_emb=True)
+        qemb = embed_query(query)
     
     # Convert numpy array to list of Python floats for psycopg2/pgvector compatibility
     if isinstance(qemb, np.ndarray):
@@ -92,7 +123,7 @@ def retrieve_stage_one(
     # Pull dense embeddings for MMR/rerank
     ids = [r[0] for r in rows]  # chunk_id
     if not ids: 
-        return []
+        return [], qemb
     
     with connect() as conn, conn.cursor() as cur:
         try:
@@ -128,11 +159,5 @@ def retrieve_stage_one(
             "lex": float(lex_s),
             "vec": float(vec_s)
         })
-
-    # Cross-encoder rerank (text-only, heavy precision step)
-    cands = rerank_candidates(query, cands)
-
-    # MMR diversify on top N, then return top-k
-    diversified = mmr(cands[:30], qemb, lambda_mult=0.5, k=k)
-    return diversified
+    return cands, qemb
 
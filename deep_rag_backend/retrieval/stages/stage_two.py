@@ -12,7 +12,8 @@ from retrieval.sanitize import sanitize_query_for_tsquery
 from retrieval.vector_utils import parse_vector
 from retrieval.reranker import rerank_candidates
 from retrieval.mmr import mmr
-from ingestion.embeddings import embed_text, embed_multi_modal, EMBEDDING_DIM
+from ingestion.embeddings import embed_multi_modal, EMBEDDING_DIM
+from retrieval.embed_cache import embed_query
 
 logger = logging.getLogger(__name__)
 
@@ -43,7 +44,7 @@ def retrieve_stage_two(
     if query_image:
         qemb = embed_multi_modal(text=query, image_path=query_image, normalize_emb=True)
     else:
-        qemb = embed_text(query, normalize_emb=True)
+        qemb = embed_query(query)
     
     # Convert numpy array to list of Python floats
     if isinstance(qemb, np.ndarray):
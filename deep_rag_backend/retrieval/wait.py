@@ -3,11 +3,38 @@ Wait for chunks to be available after ingestion.
 """
 import time
 import logging
+import threading
+from collections import OrderedDict
 from typing import Optional
 from retrieval.db_utils import connect
+from retrieval.invalidation import notify_index_changed
 
 logger = logging.getLogger(__name__)
 
+# doc_id -> chunk count for ingestions committed by this process. Lets
+# wait_for_chunks return without polling when the caller ran the ingest itself.
+_COMMITTED_MAX = 1024
+_committed: "OrderedDict[str, int]" = OrderedDict()
+_committed_lock = threading.Lock()
+
+
+def mark_chunks_committed(doc_id: str, chunk_count: int) -> None:
+    """Record that `chunk_count` chunks for `doc_id` were committed in this process."""
+    # New chunks can change any cached retrieval (cross-doc ones included)
+    # and any cached answer built on one
+    notify_index_changed()
+    with _committed_lock:
+        _committed[str(doc_id)] = chunk_count
+        _committed.move_to_end(str(doc_id))
+        while len(_committed) > _COMMITTED_MAX:
+            _committed.popitem(last=False)
+
+
+def get_committed_chunk_count(doc_id: str) -> Optional[int]:
+    """Chunk count committed in-process for `doc_id`, or None if it was ingested elsewhere."""
+    with _committed_lock:
+        return _committed.get(str(doc_id))
+
 
 def wait_for_chunks(
     doc_id: str, 
@@ -33,6 +60,11 @@ def wait_for_chunks(
     Raises:
         TimeoutError: If chunks are not available within max_wait_seconds
     """
+    committed = get_committed_chunk_count(doc_id)
+    if committed and (expected_count is None or committed >= expected_count):
+        logger.info(f"Chunks for document {doc_id} were committed in-process ({committed}), skipping poll")
+        return committed
+    
     start_time = time.time()
     logger.info(f"Waiting for chunks for document {doc_id}...")
     
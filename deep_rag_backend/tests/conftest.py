@@ -54,3 +54,38 @@ def test_env():
         "DB_NAME": os.getenv("DB_NAME"),
     }
 
+
+
+@pytest.fixture(autouse=True)
+def clear_agent_caches():
+    """Clear agent LLM caches so cached outputs don't leak between tests."""
+    from inference.agents._cache import clear_caches
+    clear_caches()
+    yield
+    clear_caches()
+
+
+@pytest.fixture(autouse=True)
+def clear_llm_responses():
+    """Clear the LLM response cache so mocked provider calls don't leak between tests."""
+    from inference.llm.cache import clear_responses
+    clear_responses()
+    yield
+    clear_responses()
+
+
+@pytest.fixture(autouse=True)
+def clear_retrieval_results():
+    """Clear the retrieval result cache so mocked retrievals don't leak between tests."""
+    from retrieval.result_cache import clear_results
+    clear_results()
+    yield
+    clear_results()
+
+
+@pytest.fixture(autouse=True)
+def refill_llm_rate_bucket():
+    """Start each test with a full LLM request bucket so mocked calls never queue on earlier tests."""
+    from inference.llm.ratelimit import request_bucket
+    request_bucket.reset()
+    yield
@@ -0,0 +1,70 @@
+"""
+Unit tests for the agent query cache.
+"""
+import pytest
+from unittest.mock import patch
+from inference.agents._cache import QueryCache, make_key
+from inference.agents.planner import planner
+from inference.agents.compressor import compressor
+
+
+class TestQueryCache:
+    """Tests for QueryCache."""
+    
+    def test_hit_and_miss_counters(self):
+        """Test get/put updates hit and miss counters."""
+        cache = QueryCache(maxsize=4, ttl_sec=60)
+        assert cache.get("a") is None
+        cache.put("a", 1)
+        assert cache.get("a") == 1
+        assert cache.hits == 1
+        assert cache.misses == 1
+        assert cache.hit_rate == pytest.approx(0.5)
+    
+    def test_lru_eviction(self):
+        """Test least recently used entry is evicted first."""
+        cache = QueryCache(maxsize=2, ttl_sec=60)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+    
+    def test_ttl_expiry(self):
+        """Test expired entries are treated as misses."""
+        cache = QueryCache(maxsize=2, ttl_sec=10)
+        with patch('inference.agents._cache.time.monotonic', return_value=100.0):
+            cache.put("a", 1)
+        with patch('inference.agents._cache.time.monotonic', return_value=111.0):
+            assert cache.get("a") is None
+        assert cache.stats()["size"] == 0
+    
+    def test_make_key_separates_parts(self):
+        """Test keys differ when parts are split differently."""
+        assert make_key("ab", "c") != make_key("a", "bc")
+
+
+class TestAgentCaching:
+    """Tests for planner/compressor cache integration."""
+    
+    @patch('inference.agents.planner.call_llm')
+    def test_planner_repeat_question_uses_cache(self, mock_call_llm):
+        """Test identical repeat questions skip the LLM."""
+        mock_call_llm.return_value = ("1. Plan", {})
+        planner({"question": "Same question"})
+        result = planner({"question": "Same question"})
+        assert result["plan"] == "1. Plan"
+        mock_call_llm.assert_called_once()
+    
+    @patch('inference.agents.compressor.call_llm')
+    def test_compressor_new_evidence_misses_cache(self, mock_call_llm):
+        """Test merged evidence (new chunk_ids) recomputes notes."""
+        mock_call_llm.return_value = ("- note", {})
+        ev = [{"chunk_id": "1", "text": "a", "p0": 1, "p1": 1}]
+        compressor({"question": "Q", "evidence": ev})
+        compressor({"question": "Q", "evidence": list(ev)})
+        assert mock_call_llm.call_count == 1
+        compressor({"question": "Q", "evidence": ev + [{"chunk_id": "2", "text": "b", "p0": 2, "p1": 2}]})
+        assert mock_call_llm.call_count == 2
@@ -73,8 +73,34 @@ class TestCritic:
         assert result["iterations"] >= 1
         assert len(result["evidence"]) >= 1
         assert mock_call_llm.call_count >= 1  # At least one refinement query
+        assert mock_call_llm.call_args.kwargs["cache"] is False  # Same prompt each iteration
         assert mock_retrieve.call_count >= 1  # At least one additional retrieval
     
+    @patch('inference.agents.critic.retrieve_hybrid')
+    @patch('inference.agents.critic.call_llm')
+    def test_critic_sanitizes_refinement_query(self, mock_call_llm, mock_retrieve):
+        """Test tsquery-breaking characters are removed from the refinement query."""
+        mock_call_llm.return_value = ('- Hygiene & DX:  "scope" | rules*!', {"input_tokens": 15, "output_tokens": 5, "total_tokens": 20})
+        mock_retrieve.return_value = [
+            {"chunk_id": "3", "text": "Strong evidence", "ce": 0.8, "lex": 0.5, "vec": 0.6, "p0": 3, "p1": 3},
+            {"chunk_id": "4", "text": "Strong evidence 2", "ce": 0.7, "lex": 0.4, "vec": 0.5, "p0": 4, "p1": 4}
+        ]
+        state: State = {
+            "question": "Test question",
+            "plan": "Test plan",
+            "evidence": [],
+            "notes": "Test notes",
+            "answer": "",
+            "confidence": 0.0,
+            "iterations": 0,
+            "doc_ids": [],
+            "cross_doc": False
+        }
+        
+        critic(state)
+        
+        assert mock_retrieve.call_args[0][0] == "Hygiene and DX scope rules"
+    
     @patch('inference.agents.critic.retrieve_hybrid')
     @patch('inference.agents.critic.call_llm')
     def test_critic_max_iterations(self, mock_call_llm, mock_retrieve):
@@ -165,3 +191,81 @@ class TestCritic:
         chunk_ids = [chunk["chunk_id"] for chunk in result["evidence"]]
         assert chunk_ids.count("1") == 1
 
+    
+    @patch('inference.agents.critic.retrieve_hybrid')
+    @patch('inference.agents.critic.call_llm')
+    def test_critic_refinement_loop_bounded(self, mock_call_llm, mock_retrieve):
+        """Test critic refines at most MAX_ITERS times when evidence stays weak."""
+        mock_call_llm.return_value = ("Refinement query", {"input_tokens": 10, "output_tokens": 2, "total_tokens": 12})
+        mock_retrieve.return_value = []
+        
+        state: State = {
+            "question": "Test question",
+            "plan": "Test plan",
+            "evidence": [
+                {"chunk_id": "1", "text": "Weak evidence", "ce": 0.2, "lex": 0.0, "vec": 0.0, "p0": 1, "p1": 1}
+            ],
+            "notes": "Test notes",
+            "answer": "",
+            "confidence": 0.0,
+            "iterations": 0,
+            "doc_ids": [],
+            "cross_doc": False
+        }
+        
+        result = critic(state)
+        
+        assert result["iterations"] == MAX_ITERS
+        assert mock_call_llm.call_count == MAX_ITERS
+        assert mock_retrieve.call_count == MAX_ITERS
+        assert result["confidence"] < 0.6
+
+    @patch('inference.agents.critic.retrieve_hybrid')
+    @patch('inference.agents.critic.call_llm')
+    def test_critic_merge_keeps_score_arrays_aligned(self, mock_call_llm, mock_retrieve):
+        """Test refinement merge dedups by chunk_id and keeps the score arrays in sync."""
+        mock_call_llm.return_value = ("Refined query", {})
+        mock_retrieve.return_value = [
+            {"chunk_id": "1", "text": "Dup", "ce": 0.1, "lex": 0.0, "vec": 0.0, "p0": 1, "p1": 1},
+            {"chunk_id": "2", "text": "New", "ce": 0.05, "lex": 0.0, "vec": 0.2, "p0": 2, "p1": 2},
+        ]
+        state: State = {
+            "question": "Test question",
+            "plan": "Test plan",
+            "notes": "Test notes",
+            "evidence": [{"chunk_id": "1", "text": "Weak", "ce": 0.1, "lex": 0.0, "vec": 0.0, "p0": 1, "p1": 1}],
+            "confidence": 0.0,
+            "iterations": MAX_ITERS - 1,
+            "doc_ids": [],
+            "cross_doc": False
+        }
+        
+        result = critic(state)
+        
+        assert [h["chunk_id"] for h in result["evidence"]] == ["1", "2"]
+        assert result["evidence_ce"].dtype.name == "float32"
+        assert list(result["evidence_vec"]) == pytest.approx([0.0, 0.2], abs=1e-3)
+        assert len(result["evidence_ce"]) == len(result["evidence_lex"]) == 2
+
+    @patch('inference.agents.critic.retrieve_hybrid')
+    @patch('inference.agents.critic.call_llm')
+    def test_critic_uses_planner_fallback_queries(self, mock_call_llm, mock_retrieve):
+        """Test critic consumes planner fallback queries before calling the LLM."""
+        mock_retrieve.return_value = []
+        state: State = {
+            "question": "Test question",
+            "plan": "Test plan",
+            "notes": "Test notes",
+            "fallback_queries": ["first fallback", "second fallback"],
+            "evidence": [],
+            "confidence": 0.0,
+            "iterations": MAX_ITERS - 1,
+            "doc_ids": [],
+            "cross_doc": False
+        }
+        
+        result = critic(state)
+        
+        mock_call_llm.assert_not_called()
+        assert mock_retrieve.call_args[0][0] == "first fallback"
+        assert result["fallback_queries"] == ["second fallback"]
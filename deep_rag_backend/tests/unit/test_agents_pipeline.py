@@ -0,0 +1,58 @@
+"""
+Unit tests for the direct pipeline entry points.
+"""
+import asyncio
+import pytest
+from unittest.mock import patch
+from inference.agents.pipeline import arun_deep_rag, run_deep_rag_batch, stream_deep_rag
+
+
+class TestRunDeepRagBatch:
+    """Tests for the concurrent batch entry point."""
+    
+    @patch('inference.agents.pipeline.prime_plans')
+    @patch('inference.agents.pipeline.run_deep_rag')
+    def test_run_deep_rag_batch_preserves_order(self, mock_run, mock_prime):
+        """Test answers come back in question order."""
+        mock_run.side_effect = lambda q, doc_id, cross_doc: f"answer to {q}"
+        
+        answers = asyncio.run(run_deep_rag_batch(["a", "b", "c"], max_concurrency=2))
+        
+        assert answers == ["answer to a", "answer to b", "answer to c"]
+        assert mock_run.call_count == 3
+        mock_prime.assert_called_once_with(["a", "b", "c"], None)
+
+
+class TestArunDeepRag:
+    """Tests for the async (non-streaming) pipeline entry point."""
+    
+    @patch('inference.agents.pipeline.asynthesize')
+    @patch('inference.agents.pipeline.critic', side_effect=lambda s: {**s, "confidence": 0.8})
+    @patch('inference.agents.pipeline.compressor', side_effect=lambda s: s)
+    @patch('inference.agents.pipeline.retriever_agent', side_effect=lambda s: s)
+    @patch('inference.agents.pipeline.aplanner')
+    def test_arun_deep_rag_returns_answer(self, mock_aplanner, mock_retriever, mock_compressor, mock_critic, mock_asynth):
+        """Test every stage runs in order and the synthesized answer is returned."""
+        async def fake_aplanner(state):
+            return {**state, "plan": "plan"}
+        async def fake_asynth(state):
+            return {**state, "answer": f"answer ({state['plan']}, {state['confidence']})"}
+        mock_aplanner.side_effect = fake_aplanner
+        mock_asynth.side_effect = fake_asynth
+        
+        assert asyncio.run(arun_deep_rag("q")) == "answer (plan, 0.8)"
+        assert mock_retriever.call_count == mock_compressor.call_count == mock_critic.call_count == 1
+
+
+class TestStreamDeepRag:
+    """Tests for the synchronous streaming wrapper used by the CLI."""
+    
+    @patch('inference.agents.pipeline.astream_deep_rag')
+    def test_stream_deep_rag_yields_deltas_in_order(self, mock_astream):
+        """Test each async delta is yielded by the sync iterator without an outer loop."""
+        async def fake_stream(question, doc_id=None, cross_doc=False):
+            for delta in ["Hello", ", ", "world"]:
+                yield delta
+        mock_astream.side_effect = fake_stream
+        
+        assert list(stream_deep_rag("q")) == ["Hello", ", ", "world"]
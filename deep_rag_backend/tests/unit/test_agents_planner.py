@@ -1,9 +1,10 @@
 """
 Unit tests for planner agent.
 """
+import asyncio
 import pytest
 from unittest.mock import patch, MagicMock
-from inference.agents.planner import planner
+from inference.agents.planner import planner, aplanner, prime_plans
 from inference.agents.state import State
 
 
@@ -98,3 +99,65 @@ class TestPlanner:
         with pytest.raises(Exception, match="LLM API error"):
             planner(state)
 
+    
+    @patch('inference.agents.planner.retrieve_hybrid')
+    @patch('inference.agents.planner.call_llm_stream')
+    def test_aplanner_streams_plan_and_prefetches(self, mock_stream, mock_retrieve):
+        """Test async planner joins streamed tokens and stores prefetched hits."""
+        async def tokens(*args, **kwargs):
+            for delta in ["1. Find ", "topics "]:
+                yield delta
+        mock_stream.side_effect = lambda *a, **kw: tokens()
+        mock_retrieve.return_value = [{"chunk_id": "c1"}]
+        
+        result = asyncio.run(aplanner({"question": "What is it?", "cross_doc": False}))
+        
+        assert result["plan"] == "1. Find topics"
+        assert result["prefetched_evidence"] == [{"chunk_id": "c1"}]
+        assert mock_retrieve.call_args[0][0] == "What is it?"
+    
+    @patch('inference.agents.planner.call_llm')
+    def test_planner_parses_json_fallback_queries(self, mock_call_llm):
+        """Test JSON planner output yields plan and fallback queries."""
+        mock_call_llm.return_value = ('```json\n{"plan": "1. Find topics", "fallback_queries": ["q1", "q2", "q3", "q4"]}\n```', {})
+        
+        result = planner({"question": "What is it?"})
+        
+        assert result["plan"] == "1. Find topics"
+        assert result["fallback_queries"] == ["q1", "q2", "q3"]
+
+
+class TestPrimePlans:
+    """Tests for batched planning ahead of a pipeline batch."""
+    
+    @patch('inference.agents.planner.call_llm')
+    @patch('inference.agents.planner.call_llm_batch')
+    def test_primed_plans_served_from_cache(self, mock_batch, mock_call_llm):
+        """Test one batched call plans every distinct question and planner() reuses it."""
+        mock_batch.return_value = ['{"plan": "Plan A", "fallback_queries": []}', "Plan B"]
+        
+        assert prime_plans(["A?", "B?", "A?"]) == 2
+        result = planner({"question": "B?", "plan": "", "evidence": [], "notes": "", "answer": "",
+                          "confidence": 0.0, "iterations": 0, "doc_ids": [], "cross_doc": False})
+        
+        assert len(mock_batch.call_args.args[1]) == 2
+        assert result["plan"] == "Plan B"
+        mock_call_llm.assert_not_called()
+        assert prime_plans(["A?"]) == 0
+
+    @patch('inference.agents.planner.call_llm')
+    def test_truncated_json_is_salvaged_not_used_as_plan(self, mock_call_llm):
+        """Test a JSON response cut off at max_tokens keeps the written fields instead of the raw JSON."""
+        from inference.agents.planner import PLANNER_MAX_TOKENS
+        mock_call_llm.return_value = ('{"plan": "1. Find \\"revenue\\" figures", "fallback_queries": ["annual revenue", "reven', {})
+        
+        result = planner({"question": "What was revenue?"})
+        
+        assert result["plan"] == '1. Find "revenue" figures'
+        assert result["fallback_queries"] == ["annual revenue"]
+        assert mock_call_llm.call_args.kwargs["max_tokens"] == PLANNER_MAX_TOKENS
+    
+    def test_json_cut_before_plan_gives_empty_plan(self):
+        """Test a response cut off before the plan field yields no plan rather than raw JSON."""
+        from inference.agents.planner import _parse_planner_output
+        assert _parse_planner_output('```json\n{"pl') == ("", [])
@@ -110,3 +110,56 @@ class TestRetrieverAgent:
         call_kwargs = mock_retrieve.call_args[1]
         assert call_kwargs.get("cross_doc") is True
 
+    
+    @patch('inference.agents.retriever.retrieve_hybrid')
+    def test_retriever_agent_splits_plan_into_queries(self, mock_retrieve):
+        """Test plan sub-goals are searched as separate queries alongside the question."""
+        mock_retrieve.return_value = []
+        state: State = {
+            "question": "Q?",
+            "plan": "1. First goal\n- Second goal\n\n3) Third goal\n4. Fourth goal",
+            "doc_ids": [],
+            "cross_doc": False
+        }
+        
+        retriever_agent(state)
+        
+        assert mock_retrieve.call_args[0][0] == ["Q?", "First goal", "Second goal", "Third goal"]
+
+
+class TestHit:
+    """Tests for the Hit record used by the direct pipeline."""
+    
+    def test_hit_from_dict_and_mapping_access(self):
+        """Test dict conversion keeps scores and unset ce behaves like a missing key."""
+        from inference.agents.hit import Hit, to_hits
+        hits = to_hits([
+            {"chunk_id": "1", "text": "t", "p0": 1, "p1": 2, "lex": 0.5, "vec": 0.4, "extra": "ignored"},
+            {"text": "no id"},
+        ])
+        assert len(hits) == 1
+        hit = hits[0]
+        assert isinstance(hit, Hit)
+        assert hit.lex == 0.5 and hit.ce is None
+        assert hit["p1"] == 2
+        assert hit.get("ce", hit.get("vec")) == 0.4
+        assert "ce" not in hit
+        assert hit.as_dict()["chunk_id"] == "1"
+        assert to_hits(hits)[0] is hit
+    
+    def test_hit_snippet_truncated_once(self):
+        """Test the prompt snippet is pre-truncated at conversion time."""
+        from inference.agents.hit import Hit, SNIPPET_CHARS
+        hit = Hit.from_dict({"chunk_id": "1", "text": "x" * (SNIPPET_CHARS + 50)})
+        assert len(hit.snippet) == SNIPPET_CHARS
+    
+    def test_merge_evidence_large_dedups_and_aligns_scores(self):
+        """Test the hashed merge path drops repeats and keeps score arrays aligned."""
+        from inference.agents.hit import to_hits
+        from inference.agents.evidence import merge_evidence
+        state = {"evidence": to_hits([{"chunk_id": f"c{i}", "vec": float(i)} for i in range(30)])}
+        added = merge_evidence(state, to_hits([{"chunk_id": f"c{i}", "vec": 99.0} for i in range(25, 40)]))
+        assert added == 10
+        assert [h.chunk_id for h in state["evidence"]] == [f"c{i}" for i in range(40)]
+        assert state["evidence_vec"][27] == 27.0
+        assert len(state["evidence_ce"]) == 40
@@ -0,0 +1,73 @@
+"""
+Unit tests for the critic evidence scoring kernel.
+"""
+import numpy as np
+import pytest
+from unittest.mock import patch
+from inference.agents import _scoring
+from inference.agents.evidence import count_strong as count_strong_numpy
+
+
+class TestCountStrong:
+    """Tests for count_strong (numba and NumPy paths)."""
+    
+    def _arrays(self):
+        ce = np.array([0.5, 0.1, 0.0, 0.31], dtype=np.float32)
+        lex = np.array([0.0, 0.2, 0.3, 0.0], dtype=np.float32)
+        vec = np.array([0.0, 0.4, 0.0, 0.0], dtype=np.float32)
+        return ce, lex, vec
+    
+    def test_count_strong_matches_numpy(self):
+        """Test the dispatched kernel agrees with the NumPy implementation."""
+        ce, lex, vec = self._arrays()
+        assert _scoring.count_strong(ce, lex, vec, 0.30) == count_strong_numpy(ce, lex, vec, 0.30) == 3
+    
+    def test_count_strong_fallback_without_numba(self):
+        """Test the NumPy fallback is used when numba is unavailable."""
+        ce, lex, vec = self._arrays()
+        with patch.object(_scoring, '_NUMBA_AVAILABLE', False):
+            assert _scoring.count_strong(ce, lex, vec, 0.30) == 3
+    
+    def test_count_strong_empty(self):
+        """Test empty evidence yields zero strong chunks."""
+        empty = np.zeros(0, dtype=np.float32)
+        assert _scoring.count_strong(empty, empty, empty, 0.30) == 0
+    
+    def test_count_strong_float16(self):
+        """Test half-precision evidence arrays score the same as float32."""
+        ce, lex, vec = (a.astype(np.float16) for a in self._arrays())
+        assert _scoring.count_strong(ce, lex, vec, 0.30) == 3
+
+    
+    def test_evidence_arrays_keep_score_precision(self):
+        """Test tiny positive scores and scores just above THRESH survive in the evidence arrays."""
+        from inference.agents.evidence import evidence_arrays
+        from inference.agents.hit import to_hits
+        hits = to_hits([
+            {"chunk_id": "1", "ce": 0.0, "lex": 1e-8, "vec": 0.2},
+            {"chunk_id": "2", "ce": 0.30002, "lex": 0.0, "vec": 0.0},
+        ])
+        ce, lex, vec = evidence_arrays(hits)
+        assert ce.dtype == np.float32
+        assert _scoring.count_strong(ce, lex, vec, 0.30) == 2
+
+class TestFirstOccurrence:
+    """Tests for first_occurrence (numba hash-set and np.unique paths)."""
+    
+    def test_first_occurrence_matches_numpy(self):
+        """Test the kernel keeps the same indices, in order, as the np.unique implementation."""
+        rng = np.random.default_rng(0)
+        base = rng.integers(0, 2**63, size=50, dtype=np.int64).astype(np.uint64)
+        ids = np.concatenate([base, base[::3], base[:5]])
+        rng.shuffle(ids)
+        
+        expected = _scoring._first_occurrence_numpy(ids)
+        assert np.array_equal(_scoring.first_occurrence(ids), expected)
+        assert len(expected) == 50
+        assert _scoring.first_occurrence(np.zeros(0, dtype=np.uint64)).size == 0
+    
+    def test_first_occurrence_fallback_without_numba(self):
+        """Test the np.unique fallback is used when numba is unavailable."""
+        ids = np.array([7, 3, 7, 1, 3], dtype=np.uint64)
+        with patch.object(_scoring, '_NUMBA_AVAILABLE', False):
+            assert _scoring.first_occurrence(ids).tolist() == [0, 1, 3]
@@ -3,7 +3,7 @@ Unit tests for synthesizer agent.
 """
 import pytest
 from unittest.mock import patch, MagicMock
-from inference.agents.synthesizer import synthesizer
+from inference.agents.synthesizer import SYNTHESIZER_JSON_MAX_TOKENS, SynthesizedAnswer, synthesizer
 from inference.agents.state import State
 
 
@@ -24,7 +24,7 @@ class TestSynthesizer:
             ],
             "notes": "Test notes",
             "answer": "",
-            "confidence": 0.0,
+            "confidence": 0.6,
             "iterations": 0,
             "doc_ids": [],
             "cross_doc": False
@@ -50,7 +50,7 @@ class TestSynthesizer:
             ],
             "notes": "Test notes",
             "answer": "",
-            "confidence": 0.0,
+            "confidence": 0.6,
             "iterations": 0,
             "doc_id": "doc1",
             "doc_ids": [],
@@ -77,7 +77,7 @@ class TestSynthesizer:
             ],
             "notes": "Test notes",
             "answer": "",
-            "confidence": 0.0,
+            "confidence": 0.6,
             "iterations": 0,
             "doc_ids": [],
             "cross_doc": False
@@ -105,7 +105,7 @@ class TestSynthesizer:
             ],
             "notes": "Test notes",
             "answer": "",
-            "confidence": 0.0,
+            "confidence": 0.6,
             "iterations": 0,
             "doc_ids": [],
             "cross_doc": False
@@ -132,7 +132,7 @@ class TestSynthesizer:
             ],
             "notes": "Test notes",
             "answer": "",
-            "confidence": 0.0,
+            "confidence": 0.6,
             "iterations": 0,
             "doc_ids": [],
             "cross_doc": False
@@ -156,7 +156,7 @@ class TestSynthesizer:
             "evidence": [],  # No evidence
             "notes": "Test notes",
             "answer": "",
-            "confidence": 0.0,
+            "confidence": 0.6,
             "iterations": 0,
             "doc_ids": [],
             "cross_doc": False
@@ -188,7 +188,7 @@ class TestSynthesizer:
             ],
             "notes": "Test notes",
             "answer": "",
-            "confidence": 0.0,
+            "confidence": 0.6,
             "iterations": 0,
             "doc_ids": [],
             "cross_doc": False
@@ -200,3 +200,82 @@ class TestSynthesizer:
         assert result["answer"] == "I don't know."
         assert result["confidence"] == 35.0
 
+    
+    @patch('inference.agents.synthesizer.get_confidence_for_chunks')
+    @patch('inference.agents.synthesizer.call_llm')
+    def test_synthesizer_low_critic_confidence_skips_llm(self, mock_call_llm, mock_confidence):
+        """Test the synthesizer abstains without an LLM call when the critic found no strong chunk."""
+        state: State = {
+            "question": "Out of domain?",
+            "plan": "Test plan",
+            "evidence": [{"chunk_id": "1", "text": "Weak", "p0": 1, "p1": 1, "lex": 0.0, "vec": 0.1}],
+            "notes": "",
+            "answer": "",
+            "confidence": 0.4,
+            "iterations": 3,
+            "doc_ids": [],
+            "cross_doc": False
+        }
+        
+        result = synthesizer(state)
+        
+        assert result["answer"] == "I don't know."
+        assert result["confidence"] == 0.0
+        mock_call_llm.assert_not_called()
+        mock_confidence.assert_not_called()
+
+    @patch('inference.agents.synthesizer.call_llm')
+    def test_structured_answer_lists_only_cited_sources(self, mock_call_llm):
+        """Test a SynthesizedAnswer JSON response keeps only the cited blocks as sources."""
+        mock_call_llm.return_value = ('{"answer": "Revenue grew [2].", "cited_ids": [2, 2, 9]}', {})
+        
+        state: State = {
+            "question": "Test question",
+            "plan": "Test plan",
+            "evidence": [
+                {"chunk_id": str(i), "text": f"Evidence {i}", "p0": i, "p1": i, "doc_id": f"doc{i}",
+                 "lex": 0.8, "vec": 0.7, "ce": 0.75}
+                for i in range(1, 4)
+            ],
+            "notes": "",
+            "answer": "",
+            "confidence": 0.6,
+            "iterations": 0,
+            "doc_ids": [],
+            "cross_doc": False
+        }
+        
+        result = synthesizer(state)
+        
+        answer, sources = result["answer"].split("\n\nSources: ")
+        assert answer == "Revenue grew [2]."
+        assert sources.startswith("[2] doc:doc2 p2–2")
+        assert "doc:doc1" not in sources and "doc:doc3" not in sources
+        assert mock_call_llm.call_args.kwargs["response_schema"] is SynthesizedAnswer
+
+    @patch('inference.agents.synthesizer.call_llm')
+    def test_truncated_json_answer_is_salvaged(self, mock_call_llm):
+        """Test JSON cut off at MAX_TOKENS yields the answer text, not raw JSON."""
+        mock_call_llm.return_value = ('{"answer": "Revenue \\"grew\\" 12% [1] while', {})
+        
+        state: State = {
+            "question": "Test question",
+            "plan": "Test plan",
+            "evidence": [
+                {"chunk_id": "1", "text": "Evidence 1", "p0": 1, "p1": 1, "doc_id": "doc1",
+                 "lex": 0.8, "vec": 0.7, "ce": 0.75}
+            ],
+            "notes": "",
+            "answer": "",
+            "confidence": 0.6,
+            "iterations": 0,
+            "doc_ids": [],
+            "cross_doc": False
+        }
+        
+        result = synthesizer(state)
+        
+        answer, sources = result["answer"].split("\n\nSources: ")
+        assert answer == 'Revenue "grew" 12% [1] while'
+        assert sources.startswith("[1] doc:doc1 p1–1")
+        assert mock_call_llm.call_args.kwargs["max_tokens"] == SYNTHESIZER_JSON_MAX_TOKENS
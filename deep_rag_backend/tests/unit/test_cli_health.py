@@ -0,0 +1,35 @@
+"""
+Unit tests for the CLI health command.
+"""
+import sys
+from unittest.mock import patch
+from inference.commands.health import health
+
+# inference.commands re-exports the health function under the module's name
+health_module = sys.modules['inference.commands.health']
+
+
+class TestHealth:
+    """Tests for the cached health check."""
+    
+    @patch('retrieval.db_utils.connect')
+    def test_repeat_probe_within_ttl_skips_database(self, mock_connect, tmp_path):
+        """Test the second probe is served from the cache file without connecting."""
+        with patch.object(health_module, 'HEALTH_CACHE_PATH', str(tmp_path / "health")):
+            assert health(fresh=False) == {"ok": True}
+            assert health(fresh=False) == {"ok": True}
+            assert mock_connect.call_count == 1
+            cur = mock_connect.return_value.__enter__.return_value.cursor.return_value.__enter__.return_value
+            cur.execute.assert_called_with("SELECT 1")
+            
+            health(fresh=True)
+            assert mock_connect.call_count == 2
+    
+    @patch('retrieval.db_utils.connect')
+    def test_expired_cache_queries_database(self, mock_connect, tmp_path):
+        """Test a cache entry older than the TTL is ignored."""
+        with patch.object(health_module, 'HEALTH_CACHE_PATH', str(tmp_path / "health")), \
+             patch.object(health_module, 'HEALTH_CACHE_TTL_SEC', 0.0):
+            health(fresh=False)
+            health(fresh=False)
+        assert mock_connect.call_count == 2
@@ -0,0 +1,74 @@
+"""
+Unit tests for CLI file-type ingest dispatch.
+"""
+import pytest
+import typer
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+from inference.commands import _ingest_dispatch
+from inference.commands._ingest_dispatch import INGESTERS, Ingester, ingest_one
+
+
+class TestIngestDispatch:
+    """Tests for ingest_one routing by file suffix."""
+    
+    def test_ingest_one_defaults_title_to_stem(self):
+        """Test text/image ingesters get the file stem as default title; PDFs get None."""
+        mock_text, mock_pdf = MagicMock(return_value="doc-txt"), MagicMock(return_value="doc-pdf")
+        with patch.dict(INGESTERS, {'.txt': Ingester(mock_text, "text file", True),
+                                    '.pdf': Ingester(mock_pdf, "PDF", False)}):
+            assert ingest_one(Path("/tmp/Notes.TXT")).doc_id == "doc-txt"
+            assert ingest_one(Path("/tmp/report.pdf")).doc_id == "doc-pdf"
+            ingest_one(Path("/tmp/Notes.txt"), "Custom")
+        mock_text.assert_any_call("/tmp/Notes.TXT", "Notes")
+        mock_text.assert_called_with("/tmp/Notes.txt", "Custom")
+        mock_pdf.assert_called_once_with("/tmp/report.pdf", None)
+    
+    def test_ingest_one_unsupported_type(self):
+        """Test unsupported suffixes raise typer.BadParameter."""
+        with pytest.raises(typer.BadParameter, match="Unsupported file type: .docx"):
+            ingest_one(Path("/tmp/file.docx"))
+    
+    def test_ingest_one_reports_in_process_commit(self):
+        """Test committed=True (with the chunk count) only when this process committed the chunks."""
+        from retrieval.wait import mark_chunks_committed
+        mark_chunks_committed("doc-new", 4)
+        with patch.dict(INGESTERS, {'.txt': Ingester(MagicMock(return_value="doc-new"), "text file", True)}):
+            result = ingest_one(Path("/tmp/a.txt"))
+        assert result.committed and result.chunk_count == 4
+        with patch.dict(INGESTERS, {'.txt': Ingester(MagicMock(return_value="doc-dup"), "text file", True)}):
+            result = ingest_one(Path("/tmp/a.txt"))
+        assert not result.committed and result.doc_id == "doc-dup"
+    
+    def test_collect_files_expands_dirs_and_globs(self, tmp_path):
+        """Test directories and globs expand to supported files, deduplicated and grouped by type."""
+        (tmp_path / "sub").mkdir()
+        for name in ("b.txt", "a.pdf", "sub/c.png", "notes.docx"):
+            (tmp_path / name).write_bytes(b"x")
+        
+        files = _ingest_dispatch.collect_files([str(tmp_path), str(tmp_path / "*.txt")])
+        
+        assert [p.name for p in files] == ["a.pdf", "c.png", "b.txt"]
+
+
+class TestResolveFile:
+    """Tests for single-stat file resolution."""
+    
+    def test_resolve_file_derives_names(self, tmp_path):
+        """Test name, stem and lower-cased suffix come from one lookup."""
+        f = tmp_path / "Report.Final.PDF"
+        f.write_bytes(b"%PDF")
+        source = _ingest_dispatch.resolve_file(str(f))
+        assert source == (str(f), "Report.Final.PDF", "Report.Final", ".pdf")
+        assert _ingest_dispatch.get_ingester(source).label == "PDF"
+    
+    def test_resolve_file_missing(self, tmp_path):
+        """Test a missing file raises FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            _ingest_dispatch.resolve_file(str(tmp_path / "missing.pdf"))
+    
+    def test_resolve_file_unreadable(self, tmp_path):
+        """Test a stat failure other than ENOENT is reported as FileNotFoundError too."""
+        with patch('inference.commands._ingest_dispatch.os.stat', side_effect=PermissionError(13, "Permission denied")):
+            with pytest.raises(FileNotFoundError, match="Permission denied"):
+                _ingest_dispatch.resolve_file(str(tmp_path / "locked.pdf"))
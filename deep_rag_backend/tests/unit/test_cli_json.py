@@ -0,0 +1,42 @@
+"""
+Unit tests for CLI JSON encoding.
+"""
+import numpy as np
+import pytest
+from unittest.mock import patch
+from inference.commands import _json
+
+
+class TestCliJson:
+    """Tests for the orjson-backed encoder and its stdlib fallback."""
+    
+    def test_round_trip(self):
+        """Test dumps returns UTF-8 bytes that loads parses back."""
+        data = _json.dumps({"id": 1, "answer": "é", "cached": False})
+        
+        assert isinstance(data, bytes)
+        assert _json.loads(data) == {"id": 1, "answer": "é", "cached": False}
+    
+    @patch('inference.commands._json.orjson', None)
+    def test_stdlib_fallback_matches(self):
+        """Test the fallback emits bytes and stringifies unknown types."""
+        data = _json.dumps({"answer": "é", "obj": object})
+        
+        assert isinstance(data, bytes)
+        assert "é" in data.decode("utf-8")
+        assert _json.loads(data.decode("utf-8"))["obj"] == str(object)
+    
+    def test_numpy_values_serialize_with_orjson(self):
+        """Test numpy scalars in replies (e.g. confidence) do not fail to encode with orjson."""
+        pytest.importorskip("orjson")
+        
+        data = _json.dumps({"confidence": np.float32(0.5), "scores": np.array([1, 2])})
+        
+        assert _json.loads(data) == {"confidence": 0.5, "scores": [1, 2]}
+    
+    @patch('inference.commands._json.orjson', None)
+    def test_numpy_values_serialize_with_stdlib(self):
+        """Test the fallback encodes numpy scalars and arrays as plain values, not strings."""
+        data = _json.dumps({"confidence": np.float32(0.5), "scores": np.array([1, 2])})
+        
+        assert _json.loads(data) == {"confidence": 0.5, "scores": [1, 2]}
@@ -0,0 +1,31 @@
+"""
+Unit tests for CLI answer output.
+"""
+from unittest.mock import patch
+from typer.testing import CliRunner
+from inference.cli import app
+from inference.commands._output import ANSWER_HEADER, FOOTER
+
+
+class TestAnswerOutput:
+    """Tests for the single-write answer banner."""
+    
+    @patch('inference.semantic_cache.SEMANTIC_CACHE_ENABLED', False)
+    @patch('inference.agents.run_deep_rag', return_value="Paris é a capital")
+    def test_banner_follows_echoed_lines_in_order(self, mock_run):
+        """Test the byte banner lands after earlier typer.echo output, around the answer."""
+        result = CliRunner().invoke(app, ["query", "capital?", "--cross-doc", "--no-stream"])
+        
+        assert result.exit_code == 0
+        expected = "🌐 Cross-document retrieval enabled\n" + (ANSWER_HEADER + "Paris é a capital\n".encode() + FOOTER).decode()
+        assert result.stdout == expected
+    
+    @patch('inference.semantic_cache.cached_answer', return_value=("Buffered", False))
+    @patch('inference.semantic_cache.cached_stream', return_value=iter(["Streamed"]))
+    def test_stream_and_buffered_use_separate_cache_scopes(self, mock_stream, mock_answer):
+        """Test a streamed answer is never served to the buffered path (their Sources lines differ)."""
+        runner = CliRunner()
+        runner.invoke(app, ["query", "capital?", "--stream"])
+        runner.invoke(app, ["query", "capital?", "--no-stream"])
+        
+        assert mock_stream.call_args[0][1] != mock_answer.call_args[0][1]
@@ -0,0 +1,49 @@
+"""
+Unit tests for the JSON-lines serve command.
+"""
+import json
+import time
+from unittest.mock import patch
+from inference.commands.serve import HANDLERS, handle_request
+
+
+class TestHandleRequest:
+    """Tests for request dispatch and error replies."""
+    
+    def test_dispatches_to_handler_with_args(self):
+        """Test cmd/args are routed to the handler and the id is echoed."""
+        with patch.dict(HANDLERS, {"query": lambda question, cross_doc=False: {"answer": question.upper(), "cached": False}}):
+            reply = handle_request(json.dumps({"id": 7, "cmd": "query", "args": {"question": "hi"}}))
+        assert reply == {"id": 7, "ok": True, "result": {"answer": "HI", "cached": False}}
+    
+    def test_errors_become_replies(self):
+        """Test unknown commands, bad JSON and handler errors are reported instead of raised."""
+        assert handle_request('{"id": 1, "cmd": "nope"}')["error"].startswith("ValueError: Unknown cmd")
+        assert handle_request("not json")["ok"] is False
+        with patch.dict(HANDLERS, {"health": lambda: 1 / 0}):
+            reply = handle_request('{"id": 2, "cmd": "health"}')
+        assert reply == {"id": 2, "ok": False, "error": "ZeroDivisionError: division by zero"}
+
+
+class TestCacheStats:
+    """Tests for reporting cache statistics."""
+    
+    def test_serve_reports_in_memory_caches(self):
+        """Test the serve worker reports the caches it holds in memory."""
+        reply = handle_request('{"id": 3, "cmd": "cache_stats"}')
+        assert reply["ok"] is True
+        assert {"agents", "llm", "semantic"} <= set(reply["result"])
+        assert reply["result"]["llm"]["hits"] == 0
+    
+    def test_cli_prints_persisted_cache(self, tmp_path, capsys):
+        """Test the one-shot command prints the on-disk semantic cache as JSON."""
+        from inference.commands.cache_stats import cache_stats
+        prefix = str(tmp_path / "sem")
+        with open(f"{prefix}.json", "w", encoding="utf-8") as f:
+            json.dump([{"expires_at": time.time() + 10.0}, {"expires_at": time.time() - 1.0}], f)
+        
+        with patch('inference.semantic_cache.SEMANTIC_CACHE_PATH', prefix):
+            assert cache_stats() is None
+        
+        report = json.loads(capsys.readouterr().out)
+        assert report["semantic_cache"] == {"path": prefix, "entries": 2, "live": 1}
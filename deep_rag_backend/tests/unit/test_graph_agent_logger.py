@@ -0,0 +1,223 @@
+"""
+Unit tests for the agent reasoning logger.
+"""
+import csv
+import json
+import os
+import numpy as np
+from datetime import datetime
+import pytest
+from unittest.mock import patch
+from inference.graph.agent_logger import AgentLogger, read_binary_log
+
+
+class TestAgentLogger:
+    """Tests for AgentLogger file output."""
+    
+    def test_records_reuse_session_handles(self, tmp_path):
+        """Test files are opened once per session, not once per record."""
+        agent_log = AgentLogger(log_dir=tmp_path)
+        with patch('builtins.open', wraps=open) as mock_open:
+            for i in range(5):
+                agent_log.log_step("planner", "plan", session_id="s1", question=f"q{i}")
+            agent_log.log_error("critic", "boom", session_id="s1")
+            agent_log.log_retrieval_details("s1", "q", [{"chunk_id": "abcdef123", "text": "t"}])
+            agent_log.flush()
+        
+        # Lazy (test-mode) initialization opens each file exactly once
+        assert mock_open.call_count == 2
+        agent_log.close()
+        
+        with open(agent_log.csv_path, newline='', encoding='utf-8') as f:
+            rows = list(csv.reader(f))
+        assert rows[0][0] == 'timestamp'
+        assert [r[4] for r in rows[1:6]] == [f"q{i}" for i in range(5)]
+        assert rows[6][3] == 'ERROR'
+        txt = agent_log.txt_path.read_text(encoding='utf-8')
+        assert txt.startswith("=" * 80 + "\nAGENT REASONING LOG\n")
+        assert "RETRIEVAL DETAILS" in txt and "Session ended" in txt
+    
+    def test_records_visible_before_close(self, tmp_path):
+        """Test queued records reach disk on flush() so the logs can be tailed during a run."""
+        agent_log = AgentLogger(log_dir=tmp_path)
+        agent_log.log_step("retriever", "retrieve", query="what is rag")
+        agent_log.flush()
+        
+        assert "what is rag" in agent_log.csv_path.read_text(encoding='utf-8')
+        assert "Query: what is rag" in agent_log.txt_path.read_text(encoding='utf-8')
+        agent_log.close()
+    
+    def test_close_without_records(self, tmp_path):
+        """Test closing an unused test-mode logger still writes the session footer."""
+        agent_log = AgentLogger(log_dir=tmp_path)
+        agent_log.close()
+        
+        assert not agent_log.csv_path.exists()
+        assert "Session ended" in agent_log.txt_path.read_text(encoding='utf-8')
+    
+    def test_close_drains_queue_and_stops_writer(self, tmp_path):
+        """Test close() writes every queued record in order and joins the writer thread."""
+        agent_log = AgentLogger(log_dir=tmp_path)
+        writer = agent_log._writer
+        for i in range(200):
+            agent_log.log_step("critic", "evaluate", question=f"q{i}")
+        agent_log.close()
+        
+        assert not writer.is_alive()
+        with open(agent_log.csv_path, newline='', encoding='utf-8') as f:
+            rows = list(csv.reader(f))
+        assert [r[4] for r in rows[1:]] == [f"q{i}" for i in range(200)]
+    
+    def test_log_after_close_is_written(self, tmp_path):
+        """Test nodes holding a closed logger still get their records written."""
+        agent_log = AgentLogger(log_dir=tmp_path)
+        agent_log.log_step("planner", "plan", question="first")
+        agent_log.close()
+        agent_log.log_step("planner", "plan", question="second")
+        
+        with open(agent_log.csv_path, newline='', encoding='utf-8') as f:
+            rows = list(csv.reader(f))
+        assert [r[4] for r in rows[1:]] == ["first", "second"]
+    
+    def test_records_in_quick_succession_share_one_write(self, tmp_path):
+        """Test a burst of records is written with a single writerows() call."""
+        agent_log = AgentLogger(log_dir=tmp_path)
+        agent_log.log_step("planner", "plan", question="warm-up")
+        agent_log.flush()
+        
+        with patch.object(agent_log, '_write_batch', wraps=agent_log._write_batch) as mock_write_batch:
+            for i in range(10):
+                agent_log.log_step("retriever", "retrieve", query=f"q{i}")
+            agent_log.flush()
+        
+        assert mock_write_batch.call_count == 1
+        assert len(mock_write_batch.call_args[0][0]) == 10
+        agent_log.close()
+    
+    def test_txt_batch_is_one_os_write(self, tmp_path):
+        """Test a batch of TXT blocks goes out in a single os.write() from the reused scratch buffer."""
+        agent_log = AgentLogger(log_dir=tmp_path, verbose=True)
+        agent_log._write_batch([(None, "first\n", None)])
+        scratch = agent_log._txt_scratch
+        
+        calls = []
+        real_write = os.write
+        
+        def counting_write(fd, data):
+            # A Mock would keep the memoryview alive and block reusing the buffer
+            calls.append(len(data))
+            return real_write(fd, data)
+        
+        with patch('inference.graph.agent_logger.os.write', new=counting_write):
+            agent_log._write_batch([(None, f"block {i}\n", None) for i in range(10)])
+        
+        assert len(calls) == 1
+        assert agent_log._txt_scratch is scratch and len(scratch) == 0
+        agent_log.close()
+        txt = agent_log.txt_path.read_text(encoding='utf-8')
+        assert "first\n" + "".join(f"block {i}\n" for i in range(10)) in txt
+    
+    def test_json_fields_round_trip(self, tmp_path):
+        """Test CSV JSON cells (orjson or stdlib) parse back, numpy scalars included."""
+        agent_log = AgentLogger(log_dir=tmp_path)
+        agent_log.log_step("critic", "evaluate", pages=[3, 1], refinements=["a"],
+                           metadata={"score": np.float64(0.5), "label": "seven"})
+        agent_log.close()
+        
+        with open(agent_log.csv_path, newline='', encoding='utf-8') as f:
+            row = list(csv.reader(f))[1]
+        assert json.loads(row[8]) == [3, 1]
+        assert json.loads(row[11]) == ["a"]
+        assert json.loads(row[13]) == {"score": 0.5, "label": "seven"}
+        assert '"score": 0.5' in agent_log.txt_path.read_text(encoding='utf-8')
+    
+    def test_timestamp_matches_datetime_isoformat(self, tmp_path):
+        """Test the per-second cached prefix formats like datetime.isoformat and rolls over."""
+        agent_log = AgentLogger(log_dir=tmp_path)
+        base = 1_700_000_000 * 10**9
+        for ts_ns in (base + 123_456_000, base + 999_999_999, base + 10**9 + 1_000):
+            expected = datetime.fromtimestamp(ts_ns // 1000 / 1e6).isoformat(timespec='microseconds')
+            assert agent_log._timestamp(ts_ns) == expected
+        agent_log.close()
+    
+    def test_pages_line_reused_until_pages_change(self, tmp_path):
+        """Test an unchanged page list reuses the session's formatted line."""
+        agent_log = AgentLogger(log_dir=tmp_path)
+        first = agent_log._pages_line("s1", [3, 1, 3])
+        
+        assert first == "Pages Retrieved: [1, 3]\n"
+        assert agent_log._pages_line("s1", [3, 1, 3]) is first
+        assert agent_log._pages_line("s2", [2]) == "Pages Retrieved: [2]\n"
+        assert agent_log._pages_line("s1", [5, 4]) == "Pages Retrieved: [4, 5]\n"
+        agent_log.close()
+    
+    def test_csv_round_trips_multiline_fields(self, tmp_path):
+        """Test answers with newlines, commas and quotes stay in one CSV row."""
+        answer = 'Line one, with a comma\nLine "two"\x1f'
+        agent_log = AgentLogger(log_dir=tmp_path)
+        agent_log.log_step("synthesizer", "synthesize", plan="1. a\n2. b", answer=answer)
+        agent_log.close()
+        
+        with open(agent_log.csv_path, newline='', encoding='utf-8') as f:
+            rows = list(csv.reader(f))
+        assert len(rows) == 2
+        assert rows[1][5] == "1. a\n2. b" and rows[1][12] == answer
+    
+    def test_binary_log_round_trip(self, tmp_path):
+        """Test .bin records decode back to the logged fields."""
+        pytest.importorskip("msgpack")
+        agent_log = AgentLogger(log_dir=tmp_path, binary=True)
+        agent_log.log_step("retriever", "retrieve", session_id="s1", query="q", pages=[1, 2], confidence=0.5)
+        agent_log.log_step("custom_node", "custom_action", metadata={"k": 1})
+        agent_log.log_error("critic", "boom")
+        agent_log.close()
+        
+        records = list(read_binary_log(agent_log.bin_path))
+        assert records[0]["node"] == "retriever" and records[0]["action"] == "retrieve"
+        assert records[0]["session_id"] == "s1" and records[0]["session_hash"] != 0
+        assert records[0]["pages"] == [1, 2] and records[0]["confidence"] == 0.5
+        assert "answer" not in records[0]
+        assert records[1]["node"] == "custom_node" and records[1]["metadata"] == {"k": 1}
+        assert records[2]["action"] == "ERROR" and records[2]["error"] == "boom"
+    
+    def test_non_verbose_skips_txt(self, tmp_path):
+        """Test verbose=False writes the CSV but no TXT log."""
+        agent_log = AgentLogger(log_dir=tmp_path, verbose=False)
+        agent_log.log_step("planner", "plan", question="q")
+        agent_log.log_retrieval_details("s1", "q", [])
+        agent_log.close()
+        
+        assert agent_log.csv_path.exists()
+        assert not agent_log.txt_path.exists()
+    
+    def test_csv_channel_disabled(self, tmp_path):
+        """Test csv_log=False writes the TXT log but no CSV."""
+        agent_log = AgentLogger(log_dir=tmp_path, csv_log=False)
+        agent_log.log_step("planner", "plan", question="q")
+        agent_log.log_error("critic", "boom")
+        agent_log.close()
+        
+        assert not agent_log.csv_path.exists()
+        txt = agent_log.txt_path.read_text(encoding='utf-8')
+        assert "Question: q" in txt and "Error: boom" in txt
+    
+    def test_all_channels_disabled_skips_work(self, tmp_path):
+        """Test log calls return before queueing anything when every channel is off."""
+        agent_log = AgentLogger(log_dir=tmp_path, csv_log=False, verbose=False, binary=False)
+        with patch.object(agent_log, '_write') as mock_write:
+            agent_log.log_step("planner", "plan", question="q")
+            agent_log.log_error("critic", "boom")
+        
+        mock_write.assert_not_called()
+        agent_log.close()
+        assert not agent_log.csv_path.exists() and not agent_log.txt_path.exists()
+    
+    def test_csv_and_txt_share_one_timestamp(self, tmp_path):
+        """Test the TXT time stamp is taken from the same clock read as the CSV one."""
+        agent_log = AgentLogger(log_dir=tmp_path)
+        agent_log.log_step("planner", "plan", question="q")
+        agent_log.close()
+        
+        with open(agent_log.csv_path, newline='', encoding='utf-8') as f:
+            timestamp = list(csv.reader(f))[1][0]
+        assert f"[{timestamp[11:19]}] PLANNER - plan" in agent_log.txt_path.read_text(encoding='utf-8')
@@ -0,0 +1,105 @@
+"""
+Unit tests for the compiled LangGraph app cache.
+"""
+import pytest
+from unittest.mock import patch
+from inference.graph.builder import get_app
+
+
+class TestGetApp:
+    """Tests for get_app memoization."""
+    
+    @patch('inference.graph.builder.build_app')
+    def test_compiled_once_per_sqlite_path(self, mock_build):
+        """Test repeated calls reuse the compiled app for the same checkpoint path."""
+        mock_build.side_effect = lambda path, persistent=False: object()
+        get_app.cache_clear()
+        try:
+            first = get_app("/tmp/a.sqlite")
+            assert get_app("/tmp/a.sqlite") is first
+            assert get_app("/tmp/b.sqlite") is not first
+            assert mock_build.call_count == 2
+        finally:
+            get_app.cache_clear()
+
+
+class TestLegacyGraphModule:
+    """Tests for the lazy re-exports in inference.graph.graph."""
+    
+    def test_exports_resolve_lazily(self):
+        """Test legacy names still resolve and unknown names raise AttributeError."""
+        from inference.graph import graph
+        from inference.graph.builder import build_app
+        from inference.graph.state import GraphState
+        
+        assert graph.build_app is build_app
+        assert graph.GraphState is GraphState
+        with pytest.raises(AttributeError):
+            graph.not_a_name
+
+
+class TestGetAppConcurrency:
+    """Tests for get_app under concurrent first use."""
+    
+    @patch('inference.graph.builder.build_app')
+    def test_concurrent_first_calls_compile_once(self, mock_build):
+        """Test threads racing on a cold cache share one compiled app."""
+        import threading
+        import time
+        
+        def slow_build(path, persistent=False):
+            time.sleep(0.05)
+            return object()
+        
+        mock_build.side_effect = slow_build
+        get_app.cache_clear()
+        try:
+            results = []
+            threads = [threading.Thread(target=lambda: results.append(get_app("/tmp/c.sqlite"))) for _ in range(4)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            assert mock_build.call_count == 1
+            assert all(r is results[0] for r in results)
+        finally:
+            get_app.cache_clear()
+
+
+class TestCheckpointing:
+    """Tests for opt-in SQLite checkpointing."""
+    
+    @patch('inference.graph.builder.SqliteSaver')
+    def test_no_checkpointer_by_default(self, mock_saver, tmp_path):
+        """Test the default build never opens the SQLite checkpoint."""
+        from inference.graph.builder import build_app
+        
+        build_app(str(tmp_path / "state.sqlite"))
+        
+        mock_saver.assert_not_called()
+        assert not (tmp_path / "state.sqlite").exists()
+    
+    @patch('inference.graph.builder.SqliteSaver')
+    def test_persistent_connection_uses_wal(self, mock_saver, tmp_path):
+        """Test persistent=True wraps a WAL, synchronous=NORMAL connection."""
+        from inference.graph.builder import build_app
+        
+        build_app(str(tmp_path / "state.sqlite"), persistent=True)
+        
+        conn = mock_saver.call_args[0][0]
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        conn.close()
+    
+    @patch('inference.graph.builder.build_app')
+    def test_get_app_defaults_to_env_setting(self, mock_build):
+        """Test persistent=None resolves to GRAPH_CHECKPOINT_PERSIST and is part of the cache key."""
+        get_app.cache_clear()
+        try:
+            with patch('inference.graph.builder.GRAPH_CHECKPOINT_PERSIST', False):
+                get_app("/tmp/d.sqlite")
+            get_app("/tmp/d.sqlite", persistent=True)
+            
+            assert [c.kwargs["persistent"] for c in mock_build.call_args_list] == [False, True]
+        finally:
+            get_app.cache_clear()
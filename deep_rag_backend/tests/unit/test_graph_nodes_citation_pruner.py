@@ -0,0 +1,60 @@
+"""
+Unit tests for the citation pruner graph node.
+"""
+from unittest.mock import patch
+from inference.graph.nodes.citation_pruner import (
+    _check_idont_know,
+    _extract_doc_references,
+    _replace_doc_citations,
+    node_citation_pruner,
+)
+
+DOC_A = "aaaaaaaa-1111-2222-3333-444444444444"
+DOC_B = "bbbbbbbb-1111-2222-3333-444444444444"
+
+
+class TestCitationPrunerHelpers:
+    """Tests for the citation pattern helpers."""
+    
+    def test_check_idont_know(self):
+        """Test negative-answer detection, anchored and unanchored patterns."""
+        assert _check_idont_know("I don't know.")
+        assert _check_idont_know("Sorry, the Document does not mention that.")
+        assert not _check_idont_know("Well, I don't know much, but it is Paris.")  # ^-anchored
+        assert not _check_idont_know("The capital is Paris.")
+    
+    def test_extract_doc_references(self):
+        """Test every inline reference style is extracted."""
+        answer = "See [DOC aaaaaaaa], DOC {bbbbbbbb}, Document cccccccc and doc: dddddddd."
+        
+        assert _extract_doc_references(answer) == {"aaaaaaaa", "bbbbbbbb", "cccccccc", "dddddddd"}
+    
+    def test_replace_doc_citations(self):
+        """Test known prefixes become titles and unknown ones are kept."""
+        answer = "Per [DOC aaaaaaaa] and [DOC eeeeeeee]."
+        
+        assert _replace_doc_citations(answer, {DOC_A: "Report"}) == "Per [Report] and [DOC eeeeeeee]."
+
+
+class TestNodeCitationPruner:
+    """Tests for the citation pruner node."""
+    
+    @patch('inference.graph.nodes.citation_pruner.get_document_title')
+    def test_sources_section_pruned_to_cited_documents(self, mock_title):
+        """Test Sources lines map letters to titles and drop unused documents."""
+        mock_title.side_effect = lambda doc_id: {DOC_A: "Alpha", DOC_B: "Beta"}[doc_id]
+        state = {
+            "question": "q",
+            "answer": "Answer [A].\n\nSources:\n- [A] [DOC: aaaaaaaa]",
+            "doc_ids": [DOC_A, DOC_B],
+            "citations": [f"[1] doc:{DOC_A} p1", f"[2] doc:{DOC_B} p2"],
+            "confidence": 80.0,
+            "letter_to_doc_prefix": {"A": "aaaaaaaa", "B": "bbbbbbbb"},
+        }
+        
+        result = node_citation_pruner(state)
+        
+        assert result["doc_ids"] == [DOC_A]
+        assert "- [A] Alpha" in result["answer"]
+        assert "[DOC:" not in result["answer"]
+        assert result["citations"] == ["[1] Alpha p1"]
@@ -0,0 +1,34 @@
+"""
+Unit tests for the compressor graph node.
+"""
+from unittest.mock import patch
+from inference.graph.nodes import compressor
+from inference.graph.nodes.compressor import node_compressor
+
+
+class TestCompressorSnippets:
+    """Tests for the evidence snippets quoted in the compressor prompt."""
+    
+    @patch('inference.graph.nodes.compressor.call_llm')
+    def test_node_compressor_prompt_includes_snippets(self, mock_call_llm):
+        """Test the prompt carries every evidence snippet."""
+        mock_call_llm.return_value = ("notes", {})
+        state = {"evidence": [
+            {"chunk_id": "a", "doc_id": "d1", "p0": 1, "p1": 1, "text": "alpha"},
+            {"chunk_id": "b", "doc_id": "d1", "p0": 2, "p1": 3, "text": "beta"},
+        ]}
+        
+        result = node_compressor(state)
+        
+        prompt = mock_call_llm.call_args[0][1][0]["content"]
+        assert "[p1–1] alpha\n\n[p2–3] beta" in prompt
+        assert result == {"notes": "notes"}
+    
+    def test_snippets_truncated_to_snippet_chars(self):
+        """Test each snippet quotes at most SNIPPET_CHARS of its chunk."""
+        evidence = [
+            {"chunk_id": "a", "p0": 1, "p1": 2, "text": "x" * 2000},
+            {"chunk_id": None, "p0": 3, "p1": 3, "text": "anon"},
+        ]
+        
+        assert compressor._snippets(evidence) == "[p1–2] " + "x" * 1200 + "\n\n[p3–3] anon"
@@ -0,0 +1,60 @@
+"""
+Unit tests for the critic graph node.
+"""
+from unittest.mock import patch
+from inference.graph.constants import THRESH
+from inference.graph.nodes.critic import node_critic
+from inference.graph.scoring import count_strong
+
+
+class TestCountStrong:
+    """Tests for the vectorized strong-chunk count."""
+    
+    def test_count_strong(self):
+        """Test CE above THRESH or positive lex AND vec counts; missing/None scores are 0."""
+        ev = [
+            {"chunk_id": "1", "ce": THRESH + 0.1},
+            {"chunk_id": "2", "ce": 0.0, "lex": 0.2, "vec": 0.3},
+            {"chunk_id": "3", "ce": THRESH, "lex": 0.2, "vec": 0.0},
+            {"chunk_id": "4", "ce": None, "lex": None, "vec": 0.5},
+            {"chunk_id": "5"},
+        ]
+        
+        assert count_strong(ev) == 2
+        assert count_strong([]) == 0
+
+
+class TestNodeCritic:
+    """Tests for the critic node."""
+    
+    @patch('inference.graph.nodes.critic.call_llm')
+    def test_confident_evidence_skips_refinement(self, mock_call_llm):
+        """Test two strong chunks give confidence 0.6 and no refinement query."""
+        state = {
+            "question": "Test question",
+            "iterations": 0,
+            "evidence": [
+                {"chunk_id": "1", "ce": 0.9, "lex": 0.0, "vec": 0.0},
+                {"chunk_id": "2", "ce": 0.0, "lex": 0.4, "vec": 0.5},
+            ],
+        }
+        
+        result = node_critic(state)
+        
+        assert abs(result["confidence"] - 0.6) < 1e-9
+        mock_call_llm.assert_not_called()
+    
+    @patch('inference.graph.nodes.critic.call_llm')
+    def test_refinements_are_sanitized(self, mock_call_llm):
+        """Test bullets are stripped, tsquery characters cleaned, and only two lines kept."""
+        mock_call_llm.return_value = (
+            "- revenue & growth: 2023\n\n•  \"risk\" factors!\n- third query\n",
+            {},
+        )
+        state = {"question": "Test question", "iterations": 0, "evidence": []}
+        
+        result = node_critic(state)
+        
+        assert result["refinements"] == ["revenue and growth 2023", "risk factors"]
+        assert result["iterations"] == 1
+        assert mock_call_llm.call_args.kwargs["cache"] is False
@@ -0,0 +1,68 @@
+"""
+Unit tests for the planner graph node.
+"""
+import threading
+from unittest.mock import patch
+from inference.graph.nodes import planner
+from inference.graph.nodes.planner import node_planner
+
+
+class TestNodePlanner:
+    """Tests for the planner node."""
+    
+    def setup_method(self):
+        planner._warmup_started = False
+        planner._warmup_thread = None
+        # Never load the real cross-encoder from the warm-up thread
+        self._reranker_patch = patch('retrieval.reranker.warmup_reranker')
+        self.mock_warmup_reranker = self._reranker_patch.start()
+    
+    def teardown_method(self):
+        if planner._warmup_thread is not None:
+            planner._warmup_thread.join(timeout=5)
+        self._reranker_patch.stop()
+    
+    @patch('inference.graph.nodes.planner.call_llm')
+    def test_db_pool_warmed_while_planning(self, mock_call_llm):
+        """Test the DB pool opens concurrently with the planner LLM call, once per process."""
+        pool_opened = threading.Event()
+        
+        def fake_call_llm(*args, **kwargs):
+            # The warm-up runs on its own thread while the LLM call is in flight
+            assert pool_opened.wait(timeout=5)
+            return ("1. Find the answer", {})
+        
+        mock_call_llm.side_effect = fake_call_llm
+        with patch('retrieval.db_utils._get_pool', side_effect=pool_opened.set) as mock_get_pool:
+            result = node_planner({"question": "What is RAG?"})
+            mock_call_llm.side_effect = None
+            mock_call_llm.return_value = ("1. Again", {})
+            node_planner({"question": "What is RAG?"})
+        
+        assert result["plan"] == "1. Find the answer"
+        assert mock_get_pool.call_count == 1
+    
+    @patch('inference.graph.nodes.planner.call_llm')
+    def test_db_pool_warmup_failure_is_ignored(self, mock_call_llm):
+        """Test a failing warm-up does not affect planning."""
+        mock_call_llm.return_value = ("plan", {})
+        attempted = threading.Event()
+        
+        def failing_get_pool():
+            attempted.set()
+            raise RuntimeError("db down")
+        
+        with patch('retrieval.db_utils._get_pool', side_effect=failing_get_pool):
+            assert node_planner({"question": "q"})["plan"] == "plan"
+            assert attempted.wait(timeout=5)
+    
+    @patch('inference.graph.nodes.planner.call_llm')
+    def test_reranker_warmed_in_background(self, mock_call_llm):
+        """Test the cross-encoder warm-up runs on the warm-up thread."""
+        mock_call_llm.return_value = ("plan", {})
+        
+        with patch('retrieval.db_utils._get_pool'):
+            node_planner({"question": "q"})
+            planner._warmup_thread.join(timeout=5)
+        
+        self.mock_warmup_reranker.assert_called_once()
@@ -0,0 +1,77 @@
+"""
+Unit tests for the refine retrieve graph node.
+"""
+import threading
+from unittest.mock import patch
+from inference.graph.nodes.refine_retrieve import node_refine_retrieve
+
+
+def _hit(chunk_id, doc_id="doc-a", p0=1):
+    return {"chunk_id": chunk_id, "doc_id": doc_id, "p0": p0, "p1": p0, "text": f"text {chunk_id}"}
+
+
+class TestNodeRefineRetrieve:
+    """Tests for the refine retrieve node."""
+    
+    def test_no_refinements_is_noop(self):
+        """Test nothing is retrieved without refinement queries."""
+        with patch('inference.graph.nodes.refine_retrieve.retrieve_hybrid_batch') as mock_retrieve:
+            assert node_refine_retrieve({"refinements": []}) == {}
+        mock_retrieve.assert_not_called()
+    
+    def test_refinements_retrieved_as_one_batch_in_order(self):
+        """Test all refinement queries go in one batch call and merge in refinement order."""
+        state = {"refinements": ["q1", "q2"], "evidence": [_hit("z")], "doc_ids": []}
+        with patch('inference.graph.nodes.refine_retrieve.retrieve_hybrid_batch', return_value=[
+            [_hit("a"), _hit("b")], [_hit("b"), _hit("c", doc_id="doc-b")]
+        ]) as mock_retrieve:
+            result = node_refine_retrieve(state)
+        
+        mock_retrieve.assert_called_once()
+        assert mock_retrieve.call_args.args[0] == ["q1", "q2"]
+        assert [h["chunk_id"] for h in result["evidence"]] == ["z", "a", "b", "c"]
+        assert sorted(result["doc_ids"]) == ["doc-a", "doc-b"]
+    
+    def test_scoped_refinement_filters_to_selected_docs(self):
+        """Test cross_doc=False keeps only hits from the selected document."""
+        state = {"refinements": ["q1"], "evidence": [], "doc_id": "doc-a", "cross_doc": False}
+        with patch('inference.graph.nodes.refine_retrieve.retrieve_hybrid_batch',
+                   return_value=[[_hit("a"), _hit("x", doc_id="doc-x")]]) as mock_retrieve:
+            result = node_refine_retrieve(state)
+        
+        assert [h["chunk_id"] for h in result["evidence"]] == ["a"]
+        assert mock_retrieve.call_args.kwargs["doc_id"] == "doc-a"
+    
+    @patch.dict('os.environ', {"RETRIEVAL_MAX_WORKERS": "4"})
+    def test_selected_documents_retrieved_concurrently(self):
+        """Test per-document batches run in parallel and hits stay in selection order per refinement."""
+        barrier = threading.Barrier(2, timeout=5)
+        
+        def fake_batch(queries, *args, doc_id=None, **kwargs):
+            barrier.wait()
+            return [[_hit(f"{doc_id}-{q}", doc_id=doc_id)] for q in queries]
+        
+        state = {"refinements": ["q1", "q2"], "evidence": [], "selected_doc_ids": ["doc-a", "doc-b"], "cross_doc": False}
+        with patch('inference.graph.nodes.refine_retrieve.retrieve_hybrid_batch', side_effect=fake_batch):
+            result = node_refine_retrieve(state)
+        
+        assert [h["chunk_id"] for h in result["evidence"]] == ["doc-a-q1", "doc-b-q1", "doc-a-q2", "doc-b-q2"]
+    
+    def test_cross_doc_supplements_only_limited_refinements(self):
+        """Test the cross-doc supplement batch covers only refinements with limited coverage."""
+        calls = []
+        
+        def fake_batch(queries, *args, doc_id=None, cross_doc=False, **kwargs):
+            calls.append((list(queries), doc_id))
+            if doc_id is None:
+                return [[_hit(f"x-{q}", doc_id="doc-x"), _hit(f"a-{q}")] for q in queries]
+            hit_counts = {"q1": 12, "q2": 1}
+            return [[_hit(f"{q}-{i}") for i in range(hit_counts[q])] for q in queries]
+        
+        state = {"refinements": ["q1", "q2"], "evidence": [], "selected_doc_ids": ["doc-a"], "cross_doc": True}
+        with patch('inference.graph.nodes.refine_retrieve.retrieve_hybrid_batch', side_effect=fake_batch):
+            result = node_refine_retrieve(state)
+        
+        assert calls == [(["q1", "q2"], "doc-a"), (["q2"], None)]
+        ids = [h["chunk_id"] for h in result["evidence"]]
+        assert "x-q2" in ids and "a-q2" not in ids
@@ -237,3 +237,90 @@ class TestNodeRetriever:
         assert result["evidence"][0]["doc_id"] == "doc1"
         assert result["doc_ids"] == ["doc1"]
 
+
+
+class TestEarlyAccept:
+    """Tests for routing strong first-pass evidence straight to the synthesizer."""
+    
+    @staticmethod
+    def _state():
+        return {"question": "Test question", "plan": "", "evidence": [], "iterations": 0,
+                "doc_id": "doc1", "doc_ids": [], "cross_doc": False}
+    
+    @patch('inference.graph.nodes.retriever.retrieve_hybrid')
+    def test_strong_evidence_skips_compressor(self, mock_retrieve):
+        """Test five strong chunks set the critic-equivalent confidence and route to the synthesizer."""
+        from inference.graph.routing import should_compress
+        mock_retrieve.return_value = [
+            {"chunk_id": str(i), "text": "Evidence", "ce": 0.8, "lex": 0.5, "vec": 0.6, "p0": i, "p1": i, "doc_id": "doc1"}
+            for i in range(5)
+        ]
+        
+        result = node_retriever(self._state())
+        
+        assert result["strong_chunks"] == 5
+        assert result["confidence"] == pytest.approx(0.9)
+        assert result["refinements"] == []
+        assert should_compress(result) == "skip"
+    
+    @patch('inference.graph.nodes.retriever.retrieve_hybrid')
+    def test_weak_evidence_goes_to_compressor(self, mock_retrieve):
+        """Test too few strong chunks leave confidence to the critic."""
+        from inference.graph.routing import should_compress
+        mock_retrieve.return_value = [
+            {"chunk_id": "1", "text": "Evidence", "ce": 0.8, "lex": 0.5, "vec": 0.6, "p0": 1, "p1": 1, "doc_id": "doc1"}
+        ]
+        
+        result = node_retriever(self._state())
+        
+        assert result["strong_chunks"] == 1
+        assert "confidence" not in result
+        assert should_compress(result) == "compress"
+    
+    @patch('inference.graph.nodes.retriever.retrieve_hybrid')
+    def test_accepted_evidence_skips_only_compressor(self, mock_retrieve):
+        """Test evidence the critic will accept goes to the critic without compressing."""
+        from inference.graph.routing import should_compress
+        mock_retrieve.return_value = [
+            {"chunk_id": str(i), "text": "Evidence", "ce": 0.8, "lex": 0.5, "vec": 0.6, "p0": i, "p1": i, "doc_id": "doc1"}
+            for i in range(2)
+        ]
+        
+        result = node_retriever(self._state())
+        
+        assert result["strong_chunks"] == 2
+        assert should_compress({**self._state(), **result}) == "critique"
+        assert should_compress({**self._state(), **result, "evidence": result["evidence"][:1]}) == "compress"
+
+
+class TestEvidenceHits:
+    """Tests for what retrieval hits keep in graph state."""
+    
+    @patch('inference.graph.nodes.retriever.retrieve_hybrid')
+    def test_embeddings_not_stored_in_state(self, mock_retrieve):
+        """Test the dense embedding is dropped from evidence and the retrieval result is untouched."""
+        import numpy as np
+        hit = {"chunk_id": "1", "text": "Evidence", "emb": np.ones(4, dtype=np.float32),
+               "ce": 0.8, "lex": 0.5, "vec": 0.6, "p0": 1, "p1": 1, "doc_id": "doc1"}
+        mock_retrieve.return_value = [hit]
+        
+        result = node_retriever({"question": "q", "plan": "", "evidence": [], "doc_id": "doc1", "cross_doc": False})
+        
+        assert "emb" not in result["evidence"][0]
+        assert result["evidence"][0]["text"] == "Evidence"
+        assert "emb" in hit
+
+    def test_evidence_hits_store_no_snippet_copy(self):
+        """Test hits enter the state without a stored snippet; emb-free hits are not copied."""
+        from inference.graph.constants import SNIPPET_CHARS
+        from inference.graph.state import evidence_hits, hit_snippet
+        long_text = "x" * (SNIPPET_CHARS + 50)
+        plain = {"chunk_id": "1", "text": long_text, "ce": 0.8, "p0": 1, "p1": 1, "doc_id": "doc1"}
+        with_emb = {"chunk_id": "2", "text": "short", "emb": [0.1], "p0": 2, "p1": 2, "doc_id": "doc1"}
+        
+        out = evidence_hits([plain, with_emb])
+        
+        assert out[0] is plain
+        assert "snippet" not in out[1] and "emb" not in out[1]
+        assert hit_snippet(out[0]) == long_text[:SNIPPET_CHARS]
+        assert hit_snippet(out[1]) == "short"
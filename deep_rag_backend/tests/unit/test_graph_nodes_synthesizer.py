@@ -32,7 +32,7 @@ class TestNodeSynthesizer:
             ],
             "notes": "Test notes",
             "answer": "",
-            "confidence": 0.0,
+            "confidence": 0.6,
             "iterations": 0,
             "refinements": [],
             "doc_ids": [],
@@ -55,7 +55,7 @@ class TestNodeSynthesizer:
             "evidence": [],  # No evidence
             "notes": "Test notes",
             "answer": "",
-            "confidence": 0.0,
+            "confidence": 0.6,
             "iterations": 0,
             "refinements": [],
             "doc_ids": [],
@@ -77,7 +77,7 @@ class TestNodeSynthesizer:
             "evidence": None,  # None evidence
             "notes": "Test notes",
             "answer": "",
-            "confidence": 0.0,
+            "confidence": 0.6,
             "iterations": 0,
             "refinements": [],
             "doc_ids": [],
@@ -112,7 +112,7 @@ class TestNodeSynthesizer:
             ],
             "notes": "Test notes",
             "answer": "",
-            "confidence": 0.0,
+            "confidence": 0.6,
             "iterations": 0,
             "refinements": [],
             "doc_ids": [],
@@ -148,7 +148,7 @@ class TestNodeSynthesizer:
             ],
             "notes": "Test notes",
             "answer": "",
-            "confidence": 0.0,
+            "confidence": 0.6,
             "iterations": 0,
             "refinements": [],
             "doc_ids": [],
@@ -185,7 +185,7 @@ class TestNodeSynthesizer:
             ],
             "notes": "Test notes",
             "answer": "",
-            "confidence": 0.0,
+            "confidence": 0.6,
             "iterations": 0,
             "refinements": [],
             "doc_ids": [],
@@ -222,7 +222,7 @@ class TestNodeSynthesizer:
             ],
             "notes": "Test notes",
             "answer": "",
-            "confidence": 0.0,
+            "confidence": 0.6,
             "iterations": 0,
             "refinements": [],
             "doc_id": "doc1",
@@ -261,7 +261,7 @@ class TestNodeSynthesizer:
             ],
             "notes": "Test notes",
             "answer": "",
-            "confidence": 0.0,
+            "confidence": 0.6,
             "iterations": 0,
             "refinements": [],
             "doc_ids": [],
@@ -295,7 +295,7 @@ class TestNodeSynthesizer:
             ],
             "notes": "Test notes",
             "answer": "",
-            "confidence": 0.0,
+            "confidence": 0.6,
             "iterations": 0,
             "refinements": [],
             "doc_ids": [],
@@ -312,3 +312,26 @@ class TestNodeSynthesizer:
         # Should see multiple chunks (context is limited by MAX_CONTEXT_CHUNKS=8, MAX_CHUNKS_PER_DOC=2)
         assert "Evidence" in context
 
+    
+    @patch('inference.graph.nodes.synthesizer.get_confidence_for_chunks')
+    @patch('inference.graph.nodes.synthesizer.call_llm')
+    def test_node_synthesizer_low_critic_confidence_skips_llm(self, mock_call_llm, mock_confidence):
+        """Test low critic confidence abstains before the LLM unless documents were pinned."""
+        state: GraphState = {
+            "question": "Out of domain?",
+            "evidence": [{"chunk_id": "1", "text": "Weak", "p0": 1, "p1": 1, "doc_id": "doc1", "lex": 0.0, "vec": 0.1}],
+            "confidence": 0.4,
+            "iterations": 5,
+        }
+        
+        result = node_synthesizer(state)
+        
+        assert result["answer"] == "I don't know."
+        assert result["action"] == "abstain"
+        mock_call_llm.assert_not_called()
+        mock_confidence.assert_not_called()
+        
+        # Explicitly selected documents still go through the normal confidence gate
+        mock_confidence.return_value = {"confidence": 10.0, "probability": 0.1, "action": "abstain", "features": {}}
+        node_synthesizer({**state, "selected_doc_ids": ["doc1"]})
+        mock_confidence.assert_called_once()
@@ -0,0 +1,85 @@
+"""
+Unit tests for token streaming out of the LangGraph pipeline.
+"""
+import asyncio
+import threading
+import pytest
+from unittest.mock import patch
+from inference.graph.graph_wrapper import ask_with_graph_async, stream_with_graph
+from inference.graph.streaming import current_token_sink, stream_llm_to_sink, stream_tokens
+
+
+class TestStreamLlmToSink:
+    """Tests for the blocking streaming LLM helper."""
+
+    @patch('inference.graph.streaming.call_llm_stream')
+    def test_forwards_deltas_and_returns_full_text(self, mock_stream):
+        """Test each delta reaches the sink in order and the joined text is returned."""
+        async def fake_stream(*args, **kwargs):
+            for delta in ("The ", "answer", "."):
+                yield delta
+
+        mock_stream.side_effect = fake_stream
+        seen = []
+
+        text, token_info = stream_llm_to_sink(seen.append, "sys", [{"role": "user", "content": "q"}], max_tokens=10)
+
+        assert seen == ["The ", "answer", "."]
+        assert text == "The answer."
+        assert token_info == {}
+
+    def test_sink_scoped_to_block(self):
+        """Test the sink is only visible inside stream_tokens."""
+        sink = [].append
+        assert current_token_sink() is None
+        with stream_tokens(sink):
+            assert current_token_sink() is sink
+        assert current_token_sink() is None
+
+
+class TestStreamWithGraph:
+    """Tests for stream_with_graph."""
+
+    @patch('inference.graph.graph_wrapper.ask_with_graph')
+    def test_yields_tokens_then_result(self, mock_ask):
+        """Test tokens emitted during the graph run precede the final result event."""
+        def fake_ask(question, **kwargs):
+            sink = current_token_sink()
+            sink("Hello ")
+            sink("world")
+            return {"answer": "Hello world\n\nSources: [1]", "thread_id": kwargs.get("thread_id")}
+
+        mock_ask.side_effect = fake_ask
+
+        events = list(stream_with_graph("q", thread_id="t1"))
+
+        assert events == [
+            {"event": "token", "data": "Hello "},
+            {"event": "token", "data": "world"},
+            {"event": "result", "data": {"answer": "Hello world\n\nSources: [1]", "thread_id": "t1"}},
+        ]
+
+    @patch('inference.graph.graph_wrapper.ask_with_graph')
+    def test_graph_error_is_raised_to_consumer(self, mock_ask):
+        """Test an exception in the graph thread propagates to the iterating caller."""
+        mock_ask.side_effect = RuntimeError("LLM down")
+
+        with pytest.raises(RuntimeError, match="LLM down"):
+            list(stream_with_graph("q"))
+
+
+class TestAskWithGraphAsync:
+    """Tests for ask_with_graph_async."""
+
+    @patch('inference.graph.graph_wrapper.ask_with_graph')
+    def test_runs_graph_off_the_event_loop(self, mock_ask):
+        """Test the sync graph runs in a worker thread with the caller's arguments."""
+        loop_thread = threading.get_ident()
+        mock_ask.side_effect = lambda question, **kwargs: {"answer": question, "thread": threading.get_ident(), **kwargs}
+
+        result = asyncio.run(ask_with_graph_async("q", thread_id="t1", cross_doc=True))
+
+        assert result["answer"] == "q"
+        assert result["thread_id"] == "t1"
+        assert result["cross_doc"] is True
+        assert result["thread"] != loop_thread
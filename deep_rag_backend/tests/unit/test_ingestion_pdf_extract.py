@@ -0,0 +1,34 @@
+"""
+Unit tests for PDF page extraction.
+"""
+import fitz
+from unittest.mock import MagicMock, patch
+from ingestion.pdf_extract import FITZ_LOCK, pdf_extract
+
+
+class TestPdfExtract:
+    """Tests for pdf_extract and its PyMuPDF lock."""
+    
+    @patch('ingestion.pdf_extract.pytesseract.image_to_string')
+    @patch('ingestion.pdf_extract.convert_from_path')
+    def test_ocr_runs_outside_fitz_lock(self, mock_convert, mock_ocr, tmp_path):
+        """Test a blank (scanned) page is OCRed without holding FITZ_LOCK."""
+        path = str(tmp_path / "scan.pdf")
+        doc = fitz.open()
+        doc.new_page()
+        doc.save(path)
+        doc.close()
+        lock_held = []
+        
+        def ocr(image):
+            lock_held.append(FITZ_LOCK.locked())
+            return "Scanned page text"
+        
+        mock_convert.return_value = [MagicMock()]
+        mock_ocr.side_effect = ocr
+        
+        pages = pdf_extract(path)
+        
+        assert lock_held == [False]
+        assert pages[0]["text"] == "Scanned page text"
+        assert pages[0]["is_ocr"] is True
@@ -1,12 +1,21 @@
 """
 Unit tests for Gemini LLM provider.
 """
+import asyncio
 import pytest
-from unittest.mock import patch, MagicMock
-from inference.llm.providers.gemini import gemini_chat
+from unittest.mock import AsyncMock, patch, MagicMock
+from inference.llm.providers.gemini import gemini_chat, gemini_chat_async, reset_clients
 from inference.llm.config import GEMINI_API_KEY
 
 
+@pytest.fixture(autouse=True)
+def fresh_clients():
+    """Each test builds its own (possibly mocked) Gemini client."""
+    reset_clients()
+    yield
+    reset_clients()
+
+
 class TestGeminiChat:
     """Tests for Gemini chat implementation."""
     
@@ -22,7 +31,7 @@ class TestGeminiChat:
         mock_response.usage_metadata = mock_usage
         mock_client = MagicMock()
         mock_client.models.generate_content.return_value = mock_response
-        mock_client_class.return_value.__enter__.return_value = mock_client
+        mock_client_class.return_value = mock_client
         
         result, token_info = gemini_chat(
             system="Test system",
@@ -44,3 +53,115 @@ class TestGeminiChat:
                     temperature=0.2
                 )
 
+    
+    @patch('inference.llm.providers.gemini.genai.Client')
+    def test_gemini_chat_reuses_client(self, mock_client_class):
+        """Test consecutive calls share one SDK client built on the pooled httpx client."""
+        mock_response = MagicMock()
+        mock_response.text = "ok"
+        mock_response.usage_metadata = None
+        mock_client_class.return_value.models.generate_content.return_value = mock_response
+        
+        with patch('inference.llm.providers.gemini.GEMINI_API_KEY', 'test-key'), \
+             patch('inference.llm.providers.gemini.GEMINI_MODEL', 'gemini-test'):
+            gemini_chat("sys", [{"role": "user", "content": "hi"}], 10, 0.1)
+            gemini_chat("sys", [{"role": "user", "content": "hi"}], 10, 0.1)
+        
+        assert mock_client_class.call_count == 1
+        assert mock_client_class.return_value.models.generate_content.call_count == 2
+        assert mock_client_class.call_args.kwargs["http_options"].httpx_client is not None
+
+    @patch('inference.llm.providers.gemini.genai.Client')
+    def test_async_client_reused_within_loop(self, mock_client_class):
+        """Test async calls on one event loop share a client and never close it."""
+        mock_response = MagicMock()
+        mock_response.text = "ok"
+        mock_response.usage_metadata = None
+        mock_client = mock_client_class.return_value
+        mock_client.aio.models.generate_content = AsyncMock(return_value=mock_response)
+        mock_client.aio.aclose = AsyncMock()
+        
+        async def two_calls():
+            await gemini_chat_async("sys", [{"role": "user", "content": "hi"}], 10, 0.1)
+            await gemini_chat_async("sys", [{"role": "user", "content": "hi"}], 10, 0.1)
+        
+        with patch('inference.llm.providers.gemini.GEMINI_API_KEY', 'test-key'):
+            asyncio.run(two_calls())
+        
+        assert mock_client_class.call_count == 1
+        assert mock_client.aio.models.generate_content.call_count == 2
+        mock_client.aio.aclose.assert_not_called()
+
+    @patch('inference.llm.providers.gemini.genai.Client')
+    def test_response_schema_requests_json(self, mock_client_class):
+        """Test a response_schema switches the request to structured JSON output."""
+        from pydantic import BaseModel
+
+        class Reply(BaseModel):
+            answer: str
+
+        mock_response = MagicMock()
+        mock_response.text = '{"answer": "ok"}'
+        mock_response.usage_metadata = None
+        mock_client_class.return_value.models.generate_content.return_value = mock_response
+        
+        with patch('inference.llm.providers.gemini.GEMINI_API_KEY', 'test-key'):
+            text, _ = gemini_chat("sys", [{"role": "user", "content": "hi"}], 10, 0.1, response_schema=Reply)
+        
+        config = mock_client_class.return_value.models.generate_content.call_args.kwargs["config"]
+        assert text == '{"answer": "ok"}'
+        assert config.response_mime_type == "application/json"
+        assert config.response_schema is Reply
+
+    def test_config_built_once_per_setting(self):
+        """Test repeated requests with the same settings share one GenerateContentConfig."""
+        from inference.llm.providers.gemini import _build_request
+        
+        _, _, first = _build_request("sys", [{"role": "user", "content": "a"}], 500, 0.2)
+        _, _, second = _build_request("sys", [{"role": "user", "content": "b"}], 500, 0.2)
+        _, _, other = _build_request("sys", [{"role": "user", "content": "a"}], 100, 0.2)
+        
+        assert first is second
+        assert other is not first
+        assert (first.max_output_tokens, first.temperature, first.system_instruction) == (500, 0.2, "sys")
+
+
+class TestParseResponse:
+    """Tests for extracting text and usage from SDK responses."""
+    
+    @staticmethod
+    def _response(parts, finish_reason="STOP", usage=None):
+        from google.genai import types
+        return types.GenerateContentResponse(
+            candidates=[types.Candidate(content=types.Content(role="model", parts=parts), finish_reason=finish_reason)],
+            usage_metadata=usage,
+        )
+    
+    def test_joins_text_parts_and_skips_thoughts(self):
+        """Test the answer is the first candidate's non-thought text, with usage counts."""
+        from google.genai import types
+        from inference.llm.providers.gemini import _parse_response
+        response = self._response(
+            [types.Part(text="thinking", thought=True), types.Part(text=" The "), types.Part(text="answer. ")],
+            usage=types.GenerateContentResponseUsageMetadata(prompt_token_count=7, candidates_token_count=3, total_token_count=10),
+        )
+        
+        assert _parse_response(response, "models/m", 100) == (
+            "The answer.", {"input_tokens": 7, "output_tokens": 3, "total_tokens": 10}
+        )
+    
+    def test_truncated_empty_response_names_max_tokens(self):
+        """Test an empty MAX_TOKENS response raises the truncation error."""
+        from inference.llm.providers.gemini import _parse_response
+        response = self._response(None, finish_reason="MAX_TOKENS")
+        
+        with pytest.raises(RuntimeError, match="MAX_TOKENS.*currently 50"):
+            _parse_response(response, "models/m", 50)
+    
+    def test_empty_response_reports_finish_reason(self):
+        """Test any other empty response raises with its finish reason."""
+        from inference.llm.providers.gemini import _parse_response
+        response = self._response([], finish_reason="SAFETY")
+        
+        with pytest.raises(RuntimeError, match="empty response.*SAFETY"):
+            _parse_response(response, "models/m", 50)
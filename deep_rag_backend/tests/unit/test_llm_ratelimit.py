@@ -0,0 +1,66 @@
+"""
+Unit tests for the client-side LLM request rate limiter.
+"""
+import asyncio
+from unittest.mock import patch
+from inference.llm.ratelimit import TokenBucket
+
+
+class TestTokenBucket:
+    """Tests for TokenBucket."""
+    
+    @patch('inference.llm.ratelimit.time.monotonic', return_value=100.0)
+    def test_burst_then_queued_waits(self, mock_now):
+        """Test the first `capacity` requests go straight through and later ones wait in arrival order."""
+        bucket = TokenBucket(rate=2.0, capacity=2)
+        
+        waits = [bucket.reserve() for _ in range(4)]
+        
+        assert waits == [0.0, 0.0, 0.5, 1.0]
+    
+    @patch('inference.llm.ratelimit.time.monotonic')
+    def test_refills_over_time_up_to_capacity(self, mock_now):
+        """Test tokens accrue at `rate` per second but never beyond capacity."""
+        mock_now.return_value = 0.0
+        bucket = TokenBucket(rate=1.0, capacity=2)
+        bucket.reserve()
+        bucket.reserve()
+        
+        mock_now.return_value = 60.0
+        
+        assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 1.0]
+    
+    def test_zero_rate_disables(self):
+        """Test a rate of 0 never makes callers wait."""
+        bucket = TokenBucket(rate=0.0, capacity=1)
+        assert [bucket.reserve() for _ in range(5)] == [0.0] * 5
+    
+    @patch('inference.llm.ratelimit.asyncio.sleep')
+    @patch('inference.llm.ratelimit.time.monotonic', return_value=0.0)
+    def test_async_acquire_awaits_the_wait(self, mock_now, mock_sleep):
+        """Test aacquire sleeps on the event loop for the reserved wait."""
+        bucket = TokenBucket(rate=4.0, capacity=1)
+        
+        async def two():
+            await bucket.aacquire()
+            await bucket.aacquire()
+        
+        asyncio.run(two())
+        
+        mock_sleep.assert_called_once_with(0.25)
+
+
+class TestCallLlmRateLimit:
+    """Tests for call_llm taking a bucket token per provider request."""
+    
+    @patch('inference.llm.wrapper.request_bucket')
+    @patch('inference.llm.wrapper.gemini_chat', return_value=("ok", {}))
+    def test_cache_hit_skips_bucket(self, mock_gemini, mock_bucket):
+        """Test only the provider call takes a token; a cached repeat does not."""
+        from inference.llm import call_llm
+        
+        call_llm("sys", [{"role": "user", "content": "q"}], max_tokens=10, temperature=0.0)
+        call_llm("sys", [{"role": "user", "content": "q"}], max_tokens=10, temperature=0.0)
+        
+        assert mock_gemini.call_count == 1
+        mock_bucket.acquire.assert_called_once_with()
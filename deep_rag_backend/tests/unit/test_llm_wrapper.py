@@ -1,9 +1,10 @@
 """
 Unit tests for LLM wrapper module.
 """
+import asyncio
 import pytest
 from unittest.mock import patch, MagicMock
-from inference.llm.wrapper import call_llm
+from inference.llm.wrapper import acall_llm, acall_llm_batch, call_llm, call_llm_batch
 from inference.llm.config import LLM_PROVIDER
 
 
@@ -35,4 +36,175 @@ class TestCallLLM:
         )
         assert result == "Success"
         assert mock_gemini.call_count == 2
+    
+    @patch('inference.llm.wrapper.gemini_chat')
+    def test_call_llm_caches_identical_requests(self, mock_gemini):
+        """Test a repeated low-temperature request is served without a provider call."""
+        mock_gemini.return_value = ("Cached", {"input_tokens": 10, "output_tokens": 5, "total_tokens": 15})
+        messages = [{"role": "user", "content": "Test"}]
+        
+        first = call_llm("Test system", messages, max_tokens=100, temperature=0.2)
+        second = call_llm("Test system", messages, max_tokens=100, temperature=0.2)
+        call_llm("Test system", messages, max_tokens=200, temperature=0.2)
+        
+        assert first == ("Cached", {"input_tokens": 10, "output_tokens": 5, "total_tokens": 15})
+        assert second == ("Cached", {"input_tokens": 0, "output_tokens": 0, "total_tokens": 0})
+        assert mock_gemini.call_count == 2
+    
+    @patch('inference.llm.wrapper.gemini_chat')
+    def test_call_llm_cache_false_always_calls_provider(self, mock_gemini):
+        """Test cache=False neither reads nor fills the response cache."""
+        mock_gemini.side_effect = [("First", {}), ("Second", {}), ("Third", {})]
+        messages = [{"role": "user", "content": "Test"}]
+        
+        assert call_llm("Test system", messages, max_tokens=100, temperature=0.0, cache=False)[0] == "First"
+        assert call_llm("Test system", messages, max_tokens=100, temperature=0.0, cache=False)[0] == "Second"
+        assert call_llm("Test system", messages, max_tokens=100, temperature=0.0)[0] == "Third"
+        assert mock_gemini.call_count == 3
+    
+    @patch('inference.llm.wrapper.gemini_chat')
+    def test_call_llm_does_not_cache_sampled_requests(self, mock_gemini):
+        """Test requests above LLM_CACHE_MAX_TEMP always reach the provider."""
+        mock_gemini.return_value = ("Sampled", {})
+        messages = [{"role": "user", "content": "Test"}]
+        
+        call_llm("Test system", messages, max_tokens=100, temperature=0.9)
+        call_llm("Test system", messages, max_tokens=100, temperature=0.9)
+        
+        assert mock_gemini.call_count == 2
+
+    
+    @patch('inference.llm.wrapper.time.sleep')
+    @patch('inference.llm.wrapper.gemini_chat')
+    def test_call_llm_fails_fast_on_request_errors(self, mock_gemini, mock_sleep):
+        """Test a 4xx such as PERMISSION_DENIED is raised without retrying."""
+        from google.genai import errors
+        api_error = errors.ClientError(403, {"error": {"code": 403, "message": "denied", "status": "PERMISSION_DENIED"}})
+        mock_gemini.side_effect = RuntimeError("Gemini API call failed")
+        mock_gemini.side_effect.__cause__ = api_error
+        
+        with pytest.raises(RuntimeError, match="not retryable"):
+            call_llm("Test system", [{"role": "user", "content": "Test"}], max_tokens=100, retries=5)
+        
+        assert mock_gemini.call_count == 1
+        mock_sleep.assert_not_called()
+    
+    @patch('inference.llm.wrapper._rate_limited_until', 0.0)
+    @patch('inference.llm.wrapper.random.uniform', side_effect=lambda low, high: high / 2)
+    @patch('inference.llm.wrapper.time.sleep')
+    @patch('inference.llm.wrapper.gemini_chat')
+    def test_call_llm_rate_limit_backs_off_with_jitter(self, mock_gemini, mock_sleep, mock_uniform):
+        """Test a 429 is retried after a jittered delay and holds off other callers."""
+        from google.genai import errors
+        import inference.llm.wrapper as wrapper
+        rate_limited = RuntimeError("Gemini API call failed")
+        rate_limited.__cause__ = errors.ClientError(429, {"error": {"code": 429, "message": "quota", "status": "RESOURCE_EXHAUSTED"}})
+        mock_gemini.side_effect = [rate_limited, ("Success", {})]
+        
+        result, _ = call_llm("Test system", [{"role": "user", "content": "Test"}], max_tokens=100,
+                             retries=3, retry_backoff_sec=4.0)
+        
+        assert result == "Success"
+        mock_uniform.assert_called_once_with(0, 4.0)
+        assert mock_sleep.call_args_list[0].args[0] == pytest.approx(2.0)
+        assert wrapper._rate_limited_until > 0
+
 
+class TestAcallLLM:
+    """Tests for the async call_llm counterpart."""
+    
+    @patch('inference.llm.wrapper.asyncio.sleep')
+    @patch('inference.llm.wrapper.gemini_chat_async')
+    def test_acall_llm_retries_and_caches(self, mock_gemini, mock_sleep):
+        """Test acall_llm retries a transient error and caches the result like call_llm."""
+        mock_gemini.side_effect = [Exception("Transient error"), ("Async", {"total_tokens": 3})]
+        messages = [{"role": "user", "content": "Test"}]
+        
+        first = asyncio.run(acall_llm("Test system", messages, max_tokens=100, temperature=0.0, retries=2))
+        second = asyncio.run(acall_llm("Test system", messages, max_tokens=100, temperature=0.0))
+        
+        assert first == ("Async", {"total_tokens": 3})
+        assert second == ("Async", {"total_tokens": 0})
+        assert mock_gemini.call_count == 2
+        mock_sleep.assert_awaited_once()
+
+
+class TestCallLLMBatch:
+    """Tests for row-marshalled call_llm_batch."""
+    
+    @patch('inference.llm.wrapper.acall_llm')
+    def test_rows_split_from_one_request(self, mock_call_llm):
+        """Test one request answers every row, in prompt order."""
+        mock_call_llm.return_value = ("===ROW 2===\nsecond\n\n===ROW 1===\nfirst", {})
+        
+        answers = call_llm_batch("sys", ["p1", "p2"], max_tokens=50)
+        
+        assert answers == ["first", "second"]
+        mock_call_llm.assert_called_once()
+        batch_prompt = mock_call_llm.call_args.args[1][0]["content"]
+        assert "===ROW 1===\np1" in batch_prompt and "===ROW 2===\np2" in batch_prompt
+        assert mock_call_llm.call_args.kwargs["max_tokens"] == 100
+    
+    @patch('inference.llm.wrapper.acall_llm')
+    def test_missing_row_retried_individually(self, mock_call_llm):
+        """Test a row absent from the batched response gets its own request."""
+        mock_call_llm.side_effect = [("===ROW 1===\nfirst", {}), ("second", {})]
+        
+        answers = call_llm_batch("sys", ["p1", "p2"], max_tokens=50)
+        
+        assert answers == ["first", "second"]
+        assert mock_call_llm.call_args.args[1] == [{"role": "user", "content": "p2"}]
+    
+    @patch('inference.llm.wrapper.LLM_BATCH_MAX_ROWS', 2)
+    @patch('inference.llm.wrapper.acall_llm')
+    def test_groups_capped_at_max_rows(self, mock_call_llm):
+        """Test prompts beyond LLM_BATCH_MAX_ROWS go in further requests."""
+        mock_call_llm.side_effect = [("===ROW 1===\na\n===ROW 2===\nb", {}), ("c", {})]
+        
+        assert call_llm_batch("sys", ["p1", "p2", "p3"]) == ["a", "b", "c"]
+        assert mock_call_llm.call_count == 2
+    
+    @patch('inference.llm.wrapper.LLM_BATCH_MAX_ROWS', 1)
+    @patch('inference.llm.wrapper.acall_llm')
+    def test_groups_sent_concurrently_up_to_limit(self, mock_call_llm):
+        """Test groups overlap in flight, bounded by max_concurrency."""
+        in_flight = []
+        peak = []
+        
+        async def fake_call(system, messages, *args, **kwargs):
+            in_flight.append(1)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.pop()
+            return messages[0]["content"].upper(), {}
+        mock_call_llm.side_effect = fake_call
+        
+        answers = asyncio.run(acall_llm_batch("sys", ["a", "b", "c", "d"], max_concurrency=2))
+        
+        assert answers == ["A", "B", "C", "D"]
+        assert max(peak) == 2
+
+
+class TestCallLLMStream:
+    """Tests for call_llm_stream wrapper function."""
+    
+    @patch('inference.llm.wrapper.gemini_chat_stream')
+    def test_call_llm_stream_retries_before_first_token(self, mock_stream):
+        """Test streaming retries a failed call that produced no tokens."""
+        from inference.llm.wrapper import call_llm_stream
+        
+        async def failing(*args, **kwargs):
+            raise Exception("Transient error")
+            yield  # pragma: no cover
+        
+        async def succeeding(*args, **kwargs):
+            for delta in ["Hel", "lo"]:
+                yield delta
+        
+        mock_stream.side_effect = [failing(), succeeding()]
+        
+        async def collect():
+            return [d async for d in call_llm_stream("sys", [{"role": "user", "content": "Test"}], retries=2, retry_backoff_sec=0)]
+        
+        assert asyncio.run(collect()) == ["Hel", "lo"]
+        assert mock_stream.call_count == 2
@@ -0,0 +1,30 @@
+"""
+Unit tests for prompt template loading.
+"""
+import pytest
+from unittest.mock import patch
+from inference.graph.prompt_templates import format_template, load_template
+
+
+class TestPromptTemplates:
+    """Tests for load_template and format_template."""
+
+    def test_templates_read_once(self):
+        """Test formatting a preloaded template does not touch the filesystem."""
+        with patch('pathlib.Path.read_text') as mock_read:
+            prompt = format_template("planner", question="What is X?", doc_context="")
+
+        mock_read.assert_not_called()
+        assert "What is X?" in prompt
+
+    def test_missing_template_raises(self):
+        """Test an unknown template name still raises FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            load_template("does_not_exist")
+
+    @pytest.mark.parametrize("name", ["synthesizer_standard", "synthesizer_content_multi_doc",
+                                      "critic_standard", "critic_multi_doc"])
+    def test_instructions_precede_variables(self, name):
+        """Test per-query fields come after the fixed instructions, so the prompt prefix is shared."""
+        template = load_template(name)
+        assert template.index("{") > len(template) // 2
@@ -0,0 +1,44 @@
+"""
+Unit tests for the shared PostgreSQL connection pool.
+"""
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch, MagicMock
+from retrieval import db_utils
+
+
+@pytest.fixture(autouse=True)
+def reset_pool():
+    db_utils._connection_pool = None
+    yield
+    db_utils._connection_pool = None
+
+
+class TestConnect:
+    """Tests for pooled connect()."""
+    
+    @patch('retrieval.db_utils.pool.ThreadedConnectionPool')
+    def test_pool_created_once_across_threads(self, mock_pool_cls):
+        """Test concurrent first callers share a single pool."""
+        with ThreadPoolExecutor(max_workers=8) as ex:
+            list(ex.map(lambda _: db_utils._get_pool(), range(32)))
+        assert mock_pool_cls.call_count == 1
+    
+    @patch('retrieval.db_utils.psycopg2.connect')
+    @patch('retrieval.db_utils.pool.ThreadedConnectionPool')
+    def test_error_in_block_returns_connection_without_fallback(self, mock_pool_cls, mock_direct):
+        """Test a caller's exception propagates and the pooled connection is returned."""
+        conn_pool = mock_pool_cls.return_value
+        with pytest.raises(ValueError):
+            with db_utils.connect() as conn:
+                raise ValueError("query failed")
+        conn_pool.putconn.assert_called_once_with(conn_pool.getconn.return_value)
+        mock_direct.assert_not_called()
+    
+    @patch('retrieval.db_utils.psycopg2.connect')
+    @patch('retrieval.db_utils.pool.ThreadedConnectionPool', side_effect=Exception("no pool"))
+    def test_falls_back_to_direct_connection(self, mock_pool_cls, mock_direct):
+        """Test a direct connection is used (and closed) when the pool cannot be created."""
+        with db_utils.connect() as conn:
+            assert conn is mock_direct.return_value
+        mock_direct.return_value.close.assert_called_once()
@@ -0,0 +1,89 @@
+"""
+Unit tests for turn-local query embedding memoization.
+"""
+import os
+import numpy as np
+import pytest
+from unittest.mock import patch, MagicMock
+from retrieval.embed_cache import embed_query, get_or_compute, turn_embedding_cache
+
+
+@pytest.fixture(autouse=True)
+def embed_cache_dir(tmp_path):
+    with patch('retrieval.embed_cache.EMBED_CACHE_DIR', str(tmp_path)):
+        yield tmp_path
+
+
+class TestTurnEmbeddingCache:
+    """Tests for embed_query inside and outside a turn."""
+    
+    @patch('ingestion.embeddings.embed_text')
+    def test_repeated_query_embedded_once_per_turn(self, mock_embed):
+        """Test case/whitespace variants share one embedding and the cache ends with the turn."""
+        mock_embed.side_effect = lambda text, normalize_emb=True: np.ones(4, dtype=np.float32)
+        with turn_embedding_cache():
+            first = embed_query("What is RAG?")
+            assert embed_query("  what is  rag? ") is first
+            with turn_embedding_cache() as inner:
+                embed_query("What is RAG?")
+                assert len(inner) == 1
+        assert mock_embed.call_count == 1
+        with pytest.raises(ValueError):
+            first[0] = 2.0
+        
+        with patch('retrieval.embed_cache.EMBED_CACHE_ENABLED', False):
+            embed_query("What is RAG?")
+            embed_query("What is RAG?")
+        assert mock_embed.call_count == 3
+    
+    @patch.dict('os.environ', {'RETRIEVAL_MAX_WORKERS': '1'})
+    @patch('retrieval.retrieval.retrieve_hybrid')
+    @patch('ingestion.embeddings.embed_text')
+    def test_multi_query_workers_share_turn_cache(self, mock_embed, mock_retrieve):
+        """Test retrieve_hybrid_multi worker threads see the caller's turn cache."""
+        from retrieval.retrieval import retrieve_hybrid_multi
+        mock_embed.side_effect = lambda text, normalize_emb=True: np.ones(4, dtype=np.float32)
+        mock_retrieve.side_effect = lambda q, *args, **kwargs: (embed_query("shared"), [])[1]
+        with turn_embedding_cache():
+            retrieve_hybrid_multi(["a", "b", "c"])
+        assert mock_embed.call_count == 1
+
+
+class TestDiskEmbeddingCache:
+    """Tests for the persistent embedding cache."""
+    
+    @patch('retrieval.embed_cache.EMBED_CACHE_ENABLED', True)
+    def test_get_or_compute_persists_per_model(self, embed_cache_dir):
+        """Test a stored embedding is reused across calls and keyed by CLIP model."""
+        fn = MagicMock(return_value=np.arange(4, dtype=np.float32))
+        with patch.dict('os.environ', {'CLIP_MODEL': 'openai/clip-a'}):
+            get_or_compute("What is RAG?", fn)
+            cached = get_or_compute("what is  RAG?", fn)
+        assert fn.call_count == 1
+        np.testing.assert_array_equal(cached, np.arange(4, dtype=np.float32))
+        assert len(list((embed_cache_dir / "openai__clip-a").glob("*.npy"))) == 1
+        
+        with patch.dict('os.environ', {'CLIP_MODEL': 'openai/clip-b'}):
+            get_or_compute("What is RAG?", fn)
+        assert fn.call_count == 2
+    
+    @patch('retrieval.embed_cache.EMBED_CACHE_MAX_AGE_SEC', 3600.0)
+    @patch('retrieval.embed_cache.EMBED_CACHE_MAX_FILES', 2)
+    @patch('retrieval.embed_cache._writes', 0)
+    @patch('retrieval.embed_cache.EMBED_CACHE_ENABLED', True)
+    def test_disk_cache_is_bounded(self, embed_cache_dir):
+        """Test stale files and the least recently used beyond the cap are deleted on write."""
+        from retrieval.embed_cache import _cache_path
+        fn = MagicMock(return_value=np.zeros(4, dtype=np.float32))
+        with patch.dict('os.environ', {'CLIP_MODEL': 'm'}):
+            for q in ("stale", "old", "recent"):
+                get_or_compute(q, fn)
+            now = os.path.getmtime(_cache_path("recent"))
+            os.utime(_cache_path("stale"), (now - 7200, now - 7200))
+            os.utime(_cache_path("old"), (now - 60, now - 60))
+            os.utime(_cache_path("recent"), (now - 30, now - 30))
+            with patch('retrieval.embed_cache._writes', 0):
+                get_or_compute("new", fn)
+            
+            remaining = {p.name for p in (embed_cache_dir / "m").glob("*.npy")}
+        assert remaining == {_cache_path("recent").name, _cache_path("new").name}
@@ -2,7 +2,7 @@
 Unit tests for retrieval chunk merging and deduplication.
 """
 import pytest
-from retrieval.stages import merge_and_deduplicate
+from retrieval.stages import merge_and_deduplicate, dedup_by_chunk_id
 
 
 class TestMergeAndDeduplicate:
@@ -33,3 +33,51 @@ class TestMergeAndDeduplicate:
         result = merge_and_deduplicate(primary, secondary, k=2)
         assert result[0]["chunk_id"] == "1"  # Primary comes first
 
+
+
+class TestFuseRRF:
+    """Tests for reciprocal rank fusion of multi-query results."""
+    
+    def test_fuse_rrf_ranks_shared_chunks_first(self):
+        """Test chunks found by several queries outrank single-query chunks."""
+        from retrieval.stages import fuse_rrf
+        list_a = [{"chunk_id": "1", "vec": 0.9}, {"chunk_id": "2", "vec": 0.8}]
+        list_b = [{"chunk_id": "3", "vec": 0.95}, {"chunk_id": "2", "vec": 0.1}]
+        result = fuse_rrf([list_a, list_b], k=3)
+        assert [c["chunk_id"] for c in result] == ["2", "1", "3"]
+        # First-seen dict is kept for duplicates
+        assert result[0]["vec"] == 0.8
+    
+    def test_fuse_rrf_respects_k(self):
+        """Test fused result is truncated to k."""
+        from retrieval.stages import fuse_rrf
+        result = fuse_rrf([[{"chunk_id": str(i)} for i in range(5)]], k=2)
+        assert len(result) == 2
+
+
+class TestDedupByChunkId:
+    """Tests for first-occurrence deduplication by chunk_id."""
+    
+    def test_dedup_small_list_keeps_first(self):
+        """Test a small list keeps the first occurrence in order."""
+        chunks = [{"chunk_id": "a", "n": 1}, {"chunk_id": "b"}, {"chunk_id": "a", "n": 2}]
+        result = dedup_by_chunk_id(chunks)
+        assert [c["chunk_id"] for c in result] == ["a", "b"]
+        assert result[0]["n"] == 1
+    
+    def test_dedup_large_list_matches_set_path(self):
+        """Test large lists keep the first occurrence in order."""
+        chunks = [{"chunk_id": f"c{i % 25}", "n": i} for i in range(60)]
+        result = dedup_by_chunk_id(chunks)
+        assert [c["n"] for c in result] == list(range(25))
+    
+    def test_dedup_several_sources_in_order(self):
+        """Test prior evidence and new hits dedup as one list."""
+        evidence = [{"chunk_id": "a", "n": 1}, {"chunk_id": "b", "n": 2}]
+        hits = [{"chunk_id": "b", "n": 3}, {"chunk_id": "c", "n": 4}]
+        assert [c["n"] for c in dedup_by_chunk_id(evidence, hits)] == [1, 2, 4]
+        
+        evidence = [{"chunk_id": f"c{i}", "n": i} for i in range(30)]
+        hits = [{"chunk_id": f"c{i}", "n": 100 + i} for i in range(25, 40)]
+        assert [c["n"] for c in dedup_by_chunk_id(evidence, hits)] == list(range(30)) + list(range(130, 140))
+        assert dedup_by_chunk_id([], []) == []
@@ -39,3 +39,38 @@ def test_mmr_basic():
     assert all("chunk_id" in r for r in result)
     assert all("emb" in r for r in result)
 
+
+
+def _mmr_reference(candidates, query_emb, lambda_mult=0.5, k=8):
+    """Per-pair reference implementation the vectorized mmr must match."""
+    selected = []
+    cand = candidates.copy()
+    while len(selected) < min(k, len(cand)):
+        best, best_id, best_score = None, None, -1e9
+        for c in cand:
+            sim_q = float(np.dot(c["emb"], query_emb))
+            sim_d = max((np.dot(c["emb"], s["emb"]) for s in selected), default=0.0)
+            score = lambda_mult*sim_q - (1-lambda_mult)*sim_d
+            if score > best_score:
+                best, best_id, best_score = c, c["chunk_id"], score
+        selected.append(best)
+        cand = [x for x in cand if x["chunk_id"] != best_id]
+    return selected
+
+
+def test_mmr_matches_reference_selection():
+    """Test the vectorized selection order matches the per-pair implementation."""
+    rng = np.random.default_rng(0)
+    for lambda_mult in (0.0, 0.5, 0.9):
+        embs = rng.standard_normal((30, 64)).astype(np.float32)
+        embs /= np.linalg.norm(embs, axis=1, keepdims=True)
+        query_emb = embs[0] + 0.1 * embs[1]
+        candidates = [{"chunk_id": str(i), "emb": e} for i, e in enumerate(embs)]
+        
+        expected = [c["chunk_id"] for c in _mmr_reference(candidates, query_emb, lambda_mult, k=8)]
+        assert [c["chunk_id"] for c in mmr(candidates, query_emb, lambda_mult, k=8)] == expected
+
+
+def test_mmr_empty_candidates():
+    """Test no candidates yields no selection."""
+    assert mmr([], np.ones(4, dtype=np.float32)) == []
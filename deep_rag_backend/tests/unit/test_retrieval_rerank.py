@@ -3,7 +3,7 @@ Unit tests for reranking functionality.
 """
 import pytest
 from unittest.mock import patch, MagicMock
-from retrieval.reranker.rerank import rerank_candidates
+from retrieval.reranker.rerank import rerank_candidates, rerank_candidates_batch
 
 
 class TestRerankCandidates:
@@ -97,3 +97,90 @@ class TestRerankCandidates:
         assert result == candidates
         assert "ce" not in result[0]  # No scores added on failure
 
+    
+    @patch('retrieval.reranker.rerank.get_reranker')
+    def test_rerank_candidates_batch_single_predict(self, mock_get_reranker):
+        """Test several queries are scored in one predict call and sorted per query."""
+        mock_reranker = MagicMock()
+        mock_reranker.predict.return_value = [0.1, 0.9, 0.4]
+        mock_get_reranker.return_value = mock_reranker
+        
+        result = rerank_candidates_batch(
+            ["q1", "q2"],
+            [[{"chunk_id": "a", "text": "A"}, {"chunk_id": "b", "text": "B"}], [{"chunk_id": "c", "text": "C"}]],
+        )
+        
+        mock_reranker.predict.assert_called_once_with([["q1", "A"], ["q1", "B"], ["q2", "C"]])
+        assert [c["chunk_id"] for c in result[0]] == ["b", "a"]
+        assert result[1][0]["ce"] == 0.4
+
+
+class TestGetReranker:
+    """Tests for one-time reranker loading."""
+    
+    def setup_method(self):
+        from retrieval.reranker import model
+        model._reranker = None
+        model._reranker_loaded = False
+        model._reranker_retry_at = 0.0
+        model._reranker_warm = False
+    
+    def teardown_method(self):
+        self.setup_method()
+    
+    @patch('retrieval.reranker.model.CrossEncoder')
+    def test_concurrent_first_calls_load_once(self, mock_cross_encoder):
+        """Test parallel retrievals share a single model load."""
+        import threading
+        import time
+        from retrieval.reranker.model import get_reranker
+        
+        def slow_load(path):
+            time.sleep(0.05)
+            return MagicMock()
+        
+        mock_cross_encoder.side_effect = slow_load
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(get_reranker())) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        
+        assert mock_cross_encoder.call_count == 1
+        assert all(r is results[0] for r in results)
+    
+    @patch('retrieval.reranker.model.CrossEncoder', side_effect=OSError("no model"))
+    def test_failed_load_not_retried(self, mock_cross_encoder):
+        """Test a missing model is not reloaded on every query."""
+        from retrieval.reranker.model import get_reranker
+        
+        assert get_reranker() is None
+        assert get_reranker() is None
+        assert mock_cross_encoder.call_count == 1
+    
+    @patch('retrieval.reranker.model.time.monotonic')
+    @patch('retrieval.reranker.model.CrossEncoder')
+    def test_failed_load_retried_after_backoff(self, mock_cross_encoder, mock_monotonic):
+        """Test a failed load is retried once RERANK_RETRY_SECONDS have passed."""
+        from retrieval.reranker import model
+        
+        loaded = MagicMock()
+        mock_cross_encoder.side_effect = [OSError("no model"), loaded]
+        mock_monotonic.return_value = 100.0
+        assert model.get_reranker() is None
+        
+        mock_monotonic.return_value = 100.0 + model.RERANK_RETRY_SECONDS + 1
+        assert model.get_reranker() is loaded
+        assert model.get_reranker() is loaded
+        assert mock_cross_encoder.call_count == 2
+    
+    @patch('retrieval.reranker.model.CrossEncoder')
+    def test_warmup_predicts_once(self, mock_cross_encoder):
+        """Test warm-up runs a single tiny prediction per process."""
+        from retrieval.reranker.model import warmup_reranker
+        
+        warmup_reranker()
+        warmup_reranker()
+        
+        mock_cross_encoder.return_value.predict.assert_called_once_with([["warm", "up"]])
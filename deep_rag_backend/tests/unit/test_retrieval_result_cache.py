@@ -0,0 +1,105 @@
+"""
+Unit tests for retrieval result memoization.
+"""
+import numpy as np
+from unittest.mock import MagicMock, patch
+from inference.routes.documents import delete_document
+from retrieval.invalidation import register_index_hook
+from retrieval.retrieval import retrieve_hybrid, retrieve_hybrid_batch
+from retrieval.wait import mark_chunks_committed
+
+
+def _hits(query):
+    return [{"chunk_id": f"{query}-1", "doc_id": "doc1", "text": "t", "ce": 0.5}]
+
+
+class TestRetrievalResultCache:
+    """Tests for caching retrieve_hybrid results."""
+
+    @patch('retrieval.retrieval.retrieve_stage_one')
+    def test_repeat_query_served_from_cache(self, mock_stage_one):
+        """Test a whitespace/case variant of the same query reuses the cached hits."""
+        mock_stage_one.side_effect = lambda q, *args: _hits(q)
+
+        first = retrieve_hybrid("Revenue  growth", 5, 10, 10, doc_id="doc1")
+        first[0]["ce"] = 99.0  # callers may annotate hits; the cache keeps its own copy
+        second = retrieve_hybrid(" revenue growth ", 5, 10, 10, doc_id="doc1")
+
+        assert mock_stage_one.call_count == 1
+        assert second[0]["chunk_id"] == "Revenue  growth-1"
+        assert second[0]["ce"] == 0.5
+
+    @patch('retrieval.retrieval.retrieve_stage_one')
+    def test_parameters_are_part_of_key(self, mock_stage_one):
+        """Test a different doc_id or k is a miss."""
+        mock_stage_one.side_effect = lambda q, *args: _hits(q)
+
+        retrieve_hybrid("q", 5, 10, 10, doc_id="doc1")
+        retrieve_hybrid("q", 5, 10, 10, doc_id="doc2")
+        retrieve_hybrid("q", 6, 10, 10, doc_id="doc1")
+
+        assert mock_stage_one.call_count == 3
+
+    @patch('retrieval.retrieval.retrieve_stage_one')
+    def test_committed_chunks_invalidate_cache(self, mock_stage_one):
+        """Test ingesting new chunks drops cached results."""
+        mock_stage_one.side_effect = lambda q, *args: _hits(q)
+
+        retrieve_hybrid("q", 5, 10, 10)
+        mark_chunks_committed("doc-new", 3)
+        retrieve_hybrid("q", 5, 10, 10)
+
+        assert mock_stage_one.call_count == 2
+
+    @patch('inference.routes.documents.connect')
+    @patch('retrieval.retrieval.retrieve_stage_one')
+    def test_deleted_document_invalidates_cache(self, mock_stage_one, mock_connect):
+        """Test deleting a document drops cached results."""
+        mock_stage_one.side_effect = lambda q, *args: _hits(q)
+        mock_cursor = MagicMock()
+        mock_cursor.fetchone.return_value = ("doc1", "Title")
+        mock_conn = mock_connect.return_value.__enter__.return_value
+        mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
+
+        retrieve_hybrid("q", 5, 10, 10)
+        delete_document("doc1")
+        retrieve_hybrid("q", 5, 10, 10)
+
+        mock_conn.commit.assert_called_once()
+        assert mock_stage_one.call_count == 2
+
+    @patch('retrieval.retrieval.rerank_candidates_batch', side_effect=lambda queries, lists: lists)
+    @patch('retrieval.retrieval.fetch_stage_one_candidates')
+    @patch('retrieval.retrieval.retrieve_stage_one')
+    def test_batch_fetches_only_misses(self, mock_stage_one, mock_fetch, mock_rerank):
+        """Test batch retrieval reuses cached queries and caches the ones it fetched."""
+        qemb = np.ones(4, dtype=np.float32)
+        mock_stage_one.side_effect = lambda q, *args: _hits(q)
+        mock_fetch.side_effect = lambda q, *args: ([{"chunk_id": f"{q}-b", "emb": qemb}], qemb)
+
+        retrieve_hybrid("q1", 5, 10, 10)
+        result = retrieve_hybrid_batch(["q1", "q2"], 5, 10, 10)
+        again = retrieve_hybrid_batch(["q2"], 5, 10, 10)
+
+        assert [h["chunk_id"] for h in result[0]] == ["q1-1"]
+        assert [h["chunk_id"] for h in result[1]] == ["q2-b"]
+        assert [c.args[0] for c in mock_fetch.call_args_list] == ["q2"]
+        assert [h["chunk_id"] for h in again[0]] == ["q2-b"]
+
+
+class TestIndexHooks:
+    """Tests for the retrieval-side index-change hook registry."""
+
+    def test_hooks_run_once_and_survive_failures(self):
+        """Test a duplicate registration runs once and a failing hook doesn't stop the rest."""
+        failing = MagicMock(side_effect=RuntimeError("boom"))
+        hook = MagicMock()
+
+        with patch('retrieval.invalidation._hooks', []):
+            register_index_hook(failing)
+            register_index_hook(hook)
+            register_index_hook(hook)
+            mark_chunks_committed("doc-new", 2)
+
+        failing.assert_called_once()
+        hook.assert_called_once()
@@ -15,15 +15,15 @@ class TestStageOne:
     """Tests for stage one retrieval."""
     
     @patch('retrieval.stages.stage_one.connect')
-    @patch('retrieval.stages.stage_one.embed_text')
-    def test_retrieve_stage_one_basic(self, mock_embed_text, mock_connect):
+    @patch('retrieval.stages.stage_one.embed_query')
+    def test_retrieve_stage_one_basic(self, mock_embed_query, mock_connect):
         k: int = int(os.getenv('K_RETRIEVER', '6'))
         k_lex: int = int(os.getenv('K_LEX', '60'))
         k_vec: int = int(os.getenv('K_VEC', '60'))
         logger.info(f"Test Retrieval - Stage One Basic Parameters: k={k}, k_lex={k_lex}, k_vec={k_vec}")
 
         """Test basic stage one retrieval."""
-        mock_embed_text.return_value = np.array([0.1] * 768)
+        mock_embed_query.return_value = np.array([0.1] * 768)
         
         mock_conn = MagicMock()
         mock_cur = MagicMock()
@@ -41,17 +41,17 @@ class TestStageOne:
         result = retrieve_stage_one("test query", k, k_lex, k_vec, query_image=None, doc_id=None)
         
         assert len(result) >= 0  # May be empty if embedding parsing fails
-        mock_embed_text.assert_called_once()
+        mock_embed_query.assert_called_once()
     
     @patch('retrieval.stages.stage_one.connect')
-    @patch('retrieval.stages.stage_one.embed_text')
-    def test_retrieve_stage_one_with_doc_id(self, mock_embed_text, mock_connect):
+    @patch('retrieval.stages.stage_one.embed_query')
+    def test_retrieve_stage_one_with_doc_id(self, mock_embed_query, mock_connect):
         k: int = int(os.getenv('K_RETRIEVER', '6'))
         k_lex: int = int(os.getenv('K_LEX', '60'))
         k_vec: int = int(os.getenv('K_VEC', '60'))
         logger.info(f"Test Retrieval - Stage One w/Doc ID Parameters: k={k}, k_lex={k_lex}, k_vec={k_vec}")
         """Test stage one retrieval with doc_id filter."""
-        mock_embed_text.return_value = np.array([0.1] * 768)
+        mock_embed_query.return_value = np.array([0.1] * 768)
         
         mock_conn = MagicMock()
         mock_cur = MagicMock()
@@ -71,10 +71,10 @@ class TestStageTwo:
     """Tests for stage two retrieval."""
     
     @patch('retrieval.stages.stage_two.connect')
-    @patch('retrieval.stages.stage_two.embed_text')
-    def test_retrieve_stage_two_basic(self, mock_embed_text, mock_connect):
+    @patch('retrieval.stages.stage_two.embed_query')
+    def test_retrieve_stage_two_basic(self, mock_embed_query, mock_connect):
         """Test basic stage two retrieval."""
-        mock_embed_text.return_value = np.array([0.1] * 768)
+        mock_embed_query.return_value = np.array([0.1] * 768)
         
         mock_conn = MagicMock()
         mock_cur = MagicMock()
@@ -96,13 +96,13 @@ class TestStageTwo:
         )
         
         assert len(result) >= 0  # May be empty if embedding parsing fails
-        mock_embed_text.assert_called_once()
+        mock_embed_query.assert_called_once()
     
     @patch('retrieval.stages.stage_two.connect')
-    @patch('retrieval.stages.stage_two.embed_text')
-    def test_retrieve_stage_two_combines_query(self, mock_embed_text, mock_connect):
+    @patch('retrieval.stages.stage_two.embed_query')
+    def test_retrieve_stage_two_combines_query(self, mock_embed_query, mock_connect):
         """Test that stage two combines original query with primary content."""
-        mock_embed_text.return_value = np.array([0.1] * 768)
+        mock_embed_query.return_value = np.array([0.1] * 768)
         
         mock_conn = MagicMock()
         mock_cur = MagicMock()
@@ -119,7 +119,44 @@ class TestStageTwo:
         )
         
         # Verify query is used
-        call_args = mock_embed_text.call_args
+        call_args = mock_embed_query.call_args
         query_text = call_args[0][0]
         assert "original query" in query_text or "primary content" in query_text
 
+
+
+class TestRetrieveHybridBatch:
+    """Tests for batch retrieval with a shared rerank pass."""
+    
+    @patch('retrieval.retrieval.rerank_candidates_batch')
+    @patch('retrieval.retrieval.fetch_stage_one_candidates')
+    def test_one_rerank_for_all_queries(self, mock_fetch, mock_rerank):
+        """Test candidates for every query are reranked together and returned per query."""
+        from retrieval.retrieval import retrieve_hybrid_batch
+        qemb = np.ones(4, dtype=np.float32)
+        
+        def fake_fetch(query, k_lex, k_vec, query_image, doc_id):
+            if query == "empty":
+                return [], qemb
+            return [{"chunk_id": f"{query}-1", "emb": qemb, "doc_id": doc_id}], qemb
+        
+        mock_fetch.side_effect = fake_fetch
+        mock_rerank.side_effect = lambda queries, lists: lists
+        
+        result = retrieve_hybrid_batch(["q1", "empty", "q2"], 5, 10, 10, doc_id="doc1")
+        
+        mock_rerank.assert_called_once()
+        assert mock_rerank.call_args.args[0] == ["q1", "empty", "q2"]
+        assert [[c["chunk_id"] for c in hits] for hits in result] == [["q1-1"], [], ["q2-1"]]
+        assert {c.args[4] for c in mock_fetch.call_args_list} == {"doc1"}
+    
+    @patch('retrieval.retrieval.retrieve_hybrid')
+    def test_two_stage_falls_back_per_query(self, mock_retrieve):
+        """Test cross_doc with doc_id keeps per-query two-stage retrieval."""
+        from retrieval.retrieval import retrieve_hybrid_batch
+        mock_retrieve.side_effect = lambda q, *args, **kwargs: [{"chunk_id": q}]
+        
+        result = retrieve_hybrid_batch(["q1", "q2"], doc_id="doc1", cross_doc=True)
+        
+        assert result == [[{"chunk_id": "q1"}], [{"chunk_id": "q2"}]]
+        assert all(c.kwargs["cross_doc"] for c in mock_retrieve.call_args_list)
@@ -38,3 +38,13 @@ class TestWaitForChunks:
         with pytest.raises(TimeoutError):
             wait_for_chunks(test_doc_id, max_wait_seconds=0.1)
 
+    
+    @patch('retrieval.wait.connect')
+    def test_wait_for_chunks_committed_in_process_skips_poll(self, mock_connect):
+        """Test chunks committed by this process are returned without querying the database."""
+        from retrieval.wait import mark_chunks_committed
+        test_doc_id = str(uuid.uuid4())
+        mark_chunks_committed(test_doc_id, 7)
+        
+        assert wait_for_chunks(test_doc_id, max_wait_seconds=1) == 7
+        mock_connect.assert_not_called()
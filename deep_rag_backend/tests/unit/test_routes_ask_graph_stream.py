@@ -0,0 +1,72 @@
+"""
+Unit tests for the /ask-graph/stream SSE route.
+"""
+import json
+from unittest.mock import patch
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from inference.routes.ask_graph import router
+
+
+def _events(body: str):
+    """Parse an SSE body into (event, data) pairs."""
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+class TestAskGraphStream:
+    """Tests for streaming graph answers as server-sent events."""
+    
+    def setup_method(self):
+        app = FastAPI()
+        app.include_router(router)
+        self.client = TestClient(app)
+    
+    @patch('inference.routes.ask_graph.log_thread_interaction')
+    @patch('inference.routes.ask_graph.get_document_title', return_value="Report")
+    @patch('inference.routes.ask_graph.stream_with_graph')
+    def test_tokens_then_result(self, mock_stream, mock_title, mock_log):
+        """Test each delta is a token event and the final event is the /ask-graph response body."""
+        mock_stream.return_value = iter([
+            {"event": "token", "data": "Line one\n"},
+            {"event": "token", "data": "line two"},
+            {"event": "result", "data": {"answer": "Line one\nline two [A]", "doc_id": "doc1",
+                                         "doc_ids": ["doc1"], "pages": ["1"], "confidence": 0.8}},
+        ])
+        
+        resp = self.client.post("/ask-graph/stream", json={"question": "q", "doc_id": "doc1", "thread_id": "t1"})
+        
+        assert resp.headers["content-type"].startswith("text/event-stream")
+        events = _events(resp.text)
+        assert events[:2] == [("token", "Line one\n"), ("token", "line two")]
+        assert events[2][0] == "result"
+        assert events[2][1]["answer"] == "Line one\nline two [A]"
+        assert events[2][1]["doc_title"] == "Report"
+        assert mock_stream.call_args.kwargs["thread_id"] == "t1"
+        mock_log.assert_called_once()
+    
+    @patch('inference.routes.ask_graph.stream_with_graph')
+    def test_no_selection_returns_result_without_running_graph(self, mock_stream):
+        """Test an explicit empty selection without cross_doc yields only the no-documents result."""
+        resp = self.client.post("/ask-graph/stream", json={"question": "q", "selected_doc_ids": []})
+        
+        events = _events(resp.text)
+        assert [e for e, _ in events] == ["result"]
+        assert events[0][1]["action"] == "no_documents"
+        mock_stream.assert_not_called()
+    
+    @patch('inference.routes.ask_graph.stream_with_graph')
+    def test_graph_error_becomes_error_event(self, mock_stream):
+        """Test a failure after the response started is reported in-band."""
+        def failing(*args, **kwargs):
+            yield {"event": "token", "data": "partial"}
+            raise RuntimeError("LLM down")
+        
+        mock_stream.side_effect = failing
+        
+        resp = self.client.post("/ask-graph/stream", json={"question": "q", "cross_doc": True})
+        
+        assert _events(resp.text) == [("token", "partial"), ("error", {"detail": "LLM down"})]
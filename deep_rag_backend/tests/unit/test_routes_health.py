@@ -0,0 +1,42 @@
+"""
+Unit tests for the /health route.
+"""
+from unittest.mock import patch
+import inference.routes.health as health_route
+
+
+class TestHealthRoute:
+    """Tests for the cached schema check in /health."""
+    
+    @staticmethod
+    def _cursor(mock_connect):
+        cur = mock_connect.return_value.__enter__.return_value.cursor.return_value.__enter__.return_value
+        cur.fetchall.return_value = [("chunks",), ("documents",), ("thread_tracking",)]
+        return cur
+    
+    @patch.object(health_route, '_healthy_result', None)
+    @patch('inference.routes.health.connect')
+    def test_repeat_probe_only_pings_database(self, mock_connect):
+        """Test a probe within the TTL reuses the table check and only runs SELECT 1."""
+        cur = self._cursor(mock_connect)
+        
+        first = health_route.health()
+        second = health_route.health()
+        
+        assert first == second
+        assert first["status"] == "healthy"
+        assert mock_connect.call_count == 2
+        assert "information_schema" in cur.execute.call_args_list[0].args[0]
+        assert cur.execute.call_args_list[1].args == ("SELECT 1",)
+    
+    @patch.object(health_route, 'HEALTH_SCHEMA_TTL_SEC', 0.0)
+    @patch.object(health_route, '_healthy_result', None)
+    @patch('inference.routes.health.connect')
+    def test_expired_check_queries_catalog(self, mock_connect):
+        """Test the table check runs again once the TTL has passed."""
+        cur = self._cursor(mock_connect)
+        
+        health_route.health()
+        health_route.health()
+        
+        assert all("information_schema" in c.args[0] for c in cur.execute.call_args_list)
@@ -0,0 +1,74 @@
+"""
+Unit tests for attachment ingestion in the /infer-graph route.
+"""
+from unittest.mock import patch
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from inference.routes.infer_graph import router
+
+
+class TestInferGraphAttachments:
+    """Tests for all-or-nothing ingestion of several attachments."""
+    
+    def setup_method(self):
+        app = FastAPI()
+        app.include_router(router)
+        self.client = TestClient(app)
+    
+    @patch('inference.routes.infer_graph.ask_with_graph_async')
+    @patch('inference.routes.infer_graph.ingest_text_file')
+    @patch('inference.routes.infer_graph.ingest_pdf')
+    def test_unsupported_type_rejected_before_ingest(self, mock_pdf, mock_txt, mock_ask):
+        """Test a bad attachment fails the request before any attachment is ingested."""
+        files = [
+            ("attachments", ("report.pdf", b"%PDF-1.4", "application/pdf")),
+            ("attachments", ("notes.txt", b"notes", "text/plain")),
+            ("attachments", ("data.xlsx", b"xlsx", "application/octet-stream")),
+        ]
+        
+        resp = self.client.post("/infer-graph", data={"question": "q"}, files=files)
+        
+        assert resp.status_code == 400
+        assert "Unsupported file type: .xlsx" in resp.json()["detail"]
+        mock_pdf.assert_not_called()
+        mock_txt.assert_not_called()
+        mock_ask.assert_not_called()
+    
+    @patch('inference.routes.infer_graph.ask_with_graph_async')
+    @patch('inference.routes.infer_graph.delete_document')
+    @patch('inference.routes.infer_graph.wait_for_chunks', return_value=3)
+    @patch('inference.routes.infer_graph.ingest_text_file', side_effect=RuntimeError("embedding failed"))
+    @patch('inference.routes.infer_graph.ingest_pdf', return_value=("doc-pdf", True))
+    def test_failed_ingest_rolls_back_the_others(self, mock_pdf, mock_txt, mock_wait, mock_delete, mock_ask):
+        """Test attachments that did ingest are deleted when another one fails."""
+        files = [
+            ("attachments", ("report.pdf", b"%PDF-1.4", "application/pdf")),
+            ("attachments", ("notes.txt", b"notes", "text/plain")),
+        ]
+        
+        resp = self.client.post("/infer-graph", data={"question": "q"}, files=files)
+        
+        assert resp.status_code == 500
+        assert "embedding failed" in resp.json()["detail"]
+        mock_delete.assert_called_once_with("doc-pdf")
+        mock_ask.assert_not_called()
+    
+    @patch('inference.routes.infer_graph.ask_with_graph_async')
+    @patch('inference.routes.infer_graph.delete_document')
+    @patch('inference.routes.infer_graph.wait_for_chunks', return_value=3)
+    @patch('inference.routes.infer_graph.ingest_image', return_value=("doc-new", True))
+    @patch('inference.routes.infer_graph.ingest_text_file', side_effect=RuntimeError("embedding failed"))
+    @patch('inference.routes.infer_graph.ingest_pdf', return_value=("doc-existing", False))
+    def test_rollback_keeps_preexisting_duplicates(self, mock_pdf, mock_txt, mock_image, mock_wait, mock_delete, mock_ask):
+        """Test an attachment that matched a document already in the knowledge base is not deleted."""
+        files = [
+            ("attachments", ("report.pdf", b"%PDF-1.4", "application/pdf")),
+            ("attachments", ("notes.txt", b"notes", "text/plain")),
+            ("attachments", ("scan.png", b"png", "image/png")),
+        ]
+        
+        resp = self.client.post("/infer-graph", data={"question": "q"}, files=files)
+        
+        assert resp.status_code == 500
+        mock_delete.assert_called_once_with("doc-new")
+        assert mock_pdf.call_args.kwargs["return_created"] is True
@@ -0,0 +1,112 @@
+"""
+Unit tests for the semantic answer cache.
+"""
+import numpy as np
+import pytest
+from unittest.mock import MagicMock, patch
+from inference.semantic_cache import SemanticCache, cached_stream, quantize_int8
+from retrieval.wait import mark_chunks_committed
+
+
+def _fake_embed(text: str) -> np.ndarray:
+    """Deterministic toy embedding: paraphrases of 'capital of france' land together."""
+    return np.array([1.0, 0.05, 0.0]) if "france" in text.lower() else np.array([0.0, 0.1, 1.0])
+
+
+class TestSemanticCache:
+    """Tests for SemanticCache lookup, scoping and persistence."""
+    
+    def test_semantic_hit_within_scope_only(self):
+        """Test paraphrases hit in the same scope and miss in another scope."""
+        cache = SemanticCache(threshold=0.9, embed_fn=_fake_embed)
+        cache.put("What is the capital of France?", "Paris", scope=("agents", None, False))
+        
+        value, _ = cache.get("capital city of France", scope=("agents", None, False))
+        assert value == "Paris"
+        assert cache.get("capital city of France", scope=("agents", "doc-1", False))[0] is None
+        assert cache.get("How do transformers work?", scope=("agents", None, False))[0] is None
+    
+    def test_exact_match_skips_embedding(self):
+        """Test a normalized exact repeat is served without embedding the question."""
+        embed = MagicMock(side_effect=_fake_embed)
+        cache = SemanticCache(embed_fn=embed)
+        cache.put("Capital of  France?", "Paris")
+        embed.reset_mock()
+        
+        assert cache.get("capital of france?")[0] == "Paris"
+        embed.assert_not_called()
+    
+    def test_lru_eviction(self):
+        """Test the least recently used entry is evicted when over capacity."""
+        cache = SemanticCache(maxsize=1, embed_fn=_fake_embed)
+        cache.put("france?", "Paris")
+        cache.put("other?", "Other")
+        assert cache.stats()["size"] == 1
+        assert cache.get("france?")[0] is None
+    
+    def test_persistence_roundtrip(self, tmp_path):
+        """Test entries saved to disk are loaded by a new cache instance."""
+        path = str(tmp_path / "semcache")
+        SemanticCache(path=path, embed_fn=_fake_embed).put("France capital", {"answer": "Paris"}, scope=("graph", None, False, "default"))
+        
+        reloaded = SemanticCache(path=path, embed_fn=_fake_embed)
+        assert reloaded.get("France capital", scope=("graph", None, False, "default"))[0] == {"answer": "Paris"}
+    
+    def test_persisted_entries_expire_on_wall_clock(self, tmp_path):
+        """Test an entry saved by one process is expired for a later process once its TTL passed."""
+        path = str(tmp_path / "semcache")
+        with patch('inference.semantic_cache.time.time', return_value=1_000.0):
+            SemanticCache(ttl_sec=60.0, path=path, embed_fn=_fake_embed).put("France capital", "Paris")
+        
+        with patch('inference.semantic_cache.time.time', return_value=1_030.0):
+            assert SemanticCache(path=path, embed_fn=_fake_embed).get("France capital")[0] == "Paris"
+        with patch('inference.semantic_cache.time.time', return_value=1_061.0):
+            assert SemanticCache(path=path, embed_fn=_fake_embed).get("France capital")[0] is None
+    
+    @patch('inference.semantic_cache.SEMANTIC_CACHE_ENABLED', True)
+    def test_ingest_clears_cached_answers(self, tmp_path):
+        """Test committing new chunks drops in-memory and persisted answers."""
+        path = str(tmp_path / "semcache")
+        cache = SemanticCache(path=path, embed_fn=_fake_embed)
+        cache.put("France capital", "Paris")
+        
+        with patch('inference.semantic_cache._cache', cache):
+            mark_chunks_committed("doc-new", 3)
+        
+        assert cache.get("France capital")[0] is None
+        assert SemanticCache(path=path, embed_fn=_fake_embed).stats()["size"] == 0
+
+
+class TestCachedStream:
+    """Tests for the streaming cache wrapper."""
+    
+    @patch('inference.semantic_cache.SEMANTIC_CACHE_ENABLED', True)
+    @patch('inference.semantic_cache.get_semantic_cache')
+    def test_miss_streams_then_caches_joined_answer(self, mock_get_cache):
+        """Test a miss yields every delta and a repeat is served whole from the cache."""
+        mock_get_cache.return_value = SemanticCache(embed_fn=_fake_embed)
+        stream = MagicMock(side_effect=lambda: iter(["Par", "is"]))
+        
+        assert list(cached_stream("capital of France?", "s", stream)) == ["Par", "is"]
+        assert list(cached_stream("capital of France?", "s", stream)) == ["Paris"]
+        assert stream.call_count == 1
+
+
+class TestQuantizeInt8:
+    """Tests for int8 embedding quantization."""
+    
+    def test_roundtrip_preserves_cosine(self):
+        """Test dequantized similarities stay within 1e-2 of float32 ones."""
+        rng = np.random.default_rng(0)
+        embs = rng.standard_normal((16, 512)).astype(np.float32)
+        embs /= np.linalg.norm(embs, axis=1, keepdims=True)
+        query = embs[0]
+        for emb in embs:
+            codes, scale = quantize_int8(emb)
+            assert codes.dtype == np.int8
+            assert abs(float(codes.astype(np.float32) @ query) * scale - float(emb @ query)) < 1e-2
+    
+    def test_zero_vector(self):
+        """Test an all-zero vector quantizes without dividing by zero."""
+        codes, scale = quantize_int8(np.zeros(4, dtype=np.float32))
+        assert not codes.any() and scale == 1.0